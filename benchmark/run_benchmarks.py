@@ -0,0 +1,663 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""Benchmark suite for state update and serialization hot paths
+
+Usage:
+    python benchmark/run_benchmarks.py [--output results.json]
+                                       [--thresholds benchmark/thresholds.json]
+                                       [--baseline previous_results.json]
+
+Every benchmark reports the median and mean latency in microseconds of one
+operation. Results are written as JSON and checked against the absolute
+thresholds file and, if given, against a previous result file. The exit
+code is 1 if any check fails.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from typing import Dict, Any, Callable, List, Optional
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deepracer_env import DEFAULT_TRACK  # noqa: E402
+from deepracer_env_config import Track as TrackConfig  # noqa: E402
+from deepracer_env_state import (  # noqa: E402
+    Agent,
+    BatchDeepRacerEnvState,
+    BirdsEyeView,
+    DeepRacerEnvState,
+    LapTiming,
+    Pose,
+    RacingLine,
+    RacingLineStatus,
+    RayCast,
+    StateTracer,
+    Status,
+    Track,
+    TrackFeatures,
+    evaluate_racing_line,
+    evaluate_trajectory)
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData  # noqa: E402
+from deepracer_track_geometry import TrackGeometry  # noqa: E402
+from synthetic_env import SyntheticDeepRacerEnv  # noqa: E402
+
+AGENT_COUNTS = (1, 2, 4, 8)
+# bundled track switched to by the on_reset benchmark
+RESET_TRACK = "reinvent_base"
+# number of poses of the trajectory evaluated at once
+TRAJECTORY_POSES = 1000
+# number of environments and agents per environment of the batch benchmark
+BATCH_ENVS = 8
+BATCH_AGENTS = 4
+# number of rays per agent of the ray cast benchmark
+RAY_CAST_RAYS = 32
+# import statements of the startup benchmark
+IMPORT_STATEMENTS = {"package": "import deepracer_env_state",
+                     "constants": "from deepracer_env_state import DEEPRACER_LENGTH",
+                     "action": "from deepracer_env_state import Action",
+                     "env_state": "from deepracer_env_state import DeepRacerEnvState",
+                     "all": "from deepracer_env_state import *"}
+# number of agents and egocentric crop size of the bird's-eye-view benchmark
+BEV_AGENTS = 4
+BEV_CROP_SIZE = 64
+THRESHOLDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+
+def measure(operation: Callable[[], Any], repeat: int, warmup: int = 5,
+            setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """
+    Measure the latency of an operation
+
+    Args:
+        operation (Callable[[], Any]): operation to measure
+        repeat (int): number of measured calls
+        warmup (int): number of calls before measuring
+        setup (Optional[Callable[[], Any]]): untimed call before every operation call
+
+    Returns:
+        Dict[str, float]: median/mean latency in microseconds and operations per second
+    """
+    for _ in range(warmup):
+        setup and setup()
+        operation()
+    timings = []
+    for _ in range(repeat):
+        setup and setup()
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """
+    Summarize the latencies of an operation
+
+    Args:
+        timings (List[float]): latency of each measured call in seconds
+
+    Returns:
+        Dict[str, float]: median/mean latency in microseconds and operations per second
+    """
+    median = statistics.median(timings)
+    repeat = len(timings)
+    return {"median_us": median * 1e6,
+            "mean_us": statistics.mean(timings) * 1e6,
+            "ops_per_sec": 1.0 / median if median else float("inf"),
+            "repeat": repeat}
+
+
+def get_racing_line(track_geometry: TrackGeometry) -> RacingLine:
+    """
+    Return a synthetic racing line of a track, the center line pulled toward its centroid
+
+    Args:
+        track_geometry (TrackGeometry): track geometry class instance
+
+    Returns:
+        RacingLine: racing line with target speeds along the line
+    """
+    coords = np.asarray(track_geometry.track_center_line.coords)[:, :2]
+    coords = coords.mean(axis=0) + 0.95 * (coords - coords.mean(axis=0))
+    return RacingLine(coords, speeds=np.linspace(1.0, 4.0, len(coords)))
+
+
+def benchmark_on_step(track_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measure DeepRacerEnvState.on_step with increasing agent count, and with
+    a StateTracer enabled for the largest agent count
+
+    Args:
+        track_name (str): bundled track name
+        repeat (int): number of measured steps
+
+    Returns:
+        Dict[str, Dict[str, float]]: measurement with benchmark name as key
+    """
+    results = dict()
+    for num_agents in AGENT_COUNTS:
+        env = SyntheticDeepRacerEnv(track_name=track_name, num_agents=num_agents)
+        DeepRacerEnvState(env)
+        results["on_step.agents_{}".format(num_agents)] = measure(env.step, repeat)
+    # tracing overhead with the ring buffer recording every step
+    tracer = StateTracer()
+    tracer.enable()
+    try:
+        results["on_step.traced.agents_{}".format(num_agents)] = measure(env.step, repeat)
+    finally:
+        tracer.disable()
+    return results
+
+
+def benchmark_status_properties(track_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measure the cost of each Status property
+
+    The env steps and the Status cache, which other states fill on update,
+    is cleared before every evaluation, so that a computed value is measured
+    instead of a memoized one.
+
+    Args:
+        track_name (str): bundled track name
+        repeat (int): number of measured evaluations per property
+
+    Returns:
+        Dict[str, Dict[str, float]]: measurement with benchmark name as key
+    """
+    env = SyntheticDeepRacerEnv(track_name=track_name)
+    env_state = DeepRacerEnvState(env)
+    env.step()
+    status = next(iter(env_state.agents.values())).status
+
+    def step() -> None:
+        env.step()
+        status.clear_cache()
+
+    return {"status.{}".format(field): measure(lambda: getattr(status, field), repeat,
+                                               setup=step)
+            for field in status.fields}
+
+
+def benchmark_update(track_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measure Pose, Status, Agent, LapTiming, TrackFeatures and RacingLineStatus
+    update latency of a single agent step
+
+    Args:
+        track_name (str): bundled track name
+        repeat (int): number of measured updates
+
+    Returns:
+        Dict[str, Dict[str, float]]: measurement with benchmark name as key
+    """
+    track_geometry = TrackGeometry(track_name)
+    trajectory = SyntheticDeepRacerEnv._generate_trajectory(track_geometry, 100,
+                                                            np.random.RandomState(0), 0.0)
+    state = {"index": 0}
+
+    def get_env_data() -> DeepRacerEnvData:
+        position, orientation, progress = trajectory[state["index"] % len(trajectory)]
+        state["index"] += 1
+        return DeepRacerEnvData({"agent0": False},
+                                {"agent0": (0.0, 1.0)},
+                                {"agent0": {"position": position,
+                                            "orientation": orientation,
+                                            "is_offtrack": False,
+                                            "progress": progress}},
+                                track_geometry)
+
+    pose = Pose("agent0")
+    status = Status("agent0", track_geometry)
+    agent = Agent("agent0")
+    lap_timing = LapTiming("agent0", track_geometry)
+    track_features = TrackFeatures("agent0")
+    racing_lines = {(track_name, track_geometry.direction): get_racing_line(track_geometry)}
+    racing_line_status = RacingLineStatus("agent0", Track(track_geometry, racing_lines))
+
+    def update_track_features() -> None:
+        track_features.update(get_env_data())
+        track_features.to_dict()
+
+    return {"update.pose": measure(lambda: pose.update(get_env_data()), repeat),
+            "update.status": measure(lambda: status.update(get_env_data()), repeat),
+            "update.agent": measure(lambda: agent.update(get_env_data()), repeat),
+            "update.lap_timing": measure(lambda: lap_timing.update(get_env_data()), repeat),
+            "update.track_features.to_dict": measure(update_track_features, repeat),
+            "update.racing_line_status": measure(
+                lambda: racing_line_status.update(get_env_data()), repeat)}
+
+
+def benchmark_to_dict(track_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measure DeepRacerEnvState.to_dict latency with full and selected fields,
+    and with decimated Status geometric fields
+
+    Args:
+        track_name (str): bundled track name
+        repeat (int): number of measured calls
+
+    Returns:
+        Dict[str, Dict[str, float]]: measurement with benchmark name as key
+    """
+    results = dict()
+    for num_agents in (1, 4):
+        env = SyntheticDeepRacerEnv(track_name=track_name, num_agents=num_agents)
+        env_state = DeepRacerEnvState(env)
+        env.step()
+        field_plan = env_state.compile_fields(["progress", "speed"])
+        results["to_dict.agents_{}".format(num_agents)] = measure(env_state.to_dict, repeat)
+        results["to_dict.agents_{}.progress_speed".format(num_agents)] = measure(
+            lambda: env_state.to_dict(field_plan), repeat)
+    # step and to_dict with the Status geometric fields updated every step and every 5 steps
+    for update_every in (1, 5):
+        env = SyntheticDeepRacerEnv(track_name=track_name, num_agents=4)
+        env_state = DeepRacerEnvState(env)
+        env_state.set_geometry_update_rate(update_every)
+        name = "step_to_dict.agents_4" if update_every == 1 else \
+            "step_to_dict.agents_4.geometry_every_{}".format(update_every)
+        results[name] = measure(lambda: (env.step(), env_state.to_dict()), repeat)
+    return results
+
+
+def benchmark_deepcopy(track_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measure the cost of the agents and track properties, which deepcopy state,
+    and of the compact agent and env state snapshots
+
+    Args:
+        track_name (str): bundled track name
+        repeat (int): number of measured calls
+
+    Returns:
+        Dict[str, Dict[str, float]]: measurement with benchmark name as key
+    """
+    results = dict()
+    for num_agents in (1, 4):
+        env = SyntheticDeepRacerEnv(track_name=track_name, num_agents=num_agents)
+        env_state = DeepRacerEnvState(env)
+        env.step()
+        results["deepcopy.agents.agents_{}".format(num_agents)] = measure(
+            lambda: env_state.agents, repeat)
+        results["snapshot.agents.agents_{}".format(num_agents)] = measure(
+            env_state.snapshot_agents, repeat)
+        snapshot = env_state.snapshot()
+        results["snapshot.env_state.agents_{}".format(num_agents)] = measure(
+            env_state.snapshot, repeat)
+        results["restore.env_state.agents_{}".format(num_agents)] = measure(
+            lambda: env_state.restore(snapshot), repeat)
+        float32_env_state = DeepRacerEnvState(env, dtype=np.float32)
+        env.step()
+        results["snapshot.env_state_float32.agents_{}".format(num_agents)] = measure(
+            float32_env_state.snapshot, repeat)
+    results["deepcopy.track"] = measure(lambda: env_state.track, repeat)
+    return results
+
+
+def benchmark_on_reset(track_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measure on_reset latency when the env switches track, and when it
+    switches opponents, which reuses pooled agents
+
+    Args:
+        track_name (str): bundled track name
+        repeat (int): number of measured resets
+
+    Returns:
+        Dict[str, Dict[str, float]]: measurement with benchmark name as key
+    """
+    env = SyntheticDeepRacerEnv(track_name=track_name)
+    env_state = DeepRacerEnvState(env)
+    track_names = [track_name, RESET_TRACK]
+    track_configs = [TrackConfig(name=name) for name in track_names]
+    state = {"index": 0}
+
+    def switch_track() -> None:
+        state["index"] += 1
+        env.reset(track_names[state["index"] % 2])
+
+    def clear_pool() -> None:
+        env_state._track_geometry_pool.clear()
+
+    def preload_pool() -> None:
+        env_state._track_geometry_pool.clear()
+        env_state.preload_tracks(track_configs)
+        # wait for the background builds to finish before the timed reset
+        [env_state._track_geometry_pool.get(track_config) for track_config in track_configs]
+
+    results = {"on_reset.new_track": measure(switch_track, max(repeat // 20, 5),
+                                             warmup=1, setup=clear_pool),
+               "on_reset.preloaded_track": measure(switch_track, max(repeat // 20, 5),
+                                                   warmup=1, setup=preload_pool)}
+    env_state._track_geometry_pool.close()
+
+    env = SyntheticDeepRacerEnv(track_name=track_name, num_agents=4)
+    DeepRacerEnvState(env)
+    opponents = [["agent0", "agent1", "agent2", "agent3"],
+                 ["agent0", "rival1", "rival2", "rival3"]]
+
+    def switch_opponents() -> None:
+        state["index"] += 1
+        env.reset(agent_names=opponents[state["index"] % 2])
+        env.step()
+
+    results["on_reset.switch_opponents.agents_4"] = measure(switch_opponents, repeat)
+    return results
+
+
+def benchmark_trajectory(track_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measure bulk trajectory evaluation against updating a Status per pose,
+    and bulk racing line evaluation
+
+    Args:
+        track_name (str): bundled track name
+        repeat (int): number of measured vectorized evaluations
+
+    Returns:
+        Dict[str, Dict[str, float]]: measurement with benchmark name as key
+    """
+    track_geometry = TrackGeometry(track_name)
+    poses = [(position, orientation) for position, orientation, _ in
+             SyntheticDeepRacerEnv._generate_trajectory(track_geometry, TRAJECTORY_POSES,
+                                                        np.random.RandomState(0), 0.0)]
+    positions = [position for position, _ in poses]
+    orientations = [orientation for _, orientation in poses]
+    status = Status("agent0", track_geometry)
+    racing_line = get_racing_line(track_geometry)
+
+    def status_loop() -> None:
+        for position, orientation in poses:
+            status.update(DeepRacerEnvData(
+                {"agent0": False}, {},
+                {"agent0": {"position": position, "orientation": orientation,
+                            "is_offtrack": False, "progress": 0.0}},
+                track_geometry))
+            status.to_dict()
+
+    name = "trajectory.poses_{}".format(TRAJECTORY_POSES)
+    return {name + ".vectorized": measure(
+                lambda: evaluate_trajectory(positions, orientations, track_geometry),
+                max(repeat // 20, 5), warmup=1),
+            name + ".status_loop": measure(status_loop, max(repeat // 200, 3), warmup=1),
+            name + ".racing_line": measure(
+                lambda: evaluate_racing_line(positions, orientations, racing_line),
+                max(repeat // 20, 5), warmup=1)}
+
+
+def benchmark_batch(track_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measure stepping environments and reading all agent states with a
+    BatchDeepRacerEnvState against one DeepRacerEnvState per environment
+
+    Args:
+        track_name (str): bundled track name
+        repeat (int): number of measured steps
+
+    Returns:
+        Dict[str, Dict[str, float]]: measurement with benchmark name as key
+    """
+    batch_envs = [SyntheticDeepRacerEnv(track_name=track_name, num_agents=BATCH_AGENTS,
+                                        seed=index * BATCH_AGENTS)
+                  for index in range(BATCH_ENVS)]
+    batch = BatchDeepRacerEnvState(batch_envs)
+    envs = [SyntheticDeepRacerEnv(track_name=track_name, num_agents=BATCH_AGENTS,
+                                  seed=index * BATCH_AGENTS)
+            for index in range(BATCH_ENVS)]
+    env_states = [DeepRacerEnvState(env) for env in envs]
+    float32_envs = [SyntheticDeepRacerEnv(track_name=track_name, num_agents=BATCH_AGENTS,
+                                          seed=index * BATCH_AGENTS)
+                    for index in range(BATCH_ENVS)]
+    float32_batch = BatchDeepRacerEnvState(float32_envs, dtype=np.float32)
+
+    def step_batch() -> None:
+        [env.step() for env in batch_envs]
+        batch.to_arrays()
+
+    def step_float32_batch() -> None:
+        [env.step() for env in float32_envs]
+        float32_batch.to_arrays()
+
+    def step_env_states() -> None:
+        [env.step() for env in envs]
+        [env_state.to_dict() for env_state in env_states]
+
+    name = "batch.envs_{}.agents_{}".format(BATCH_ENVS, BATCH_AGENTS)
+    return {name + ".batched": measure(step_batch, max(repeat // 10, 5)),
+            name + ".batched_float32": measure(step_float32_batch, max(repeat // 10, 5)),
+            name + ".env_states": measure(step_env_states, max(repeat // 10, 5))}
+
+
+def benchmark_ray_cast(track_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measure RayCast update latency with increasing agent count
+
+    Args:
+        track_name (str): bundled track name
+        repeat (int): number of measured updates
+
+    Returns:
+        Dict[str, Dict[str, float]]: measurement with benchmark name as key
+    """
+    track_geometry = TrackGeometry(track_name)
+    trajectory = SyntheticDeepRacerEnv._generate_trajectory(track_geometry, 100,
+                                                            np.random.RandomState(0), 0.0)
+    results = dict()
+    for num_agents in AGENT_COUNTS:
+        names = ["agent{}".format(index) for index in range(num_agents)]
+        env_data = [DeepRacerEnvData(
+            {name: False for name in names}, {},
+            {name: {"position": trajectory[(step + index * 7) % len(trajectory)][0],
+                    "orientation": trajectory[(step + index * 7) % len(trajectory)][1],
+                    "is_offtrack": False, "progress": 0.0}
+             for index, name in enumerate(names)},
+            track_geometry) for step in range(len(trajectory))]
+        ray_cast = RayCast(num_rays=RAY_CAST_RAYS)
+        state = {"index": 0}
+
+        def update() -> None:
+            ray_cast.update(env_data[state["index"] % len(env_data)])
+            state["index"] += 1
+
+        results["ray_cast.rays_{}.agents_{}".format(RAY_CAST_RAYS, num_agents)] = \
+            measure(update, repeat)
+    return results
+
+
+def benchmark_birds_eye_view(track_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measure BirdsEyeView update latency with egocentric crops and the whole track image
+
+    Args:
+        track_name (str): bundled track name
+        repeat (int): number of measured updates
+
+    Returns:
+        Dict[str, Dict[str, float]]: measurement with benchmark name as key
+    """
+    track_geometry = TrackGeometry(track_name)
+    trajectory = SyntheticDeepRacerEnv._generate_trajectory(track_geometry, 100,
+                                                            np.random.RandomState(0), 0.0)
+    names = ["agent{}".format(index) for index in range(BEV_AGENTS)]
+    env_data = [DeepRacerEnvData(
+        {name: False for name in names}, {},
+        {name: {"position": trajectory[(step + index * 7) % len(trajectory)][0],
+                "orientation": trajectory[(step + index * 7) % len(trajectory)][1],
+                "is_offtrack": False, "progress": 0.0}
+         for index, name in enumerate(names)},
+        track_geometry) for step in range(len(trajectory))]
+    results = dict()
+    for name, birds_eye_view in (
+            ("crop_{}".format(BEV_CROP_SIZE), BirdsEyeView(crop_size=BEV_CROP_SIZE)),
+            ("track_image", BirdsEyeView(crop_size=None))):
+        state = {"index": 0}
+
+        def update() -> None:
+            birds_eye_view.update(env_data[state["index"] % len(env_data)])
+            state["index"] += 1
+
+        results["birds_eye_view.{}.agents_{}".format(name, BEV_AGENTS)] = measure(update, repeat)
+    return results
+
+
+def measure_import(statement: str, repeat: int) -> Dict[str, float]:
+    """
+    Measure the latency of an import statement in fresh interpreters
+
+    Args:
+        statement (str): import statement
+        repeat (int): number of measured interpreters
+
+    Returns:
+        Dict[str, float]: median/mean latency in microseconds and operations per second
+    """
+    repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [repository, env.get("PYTHONPATH")]))
+    code = "import time\nstart = time.perf_counter()\n{}\nprint(time.perf_counter() - start)"
+    timings = [float(subprocess.check_output([sys.executable, "-c", code.format(statement)],
+                                             env=env, cwd=repository))
+               for _ in range(repeat)]
+    return summarize(timings)
+
+
+def benchmark_startup(track_name: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Measure package import time in a fresh interpreter and DeepRacerEnvState construction
+
+    import.all imports every public name, as the package did before lazy imports.
+
+    Args:
+        track_name (str): bundled track name
+        repeat (int): number of measured constructions
+
+    Returns:
+        Dict[str, Dict[str, float]]: measurement with benchmark name as key
+    """
+    import_repeat = max(repeat // 40, 3)
+    results = {"import." + name: measure_import(statement, import_repeat)
+               for name, statement in IMPORT_STATEMENTS.items()}
+    env = SyntheticDeepRacerEnv(track_name=track_name, num_agents=4)
+    results["init.env_state.agents_4"] = measure(lambda: DeepRacerEnvState(env), repeat,
+                                                 setup=env._observers.clear)
+    return results
+
+
+BENCHMARKS = [benchmark_on_step,
+              benchmark_on_reset,
+              benchmark_update,
+              benchmark_status_properties,
+              benchmark_to_dict,
+              benchmark_deepcopy,
+              benchmark_trajectory,
+              benchmark_ray_cast,
+              benchmark_birds_eye_view,
+              benchmark_startup,
+              benchmark_batch]
+
+
+def check_thresholds(results: Dict[str, Dict[str, float]],
+                     thresholds: Dict[str, float]) -> List[str]:
+    """
+    Return the benchmarks whose median exceeds the absolute threshold
+
+    Args:
+        results (Dict[str, Dict[str, float]]): measurement with benchmark name as key
+        thresholds (Dict[str, float]): maximum median in microseconds with benchmark name as key
+
+    Returns:
+        List[str]: failure messages
+    """
+    return ["{}: median {:.1f}us exceeds threshold {:.1f}us".format(
+                name, results[name]["median_us"], threshold)
+            for name, threshold in sorted(thresholds.items())
+            if name in results and results[name]["median_us"] > threshold]
+
+
+def check_baseline(results: Dict[str, Dict[str, float]],
+                   baseline: Dict[str, Dict[str, float]],
+                   max_slowdown: float) -> List[str]:
+    """
+    Return the benchmarks which slowed down compared with a previous run
+
+    Args:
+        results (Dict[str, Dict[str, float]]): measurement with benchmark name as key
+        baseline (Dict[str, Dict[str, float]]): previous measurement with benchmark name as key
+        max_slowdown (float): maximum allowed ratio of median to baseline median
+
+    Returns:
+        List[str]: failure messages
+    """
+    return ["{}: median {:.1f}us is {:.2f}x baseline {:.1f}us".format(
+                name, results[name]["median_us"],
+                results[name]["median_us"] / baseline[name]["median_us"],
+                baseline[name]["median_us"])
+            for name in sorted(results)
+            if name in baseline and baseline[name]["median_us"] > 0 and
+            results[name]["median_us"] > max_slowdown * baseline[name]["median_us"]]
+
+
+def main() -> int:
+    """
+    Run the benchmark suite
+
+    Returns:
+        int: exit code, 1 if any regression check fails
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--track", default=DEFAULT_TRACK, help="bundled track name")
+    parser.add_argument("--repeat", type=int, default=200, help="measured calls per benchmark")
+    parser.add_argument("--output", default="benchmark_results.json", help="result JSON path")
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH, help="threshold JSON path")
+    parser.add_argument("--baseline", default=None, help="previous result JSON path")
+    parser.add_argument("--max-slowdown", type=float, default=1.25,
+                        help="maximum allowed ratio to the baseline median")
+    args = parser.parse_args()
+
+    results = dict()
+    for benchmark in BENCHMARKS:
+        results.update(benchmark(args.track, args.repeat))
+
+    with open(args.thresholds) as thresholds_file:
+        failures = check_thresholds(results, json.load(thresholds_file))
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            failures += check_baseline(results, json.load(baseline_file)["results"],
+                                       args.max_slowdown)
+
+    report = {"metadata": {"track": args.track,
+                           "repeat": args.repeat,
+                           "python": platform.python_version(),
+                           "platform": platform.platform(),
+                           "time": time.strftime("%Y-%m-%dT%H:%M:%S%z")},
+              "results": results,
+              "failures": failures}
+    with open(args.output, "w") as output_file:
+        json.dump(report, output_file, indent=2, sort_keys=True)
+    for name, result in sorted(results.items()):
+        print("{:<48} {:>12.1f}us".format(name, result["median_us"]))
+    [print("REGRESSION {}".format(failure)) for failure in failures]
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A local stand-in for DeepRacerEnv generating synthetic trajectories"""
+import math
+import numpy as np
+
+from types import SimpleNamespace
+from typing import Any, List, Optional
+from deepracer_env import DEFAULT_TRACK
+from deepracer_env_config import Track as TrackConfig
+from deepracer_track_geometry import TrackGeometry
+
+
+class SyntheticDeepRacerEnv(object):
+    """
+    SyntheticDeepRacerEnv class
+
+    Implements the part of the DeepRacerEnv interface used by
+    DeepRacerEnvState (get_track, get_agent and register) and notifies the
+    registered observers with synthetic step results. Every agent follows the
+    track center line with a seeded random lateral weave, so runs with the
+    same arguments produce the same trajectories.
+    """
+    def __init__(self,
+                 track_name: str = DEFAULT_TRACK,
+                 num_agents: int = 1,
+                 steps_per_lap: int = 300,
+                 seed: int = 0):
+        """
+        Initialize SyntheticDeepRacerEnv
+
+        Args:
+            track_name (str): bundled track name
+            num_agents (int): number of agents
+            steps_per_lap (int): number of steps for the agents to complete a lap
+            seed (int): random seed of the trajectories
+        """
+        self._track_config = TrackConfig(name=track_name)
+        self._agents = [SimpleNamespace(name="agent{}".format(index))
+                        for index in range(num_agents)]
+        self._observers = []
+        self._step_index = 0
+        track_geometry = TrackGeometry(track_name)
+        self._trajectories = [
+            self._generate_trajectory(track_geometry,
+                                      steps_per_lap,
+                                      np.random.RandomState(seed + index),
+                                      index / max(num_agents, 1))
+            for index in range(num_agents)]
+
+    @staticmethod
+    def _generate_trajectory(track_geometry: TrackGeometry,
+                             steps_per_lap: int,
+                             random_state: np.random.RandomState,
+                             start_ndist: float) -> List[Any]:
+        """
+        Generate one lap of (position, orientation, progress) per step
+
+        Args:
+            track_geometry (TrackGeometry): track geometry to drive on
+            steps_per_lap (int): number of steps of the lap
+            random_state (np.random.RandomState): random state for the lateral weave
+            start_ndist (float): normalized distance of the start point
+
+        Returns:
+            List[Any]: (position, orientation, progress) tuple per step
+        """
+        center_line = track_geometry.track_center_line
+        amplitude = random_state.uniform(0.05, 0.3)
+        frequency = random_state.uniform(2.0, 6.0)
+        phase = random_state.uniform(0.0, 2.0 * math.pi)
+        trajectory = []
+        for step in range(1, steps_per_lap + 1):
+            progress = step / steps_per_lap
+            ndist = (start_ndist + progress) % 1.0
+            point = center_line.interpolate(ndist, normalized=True)
+            ahead = center_line.interpolate((ndist + 0.001) % 1.0, normalized=True)
+            heading = math.atan2(ahead.y - point.y, ahead.x - point.x)
+            offset = amplitude * math.sin(frequency * 2.0 * math.pi * progress + phase)
+            position = (point.x - offset * math.sin(heading),
+                        point.y + offset * math.cos(heading),
+                        0.0)
+            orientation = (0.0, 0.0, math.sin(heading / 2.0), math.cos(heading / 2.0))
+            trajectory.append((position, orientation, progress * 100.0))
+        return trajectory
+
+    def get_track(self) -> TrackConfig:
+        """
+        Return track config
+
+        Returns:
+            TrackConfig: track config
+        """
+        return self._track_config
+
+    def get_agent(self) -> List[SimpleNamespace]:
+        """
+        Return agent configs
+
+        Returns:
+            List[SimpleNamespace]: agent configs with name attribute
+        """
+        return self._agents
+
+    def register(self, observer: Any) -> None:
+        """
+        Register observer notified on step and reset
+
+        Args:
+            observer (Any): observer with on_step and on_reset callbacks
+        """
+        self._observers.append(observer)
+
+    def reset(self, track_name: Optional[str] = None,
+              agent_names: Optional[List[str]] = None) -> None:
+        """
+        Reset the episode and notify observers
+
+        Args:
+            track_name (Optional[str]): bundled track name to switch to
+            agent_names (Optional[List[str]]): agent names to switch to, which keep
+                                               the trajectories of the agent indices
+        """
+        if track_name is not None:
+            self._track_config = TrackConfig(name=track_name)
+        if agent_names is not None:
+            self._agents = [SimpleNamespace(name=name) for name in agent_names]
+        self._step_index = 0
+        [observer.on_reset(self, (None, None)) for observer in self._observers]
+
+    def step(self) -> None:
+        """
+        Advance every agent by one step and notify observers
+        """
+        done, action, info = {}, {}, {}
+        for agent, trajectory in zip(self._agents, self._trajectories):
+            position, orientation, progress = trajectory[self._step_index % len(trajectory)]
+            done[agent.name] = self._step_index % len(trajectory) == len(trajectory) - 1
+            action[agent.name] = (0.0, 1.0)
+            info[agent.name] = {"position": position,
+                                "orientation": orientation,
+                                "is_offtrack": False,
+                                "progress": progress}
+        self._step_index += 1
+        step_result = (None, None, done, action, info)
+        [observer.on_step(self, step_result) for observer in self._observers]
@@ -13,18 +13,98 @@
 #   See the License for the specific language governing permissions and         #
 #   limitations under the License.                                              #
 #################################################################################
-from .agent.action import Action
-from .agent.agent import Agent
-from .agent.constants import (
-    DEEPRACER_LENGTH,
-    DEEPRACER_WIDTH,
-    DEEPRACER_OFFTRACK_COLLIDER_LENGTH,
-    DEEPRACER_OFFTRACK_COLLIDER_WIDTH,
-    RELATIVE_POSITION_OF_FOUR_WHEELS,
-    RELATIVE_POSITION_OF_FRONT_OF_CAR)
-from .agent.pose import Pose
-from .agent.status import Status
-
-from .track.track import Track
-
-from .deepracer_env_state import DeepRacerEnvState
+"""DeepRacer environment state package
+
+Public names are imported from their submodule on first access (PEP 562), so that
+importing the package or a few lightweight names, such as Action or the agent
+constants, does not import every dependency of the package.
+"""
+import importlib
+
+from typing import Any, List
+
+# public name with the submodule defining it
+_LAZY_ATTRIBUTES = {
+    "Action": ".agent.action",
+    "Agent": ".agent.agent",
+    "AgentSnapshot": ".agent.agent",
+    "DEEPRACER_LENGTH": ".agent.constants",
+    "DEEPRACER_WIDTH": ".agent.constants",
+    "DEEPRACER_OFFTRACK_COLLIDER_LENGTH": ".agent.constants",
+    "DEEPRACER_OFFTRACK_COLLIDER_WIDTH": ".agent.constants",
+    "RELATIVE_POSITION_OF_FOUR_WHEELS": ".agent.constants",
+    "RELATIVE_POSITION_OF_FRONT_OF_CAR": ".agent.constants",
+    "EpisodeStats": ".agent.episode_stats",
+    "LapTiming": ".agent.lap_timing",
+    "Pose": ".agent.pose",
+    "RacingLineStatus": ".agent.racing_line_status",
+    "Status": ".agent.status",
+    "TrackFeatures": ".agent.track_features",
+    "evaluate_racing_line": ".agent.trajectory",
+    "evaluate_trajectory": ".agent.trajectory",
+    "get_racing_line_dtype": ".agent.trajectory",
+    "get_trajectory_dtype": ".agent.trajectory",
+    "RACING_LINE_DTYPE": ".agent.trajectory",
+    "TRAJECTORY_DTYPE": ".agent.trajectory",
+    "BEV_CHANNELS": ".track.birds_eye_view",
+    "BirdsEyeView": ".track.birds_eye_view",
+    "TrackRaster": ".track.birds_eye_view",
+    "get_track_raster": ".track.birds_eye_view",
+    "TrackStates": ".track.constants",
+    "Polyline": ".track.polyline",
+    "TrackPolylines": ".track.polyline",
+    "get_track_polylines": ".track.polyline",
+    "TrackProfile": ".track.profile",
+    "get_track_profile": ".track.profile",
+    "Proximity": ".track.proximity",
+    "RacingLine": ".track.racing_line",
+    "BorderSegments": ".track.ray_cast",
+    "RayCast": ".track.ray_cast",
+    "get_border_segments": ".track.ray_cast",
+    "Track": ".track.track",
+    "TrackGeometryPool": ".track.track_geometry_pool",
+    "BatchDeepRacerEnvState": ".batch_env_state",
+    "DeepRacerEnvState": ".deepracer_env_state",
+    "DeepRacerEnvStateSnapshot": ".deepracer_env_state",
+    "FieldPlan": ".field_plan",
+    "MemoryProfiler": ".memory_profiler",
+    "FLOAT_DTYPES": ".precision",
+    "FLOAT32_RELATIVE_ERROR": ".precision",
+    "get_error_bound": ".precision",
+    "get_float_dtype": ".precision",
+    "StateProfiler": ".profiler",
+    "StateTracer": ".tracer"}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import a public name from its submodule on first access
+
+    Args:
+        name (str): attribute name
+
+    Returns:
+        Any: attribute value
+
+    Raises:
+        AttributeError: name is not a public name of the package
+    """
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # later lookups find the module global without calling __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """
+    Return the module attributes including the not yet imported public names
+
+    Returns:
+        List[str]: attribute names
+    """
+    return sorted(set(globals()) | set(__all__))
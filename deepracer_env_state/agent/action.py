@@ -14,7 +14,7 @@
 #   limitations under the License.                                              #
 #################################################################################
 """A class for action state"""
-from typing import Dict, Any
+from typing import Dict, Any, Sequence, Tuple
 from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
 from deepracer_env_state.state_interface import StateInterface
 
@@ -23,6 +23,9 @@ class Action(StateInterface):
     """
     Action class
     """
+    # number of values of snapshot
+    SNAPSHOT_SIZE = 2
+
     def __init__(self, name: str):
         """
         Initialize Action
@@ -66,6 +69,35 @@ class Action(StateInterface):
         self._steering_angle = action[0]
         self._speed = action[1]
 
+    def snapshot(self) -> Tuple[float, ...]:
+        """
+        Return the mutable state as SNAPSHOT_SIZE floats
+
+        Returns:
+            Tuple[float, ...]: steering_angle and speed
+        """
+        return float(self._steering_angle), float(self._speed)
+
+    def restore(self, values: Sequence[float]) -> None:
+        """
+        Restore the mutable state from snapshot values
+
+        Args:
+            values (Sequence[float]): values returned by snapshot
+        """
+        self._steering_angle, self._speed = values
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Returns:
+            Tuple[str, ...]: field names in to_dict order
+        """
+        return ("speed",
+                "steering_angle")
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Return all internal state as a dict format
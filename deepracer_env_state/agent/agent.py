@@ -14,29 +14,41 @@
 #   limitations under the License.                                              #
 #################################################################################
 """A class for agent state"""
+import struct
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+import numpy as np
+
 from deepracer_env_state.composite_state import CompositeState
 from deepracer_env_state.agent.constants import AgentStates
 from deepracer_env_state.agent.action import Action
 from deepracer_env_state.agent.pose import Pose
 from deepracer_env_state.agent.status import Status
+from deepracer_env_state.precision import get_float_dtype
+from deepracer_track_geometry import TrackGeometry
 
 
 class Agent(CompositeState):
     """
     Agent class
     """
-    def __init__(self, name: str):
+    # number of values of snapshot_values
+    SNAPSHOT_SIZE = Action.SNAPSHOT_SIZE + Pose.SNAPSHOT_SIZE + Status.SNAPSHOT_SIZE
+
+    def __init__(self, name: str,
+                 track_geometry: Optional[TrackGeometry] = None):
         """
         Initialize Agent
 
         Args:
             name (str): agent name
+            track_geometry (Optional[TrackGeometry]): TrackGeometry instance
         """
         super().__init__()
         self._name = name
         self.add(AgentStates.ACTION, Action(self._name))
         self.add(AgentStates.POSE, Pose(self._name))
-        self.add(AgentStates.STATUS, Status(self._name))
+        self.add(AgentStates.STATUS, Status(self._name, track_geometry))
 
     @property
     def name(self) -> str:
@@ -77,3 +89,150 @@ class Agent(CompositeState):
             Status: Status class instance
         """
         return self.get(AgentStates.STATUS)
+
+    def snapshot_values(self) -> Tuple[float, ...]:
+        """
+        Return the Action, Pose and Status snapshot values in order
+
+        Returns:
+            Tuple[float, ...]: SNAPSHOT_SIZE values
+        """
+        return self.action.snapshot() + self.pose.snapshot() + self.status.snapshot()
+
+    def restore_values(self, values: Sequence[float],
+                       track_geometry: Optional[TrackGeometry] = None) -> None:
+        """
+        Restore the Action, Pose and Status from snapshot values
+
+        Args:
+            values (Sequence[float]): values returned by snapshot_values
+            track_geometry (Optional[TrackGeometry]): track geometry of the snapshot,
+                                                      unchanged if None
+        """
+        pose_start = Action.SNAPSHOT_SIZE
+        status_start = pose_start + Pose.SNAPSHOT_SIZE
+        self.action.restore(values[:pose_start])
+        self.pose.restore(values[pose_start:status_start])
+        self.status.restore(values[status_start:], track_geometry)
+
+    def snapshot(self, dtype: Any = np.float64) -> "AgentSnapshot":
+        """
+        Return a compact snapshot of the Action, Pose and Status
+
+        Args:
+            dtype (Any): float dtype the values are packed with, one of FLOAT_DTYPES
+
+        Returns:
+            AgentSnapshot: AgentSnapshot class instance
+        """
+        return AgentSnapshot(self._name, self.snapshot_values(), self.status.track_geometry,
+                             dtype)
+
+    def restore(self, snapshot: "AgentSnapshot") -> None:
+        """
+        Restore the Action, Pose and Status from a snapshot
+
+        Args:
+            snapshot (AgentSnapshot): AgentSnapshot class instance
+        """
+        self.restore_values(snapshot.values, snapshot.track_geometry)
+
+
+class AgentSnapshot(object):
+    """
+    AgentSnapshot class
+
+    Compact immutable copy of the mutable scalars of the Action, Pose and
+    Status of an agent, packed as doubles or, with float32 dtype, as floats
+    rounded within the precision error bounds. The track geometry is shared by
+    reference, so that keeping a snapshot per step costs a few hundred bytes
+    instead of a deepcopy of the agent and its geometry. Other agent states
+    are not captured.
+    """
+    __slots__ = ("_name", "_values", "_track_geometry", "_dtype")
+
+    def __init__(self, name: str, values: Sequence[float], track_geometry: TrackGeometry,
+                 dtype: Any = np.float64):
+        """
+        Initialize AgentSnapshot
+
+        Args:
+            name (str): agent name
+            values (Sequence[float]): Action, Pose and Status snapshot values in order
+            track_geometry (TrackGeometry): track geometry shared by reference
+            dtype (Any): float dtype the values are packed with, one of FLOAT_DTYPES
+        """
+        self._name = name
+        self._dtype = get_float_dtype(dtype)
+        self._values = struct.pack("<{}{}".format(len(values), self._dtype.char), *values)
+        self._track_geometry = track_geometry
+
+    @property
+    def name(self) -> str:
+        """
+        Return agent name
+
+        Returns:
+            str: agent name
+        """
+        return self._name
+
+    @property
+    def values(self) -> Tuple[float, ...]:
+        """
+        Return Action, Pose and Status snapshot values in order
+
+        Returns:
+            Tuple[float, ...]: snapshot values
+        """
+        return struct.unpack("<{}{}".format(len(self._values) // self._dtype.itemsize,
+                                            self._dtype.char), self._values)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        Return float dtype the values are packed with
+
+        Returns:
+            np.dtype: one of FLOAT_DTYPES
+        """
+        return self._dtype
+
+    @property
+    def track_geometry(self) -> TrackGeometry:
+        """
+        Return track geometry shared by reference
+
+        Returns:
+            TrackGeometry: track geometry class instance
+        """
+        return self._track_geometry
+
+    def to_agent(self) -> "Agent":
+        """
+        Return a new Agent restored from the snapshot
+
+        Returns:
+            Agent: Agent class instance
+        """
+        agent = Agent(self._name, self._track_geometry)
+        agent.restore(self)
+        return agent
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the restored agent state as a dict format
+
+        Returns:
+            Dict[str, Any]: agent state as a dict format
+        """
+        return self.to_agent().to_dict()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """
+        Return pickle state
+
+        Returns:
+            Tuple[Any, ...]: class and init arguments
+        """
+        return AgentSnapshot, (self._name, self.values, self._track_geometry, self._dtype)
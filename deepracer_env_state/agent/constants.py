@@ -24,6 +24,10 @@ class AgentStates(Enum):
     ACTION = "action"
     POSE = "pose"
     STATUS = "status"
+    EPISODE_STATS = "episode_stats"
+    LAP_TIMING = "lap_timing"
+    TRACK_FEATURES = "track_features"
+    RACING_LINE = "racing_line"
 
 
 # DeepRacer device dimension
@@ -0,0 +1,189 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for episode statistics state"""
+from typing import Dict, Any, Optional, Tuple
+from deepracer_env_state.state_interface import StateInterface
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.agent.status import Status
+
+
+class EpisodeStats(StateInterface):
+    """
+    EpisodeStats class
+
+    Running aggregates of the agent Status over the current episode updated
+    in O(1) per step, so that the per step history is not needed to
+    summarize an episode. It reads the Status of the same agent, so it has to
+    be added with depends_on=(AgentStates.STATUS,). Like Status steps, the
+    aggregates are reset on the first step after done and the summary of the
+    finished episode is available until then.
+    """
+    def __init__(self, name: str, status: Status):
+        """
+        Initialize EpisodeStats
+
+        Args:
+            name (str): agent name
+            status (Status): Status class instance of the agent
+        """
+        self._name = name
+        self._status = status
+        self._done = False
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        Reset the episode aggregates
+        """
+        self._steps = 0
+        self._lap_steps = None
+        self._distance_from_center_sum = 0.0
+        self._distance_from_center_max = 0.0
+        self._all_wheels_on_track_steps = 0
+        self._offtrack_count = 0
+        self._is_offtrack = False
+        self._progress = 0.0
+
+    @property
+    def steps(self) -> int:
+        """
+        Return steps aggregated in the episode
+
+        Returns:
+            int: steps aggregated in the episode
+        """
+        return self._steps
+
+    @property
+    def lap_steps(self) -> Optional[int]:
+        """
+        Return steps taken to complete the lap
+
+        Returns:
+            Optional[int]: steps when progress reached 100 and None if not yet
+        """
+        return self._lap_steps
+
+    @property
+    def mean_distance_from_center(self) -> float:
+        """
+        Return mean distance from center over the episode
+
+        Returns:
+            float: mean distance from center in meter
+        """
+        return self._distance_from_center_sum / self._steps if self._steps else 0.0
+
+    @property
+    def max_distance_from_center(self) -> float:
+        """
+        Return max distance from center over the episode
+
+        Returns:
+            float: max distance from center in meter
+        """
+        return self._distance_from_center_max
+
+    @property
+    def all_wheels_on_track_percentage(self) -> float:
+        """
+        Return percentage of steps with all wheels on track
+
+        Returns:
+            float: percentage in range [0, 100.0]
+        """
+        return 100.0 * self._all_wheels_on_track_steps / self._steps if self._steps else 0.0
+
+    @property
+    def offtrack_count(self) -> int:
+        """
+        Return number of times the agent went offtrack
+
+        Consecutive offtrack steps count as a single offtrack event.
+
+        Returns:
+            int: number of transitions into offtrack
+        """
+        return self._offtrack_count
+
+    @property
+    def progress_per_step(self) -> float:
+        """
+        Return mean progress per step
+
+        Returns:
+            float: progress percentage per step
+        """
+        return self._progress / self._steps if self._steps else 0.0
+
+    @property
+    def episode_summary(self) -> Dict[str, Any]:
+        """
+        Return episode summary
+
+        Returns:
+            Dict[str, Any]: episode aggregates in dict format
+        """
+        return {"steps": self.steps,
+                "lap_steps": self.lap_steps,
+                "mean_distance_from_center": self.mean_distance_from_center,
+                "max_distance_from_center": self.max_distance_from_center,
+                "all_wheels_on_track_percentage": self.all_wheels_on_track_percentage,
+                "offtrack_count": self.offtrack_count,
+                "progress_per_step": self.progress_per_step}
+
+    def update(self, deepracer_env_data: DeepRacerEnvData) -> None:
+        """
+        Update the internal state information
+
+        Args:
+            deepracer_env_data (DeepRacerEnvData): DeepRacerEnvData class instance
+
+        """
+        if self._done:
+            self._reset()
+        self._done = deepracer_env_data.done[self._name]
+        self._steps += 1
+        distance_from_center = self._status.distance_from_center
+        self._distance_from_center_sum += distance_from_center
+        self._distance_from_center_max = max(self._distance_from_center_max,
+                                             distance_from_center)
+        self._all_wheels_on_track_steps += int(self._status.all_wheels_on_track)
+        is_offtrack = self._status.is_offtrack
+        self._offtrack_count += int(is_offtrack and not self._is_offtrack)
+        self._is_offtrack = is_offtrack
+        self._progress = self._status.progress
+        if self._lap_steps is None and self._progress >= 100.0:
+            self._lap_steps = self._steps
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Returns:
+            Tuple[str, ...]: field names in to_dict order
+        """
+        return ("episode_summary",)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return all internal state as a dict format
+
+        Returns:
+            Dict[str, Any]: internal state as a dict format
+        """
+        return {"episode_summary": self.episode_summary}
@@ -0,0 +1,359 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for lap and sector timing state"""
+import bisect
+
+from typing import Dict, Any, Optional, Sequence, Tuple, Union
+from deepracer_env_state.state_interface import StateInterface
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.track.polyline import get_track_polylines
+from deepracer_track_geometry import TrackGeometry
+
+
+class LapTiming(StateInterface):
+    """
+    LapTiming class
+
+    Lap and sector timing from the front of car projection onto the center
+    line, with constant work per step. Sector starts are normalized distances
+    (ndist) along the center line, where ndist 0 is the finish line and ndist
+    increases in race direction. A sector or finish line crossing is detected
+    between two successive projections, and its time is interpolated between
+    the two steps, so times are fractional steps.
+
+    Timed laps start on the first finish line crossing, or on the first step
+    of the episode if the agent starts within start_tolerance of the finish
+    line. A lap only counts if all of its sectors were crossed in order.
+    Like Status steps, the timing is reset on the first step after done.
+    """
+    _shared_attributes = ("_track_geometry", "_center_line")
+
+    def __init__(self, name: str,
+                 track_geometry: Optional[TrackGeometry] = None,
+                 sectors: Union[int, Sequence[float]] = 3,
+                 start_tolerance: float = 0.01):
+        """
+        Initialize LapTiming
+
+        Args:
+            name (str): agent name
+            track_geometry (Optional[TrackGeometry]): TrackGeometry instance,
+                                                      the one of the first update if None
+            sectors (Union[int, Sequence[float]]): number of equal length sectors or
+                                                   ascending ndists in (0, 1) of the
+                                                   sector starts after the finish line
+            start_tolerance (float): maximum ndist from the finish line on the first
+                                     step for the first lap to be timed
+
+        Raises:
+            ValueError: if the sector starts are not ascending in (0, 1)
+        """
+        if isinstance(sectors, int):
+            sector_starts = [index / sectors for index in range(1, sectors)]
+        else:
+            sector_starts = list(sectors)
+        if any(not 0.0 < start < 1.0 for start in sector_starts) or \
+                sector_starts != sorted(set(sector_starts)):
+            raise ValueError("[LapTiming]: sector starts must be ascending in (0, 1), "
+                             "got {}".format(sector_starts))
+        self._name = name
+        # ndist where each sector starts, sector 0 starting at the finish line
+        self._sector_starts = tuple([0.0] + sector_starts)
+        self._start_tolerance = start_tolerance
+        self._track_geometry = None
+        self._center_line = None
+        if track_geometry is not None:
+            self._set_track_geometry(track_geometry)
+        self._done = False
+        self._laps_completed = 0
+        self._best_lap_steps = None
+        self._best_sector_splits = [None] * len(self._sector_starts)
+        self._reset()
+
+    def _set_track_geometry(self, track_geometry: TrackGeometry) -> None:
+        """
+        Set the track geometry and its center line
+
+        Args:
+            track_geometry (TrackGeometry): TrackGeometry instance
+        """
+        self._track_geometry = track_geometry
+        self._center_line = get_track_polylines(track_geometry).center_line
+
+    def _reset(self) -> None:
+        """
+        Reset the timing of the episode
+        """
+        self._steps = 0
+        self._ndist = None
+        self._sector = None
+        self._lap = 0
+        self._lap_start = None
+        self._sector_start = None
+        self._sector_splits = []
+        self._last_lap_steps = None
+        self._last_sector_splits = None
+
+    @property
+    def sector_starts(self) -> Tuple[float, ...]:
+        """
+        Return the ndist where each sector starts
+
+        Returns:
+            Tuple[float, ...]: ndists, 0.0 first for the finish line
+        """
+        return self._sector_starts
+
+    @property
+    def lap(self) -> int:
+        """
+        Return current lap number
+
+        Returns:
+            int: number of timed laps started in the episode, 0 before the first one
+        """
+        return self._lap
+
+    @property
+    def lap_steps(self) -> Optional[float]:
+        """
+        Return time elapsed in the current lap
+
+        Returns:
+            Optional[float]: steps since the lap started and None if no lap is timed
+        """
+        return None if self._lap_start is None else self._steps - self._lap_start
+
+    @property
+    def sector(self) -> Optional[int]:
+        """
+        Return current sector index
+
+        Returns:
+            Optional[int]: sector index, 0 after the finish line, and None before the first step
+        """
+        return self._sector
+
+    @property
+    def sector_splits(self) -> Tuple[float, ...]:
+        """
+        Return sector times of the current lap
+
+        Returns:
+            Tuple[float, ...]: steps taken by each completed sector of the current lap
+        """
+        return tuple(self._sector_splits)
+
+    @property
+    def laps_completed(self) -> int:
+        """
+        Return number of laps completed since the state was created
+
+        Returns:
+            int: number of completed laps
+        """
+        return self._laps_completed
+
+    @property
+    def last_lap_steps(self) -> Optional[float]:
+        """
+        Return time of the last completed lap of the episode
+
+        Returns:
+            Optional[float]: lap time in steps and None if no lap is completed
+        """
+        return self._last_lap_steps
+
+    @property
+    def last_sector_splits(self) -> Optional[Tuple[float, ...]]:
+        """
+        Return sector times of the last completed lap of the episode
+
+        Returns:
+            Optional[Tuple[float, ...]]: sector times in steps and None if no lap is completed
+        """
+        return self._last_sector_splits
+
+    @property
+    def best_lap_steps(self) -> Optional[float]:
+        """
+        Return best lap time since the state was created
+
+        Returns:
+            Optional[float]: lap time in steps and None if no lap is completed
+        """
+        return self._best_lap_steps
+
+    @property
+    def best_sector_splits(self) -> Tuple[Optional[float], ...]:
+        """
+        Return best time of each sector since the state was created
+
+        Returns:
+            Tuple[Optional[float], ...]: sector times in steps, None if never completed
+        """
+        return tuple(self._best_sector_splits)
+
+    @property
+    def lap_timing(self) -> Dict[str, Any]:
+        """
+        Return lap timing summary
+
+        Returns:
+            Dict[str, Any]: lap and sector times in steps in dict format
+        """
+        return {"lap": self.lap,
+                "lap_steps": self.lap_steps,
+                "sector": self.sector,
+                "sector_splits": self.sector_splits,
+                "laps_completed": self.laps_completed,
+                "last_lap_steps": self.last_lap_steps,
+                "last_sector_splits": self.last_sector_splits,
+                "best_lap_steps": self.best_lap_steps,
+                "best_sector_splits": self.best_sector_splits}
+
+    def _get_sector(self, ndist: float) -> int:
+        """
+        Return the sector of a ndist
+
+        Args:
+            ndist (float): normalized distance along the center line
+
+        Returns:
+            int: sector index
+        """
+        return bisect.bisect_right(self._sector_starts, ndist) - 1
+
+    def _start_lap(self, time: float) -> None:
+        """
+        Start timing a lap
+
+        Args:
+            time (float): lap start time in steps
+        """
+        self._lap += 1
+        self._lap_start = time
+        self._sector_start = time
+        self._sector_splits = []
+
+    def _cross(self, sector: int, time: float) -> None:
+        """
+        Enter a sector in race direction from the previous sector
+
+        Args:
+            sector (int): entered sector index
+            time (float): crossing time in steps
+        """
+        self._sector = sector
+        if self._lap_start is not None:
+            self._sector_splits.append(time - self._sector_start)
+            self._sector_start = time
+        if sector != 0:
+            return
+        if self._lap_start is not None and \
+                len(self._sector_splits) == len(self._sector_starts):
+            lap_steps = time - self._lap_start
+            splits = tuple(self._sector_splits)
+            self._laps_completed += 1
+            self._last_lap_steps = lap_steps
+            self._last_sector_splits = splits
+            if self._best_lap_steps is None or lap_steps < self._best_lap_steps:
+                self._best_lap_steps = lap_steps
+            self._best_sector_splits = [split if best is None else min(best, split)
+                                        for best, split in zip(self._best_sector_splits,
+                                                               splits)]
+        self._start_lap(time)
+
+    def update(self, deepracer_env_data: DeepRacerEnvData) -> None:
+        """
+        Update the internal state information
+
+        Args:
+            deepracer_env_data (DeepRacerEnvData): DeepRacerEnvData class instance
+
+        """
+        if self._done:
+            self._reset()
+        self._done = deepracer_env_data.done[self._name]
+        if deepracer_env_data.track_geometry is not self._track_geometry:
+            # sector crossings cannot be detected across tracks
+            self._set_track_geometry(deepracer_env_data.track_geometry)
+            self._reset()
+        self._steps += 1
+        x, y, _ = deepracer_env_data.get_front_of_car_position(self._name)
+        ndist = self._center_line.get_ndist(*self._center_line.locate_point(x, y))
+        previous, self._ndist = self._ndist, ndist
+        if previous is None:
+            self._sector = self._get_sector(ndist)
+            if min(ndist, 1.0 - ndist) <= self._start_tolerance:
+                self._start_lap(float(self._steps))
+            return
+        delta = ndist - previous
+        # the shorter way around between the two projections
+        if delta < -0.5:
+            delta += 1.0
+        elif delta > 0.5:
+            delta -= 1.0
+        if delta < 0.0:
+            self._reverse(ndist, delta)
+            return
+        # enter every sector start between the two projections in race direction
+        num_sectors = len(self._sector_starts)
+        for _ in range(num_sectors if delta > 0.0 else 0):
+            sector = (self._sector + 1) % num_sectors
+            distance = (self._sector_starts[sector] - previous) % 1.0
+            if distance > delta:
+                break
+            self._cross(sector, self._steps - 1 + distance / delta)
+
+    def _reverse(self, ndist: float, delta: float) -> None:
+        """
+        Follow the agent driving against race direction
+
+        Splits of the sectors left backward are dropped, and a lap is no
+        longer timed once the finish line is crossed backward.
+
+        Args:
+            ndist (float): current normalized distance along the center line
+            delta (float): negative ndist change since the previous step
+        """
+        sector = self._get_sector(ndist)
+        if ndist - delta >= 1.0:
+            self._lap_start = None
+            self._sector_splits = []
+        elif self._lap_start is not None and sector != self._sector:
+            self._sector_splits = self._sector_splits[:sector]
+            self._sector_start = self._lap_start + sum(self._sector_splits)
+        self._sector = sector
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Returns:
+            Tuple[str, ...]: field names in to_dict order
+        """
+        return ("lap_timing",)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return all internal state as a dict format
+
+        Returns:
+            Dict[str, Any]: internal state as a dict format
+        """
+        return {"lap_timing": self.lap_timing}
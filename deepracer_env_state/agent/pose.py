@@ -14,20 +14,20 @@
 #   limitations under the License.                                              #
 #################################################################################
 """A class for pose state"""
-import numpy as np
-
-from typing import Dict, Any
+from typing import Dict, Any, Sequence, Tuple
 from deepracer_env_state.state_interface import StateInterface
 from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
 from deepracer_env_state.agent.utils import quaternion_to_euler
-from deepracer_env_state.agent.utils import rotate
-from deepracer_env_state.agent.constants import RELATIVE_POSITION_OF_FRONT_OF_CAR
+from deepracer_env_state.agent.utils import get_front_of_car_position
 
 
 class Pose(StateInterface):
     """
     Pose Class
     """
+    # number of values of snapshot
+    SNAPSHOT_SIZE = 9
+
     def __init__(self, name: str):
         """
         Initialize Pose
@@ -41,9 +41,8 @@ class Pose(StateInterface):
         # euler angle: roll, pitch, yaw
         self._euler_angle = (0.0, 0.0, 0.0)
         # position: x. y, z for front of agent
-        self._front_of_car_position = np.array(self._position) + np.array(
-            rotate(RELATIVE_POSITION_OF_FRONT_OF_CAR,
-                   (0.0, 0.0, 0.0, 1)))
+        self._front_of_car_position = get_front_of_car_position(self._position,
+                                                                (0.0, 0.0, 0.0, 1))
 
     @property
     def x(self) -> float:
@@ -115,15 +114,49 @@ class Pose(StateInterface):
         """
         orientation = deepracer_env_data.orientation[self._name]
         self._position = deepracer_env_data.position[self._name]
-        self._front_of_car_position = np.array(self._position) + np.array(
-            rotate(RELATIVE_POSITION_OF_FRONT_OF_CAR,
-                   orientation))
+        self._front_of_car_position = deepracer_env_data.get_front_of_car_position(self._name)
         self._euler_angle = quaternion_to_euler(
             orientation[0],
             orientation[1],
             orientation[2],
             orientation[3])
 
+    def snapshot(self) -> Tuple[float, ...]:
+        """
+        Return the mutable state as SNAPSHOT_SIZE floats
+
+        Returns:
+            Tuple[float, ...]: position, front of car position and euler angle
+        """
+        return tuple(self._position) + tuple(self._front_of_car_position) + \
+            tuple(self._euler_angle)
+
+    def restore(self, values: Sequence[float]) -> None:
+        """
+        Restore the mutable state from snapshot values
+
+        Args:
+            values (Sequence[float]): values returned by snapshot
+        """
+        self._position = tuple(values[0:3])
+        self._front_of_car_position = tuple(values[3:6])
+        self._euler_angle = tuple(values[6:9])
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Returns:
+            Tuple[str, ...]: field names in to_dict order
+        """
+        return ("x",
+                "y",
+                "z",
+                "roll",
+                "pitch",
+                "yaw")
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Return all internal state as a dict format
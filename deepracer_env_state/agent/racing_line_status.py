@@ -0,0 +1,116 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for racing line status state"""
+from typing import Dict, Any, Optional, Tuple
+from deepracer_env_state.state_interface import StateInterface
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.track.track import Track
+
+
+class RacingLineStatus(StateInterface):
+    """
+    RacingLineStatus class
+
+    Signed deviation of the front of car from the racing line of the current
+    track, the target speed and the ndist of its projection on the line. The
+    racing line is looked up from the Track by the track of every step, so
+    that lines set on the Track later or for other tracks are picked up.
+    Values are None while the current track has no racing line.
+    """
+    _shared_attributes = ("_track",)
+
+    def __init__(self, name: str, track: Track):
+        """
+        Initialize RacingLineStatus
+
+        Args:
+            name (str): agent name
+            track (Track): track holding the racing line of each track
+        """
+        self._name = name
+        self._track = track
+        self._deviation = None
+        self._speed = None
+        self._ndist = None
+
+    @property
+    def racing_line_deviation(self) -> Optional[float]:
+        """
+        Return signed distance from the front of car to the racing line
+
+        Returns:
+            Optional[float]: deviation in meter, positive to the left of the line
+        """
+        return self._deviation
+
+    @property
+    def racing_line_speed(self) -> Optional[float]:
+        """
+        Return racing line target speed at the projection of the front of car
+
+        Returns:
+            Optional[float]: target speed in meter per second,
+                             None if the line has no target speed
+        """
+        return self._speed
+
+    @property
+    def racing_line_ndist(self) -> Optional[float]:
+        """
+        Return normalized distance along the racing line of the front of car projection
+
+        Returns:
+            Optional[float]: normalized distance in [0, 1]
+        """
+        return self._ndist
+
+    def update(self, deepracer_env_data: DeepRacerEnvData) -> None:
+        """
+        Update the internal state information
+
+        Args:
+            deepracer_env_data (DeepRacerEnvData): DeepRacerEnvData class instance
+
+        """
+        racing_line = self._track.get_racing_line(deepracer_env_data.track_geometry)
+        if racing_line is None:
+            self._deviation = self._speed = self._ndist = None
+            return
+        x, y, _ = deepracer_env_data.get_front_of_car_position(self._name)
+        self._ndist, self._deviation, self._speed = racing_line.project_point(x, y)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Returns:
+            Tuple[str, ...]: field names in to_dict order
+        """
+        return ("racing_line_deviation",
+                "racing_line_speed",
+                "racing_line_ndist")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return all internal state as a dict format
+
+        Returns:
+            Dict[str, Any]: internal state as a dict format
+        """
+        return {"racing_line_deviation": self._deviation,
+                "racing_line_speed": self._speed,
+                "racing_line_ndist": self._ndist}
@@ -14,51 +14,156 @@
 #   limitations under the License.                                              #
 #################################################################################
 """A class for status state"""
-import numpy as np
+import math
 
 from typing import Callable, Any, Optional
 from shapely.geometry import Point
-from typing import Dict, Tuple
+from typing import Dict, Sequence, Tuple
 from deepracer_env_state.state_interface import StateInterface
 from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
-from deepracer_env_state.agent.constants import (
-    RELATIVE_POSITION_OF_FOUR_WHEELS,
-    RELATIVE_POSITION_OF_FRONT_OF_CAR)
-from deepracer_env_state.agent.utils import rotate
+from deepracer_env_state.agent.utils import (
+    get_front_of_car_position,
+    get_wheel_positions)
+from deepracer_env_state.track.polyline import get_track_polylines
+from deepracer_env_state.track.track_geometry_pool import DefaultTrackGeometry
 from deepracer_track_geometry import (
     TrackGeometry,
     TrackRegion,
     TrackDirection)
-from deepracer_env import DEFAULT_TRACK
 
 
 class Status(StateInterface):
     """
     Status Class
+
+    steps, done, is_offtrack, progress and the latest pose are updated on
+    every step. The geometric fields, which project the agent onto the track,
+    can be decimated with set_geometry_update_rate, so that they keep the
+    values of the pose of the last geometry update until it is due again.
     """
+    # number of values of snapshot
+    SNAPSHOT_SIZE = 19
+    # fields computed from the pose of the last geometry update
+    GEOMETRY_FIELDS = ("all_wheels_on_track",
+                       "closest_waypoints",
+                       "distance_from_center",
+                       "track_width",
+                       "is_left_of_center")
+    _shared_attributes = ("_track_geometry", "_front_of_car_shape")
+    # default track geometry, built on first use without a track geometry
+    _track_geometry = DefaultTrackGeometry()
+
     def __init__(self, name: str,
-                 track_geometry: Optional[TrackGeometry] = None):
+                 track_geometry: Optional[TrackGeometry] = None,
+                 geometry_update_every: Optional[int] = 1,
+                 geometry_update_distance: Optional[float] = None):
         """
         Initialize Status
 
         Args:
             name (str): agent name
             track_geometry (Optional[TrackGeometry]): TrackGeometry instance
+            geometry_update_every (Optional[int]): update the geometric fields every
+                                                   geometry_update_every steps,
+                                                   only by distance if None
+            geometry_update_distance (Optional[float]): also update the geometric fields once
+                                                        the front of car moved more than
+                                                        this distance in meters
         """
         self._name = name
         self._steps = 0
         self._done = False
-        self._track_geometry = track_geometry or TrackGeometry(DEFAULT_TRACK)
+        if track_geometry is not None:
+            self._track_geometry = track_geometry
         # posiiton: x, y, z for center of agent
         self._position = (0.0, 0.0, 0.0)
         # quaternion: x, y, z, w
         self._orientation = (0.0, 0.0, 0.0, 1.0)
         # position: x. y, z for front of agent
-        self._front_of_car_point = Point(np.array(self._position) + np.array(
-            rotate(RELATIVE_POSITION_OF_FRONT_OF_CAR,
-                   self._orientation)))
+        self._front_of_car_position = get_front_of_car_position(self._position,
+                                                                self._orientation)
+        self._front_of_car_shape = None
         self._is_offtrack = False
         self._progress = 0
+        # center line projection of the front of car point it was computed for
+        self._projection_position = None
+        self._projection_track_geometry = None
+        self._projection = None
+        # wheels on track and region of the pose they were computed for
+        self._wheels_key = None
+        self._wheels_on_track = None
+        self._region_key = None
+        self._region = None
+        # geometry update rate and staleness
+        self.set_geometry_update_rate(geometry_update_every, geometry_update_distance)
+        self._geometry_age = 0
+        # pose of the last step, ahead of the pose of the last geometry update
+        # when the geometric fields are decimated
+        self._latest_position = self._position
+        self._latest_orientation = self._orientation
+        self._latest_front_of_car_position = self._front_of_car_position
+
+    def set_geometry_update_rate(self, update_every: Optional[int] = 1,
+                                 update_distance: Optional[float] = None) -> None:
+        """
+        Set how often the geometric fields are updated
+
+        The geometric fields are updated when update_every steps have passed or
+        the front of car moved more than update_distance since their last
+        update, whichever comes first. They are always updated on the first
+        step of an episode and when the track geometry changes.
+
+        Args:
+            update_every (Optional[int]): update every update_every steps,
+                                          only by distance if None
+            update_distance (Optional[float]): update once the front of car moved more
+                                               than this distance in meters, not by
+                                               distance if None
+
+        Raises:
+            ValueError: if update_every is less than 1 or both are None
+        """
+        if update_every is not None and update_every < 1:
+            raise ValueError("[Status]: update_every must be at least 1 or None, got {}".format(
+                update_every))
+        if update_every is None and update_distance is None:
+            raise ValueError("[Status]: update_every and update_distance cannot be both None")
+        self._geometry_update_every = update_every
+        self._geometry_update_distance = update_distance
+
+    @property
+    def geometry_age(self) -> int:
+        """
+        Return number of steps since the geometric fields were last updated
+
+        Returns:
+            int: 0 if the geometric fields are up to date with the last step
+        """
+        return self._geometry_age
+
+    @property
+    def geometry_distance(self) -> float:
+        """
+        Return distance the front of car moved since the geometric fields were last updated
+
+        Returns:
+            float: distance in meters in the x-y plane
+        """
+        latest = self._latest_front_of_car_position
+        current = self._front_of_car_position
+        return math.hypot(latest[0] - current[0], latest[1] - current[1])
+
+    @property
+    def _front_of_car_point(self) -> Point:
+        """
+        Return front of car point, built on first use after each update
+
+        Returns:
+            Point: front of car point
+        """
+        if self._front_of_car_shape is None:
+            self._front_of_car_shape = Point(self._front_of_car_position)
+        return self._front_of_car_shape
 
     @property
     def all_wheels_on_track(self) -> bool:
@@ -79,8 +184,15 @@ class Status(StateInterface):
             Tuple[int, int]: indices of the two nearest certer lane waypoints
                              based on the current position (front of car)
         """
-        return self._track_geometry.get_closest_waypoint_indices(
-            self._track_geometry.get_ndist_from_point(self._front_of_car_point))
+        segment, param, _ = self._project_front_of_car()
+        if 0.0 < param < 1.0:
+            ndist = get_track_polylines(self._track_geometry).center_line.get_ndist(
+                segment, param)
+        else:
+            # front of car nearest to a waypoint has exactly the waypoint ndist,
+            # where rounding decides the closest waypoints
+            ndist = self._track_geometry.get_ndist_from_point(self._front_of_car_point)
+        return self._track_geometry.get_closest_waypoint_indices(ndist)
 
     @property
     def distance_from_center(self) -> float:
@@ -90,8 +202,7 @@ class Status(StateInterface):
         Returns:
             float: distance from current position (front of car) to track center lane
         """
-        return self._front_of_car_point.distance(
-            self._track_geometry.track_center_line)
+        return abs(self._project_front_of_car()[2])
 
     @property
     def is_offtrack(self) -> bool:
@@ -132,22 +243,9 @@ class Status(StateInterface):
         Returns:
             float: current progress (front of car) track width
         """
-        # get ndist based on center line by project front of car point to center line
-        ndist = self._track_geometry.get_ndist_from_point(self._front_of_car_point)
-        # get center line point based on ndist
-        center_point = self._track_geometry.track_center_line.interpolate(
-            ndist,
-            normalized=True)
-        # get inner border line point by project and interpolate center point
-        inner_point = self._track_geometry.inner_border_line.interpolate(
-            self._track_geometry.inner_border_line.project(center_point),
-            normalized=False)
-        # get outer border line point by project and interpolate center point
-        outer_point = self._track_geometry.outer_border_line.interpolate(
-            self._track_geometry.outer_border_line.project(center_point),
-            normalized=False)
-        # return distance between inner and outer point as current track width distance
-        return inner_point.distance(outer_point)
+        # track width at the center line point nearest to the front of car
+        segment, param, _ = self._project_front_of_car()
+        return get_track_polylines(self._track_geometry).get_track_width_at(segment, param)
 
     @property
     def is_left_of_center(self) -> bool:
@@ -163,11 +261,37 @@ class Status(StateInterface):
         Returns:
             bool: Return True is to the left of center and False to the right
         """
-        region = self._track_geometry.get_region_on_track(self._front_of_car_point)
+        if self._region_key is not self._front_of_car_position or \
+                self._region is None or self._region[0] is not self._track_geometry:
+            self._region = (self._track_geometry,
+                            self._track_geometry.get_region_on_track(self._front_of_car_point))
+            self._region_key = self._front_of_car_position
+        region = self._region[1]
         is_inner = region in [TrackRegion.INNER_LANE, TrackRegion.INNER_OFFTRACK]
         is_clockwise = self._track_geometry.direction == TrackDirection.CLOCKWISE
         return is_inner ^ is_clockwise
 
+    def _project_front_of_car(self) -> Tuple[int, float, float]:
+        """
+        Return the center line projection of the front of car point
+
+        The projection is computed once per front of car position and shared by
+        closest_waypoints, distance_from_center and track_width.
+
+        Returns:
+            Tuple[int, float, float]: nearest center line segment index, parameter
+                                      in [0, 1] on the segment and signed lateral offset
+        """
+        if self._projection_position is not self._front_of_car_position or \
+                self._projection_track_geometry is not self._track_geometry:
+            center_line = get_track_polylines(self._track_geometry).center_line
+            x, y = self._front_of_car_position[0], self._front_of_car_position[1]
+            segment, param = center_line.locate_point(x, y)
+            self._projection = (segment, param, center_line.get_offset(x, y, segment, param))
+            self._projection_position = self._front_of_car_position
+            self._projection_track_geometry = self._track_geometry
+        return self._projection
+
     def _is_wheels_on_track(self, condition: Callable[[bool], bool] = all) -> bool:
         """
         Return bool regarding whether wheels on track based on condition
@@ -179,12 +303,28 @@ class Status(StateInterface):
         Returns:
             bool: True if on track and False otherwise based on condition
         """
-        wheel_points = [
-            Point(np.array(self._position) + np.array(rotate(wheel_relative_position,
-                                                             self._orientation)))
-            for wheel_relative_position in RELATIVE_POSITION_OF_FOUR_WHEELS]
-        return condition([self._track_geometry.is_on_track(wheel_point)
-                          for wheel_point in wheel_points])
+        wheels_key = (self._position, self._orientation, self._track_geometry)
+        if self._wheels_key is None or \
+                any(key is not cached for key, cached in zip(wheels_key, self._wheels_key)):
+            wheel_points = [Point(wheel_position) for wheel_position in
+                            get_wheel_positions(self._position, self._orientation)]
+            self._wheels_on_track = [self._track_geometry.is_on_track(wheel_point)
+                                     for wheel_point in wheel_points]
+            self._wheels_key = wheels_key
+        return condition(self._wheels_on_track)
+
+    def clear_cache(self) -> None:
+        """
+        Drop the front of car shape, projection, wheels and region memoized since the update
+        """
+        self._front_of_car_shape = None
+        self._projection_position = None
+        self._projection_track_geometry = None
+        self._projection = None
+        self._wheels_key = None
+        self._wheels_on_track = None
+        self._region_key = None
+        self._region = None
 
     def update(self, deepracer_env_data: DeepRacerEnvData) -> None:
         """
@@ -194,19 +334,118 @@ class Status(StateInterface):
             deepracer_env_data (DeepRacerEnvData): DeepRacerEnvData class instance
 
         """
+        self._latest_position = deepracer_env_data.position[self._name]
+        self._latest_orientation = deepracer_env_data.orientation[self._name]
+        self._latest_front_of_car_position = \
+            deepracer_env_data.get_front_of_car_position(self._name)
+        track_geometry = deepracer_env_data.track_geometry
+        if self._geometry_update_every == 1 or self._done or self._steps == 0 or \
+                track_geometry is not self._track_geometry or \
+                self._is_geometry_update_due(self._latest_front_of_car_position):
+            self._position = self._latest_position
+            self._orientation = self._latest_orientation
+            self._front_of_car_position = self._latest_front_of_car_position
+            self._front_of_car_shape = None
+            self._geometry_age = 0
+        else:
+            self._geometry_age += 1
         if self._done:
             self._steps = 0
         self._steps += 1
-        self._position = deepracer_env_data.position[self._name]
-        self._orientation = deepracer_env_data.orientation[self._name]
         self._done = deepracer_env_data.done[self._name]
-        self._track_geometry = deepracer_env_data.track_geometry
-        self._front_of_car_point = Point(np.array(self._position) + np.array(
-            rotate(RELATIVE_POSITION_OF_FRONT_OF_CAR,
-                   self._orientation)))
+        self._track_geometry = track_geometry
         self._is_offtrack = deepracer_env_data.is_offtrack[self._name]
         self._progress = deepracer_env_data.progress[self._name]
 
+    def _is_geometry_update_due(self, front_of_car_position: Tuple[float, float, float]) -> bool:
+        """
+        Return whether the geometric fields are due for update on this step
+
+        Args:
+            front_of_car_position (Tuple[float, float, float]): front of car position
+                                                                of this step
+
+        Returns:
+            bool: True if update_every steps passed or the front of car moved more than
+                  update_distance since the last geometry update and False otherwise
+        """
+        if self._geometry_update_every is not None and \
+                self._geometry_age + 1 >= self._geometry_update_every:
+            return True
+        if self._geometry_update_distance is None:
+            return False
+        current = self._front_of_car_position
+        return math.hypot(front_of_car_position[0] - current[0],
+                          front_of_car_position[1] - current[1]) > self._geometry_update_distance
+
+    @property
+    def track_geometry(self) -> TrackGeometry:
+        """
+        Return track geometry of the last update
+
+        Returns:
+            TrackGeometry: track geometry class instance
+        """
+        return self._track_geometry
+
+    def snapshot(self) -> Tuple[float, ...]:
+        """
+        Return the mutable state as SNAPSHOT_SIZE floats
+
+        Returns:
+            Tuple[float, ...]: steps, done, latest position, latest orientation,
+                               is_offtrack, progress, position and orientation of
+                               the last geometry update and geometry_age
+        """
+        return (float(self._steps), float(self._done)) + tuple(self._latest_position) + \
+            tuple(self._latest_orientation) + \
+            (float(self._is_offtrack), float(self._progress)) + \
+            tuple(self._position) + tuple(self._orientation) + (float(self._geometry_age),)
+
+    def restore(self, values: Sequence[float],
+                track_geometry: Optional[TrackGeometry] = None) -> None:
+        """
+        Restore the mutable state from snapshot values
+
+        Args:
+            values (Sequence[float]): values returned by snapshot
+            track_geometry (Optional[TrackGeometry]): track geometry of the snapshot,
+                                                      unchanged if None
+        """
+        if track_geometry is not None:
+            self._track_geometry = track_geometry
+        self._steps = int(values[0])
+        self._done = bool(values[1])
+        self._latest_position = tuple(values[2:5])
+        self._latest_orientation = tuple(values[5:9])
+        self._is_offtrack = bool(values[9])
+        self._progress = values[10]
+        self._position = tuple(values[11:14])
+        self._orientation = tuple(values[14:18])
+        self._geometry_age = int(values[18])
+        self._latest_front_of_car_position = get_front_of_car_position(self._latest_position,
+                                                                       self._latest_orientation)
+        self._front_of_car_position = get_front_of_car_position(self._position,
+                                                                self._orientation)
+        self._front_of_car_shape = None
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Returns:
+            Tuple[str, ...]: field names in to_dict order
+        """
+        return ("all_wheels_on_track",
+                "closest_waypoints",
+                "distance_from_center",
+                "is_offtrack",
+                "progress",
+                "steps",
+                "track_width",
+                "is_left_of_center")
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Return all internal state as a dict format
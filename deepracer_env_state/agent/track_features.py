@@ -0,0 +1,165 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for heading error and look-ahead curvature state"""
+import math
+
+from typing import Dict, Any, Sequence, Tuple
+from deepracer_env_state.state_interface import StateInterface
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.agent.utils import quaternion_to_euler
+from deepracer_env_state.track.polyline import get_track_polylines
+from deepracer_env_state.track.profile import get_track_profile
+from deepracer_track_geometry import TrackGeometry
+
+# default look-ahead distances along the center line in meter
+LOOK_AHEAD_DISTANCES = (1.0, 2.0, 4.0)
+# curvature in 1/meter below which the track counts as straight
+STRAIGHT_CURVATURE = 0.1
+
+
+class TrackFeatures(StateInterface):
+    """
+    TrackFeatures class
+
+    Heading error against the center line direction and curvature of the
+    center line at look-ahead distances from the front of car, read from the
+    precomputed TrackProfile of the track in O(1). The center line is assumed
+    to follow race direction.
+    """
+    _shared_attributes = ("_track_geometry", "_center_line", "_profile")
+
+    def __init__(self, name: str,
+                 look_ahead_distances: Sequence[float] = LOOK_AHEAD_DISTANCES,
+                 straight_curvature: float = STRAIGHT_CURVATURE):
+        """
+        Initialize TrackFeatures
+
+        Args:
+            name (str): agent name
+            look_ahead_distances (Sequence[float]): distances ahead of the front of car
+                                                    along the center line in meter
+            straight_curvature (float): curvature in 1/meter below which the turn
+                                        direction is straight
+        """
+        self._name = name
+        self._look_ahead_distances = tuple(look_ahead_distances)
+        self._straight_curvature = straight_curvature
+        self._track_geometry = None
+        self._center_line = None
+        self._profile = None
+        # center line segment and distance of the front of car, and agent yaw
+        self._segment = 0
+        self._distance = 0.0
+        self._yaw = 0.0
+
+    def _set_track_geometry(self, track_geometry: TrackGeometry) -> None:
+        """
+        Set the track geometry with its center line and profile
+
+        Args:
+            track_geometry (TrackGeometry): TrackGeometry instance
+        """
+        self._track_geometry = track_geometry
+        self._center_line = get_track_polylines(track_geometry).center_line
+        self._profile = get_track_profile(track_geometry)
+
+    @property
+    def look_ahead_distances(self) -> Tuple[float, ...]:
+        """
+        Return look-ahead distances
+
+        Returns:
+            Tuple[float, ...]: distances ahead of the front of car in meter
+        """
+        return self._look_ahead_distances
+
+    @property
+    def heading_error(self) -> float:
+        """
+        Return heading error against the center line direction
+
+        Returns:
+            float: agent yaw minus center line heading in radian in [-pi, pi),
+                   positive if the agent points left of the track direction
+        """
+        if self._profile is None:
+            return 0.0
+        error = self._yaw - self._profile.get_heading(self._segment)
+        return (error + math.pi) % (2.0 * math.pi) - math.pi
+
+    @property
+    def look_ahead_curvatures(self) -> Tuple[float, ...]:
+        """
+        Return center line curvature at the look-ahead distances
+
+        Returns:
+            Tuple[float, ...]: signed curvature in 1/meter, positive for left turns
+        """
+        if self._profile is None:
+            return tuple(0.0 for _ in self._look_ahead_distances)
+        return tuple(self._profile.get_curvature(self._distance + distance)
+                     for distance in self._look_ahead_distances)
+
+    @property
+    def look_ahead_turns(self) -> Tuple[int, ...]:
+        """
+        Return turn direction at the look-ahead distances
+
+        Returns:
+            Tuple[int, ...]: 1 for left, -1 for right and 0 for straight
+        """
+        return tuple(0 if abs(curvature) < self._straight_curvature else
+                     1 if curvature > 0.0 else -1
+                     for curvature in self.look_ahead_curvatures)
+
+    def update(self, deepracer_env_data: DeepRacerEnvData) -> None:
+        """
+        Update the internal state information
+
+        Args:
+            deepracer_env_data (DeepRacerEnvData): DeepRacerEnvData class instance
+
+        """
+        if deepracer_env_data.track_geometry is not self._track_geometry:
+            self._set_track_geometry(deepracer_env_data.track_geometry)
+        x, y, _ = deepracer_env_data.get_front_of_car_position(self._name)
+        segment, param = self._center_line.locate_point(x, y)
+        self._segment = segment
+        self._distance = self._center_line.get_ndist(segment, param) * self._profile.length
+        self._yaw = quaternion_to_euler(*deepracer_env_data.orientation[self._name])[2]
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Returns:
+            Tuple[str, ...]: field names in to_dict order
+        """
+        return ("heading_error",
+                "look_ahead_curvatures",
+                "look_ahead_turns")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return all internal state as a dict format
+
+        Returns:
+            Dict[str, Any]: internal state as a dict format
+        """
+        return {"heading_error": self.heading_error,
+                "look_ahead_curvatures": self.look_ahead_curvatures,
+                "look_ahead_turns": self.look_ahead_turns}
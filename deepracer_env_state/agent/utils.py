@@ -15,8 +15,12 @@
 #################################################################################
 """Module to contain agent related utils"""
 import math
+import numpy as np
 
 from typing import List, Tuple
+from deepracer_env_state.agent.constants import (
+    RELATIVE_POSITION_OF_FOUR_WHEELS,
+    RELATIVE_POSITION_OF_FRONT_OF_CAR)
 
 
 def rotate(vector: List[float], quaternion: List[float]) -> Tuple[float, float, float]:
@@ -77,6 +81,124 @@ def rotate(vector: List[float], quaternion: List[float]) -> Tuple[float, float,
     return x, y, z
 
 
+def rotate_array(vector: List[float], quaternions: np.ndarray) -> np.ndarray:
+    """
+    Returns the vector rotated by each quaternion of an array.
+
+    Vectorized version of rotate with the same simplified formula.
+
+    Args:
+        vector (List[float]): vector to apply the given quaternions.
+        quaternions (np.ndarray): (N, 4) quaternions x, y, z, w
+
+    Returns:
+        np.ndarray: (N, 3) vectors from vector with each quaternion applied.
+    """
+    quaternions = np.asarray(quaternions, dtype=float)
+    b1, c1, d1, a1 = quaternions[:, 0], quaternions[:, 1], quaternions[:, 2], quaternions[:, 3]
+    b2, c2, d2 = vector[0], vector[1], vector[2]
+
+    a1_sq = a1 ** 2
+    b1_sq = b1 ** 2
+    c1_sq = c1 ** 2
+    d1_sq = d1 ** 2
+
+    x = b2 * (-c1_sq - d1_sq + b1_sq + a1_sq) + 2 * \
+        (-(a1 * c2 * d1) + (b1 * c1 * c2) + (b1 * d1 * d2) + (a1 * c1 * d2))
+    y = c2 * (c1_sq - d1_sq + a1_sq - b1_sq) + 2 * \
+        ((a1 * b2 * d1) + (b1 * b2 * c1) + (c1 * d1 * d2) - (a1 * b1 * d2))
+    z = d2 * (-c1_sq + d1_sq + a1_sq - b1_sq) + 2 * \
+        ((a1 * b1 * c2) + (b1 * b2 * d1) - (a1 * b2 * c1) + (c1 * c2 * d1))
+    return np.stack([x, y, z], axis=1)
+
+
+def get_rotation_coefficients(quaternion: List[float]) -> Tuple[float, ...]:
+    """
+    Returns the rotation matrix coefficients of the given quaternion.
+
+    The coefficients are the quaternion products of the simplified formula in
+    rotate grouped per vector component, so that rotating several vectors by
+    the same quaternion with apply_rotation computes them only once.
+
+    Args:
+        quaternion (List[float]): A quaternion x, y, z, w
+
+    Returns:
+        Tuple[float, ...]: row major 3x3 rotation matrix coefficients
+    """
+    b1, c1, d1, a1 = quaternion[0], quaternion[1], quaternion[2], quaternion[3]
+
+    a1_sq = a1 * a1
+    b1_sq = b1 * b1
+    c1_sq = c1 * c1
+    d1_sq = d1 * d1
+    a1_b1 = a1 * b1
+    a1_c1 = a1 * c1
+    a1_d1 = a1 * d1
+    b1_c1 = b1 * c1
+    b1_d1 = b1 * d1
+    c1_d1 = c1 * d1
+
+    return (a1_sq + b1_sq - c1_sq - d1_sq, 2 * (b1_c1 - a1_d1), 2 * (b1_d1 + a1_c1),
+            2 * (b1_c1 + a1_d1), a1_sq - b1_sq + c1_sq - d1_sq, 2 * (c1_d1 - a1_b1),
+            2 * (b1_d1 - a1_c1), 2 * (c1_d1 + a1_b1), a1_sq - b1_sq - c1_sq + d1_sq)
+
+
+def apply_rotation(vector: List[float], coefficients: Tuple[float, ...],
+                   translation: List[float] = (0.0, 0.0, 0.0)) -> Tuple[float, float, float]:
+    """
+    Returns the vector rotated by rotation coefficients and translated.
+
+    Args:
+        vector (List[float]): vector to apply the given rotation.
+        coefficients (Tuple[float, ...]): coefficients from get_rotation_coefficients.
+        translation (List[float]): vector added after the rotation.
+
+    Returns:
+        Tuple[float, float, float]: final vector from vector with the rotation applied.
+    """
+    r00, r01, r02, r10, r11, r12, r20, r21, r22 = coefficients
+    x, y, z = vector[0], vector[1], vector[2]
+    return (translation[0] + r00 * x + r01 * y + r02 * z,
+            translation[1] + r10 * x + r11 * y + r12 * z,
+            translation[2] + r20 * x + r21 * y + r22 * z)
+
+
+def get_front_of_car_position(position: List[float],
+                              orientation: List[float]) -> Tuple[float, float, float]:
+    """
+    Returns the position of the front of car.
+
+    Args:
+        position (List[float]): position x, y, z for center of agent.
+        orientation (List[float]): orientation quaternion x, y, z, w of agent.
+
+    Returns:
+        Tuple[float, float, float]: position x, y, z for front of agent.
+    """
+    return apply_rotation(RELATIVE_POSITION_OF_FRONT_OF_CAR,
+                          get_rotation_coefficients(orientation),
+                          position)
+
+
+def get_wheel_positions(position: List[float],
+                        orientation: List[float]) -> List[Tuple[float, float, float]]:
+    """
+    Returns the positions of the four wheels.
+
+    Args:
+        position (List[float]): position x, y, z for center of agent.
+        orientation (List[float]): orientation quaternion x, y, z, w of agent.
+
+    Returns:
+        List[Tuple[float, float, float]]: position x, y, z for each wheel in
+                                          RELATIVE_POSITION_OF_FOUR_WHEELS order.
+    """
+    coefficients = get_rotation_coefficients(orientation)
+    return [apply_rotation(wheel_relative_position, coefficients, position)
+            for wheel_relative_position in RELATIVE_POSITION_OF_FOUR_WHEELS]
+
+
 def quaternion_to_euler(x: float, y: float, z: float, w: float) -> Tuple[float, float, float]:
     """
     Convert quaternion x, y, z, w to euler angle roll, pitch, yaw
@@ -108,3 +230,19 @@ def quaternion_to_euler(x: float, y: float, z: float, w: float) -> Tuple[float,
     yaw = math.atan2(siny_cosp, cosy_cosp)
 
     return roll, pitch, yaw
+
+
+def get_yaws(quaternions: np.ndarray) -> np.ndarray:
+    """
+    Returns the yaw of each quaternion of an array.
+
+    Vectorized version of the yaw of quaternion_to_euler with the same formula.
+
+    Args:
+        quaternions (np.ndarray): (N, 4) quaternions x, y, z, w
+
+    Returns:
+        np.ndarray: (N,) yaw in radian
+    """
+    x, y, z, w = np.asarray(quaternions, dtype=float).reshape(-1, 4).T
+    return np.arctan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
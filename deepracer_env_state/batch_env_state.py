@@ -0,0 +1,269 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for batched state of multiple environments"""
+import numpy as np
+
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+from deepracer_env import (
+    DeepRacerEnv,
+    DeepRacerEnvObserverInterface)
+from deepracer_env_state.agent.trajectory import (
+    evaluate_trajectory,
+    get_trajectory_dtype)
+from deepracer_env_state.precision import get_float_dtype
+from deepracer_env_state.track.track_geometry_pool import TrackGeometryPool
+from deepracer_track_geometry import TrackGeometry
+from ude import (
+    UDEStepResult,
+    UDEResetResult)
+
+# fields of to_arrays stored from the step result with (M, N, ...) shape
+STEP_FIELDS = ("steering_angle",
+               "speed",
+               "position",
+               "orientation",
+               "steps",
+               "done",
+               "is_offtrack",
+               "progress")
+# fields of to_arrays evaluated with evaluate_trajectory
+TRACK_FIELDS = ("front_of_car_position",
+                "all_wheels_on_track",
+                "closest_waypoints",
+                "distance_from_center",
+                "track_width",
+                "is_left_of_center")
+
+
+class BatchDeepRacerEnvState(DeepRacerEnvObserverInterface):
+    """
+    BatchDeepRacerEnvState class
+
+    Observes M environments with N agents each and keeps the agent states as
+    (M, N, ...) arrays instead of per agent Python objects. Environments on
+    the same track share the track geometry of the track geometry pool, and
+    the Status fields of all agents on a track are evaluated at once with
+    evaluate_trajectory when to_arrays asks for them.
+    """
+    def __init__(self, deepracer_envs: Sequence[DeepRacerEnv],
+                 track_geometry_pool: Optional[TrackGeometryPool] = None,
+                 dtype: Any = np.float64):
+        """
+        Initialize BatchDeepRacerEnvState
+
+        Args:
+            deepracer_envs (Sequence[DeepRacerEnv]): DeepRacerEnv class instances
+            track_geometry_pool (Optional[TrackGeometryPool]): pool to get track geometry
+                                                               from, which can be shared
+                                                               with other env states,
+                                                               private bounded pool if None
+            dtype (Any): float dtype of the arrays, np.float32 halves their size
+                         within the precision error bounds
+
+        Raises:
+            ValueError: if the environments do not have the same number of agents,
+                        or dtype is not one of FLOAT_DTYPES
+        """
+        self._dtype = get_float_dtype(dtype)
+        self._deepracer_envs = list(deepracer_envs)
+        if track_geometry_pool is None:
+            track_geometry_pool = TrackGeometryPool()
+        self._track_geometry_pool = track_geometry_pool
+        self._track_configs = [env.get_track() for env in self._deepracer_envs]
+        self._track_geometries = [self._track_geometry_pool.get(track_config)
+                                  for track_config in self._track_configs]
+        self._agent_names = []
+        for env in self._deepracer_envs:
+            agents = env.get_agent()
+            agents = [agents] if not isinstance(agents, list) else agents
+            self._agent_names.append(tuple(agent.name for agent in agents))
+        if len(set(len(names) for names in self._agent_names)) > 1:
+            raise ValueError("[BatchDeepRacerEnvState]: environments have different "
+                             "number of agents {}".format(
+                                 [len(names) for names in self._agent_names]))
+        # env index with env id as key, as envs are not required to be hashable
+        self._env_indices = {id(env): index for index, env in enumerate(self._deepracer_envs)}
+        shape = (len(self._deepracer_envs),
+                 len(self._agent_names[0]) if self._agent_names else 0)
+        self._steering_angle = np.zeros(shape, dtype=self._dtype)
+        self._speed = np.zeros(shape, dtype=self._dtype)
+        self._position = np.zeros(shape + (3,), dtype=self._dtype)
+        self._orientation = np.zeros(shape + (4,), dtype=self._dtype)
+        self._orientation[..., 3] = 1.0
+        self._steps = np.zeros(shape, dtype=np.int64)
+        self._done = np.zeros(shape, dtype=np.bool_)
+        self._is_offtrack = np.zeros(shape, dtype=np.bool_)
+        self._progress = np.zeros(shape, dtype=self._dtype)
+        # evaluate_trajectory result of the current step, evaluated on first use
+        self._track_result = None
+        [env.register(self) for env in self._deepracer_envs]
+
+    def on_step(self, env: DeepRacerEnv, step_result: UDEStepResult) -> None:
+        """
+        On step callback
+
+        Args:
+            env (DeepRacerEnv): DeepRacer environment.
+            step_result (UDEStepResult): step result (obs, reward, done, last action, info)
+        """
+        _, _, done, action, info = step_result
+        env_index = self._env_indices[id(env)]
+        for agent_index, name in enumerate(self._agent_names[env_index]):
+            if name not in info:
+                continue
+            agent_info = info[name]
+            if self._done[env_index, agent_index]:
+                self._steps[env_index, agent_index] = 0
+            self._steps[env_index, agent_index] += 1
+            self._steering_angle[env_index, agent_index] = action[name][0]
+            self._speed[env_index, agent_index] = action[name][1]
+            self._position[env_index, agent_index] = agent_info["position"]
+            self._orientation[env_index, agent_index] = agent_info["orientation"]
+            self._done[env_index, agent_index] = done[name]
+            self._is_offtrack[env_index, agent_index] = agent_info["is_offtrack"]
+            self._progress[env_index, agent_index] = agent_info["progress"]
+        self._track_result = None
+
+    def on_reset(self, env: DeepRacerEnv, reset_result: UDEResetResult) -> None:
+        """
+        On Reset callback.
+
+        Args:
+            env (DeepRacerEnv): DeepRacer environment.
+            reset_result (UDEResetResult): reset result (obs, info)
+        """
+        env_index = self._env_indices[id(env)]
+        track_config = env.get_track()
+        if not self._track_configs[env_index] == track_config:
+            self._track_geometries[env_index] = self._track_geometry_pool.get(track_config)
+            self._track_result = None
+        self._track_configs[env_index] = track_config
+
+    def preload_tracks(self, track_configs: Iterable[Any]) -> None:
+        """
+        Start building the track geometry of upcoming tracks in the background
+
+        Args:
+            track_configs (Iterable[Any]): upcoming track configs
+        """
+        self._track_geometry_pool.preload(track_configs)
+
+    @property
+    def num_envs(self) -> int:
+        """
+        Return number of environments M
+
+        Returns:
+            int: number of environments
+        """
+        return len(self._deepracer_envs)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        Return float dtype of the arrays
+
+        Returns:
+            np.dtype: one of FLOAT_DTYPES
+        """
+        return self._dtype
+
+    @property
+    def agent_names(self) -> List[Tuple[str, ...]]:
+        """
+        Return agent names of every environment in agent index order
+
+        Returns:
+            List[Tuple[str, ...]]: agent names with env index as list index
+        """
+        return list(self._agent_names)
+
+    @property
+    def track_geometries(self) -> List[TrackGeometry]:
+        """
+        Return track geometry of every environment
+
+        Environments on the same track share the same instance.
+
+        Returns:
+            List[TrackGeometry]: track geometries with env index as list index
+        """
+        return list(self._track_geometries)
+
+    def get_env_index(self, env: DeepRacerEnv) -> int:
+        """
+        Return the env index used as first array dimension
+
+        Args:
+            env (DeepRacerEnv): DeepRacer environment
+
+        Returns:
+            int: env index
+        """
+        return self._env_indices[id(env)]
+
+    def _evaluate_track_fields(self) -> np.ndarray:
+        """
+        Return Status fields of every agent evaluated once per track geometry
+
+        Returns:
+            np.ndarray: (M, N) structured array of get_trajectory_dtype(dtype)
+        """
+        if self._track_result is None:
+            result = np.zeros(self._steps.shape, dtype=get_trajectory_dtype(self._dtype))
+            groups = dict()
+            for env_index, track_geometry in enumerate(self._track_geometries):
+                groups.setdefault(id(track_geometry), (track_geometry, []))[1].append(env_index)
+            for track_geometry, env_indices in groups.values():
+                result[env_indices] = evaluate_trajectory(
+                    self._position[env_indices].reshape(-1, 3),
+                    self._orientation[env_indices].reshape(-1, 4),
+                    track_geometry, self._dtype).reshape(len(env_indices), -1)
+            self._track_result = result
+        return self._track_result
+
+    def to_arrays(self, fields: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Return agent states of all environments as stacked (M, N, ...) arrays
+
+        Track fields are only evaluated if selected, once per step.
+
+        Args:
+            fields (Optional[Iterable[str]]): STEP_FIELDS and/or TRACK_FIELDS names to select,
+                                              all fields if None
+
+        Returns:
+            Dict[str, np.ndarray]: arrays with env index and agent index as first dimensions
+                                   with field name as key
+
+        Raises:
+            ValueError: if any field is unknown
+        """
+        fields = STEP_FIELDS + TRACK_FIELDS if fields is None else tuple(fields)
+        unknown = set(fields).difference(STEP_FIELDS, TRACK_FIELDS)
+        if unknown:
+            raise ValueError("[BatchDeepRacerEnvState]: unknown field(s) {}".format(
+                sorted(unknown)))
+        arrays = {field: getattr(self, "_" + field).copy()
+                  for field in fields if field in STEP_FIELDS}
+        if any(field in TRACK_FIELDS for field in fields):
+            result = self._evaluate_track_fields()
+            for field in fields:
+                if field == "front_of_car_position":
+                    arrays[field] = np.stack([result["x"], result["y"], result["z"]], axis=-1)
+                elif field in TRACK_FIELDS:
+                    arrays[field] = result[field].copy()
+        return arrays
@@ -16,7 +16,7 @@
 """A class for composite state"""
 import logging
 
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from deepracer_env_state.state_interface import StateInterface
 from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
 from deepracer_env_state.agent.constants import AgentStates
@@ -25,23 +25,68 @@ from deepracer_env_state.agent.constants import AgentStates
 class CompositeState(StateInterface):
     """
     CompositeState class
+
+    Registry of states updated in dependency order. Every state declares the
+    states it reads and how often it is updated: every step, every k steps or
+    on demand. On demand states only keep the latest DeepRacerEnvData and are
+    updated with it when they are read, or before a state depending on them
+    is updated, so they should not accumulate over steps.
     """
     def __init__(self):
         """
         Initialize CompositeState
         """
         self._states = dict()
+        self._dependencies = dict()
+        self._update_intervals = dict()
+        # latest DeepRacerEnvData not yet applied to on demand states with state name as key
+        self._pending = dict()
+        self._update_count = 0
+        self._update_plan = None
+        # states in update order if all of them are updated on every step, None otherwise
+        self._every_step_states = None
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "CompositeState":
+        """
+        Return a deep copy sharing the track geometry of the pending DeepRacerEnvData
+
+        Args:
+            memo (Dict[int, Any]): deepcopy memo
+
+        Returns:
+            CompositeState: deep copy of the state
+        """
+        for deepracer_env_data in self._pending.values():
+            track_geometry = deepracer_env_data.track_geometry
+            memo.setdefault(id(track_geometry), track_geometry)
+        return super().__deepcopy__(memo)
 
-    def add(self, name: AgentStates, state: StateInterface) -> None:
+    def add(self, name: AgentStates, state: StateInterface,
+            depends_on: Iterable[Any] = tuple(),
+            update_every: Optional[int] = 1) -> None:
         """
         Add a state
 
         Args:
             name (AgentStates): state name
             state (StateInterface): state implementing StateInterface
+            depends_on (Iterable[Any]): names of the states read by the state,
+                                        which are updated before it
+            update_every (Optional[int]): update the state on the first step and every
+                                          update_every steps after, on demand if None
+
+        Raises:
+            ValueError: if update_every is less than 1
         """
+        if update_every is not None and update_every < 1:
+            raise ValueError("[CompositeState]: update_every must be at least 1 "
+                             "or None, got {}".format(update_every))
         if name not in self._states:
             self._states[name] = state
+            self._dependencies[name] = tuple(depends_on)
+            self._update_intervals[name] = update_every
+            self._update_plan = None
+            self._every_step_states = None
         else:
             logging.info("[CompositeState]: state {} has already added,"
                          " so ignore.".format(name))
@@ -50,31 +95,185 @@ class CompositeState(StateInterface):
         """
         Get a state
 
+        On demand states are brought up to date before being returned.
+
         Args:
             name (AgentStates): state name
 
         Returns:
             StateInterface: state implementing StateInterface
         """
+        if self._pending:
+            self._refresh(name)
         return self._states[name]
 
+    @property
+    def update_plan(self) -> Tuple[Any, ...]:
+        """
+        Return state names in update order
+
+        Returns:
+            Tuple[Any, ...]: state names with dependencies before dependents
+
+        Raises:
+            ValueError: if a dependency is not added or dependencies form a cycle
+        """
+        return tuple(name for name, _, _, _ in self._get_update_plan())
+
+    def _get_update_plan(self) -> List[Tuple[Any, StateInterface, Optional[int], Tuple[Any, ...]]]:
+        """
+        Return the update plan compiled on first use after each add
+
+        States follow the order they were added in, except that dependencies
+        are moved before their dependents. A state added under more than one
+        name is only updated once.
+
+        Returns:
+            List[Tuple[Any, StateInterface, Optional[int], Tuple[Any, ...]]]:
+                state name, state, update interval and on demand dependencies in update order
+
+        Raises:
+            ValueError: if a dependency is not added or dependencies form a cycle
+        """
+        if self._update_plan is not None:
+            return self._update_plan
+        order = []
+        visiting = set()
+
+        def visit(name: Any, dependent: Any) -> None:
+            if name in order:
+                return
+            if name not in self._states:
+                raise ValueError("[CompositeState]: state {} depends on unknown state {}".format(
+                    dependent, name))
+            if name in visiting:
+                raise ValueError("[CompositeState]: dependency cycle through state {}".format(
+                    name))
+            visiting.add(name)
+            [visit(dependency, name) for dependency in self._dependencies.get(name, tuple())]
+            visiting.discard(name)
+            order.append(name)
+
+        [visit(name, None) for name in self._states]
+        plan = []
+        state_ids = set()
+        for name in order:
+            state = self._states[name]
+            if id(state) in state_ids:
+                continue
+            state_ids.add(id(state))
+            on_demand = tuple(dependency for dependency in self._dependencies.get(name, tuple())
+                              if self._update_intervals.get(dependency, 1) is None)
+            plan.append((name, state, self._update_intervals.get(name, 1), on_demand))
+        self._update_plan = plan
+        if all(update_every == 1 for _, _, update_every, _ in plan):
+            self._every_step_states = tuple(state for _, state, _, _ in plan)
+        return plan
+
+    def _refresh(self, name: Any) -> None:
+        """
+        Update an on demand state and its on demand dependencies with the latest data
+
+        Args:
+            name (Any): state name
+        """
+        deepracer_env_data = self._pending.pop(name, None)
+        if deepracer_env_data is None:
+            return
+        [self._refresh(dependency) for dependency in self._dependencies[name]]
+        self._states[name].update(deepracer_env_data)
+
     def update(self, deepracer_env_data: DeepRacerEnvData) -> None:
         """
-        update each state using DeepRacerEnvData instance
+        update each state using DeepRacerEnvData instance following the update plan
 
         Args:
             deepracer_env_data (DeepRacerEnvData): DeepRacerEnvData class instance
         """
-        [state.update(deepracer_env_data) for state in self._states.values()]
+        self._update_count += 1
+        if self._every_step_states is not None:
+            [state.update(deepracer_env_data) for state in self._every_step_states]
+            return
+        for name, state, update_every, on_demand in self._get_update_plan():
+            if update_every is None:
+                self._pending[name] = deepracer_env_data
+            elif update_every == 1 or (self._update_count - 1) % update_every == 0:
+                [self._refresh(dependency) for dependency in on_demand]
+                state.update(deepracer_env_data)
+
+    def clear_cache(self) -> None:
+        """
+        Drop the values memoized by every state since the last update
+        """
+        [state.clear_cache() for state in self._states.values()]
 
-    def to_dict(self) -> Dict[str, Any]:
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Returns:
+            Tuple[str, ...]: field names of every state in to_dict order
+        """
+        return tuple(field for state in self._states.values() for field in state.fields)
+
+    def compile_fields(self, fields: Iterable[str]) -> Dict[Any, Tuple[str, ...]]:
+        """
+        Compile a field selection into the minimal per state evaluation plan
+
+        States without any requested field are left out of the plan, so that
+        they are not evaluated at all.
+
+        Args:
+            fields (Iterable[str]): field names to select
+
+        Returns:
+            Dict[Any, Tuple[str, ...]]: selected field names with state name as key
+
+        Raises:
+            ValueError: if any field is not provided by the states
+        """
+        fields = set(fields)
+        plan = dict()
+        for name, state in self._states.items():
+            selected = tuple(field for field in state.fields if field in fields)
+            if selected:
+                plan[name] = selected
+        unknown = fields.difference(field for selected in plan.values()
+                                    for field in selected)
+        if unknown:
+            raise ValueError("[CompositeState]: unknown field(s) {}".format(
+                sorted(unknown)))
+        return plan
+
+    def evaluate(self, plan: Dict[Any, Tuple[str, ...]]) -> Dict[str, Any]:
+        """
+        Return the fields of a compiled plan in dict format
+
+        Args:
+            plan (Dict[Any, Tuple[str, ...]]): plan returned by compile_fields
+
+        Returns:
+            Dict[str, Any]: selected fields in dict format
+        """
+        states_dict = dict()
+        for name, selected in plan.items():
+            states_dict.update(self.get(name).select(selected))
+        return states_dict
+
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         Return CompositeState class instance in dict format
 
+        Args:
+            fields (Optional[Iterable[str]]): field names to select, all fields if None
+
         Returns:
             Dict[str, Any]: CompositeState class instance in dict format
         """
+        if fields is not None:
+            return self.evaluate(self.compile_fields(fields))
         states_dict = dict()
-        for state in self._states.values():
-            states_dict.update(state.to_dict())
+        for name in self._states:
+            states_dict.update(self.get(name).to_dict())
         return states_dict
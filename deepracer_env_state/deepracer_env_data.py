@@ -14,9 +14,14 @@
 #   limitations under the License.                                              #
 #################################################################################
 """A class for environment data"""
-from typing import Dict, Any, List
+import numpy as np
 
-from deepracer_track_geometry import TrackGeometry
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Sequence, Tuple
+
+from deepracer_env_state.agent.utils import get_front_of_car_position
+
+if TYPE_CHECKING:
+    from deepracer_track_geometry import TrackGeometry
 
 
 class DeepRacerEnvData():
@@ -27,7 +32,8 @@ class DeepRacerEnvData():
                  done: Dict[str, bool],
                  action: Dict[str, Any],
                  info: Dict[str, Any],
-                 track_geometry: TrackGeometry):
+                 track_geometry: "TrackGeometry",
+                 agent_names: Optional[Sequence[str]] = None):
         """
         Initialize DeepRacerEnvData
 
@@ -36,11 +42,15 @@ class DeepRacerEnvData():
             action (Dict[str, Any]): the action(s) for agent(s) with agent_name as key
             info (Dict[str, Any]): the info(s) for agent(s) with agent_name as key
             track_geometry (TrackGeometry): track geometry class instance
+            agent_names (Optional[Sequence[str]]): agent names in agent index order,
+                                                   info order if None
         """
         self._done = done
         self._action = action
         self._info = info
         self._track_geometry = track_geometry
+        self._agent_names = tuple(agent_names) if agent_names is not None else None
+        self._front_of_car_positions = dict()
 
     @property
     def done(self) -> Dict[str, bool]:
@@ -63,7 +73,7 @@ class DeepRacerEnvData():
         return self._action
 
     @property
-    def track_geometry(self) -> TrackGeometry:
+    def track_geometry(self) -> "TrackGeometry":
         """
         Return track geometry class instance
 
@@ -72,6 +82,30 @@ class DeepRacerEnvData():
         """
         return self._track_geometry
 
+    @property
+    def agent_names(self) -> Tuple[str, ...]:
+        """
+        Return names of the agent(s) with info in agent index order
+
+        Returns:
+            Tuple[str, ...]: agent names in agent index order
+        """
+        if self._agent_names is None:
+            return tuple(self._info)
+        return tuple(name for name in self._agent_names if name in self._info)
+
+    def get_array(self, key: str) -> np.ndarray:
+        """
+        Return an info value of every agent stacked in agent_names order
+
+        Args:
+            key (str): info key such as position, orientation, progress or is_offtrack
+
+        Returns:
+            np.ndarray: info values with agent index as first dimension
+        """
+        return np.array([self._info[name][key] for name in self.agent_names])
+
     @property
     def position(self) -> Dict[str, List[float]]:
         """
@@ -92,6 +126,24 @@ class DeepRacerEnvData():
         """
         return {agent: info["orientation"] for agent, info in self._info.items()}
 
+    def get_front_of_car_position(self, name: str) -> Tuple[float, float, float]:
+        """
+        Return the front of car position of an agent, computed once per data instance
+
+        Args:
+            name (str): agent name
+
+        Returns:
+            Tuple[float, float, float]: position x, y, z for front of agent
+        """
+        front_of_car_position = self._front_of_car_positions.get(name)
+        if front_of_car_position is None:
+            info = self._info[name]
+            front_of_car_position = get_front_of_car_position(info["position"],
+                                                              info["orientation"])
+            self._front_of_car_positions[name] = front_of_car_position
+        return front_of_car_position
+
     @property
     def is_offtrack(self) -> Dict[str, bool]:
         """
@@ -15,43 +15,109 @@
 #################################################################################
 """A class for environment state"""
 import copy
+import struct
 
-from typing import Dict, Any
+from collections import OrderedDict
+
+from typing import (
+    Dict, Any, Callable, Hashable, Iterable, Optional, Sequence, Tuple, Union)
+import numpy as np
 from deepracer_env import (
     DeepRacerEnv,
-    DeepRacerEnvObserverInterface,
-    DEFAULT_TRACK)
-from deepracer_env_state.agent.agent import Agent
+    DeepRacerEnvObserverInterface)
+from deepracer_env_state.agent.agent import (
+    Agent,
+    AgentSnapshot)
+from deepracer_env_state.agent.constants import AgentStates
+from deepracer_env_state.agent.racing_line_status import RacingLineStatus
+from deepracer_env_state.composite_state import CompositeState
 from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.field_plan import (
+    FieldPlan,
+    profile_field_costs)
+from deepracer_env_state.precision import get_float_dtype
+from deepracer_env_state.track.racing_line import RacingLine
 from deepracer_env_state.track.track import Track
-from deepracer_track_geometry import TrackGeometry
+from deepracer_env_state.track.track_geometry_pool import (
+    DefaultTrackGeometry,
+    TrackGeometryPool)
+from deepracer_env_state.state_interface import StateInterface
+from deepracer_track_geometry import TrackDirection
 from ude import (
     UDEStepResult,
     UDEResetResult)
 
 
+# default maximum number of agents removed on reset kept for reuse
+DEFAULT_MAX_POOLED_AGENTS = 16
+
+
 class DeepRacerEnvState(DeepRacerEnvObserverInterface):
     """
     DeepRacerEnvState class
+
+    The agent set follows the env agents, which are read again on every
+    reset. Agents removed on reset are pooled and reused when they come back.
     """
-    def __init__(self, deepracer_env: DeepRacerEnv):
+    # default track geometry until the first track switch, built on first use
+    _track_geometry = DefaultTrackGeometry()
+
+    def __init__(self, deepracer_env: DeepRacerEnv,
+                 track_geometry_pool: Optional[TrackGeometryPool] = None,
+                 dtype: Any = np.float64,
+                 max_pooled_agents: Optional[int] = DEFAULT_MAX_POOLED_AGENTS):
         """
         Initialize DeepRacerEnvState
 
         Args:
             deepracer_env (DeepRacerEnv): DeepRacerEnv class instance
+            track_geometry_pool (Optional[TrackGeometryPool]): pool to get track geometry
+                                                               from on reset, which can be
+                                                               shared between env states,
+                                                               private bounded pool if None
+            dtype (Any): float dtype of snapshots, np.float32 halves their size
+                         within the precision error bounds
+            max_pooled_agents (Optional[int]): maximum number of agents removed on reset
+                                               kept for reuse, unbounded if None
+
+        Raises:
+            ValueError: if dtype is not one of FLOAT_DTYPES
         """
+        self._dtype = get_float_dtype(dtype)
+        self._max_pooled_agents = max_pooled_agents
+        # agents removed on reset with name as key in least recently removed order,
+        # with the number of agent states added to them
+        self._agent_pool = OrderedDict()
+        # add_agent_state arguments in order, and set_geometry_update_rate arguments
+        # if set, to configure agents added on reset the same way
+        self._agent_states = []
+        self._geometry_update_rate = None
         self._deepracer_env = deepracer_env
-        self._track_geometry = TrackGeometry(DEFAULT_TRACK)
+        if track_geometry_pool is None:
+            track_geometry_pool = TrackGeometryPool()
+        self._track_geometry_pool = track_geometry_pool
         self._track_config = self._deepracer_env.get_track()
         self._track = Track()
+        # additional track level states, such as multi-agent proximity
+        self._track_states = CompositeState()
+        # agents in env order with name as key, and agent index with name as key
+        self._agents = {name: Agent(name) for name in self._get_env_agent_names()}
+        self._agent_indices = {name: index for index, name in enumerate(self._agents)}
+        self._deepracer_env.register(self)
+
+    def _get_env_agent_names(self) -> Tuple[str, ...]:
+        """
+        Return the names of the current agents of the env in env order
+
+        Returns:
+            Tuple[str, ...]: agent names
+        """
         # TODO: deepracer_env.get_agent is return single agent now.
         # After supporting multi-agent and return list, we do not need
         # list conversion anymore.
-        agents = deepracer_env.get_agent()
+        agents = self._deepracer_env.get_agent()
         agents = [agents] if not isinstance(agents, list) else agents
-        self._agents = {Agent(agent.name) for agent in agents}
-        self._deepracer_env.register(self)
+        return tuple(agent.name for agent in agents)
 
     def on_step(self, env: DeepRacerEnv, step_result: UDEStepResult) -> None:
         """
@@ -62,9 +128,11 @@ class DeepRacerEnvState(DeepRacerEnvObserverInterface):
             step_result (UDEStepResult): step result (obs, reward, done, last action, info)
         """
         _, _, done, action, info = step_result
-        deepracer_env_data = DeepRacerEnvData(done, action, info, self._track_geometry)
-        [agent.update(deepracer_env_data) for agent in self._agents]
+        deepracer_env_data = DeepRacerEnvData(done, action, info, self._track_geometry,
+                                              agent_names=self.agent_names)
+        [agent.update(deepracer_env_data) for agent in self._agents.values()]
         self._track.update(deepracer_env_data)
+        self._track_states.update(deepracer_env_data)
 
     def on_reset(self, env: DeepRacerEnv, reset_result: UDEResetResult) -> None:
         """
@@ -76,11 +144,170 @@ class DeepRacerEnvState(DeepRacerEnvObserverInterface):
         """
         track_config = self._deepracer_env.get_track()
         if not self._track_config == track_config:
-            self._track_geometry = TrackGeometry(
-                track_name=track_config.name,
-                finish_line=track_config.finish_line,
-                direction=track_config.direction)
+            self._track_geometry = self._track_geometry_pool.get(track_config)
         self._track_config = track_config
+        agent_names = self._get_env_agent_names()
+        if agent_names != self.agent_names:
+            self._reconcile_agents(agent_names)
+
+    def _reconcile_agents(self, agent_names: Tuple[str, ...]) -> None:
+        """
+        Update the agents to the given agent set
+
+        Removed agents are kept in the agent pool and reused when an agent
+        with the same name is added again, as agent states keep the agent
+        name they are built with. Reused agents are not reset, like agents
+        kept across resets, and new agent states and the geometry update
+        rate are applied to them.
+
+        Args:
+            agent_names (Tuple[str, ...]): agent names in env order
+        """
+        for name in self._agents:
+            if name not in agent_names:
+                self._agent_pool[name] = (self._agents[name], len(self._agent_states))
+        self._agents = {name: self._agents[name] if name in self._agents
+                        else self._acquire_agent(name)
+                        for name in agent_names}
+        self._agent_indices = {name: index for index, name in enumerate(self._agents)}
+        # evict after reusing, so that agents coming back are never evicted
+        if self._max_pooled_agents is not None:
+            while len(self._agent_pool) > self._max_pooled_agents:
+                self._agent_pool.popitem(last=False)
+
+    def _acquire_agent(self, name: str) -> Agent:
+        """
+        Return the pooled agent of a name or a new agent, with every agent state
+
+        Args:
+            name (str): agent name
+
+        Returns:
+            Agent: Agent class instance
+        """
+        agent, num_agent_states = self._agent_pool.pop(name, (None, 0))
+        if agent is None:
+            agent = Agent(name)
+        for state_name, build, depends_on, update_every in \
+                self._agent_states[num_agent_states:]:
+            agent.add(state_name, build(agent), depends_on, update_every)
+        if self._geometry_update_rate is not None:
+            agent.status.set_geometry_update_rate(*self._geometry_update_rate)
+        return agent
+
+    @property
+    def pooled_agent_names(self) -> Tuple[str, ...]:
+        """
+        Return names of the agents kept for reuse in least recently removed order
+
+        Returns:
+            Tuple[str, ...]: agent names
+        """
+        return tuple(self._agent_pool)
+
+    def preload_tracks(self, track_configs: Iterable[Any]) -> None:
+        """
+        Start building the track geometry of upcoming tracks in the background
+
+        on_reset then only swaps in the ready track geometry when the env
+        switches to one of the preloaded tracks.
+
+        Args:
+            track_configs (Iterable[Any]): upcoming track configs
+        """
+        self._track_geometry_pool.preload(track_configs)
+
+    def add_agent_state(self, name: Any, build: Callable[[Agent], StateInterface],
+                        depends_on: Iterable[Any] = tuple(),
+                        update_every: Optional[int] = 1) -> None:
+        """
+        Add a state to every agent updated after the existing agent states
+
+        Fields of the agent state are added to the agent in to_dict.
+
+        Args:
+            name (Any): agent state name such as AgentStates member
+            build (Callable[[Agent], StateInterface]): function building the state of an agent
+            depends_on (Iterable[Any]): names of the agent states read by the state
+            update_every (Optional[int]): update the state every update_every steps,
+                                          on demand if None
+        """
+        if name not in [state_name for state_name, _, _, _ in self._agent_states]:
+            self._agent_states.append((name, build, tuple(depends_on), update_every))
+        [agent.add(name, build(agent), depends_on, update_every)
+         for agent in self._agents.values()]
+
+    def set_geometry_update_rate(self, update_every: Optional[int] = 1,
+                                 update_distance: Optional[float] = None) -> None:
+        """
+        Set how often the Status geometric fields of every agent are updated
+
+        steps, done, is_offtrack and progress stay updated on every step, and
+        Status.geometry_age and Status.geometry_distance tell how stale the
+        geometric fields are.
+
+        Args:
+            update_every (Optional[int]): update every update_every steps,
+                                          only by distance if None
+            update_distance (Optional[float]): update once the front of car moved more
+                                               than this distance in meters, not by
+                                               distance if None
+        """
+        self._geometry_update_rate = (update_every, update_distance)
+        [agent.status.set_geometry_update_rate(update_every, update_distance)
+         for agent in self._agents.values()]
+
+    def set_racing_line(self, track_name: str, racing_line: Optional[RacingLine],
+                        direction: TrackDirection = TrackDirection.COUNTER_CLOCKWISE) -> None:
+        """
+        Set the racing line of a track direction and report it for every agent
+
+        The first line set adds RacingLineStatus to every agent as
+        AgentStates.RACING_LINE, which reads the line of the current track
+        and direction from the Track on every step.
+
+        Args:
+            track_name (str): track name
+            racing_line (Optional[RacingLine]): racing line following the direction,
+                                                removes the line if None
+            direction (TrackDirection): track direction the line is raced in
+        """
+        self._track.set_racing_line(track_name, racing_line, direction)
+        if racing_line is not None and AgentStates.RACING_LINE not in \
+                [state_name for state_name, _, _, _ in self._agent_states]:
+            self.add_agent_state(AgentStates.RACING_LINE,
+                                 lambda agent: RacingLineStatus(agent.name, self._track))
+
+    def add_track_state(self, name: Any, state: StateInterface,
+                        depends_on: Iterable[Any] = tuple(),
+                        update_every: Optional[int] = 1) -> None:
+        """
+        Add a track level state updated after the agents and track
+
+        Fields of the track level state are added to to_dict at top level.
+
+        Args:
+            name (Any): track state name such as TrackStates member
+            state (StateInterface): state implementing StateInterface
+            depends_on (Iterable[Any]): names of the track level states read by the state
+            update_every (Optional[int]): update the state every update_every steps,
+                                          on demand if None
+        """
+        self._track_states.add(name, state, depends_on, update_every)
+
+    def get_track_state(self, name: Any) -> StateInterface:
+        """
+        Return a track level state
+
+        The returned state is updated in place on every step.
+
+        Args:
+            name (Any): track state name such as TrackStates member
+
+        Returns:
+            StateInterface: state implementing StateInterface
+        """
+        return self._track_states.get(name)
 
     @property
     def track(self) -> Track:
@@ -100,16 +327,290 @@ class DeepRacerEnvState(DeepRacerEnvObserverInterface):
         Returns:
             Dict[str, Agent]: dict with key as agent name and value as Agent class instance
         """
-        return {agent.name: copy.deepcopy(agent) for agent in self._agents}
+        return {name: copy.deepcopy(agent) for name, agent in self._agents.items()}
 
-    def to_dict(self) -> Dict[str, Any]:
+    def snapshot_agents(self) -> Dict[str, AgentSnapshot]:
+        """
+        Return compact snapshots of agents state
+
+        Unlike agents, the snapshots share the track geometry by reference and
+        only capture the Action, Pose and Status scalars, which makes them
+        cheap to keep for every step.
+
+        Returns:
+            Dict[str, AgentSnapshot]: dict with key as agent name and value as
+                                      AgentSnapshot class instance
+        """
+        return {name: agent.snapshot(self._dtype) for name, agent in self._agents.items()}
+
+    def snapshot(self) -> "DeepRacerEnvStateSnapshot":
+        """
+        Return a compact snapshot of the mutable agents state to branch from
+
+        The snapshot packs the Action, Pose and Status of every agent into a
+        single buffer and references the track geometry by track key, so it
+        can be taken on every step and restored in microseconds. Additional
+        agent and track level states, such as EpisodeStats or Proximity, are
+        not captured.
+
+        Returns:
+            DeepRacerEnvStateSnapshot: DeepRacerEnvStateSnapshot class instance
+        """
+        values = []
+        [values.extend(agent.snapshot_values()) for agent in self._agents.values()]
+        return DeepRacerEnvStateSnapshot(self._track_config, self.agent_names, values,
+                                         self._dtype)
+
+    def restore(self, snapshot: "DeepRacerEnvStateSnapshot") -> None:
+        """
+        Restore the agents state and the track from a snapshot
+
+        The track geometry is only looked up from the track geometry pool
+        when the snapshot was taken on a different track. The env itself is
+        not reset, so the caller is responsible for putting the simulation
+        back into the same state.
+
+        Args:
+            snapshot (DeepRacerEnvStateSnapshot): snapshot returned by snapshot
+
+        Raises:
+            ValueError: if the snapshot agents differ from the env state agents
+        """
+        if snapshot.agent_names != self.agent_names:
+            raise ValueError("[DeepRacerEnvState]: snapshot agents {} do not match {}".format(
+                snapshot.agent_names, self.agent_names))
+        if snapshot.track_key != TrackGeometryPool.get_key(self._track_config):
+            self._track_geometry = self._track_geometry_pool.get(snapshot.track_config)
+            self._track.update(DeepRacerEnvData(dict(), dict(), dict(), self._track_geometry))
+        self._track_config = snapshot.track_config
+        values = snapshot.values
+        size = Agent.SNAPSHOT_SIZE
+        for index, agent in enumerate(self._agents.values()):
+            agent.restore_values(values[index * size:(index + 1) * size], self._track_geometry)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        Return float dtype of snapshots
+
+        Returns:
+            np.dtype: one of FLOAT_DTYPES
+        """
+        return self._dtype
+
+    @property
+    def agent_names(self) -> Tuple[str, ...]:
+        """
+        Return agent names in agent index order
+
+        Returns:
+            Tuple[str, ...]: agent names in agent index order
+        """
+        return tuple(self._agents)
+
+    def get_agent_index(self, name: str) -> int:
+        """
+        Return the stable agent index used by batched array state
+
+        Args:
+            name (str): agent name
+
+        Returns:
+            int: agent index
+        """
+        return self._agent_indices[name]
+
+    def get_agent(self, name: str) -> Agent:
+        """
+        Return agent state of one agent
+
+        Args:
+            name (str): agent name
+
+        Returns:
+            Agent: Agent class instance
+        """
+        return copy.deepcopy(self._agents[name])
+
+    def compile_fields(self, fields: Iterable[str]) -> FieldPlan:
+        """
+        Compile a field selection into the minimal evaluation plan for to_dict
+
+        Agent fields are resolved against the agent states and the remaining
+        fields against the track state.
+
+        Args:
+            fields (Iterable[str]): agent and/or track field names to select
+
+        Returns:
+            FieldPlan: compiled field selection
+
+        Raises:
+            ValueError: if any field is neither an agent nor a track field
+        """
+        fields = set(fields)
+        # all agents share the same states, so any agent can compile the plan
+        agent = next(iter(self._agents.values()), None)
+        agent_fields = fields.intersection(agent.fields) if agent else set()
+        agent_plan = agent.compile_fields(agent_fields) if agent else dict()
+        track_fields = tuple(field for field in self._track.fields if field in fields)
+        track_state_fields = fields.intersection(self._track_states.fields)
+        track_state_plan = self._track_states.compile_fields(track_state_fields)
+        unknown = fields.difference(agent_fields, track_fields, track_state_fields)
+        if unknown:
+            raise ValueError("[DeepRacerEnvState]: unknown field(s) {}".format(
+                sorted(unknown)))
+        return FieldPlan(agent_plan, track_fields, track_state_plan)
+
+    def profile_fields(self, repeat: int = 10) -> Dict[str, float]:
+        """
+        Return the evaluation cost profile of every to_dict field
+
+        Agent field costs are summed over all agents, which is what to_dict
+        pays for selecting the field.
+
+        Args:
+            repeat (int): number of evaluations averaged per field
+
+        Returns:
+            Dict[str, float]: mean evaluation time in seconds with field name as key
+        """
+        costs = dict()
+        for agent in self._agents.values():
+            for name, selected in agent.compile_fields(agent.fields).items():
+                for field, cost in profile_field_costs(agent.get(name), selected,
+                                                       repeat).items():
+                    costs[field] = costs.get(field, 0.0) + cost
+        costs.update(profile_field_costs(self._track, self._track.fields, repeat))
+        for name, selected in self._track_states.compile_fields(self._track_states.fields).items():
+            costs.update(profile_field_costs(self._track_states.get(name), selected, repeat))
+        return costs
+
+    def to_dict(self, fields: Optional[Union[Iterable[str], FieldPlan]] = None) -> Dict[str, Any]:
         """
         Return DeepRacerEnvState class instance in dict format
 
+        Args:
+            fields (Optional[Union[Iterable[str], FieldPlan]]): field names or compiled
+                                                                 plan to select,
+                                                                 all fields if None
+
         Returns:
             Dict[str, Any]: DeepRacerEnvState class instance in dict format
         """
         env_dict = {}
-        env_dict.update({agent.name: agent.to_dict() for agent in self._agents})
-        env_dict.update(self._track.to_dict())
+        if fields is None:
+            env_dict.update({name: agent.to_dict() for name, agent in self._agents.items()})
+            env_dict.update(self._track.to_dict())
+            env_dict.update(self._track_states.to_dict())
+            return env_dict
+        plan = fields if isinstance(fields, FieldPlan) else self.compile_fields(fields)
+        if plan.agent_plan:
+            env_dict.update({name: agent.evaluate(plan.agent_plan)
+                             for name, agent in self._agents.items()})
+        env_dict.update(self._track.select(plan.track_fields))
+        env_dict.update(self._track_states.evaluate(plan.track_state_plan))
         return env_dict
+
+
+class DeepRacerEnvStateSnapshot(object):
+    """
+    DeepRacerEnvStateSnapshot class
+
+    Compact immutable copy of the Action, Pose and Status of every agent,
+    packed as doubles or floats in agent index order. The track geometry is
+    referenced by track config and key instead of being copied.
+    """
+    __slots__ = ("_track_config", "_track_key", "_agent_names", "_values", "_dtype")
+
+    def __init__(self, track_config: Any, agent_names: Tuple[str, ...],
+                 values: Sequence[float], dtype: Any = np.float64):
+        """
+        Initialize DeepRacerEnvStateSnapshot
+
+        Args:
+            track_config (Any): track config the snapshot was taken on
+            agent_names (Tuple[str, ...]): agent names in agent index order
+            values (Sequence[float]): Agent snapshot values of every agent in agent index order
+            dtype (Any): float dtype the values are packed with, one of FLOAT_DTYPES
+        """
+        self._track_config = track_config
+        self._track_key = TrackGeometryPool.get_key(track_config)
+        self._agent_names = tuple(agent_names)
+        self._dtype = get_float_dtype(dtype)
+        self._values = struct.pack("<{}{}".format(len(values), self._dtype.char), *values)
+
+    @property
+    def track_config(self) -> Any:
+        """
+        Return track config the snapshot was taken on
+
+        Returns:
+            Any: track config
+        """
+        return self._track_config
+
+    @property
+    def track_key(self) -> Hashable:
+        """
+        Return track geometry pool key of the track config
+
+        Returns:
+            Hashable: track geometry pool key
+        """
+        return self._track_key
+
+    @property
+    def agent_names(self) -> Tuple[str, ...]:
+        """
+        Return agent names in agent index order
+
+        Returns:
+            Tuple[str, ...]: agent names in agent index order
+        """
+        return self._agent_names
+
+    @property
+    def values(self) -> Tuple[float, ...]:
+        """
+        Return Agent snapshot values of every agent in agent index order
+
+        Returns:
+            Tuple[float, ...]: snapshot values
+        """
+        return struct.unpack("<{}{}".format(len(self._values) // self._dtype.itemsize,
+                                            self._dtype.char), self._values)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        Return float dtype the values are packed with
+
+        Returns:
+            np.dtype: one of FLOAT_DTYPES
+        """
+        return self._dtype
+
+    def get_agent_values(self, name: str) -> Tuple[float, ...]:
+        """
+        Return Agent snapshot values of one agent
+
+        Args:
+            name (str): agent name
+
+        Returns:
+            Tuple[float, ...]: Agent.SNAPSHOT_SIZE values
+        """
+        size = Agent.SNAPSHOT_SIZE
+        index = self._agent_names.index(name)
+        return self.values[index * size:(index + 1) * size]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """
+        Return pickle state
+
+        Returns:
+            Tuple[Any, ...]: class and init arguments
+        """
+        return DeepRacerEnvStateSnapshot, (self._track_config, self._agent_names, self.values,
+                                           self._dtype)
@@ -0,0 +1,125 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for compiled field selection plan"""
+import time
+
+from typing import Dict, Any, Tuple, Iterable, Optional
+from deepracer_env_state.state_interface import StateInterface
+
+
+class FieldPlan(object):
+    """
+    FieldPlan class
+
+    Compiled field selection of DeepRacerEnvState.to_dict. The plan lists
+    only the states and properties needed for the selection, so it can be
+    compiled once and reused on every step.
+    """
+    def __init__(self,
+                 agent_plan: Dict[Any, Tuple[str, ...]],
+                 track_fields: Tuple[str, ...],
+                 track_state_plan: Optional[Dict[Any, Tuple[str, ...]]] = None):
+        """
+        Initialize FieldPlan
+
+        Args:
+            agent_plan (Dict[Any, Tuple[str, ...]]): selected agent field names
+                                                     with agent state name as key
+            track_fields (Tuple[str, ...]): selected track field names
+            track_state_plan (Optional[Dict[Any, Tuple[str, ...]]]): selected additional
+                                                                     track state field names
+                                                                     with track state name
+                                                                     as key
+        """
+        self._agent_plan = agent_plan
+        self._track_fields = track_fields
+        self._track_state_plan = track_state_plan or dict()
+
+    @property
+    def agent_plan(self) -> Dict[Any, Tuple[str, ...]]:
+        """
+        Return selected agent field names with agent state name as key
+
+        Returns:
+            Dict[Any, Tuple[str, ...]]: selected agent field names with agent state name as key
+        """
+        return self._agent_plan
+
+    @property
+    def track_fields(self) -> Tuple[str, ...]:
+        """
+        Return selected track field names
+
+        Returns:
+            Tuple[str, ...]: selected track field names
+        """
+        return self._track_fields
+
+    @property
+    def track_state_plan(self) -> Dict[Any, Tuple[str, ...]]:
+        """
+        Return selected additional track state field names with track state name as key
+
+        Returns:
+            Dict[Any, Tuple[str, ...]]: selected track state field names with
+                                        track state name as key
+        """
+        return self._track_state_plan
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return all selected field names
+
+        Returns:
+            Tuple[str, ...]: all selected field names
+        """
+        agent_fields = tuple(field for selected in self._agent_plan.values()
+                             for field in selected)
+        track_state_fields = tuple(field for selected in self._track_state_plan.values()
+                                   for field in selected)
+        return agent_fields + self._track_fields + track_state_fields
+
+
+def profile_field_costs(state: StateInterface,
+                        fields: Iterable[str],
+                        repeat: int = 10) -> Dict[str, float]:
+    """
+    Measure the evaluation cost of each field of a state
+
+    The state cache is cleared before every evaluation, so that the cost is
+    the one of the first evaluation after an update rather than of a
+    memoized value.
+
+    Args:
+        state (StateInterface): state implementing StateInterface
+        fields (Iterable[str]): field names of the state to measure
+        repeat (int): number of evaluations averaged per field
+
+    Returns:
+        Dict[str, float]: mean evaluation time in seconds with field name as key
+    """
+    costs = dict()
+    for field in fields:
+        cost = 0.0
+        for _ in range(repeat):
+            state.clear_cache()
+            start = time.perf_counter()
+            getattr(state, field)
+            cost += time.perf_counter() - start
+        costs[field] = cost / repeat
+    state.clear_cache()
+    return costs
@@ -0,0 +1,127 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""Shared registry of class member instrumentation
+
+StateProfiler, MemoryProfiler and StateTracer instrument class members by
+replacing them on the class. They install their wrappers through this
+registry, which chains the wrappers of every tool on a member in install
+order and rebuilds the chain when a tool removes its own, so that the tools
+can be enabled and disabled in any order.
+"""
+import threading
+
+from typing import Any, Callable, Iterable, Tuple
+
+# wrappers of each class member in install order as (owner, wrap) pairs,
+# with (cls, member) as key
+_LAYERS = dict()
+# class member before instrumentation, None if inherited, with (cls, member) as key
+_ORIGINALS = dict()
+_LOCK = threading.RLock()
+
+
+def install(owner: Any, targets: Iterable[Tuple[type, str, Callable[[Any], Any]]]) -> None:
+    """
+    Install wrappers on class members on top of the wrappers of other owners
+
+    Args:
+        owner (Any): instance installing the wrappers, such as a StateProfiler
+        targets (Iterable[Tuple[type, str, Callable[[Any], Any]]]): class, member name,
+                                                                   which may be inherited,
+                                                                   and function returning
+                                                                   the wrapped member
+    """
+    with _LOCK:
+        for cls, member, wrap in targets:
+            key = (cls, member)
+            if key not in _LAYERS:
+                _ORIGINALS[key] = vars(cls).get(member)
+                _LAYERS[key] = []
+            _LAYERS[key].append((owner, wrap))
+        _rebuild()
+
+
+def uninstall(owner: Any) -> None:
+    """
+    Remove every wrapper of an owner and keep the wrappers of other owners
+
+    Args:
+        owner (Any): instance which installed the wrappers
+    """
+    with _LOCK:
+        for key, layers in _LAYERS.items():
+            _LAYERS[key] = [layer for layer in layers if layer[0] is not owner]
+        _rebuild()
+
+
+def is_installed(owner: Any) -> bool:
+    """
+    Return whether an owner has wrappers installed
+
+    Args:
+        owner (Any): instance installing wrappers
+
+    Returns:
+        bool: True if any wrapper of the owner is installed and False otherwise
+    """
+    with _LOCK:
+        return any(layer[0] is owner for layers in _LAYERS.values() for layer in layers)
+
+
+def _get_inherited(cls: type, member: str) -> Any:
+    """
+    Return the member a class inherits from its nearest base class defining it
+
+    Args:
+        cls (type): class
+        member (str): member name
+
+    Returns:
+        Any: member as defined in the base class
+
+    Raises:
+        AttributeError: if no base class defines the member
+    """
+    for base in cls.__mro__[1:]:
+        if member in vars(base):
+            return vars(base)[member]
+    raise AttributeError("[instrumentation]: {} has no member {}".format(
+        cls.__name__, member))
+
+
+def _rebuild() -> None:
+    """
+    Restore every class member and install the wrapper chains again
+
+    Base classes are instrumented before their subclasses, so that wrappers
+    of an inherited member wrap the instrumented member of the base class.
+    Members without wrappers are left restored and forgotten.
+    """
+    for (cls, member), original in _ORIGINALS.items():
+        if original is not None:
+            setattr(cls, member, original)
+        elif member in vars(cls):
+            delattr(cls, member)
+    for key in [key for key, layers in _LAYERS.items() if not layers]:
+        del _LAYERS[key]
+        del _ORIGINALS[key]
+    for cls, member in sorted(_LAYERS, key=lambda key: len(key[0].__mro__)):
+        value = _ORIGINALS[(cls, member)]
+        if value is None:
+            value = _get_inherited(cls, member)
+        for _, wrap in _LAYERS[(cls, member)]:
+            value = wrap(value)
+        setattr(cls, member, value)
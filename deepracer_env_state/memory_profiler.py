@@ -0,0 +1,393 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for state component memory profiler"""
+import enum
+import functools
+import gc
+import logging
+import sys
+import tracemalloc
+import types
+
+from typing import Dict, Any, Callable, Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+from deepracer_env_state import instrumentation
+from deepracer_env_state.composite_state import CompositeState
+from deepracer_env_state.state_interface import StateInterface
+from deepracer_env_state.deepracer_env_state import DeepRacerEnvState
+from deepracer_env_state.track import (
+    birds_eye_view,
+    polyline,
+    profile,
+    ray_cast,
+    road)
+from deepracer_track_geometry import TrackGeometry
+
+# number of allocation sites reported by default
+DEFAULT_TOP_ALLOCATIONS = 10
+
+# objects which are not owned by a state, track geometries are counted separately
+_UNSIZED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                  types.MethodType, enum.Enum, TrackGeometry)
+
+
+def _get_caches() -> Dict[str, Any]:
+    """
+    Return the per track geometry caches with cache name as key
+
+    Returns:
+        Dict[str, Any]: WeakKeyDictionary with track geometry as key
+    """
+    return {"track_polylines": polyline._TRACK_POLYLINES,
+            "road_edge_indices": road._ROAD_EDGE_INDICES,
+            "track_profiles": profile._TRACK_PROFILES,
+            "border_segments": ray_cast._BORDER_SEGMENTS,
+            "track_rasters": birds_eye_view._TRACK_RASTERS}
+
+
+def get_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Return the number of bytes held by an object and everything it references
+
+    Objects already in seen are not counted again, and ids of the counted
+    objects are added to seen, so that a seen set shared over several calls
+    counts every object once. Classes, modules, functions, enum members and
+    track geometries are not counted.
+
+    Args:
+        obj (Any): object to measure
+        seen (Optional[Set[int]]): ids of objects already counted
+
+    Returns:
+        int: number of bytes
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _UNSIZED_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, np.ndarray):
+            # a view does not own its data, which is held by its base
+            if obj.base is not None:
+                stack.append(obj.base)
+        else:
+            if hasattr(obj, "__dict__"):
+                stack.append(vars(obj))
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", tuple()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return size
+
+
+def get_components(env_state: DeepRacerEnvState) -> List[Tuple[str, StateInterface]]:
+    """
+    Return the states of an environment state with dotted component name
+
+    Agents kept in the agent pool for reuse are included. States of a
+    CompositeState come before the CompositeState itself.
+
+    Args:
+        env_state (DeepRacerEnvState): DeepRacerEnvState class instance
+
+    Returns:
+        List[Tuple[str, StateInterface]]: (component name, state) pairs
+    """
+    def get_name(name: Any) -> str:
+        return str(name.value if isinstance(name, enum.Enum) else name)
+
+    def walk(name: str, state: StateInterface) -> Iterable[Tuple[str, StateInterface]]:
+        if isinstance(state, CompositeState):
+            for child_name, child in state._states.items():
+                yield from walk("{}.{}".format(name, get_name(child_name)), child)
+        yield name, state
+
+    components = []
+    for agent_name, agent in env_state._agents.items():
+        components.extend(walk("agents.{}".format(agent_name), agent))
+    for agent_name, (agent, _) in env_state._agent_pool.items():
+        components.extend(walk("agent_pool.{}".format(agent_name), agent))
+    components.extend(walk("track", env_state._track))
+    components.extend(walk("track_states", env_state._track_states))
+    return components
+
+
+def get_component_sizes(env_state: DeepRacerEnvState) -> Dict[str, int]:
+    """
+    Return the number of bytes held by each state of an environment state
+
+    Objects in the _shared_attributes of the states, such as center lines and
+    racing lines, are counted once under the shared key. Every other object is
+    counted for the first state reaching it, so a CompositeState only counts
+    what its states do not hold, like pending DeepRacerEnvData.
+
+    Args:
+        env_state (DeepRacerEnvState): DeepRacerEnvState class instance
+
+    Returns:
+        Dict[str, int]: number of bytes with component name as key
+    """
+    components = get_components(env_state)
+    seen = set()
+    shared = [state.__dict__.get(name) for _, state in components
+              for name in state._shared_attributes]
+    sizes = {"shared": sum(get_size(value, seen) for value in shared)}
+    for name, state in components:
+        sizes[name] = get_size(state, seen)
+    return sizes
+
+
+def get_cache_sizes() -> Dict[str, Dict[str, int]]:
+    """
+    Return the number of entries and bytes of the per track geometry caches
+
+    Returns:
+        Dict[str, Dict[str, int]]: entries and bytes with cache name as key
+    """
+    cache_sizes = dict()
+    for name, cache in _get_caches().items():
+        values = list(cache.values())
+        seen = set()
+        cache_sizes[name] = {"entries": len(values),
+                             "bytes": sum(get_size(value, seen) for value in values)}
+    return cache_sizes
+
+
+def get_live_track_geometries() -> Dict[str, int]:
+    """
+    Return the number of live TrackGeometry instances per track name
+
+    More than one instance of a track means the track geometry is built again
+    instead of being shared, e.g. outside of a TrackGeometryPool.
+
+    Returns:
+        Dict[str, int]: number of instances with track name as key
+    """
+    counts = dict()
+    for obj in gc.get_objects():
+        if isinstance(obj, TrackGeometry):
+            track_name = str(getattr(obj, "track_name", None))
+            counts[track_name] = counts.get(track_name, 0) + 1
+    return counts
+
+
+class MemoryProfiler(object):
+    """
+    MemoryProfiler class
+
+    Records the memory allocated by every DeepRacerEnvState.on_step with
+    tracemalloc and reports the bytes held by each state, the live track
+    geometries and the per track geometry caches. Like StateProfiler,
+    on_step is only wrapped through the shared instrumentation registry
+    while the profiler is enabled, and tracemalloc is started on enable and
+    stopped on disable unless it was already tracing.
+    The report can be passed to a dump callback every dump_every steps to
+    catch memory growth of long running jobs.
+    """
+    def __init__(self, dump_every: Optional[int] = None,
+                 dump: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 top_allocations: int = DEFAULT_TOP_ALLOCATIONS,
+                 traceback_limit: int = 1):
+        """
+        Initialize MemoryProfiler
+
+        Args:
+            dump_every (Optional[int]): call dump with the report every dump_every steps,
+                                        never if None
+            dump (Optional[Callable[[Dict[str, Any]], None]]): report callback,
+                                                                logs the report if None
+            top_allocations (int): number of allocation sites with the largest
+                                   growth since the previous report
+            traceback_limit (int): number of frames stored by tracemalloc per allocation
+
+        Raises:
+            ValueError: if dump_every is less than 1
+        """
+        if dump_every is not None and dump_every < 1:
+            raise ValueError("[MemoryProfiler]: dump_every must be at least 1 "
+                             "or None, got {}".format(dump_every))
+        self._dump_every = dump_every
+        self._dump = dump or self._log
+        self._top_allocations = top_allocations
+        self._traceback_limit = traceback_limit
+        self._is_tracing_started = False
+        self._snapshot = None
+        self.reset()
+
+    @property
+    def is_enabled(self) -> bool:
+        """
+        Return whether the profiler is enabled
+
+        Returns:
+            bool: True if on_step is instrumented and False otherwise
+        """
+        return instrumentation.is_installed(self)
+
+    @property
+    def step_count(self) -> int:
+        """
+        Return number of recorded steps
+
+        Returns:
+            int: number of recorded steps
+        """
+        return self._step_count
+
+    def enable(self) -> None:
+        """
+        Start tracemalloc and install instrumentation on DeepRacerEnvState.on_step
+        """
+        if self.is_enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._traceback_limit)
+            self._is_tracing_started = True
+        self._snapshot = None
+        instrumentation.install(self, [(DeepRacerEnvState, "on_step", self._wrap)])
+
+    def disable(self) -> None:
+        """
+        Remove the on_step instrumentation and stop tracemalloc if started by enable
+        """
+        if not self.is_enabled:
+            return
+        instrumentation.uninstall(self)
+        self._snapshot = None
+        if self._is_tracing_started:
+            tracemalloc.stop()
+            self._is_tracing_started = False
+
+    def reset(self) -> None:
+        """
+        Clear all recorded step allocations
+        """
+        self._step_count = 0
+        self._last_step_bytes = 0
+        self._total_step_bytes = 0
+        self._max_step_bytes = 0
+
+    def _wrap(self, on_step: Callable) -> Callable:
+        """
+        Return the measured version of on_step
+
+        Args:
+            on_step (Callable): original on_step
+
+        Returns:
+            Callable: measured on_step
+        """
+        @functools.wraps(on_step)
+        def measured(env_state, *args, **kwargs):
+            start, _ = tracemalloc.get_traced_memory()
+            try:
+                return on_step(env_state, *args, **kwargs)
+            finally:
+                current, _ = tracemalloc.get_traced_memory()
+                self._record(current - start, env_state)
+        return measured
+
+    def _record(self, step_bytes: int, env_state: DeepRacerEnvState) -> None:
+        """
+        Record the bytes allocated by a step and dump the report if it is due
+
+        Args:
+            step_bytes (int): bytes allocated and not freed during the step
+            env_state (DeepRacerEnvState): DeepRacerEnvState class instance stepped
+        """
+        self._step_count += 1
+        self._last_step_bytes = step_bytes
+        self._total_step_bytes += step_bytes
+        self._max_step_bytes = max(self._max_step_bytes, step_bytes)
+        if self._dump_every is not None and self._step_count % self._dump_every == 0:
+            self._dump(self.report(env_state))
+
+    def _get_top_allocations(self) -> List[Dict[str, Any]]:
+        """
+        Return the allocation sites with the largest growth since the previous call
+
+        Sizes are since tracing started on the first call.
+
+        Returns:
+            List[Dict[str, Any]]: location, size_diff and count_diff of allocation sites
+        """
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),))
+        if self._snapshot is None:
+            statistics = snapshot.statistics("lineno")
+            top_allocations = [{"location": str(statistic.traceback),
+                                "size_diff": statistic.size,
+                                "count_diff": statistic.count}
+                               for statistic in statistics[:self._top_allocations]]
+        else:
+            statistics = snapshot.compare_to(self._snapshot, "lineno")
+            top_allocations = [{"location": str(statistic.traceback),
+                                "size_diff": statistic.size_diff,
+                                "count_diff": statistic.count_diff}
+                               for statistic in statistics[:self._top_allocations]]
+        self._snapshot = snapshot
+        return top_allocations
+
+    def report(self, env_state: Optional[DeepRacerEnvState] = None) -> Dict[str, Any]:
+        """
+        Return the memory report
+
+        Walking the objects is much slower than a step, so the report is
+        meant to be taken every many steps.
+
+        Args:
+            env_state (Optional[DeepRacerEnvState]): env state whose components are
+                                                     reported, no components if None
+
+        Returns:
+            Dict[str, Any]: memory report in dict format
+        """
+        report = {"step_count": self._step_count,
+                  "step_allocations": {
+                      "last": self._last_step_bytes,
+                      "total": self._total_step_bytes,
+                      "max": self._max_step_bytes,
+                      "mean": (self._total_step_bytes / self._step_count
+                               if self._step_count else 0.0)},
+                  "components": (get_component_sizes(env_state)
+                                 if env_state is not None else dict()),
+                  "track_geometries": get_live_track_geometries(),
+                  "caches": get_cache_sizes()}
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            report["traced_memory"] = {"current": current, "peak": peak}
+            report["top_allocations"] = self._get_top_allocations()
+        return report
+
+    @staticmethod
+    def _log(report: Dict[str, Any]) -> None:
+        """
+        Log the memory report
+
+        Args:
+            report (Dict[str, Any]): memory report
+        """
+        logging.info("[MemoryProfiler]: {}".format(report))
@@ -0,0 +1,81 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""Module to contain float precision options of state arrays and exports
+
+State arrays and exports are float64 by default. With float32, values are
+computed in float64 and rounded to float32 when they are stored, which
+halves their memory and bandwidth. The error bounds against the float64
+reference, with u = FLOAT32_RELATIVE_ERROR = 2 ** -24, are:
+
+- Stored values, such as positions, orientations, angles and the distances
+  of evaluate_trajectory: |value| * u. Coordinates of the bundled tracks are
+  below 100 meters, so positions are within 6e-6 meter.
+- Distances evaluated from float32 positions, such as distance_from_center
+  of BatchDeepRacerEnvState: u * (|distance| + norm of the position + 1),
+  because distances to the track lines change by at most the position error.
+- Discrete values, such as closest_waypoints, all_wheels_on_track and
+  is_left_of_center, and track_width, can only differ for points within the
+  position error of a border, a waypoint boundary or the center line.
+- Integers stored as float32, such as steps in snapshots, are exact up to
+  2 ** 24.
+"""
+from typing import Any
+import numpy as np
+
+# supported float dtypes of state arrays and exports
+FLOAT_DTYPES = (np.dtype(np.float64), np.dtype(np.float32))
+
+# largest relative error of rounding a float64 value to float32
+FLOAT32_RELATIVE_ERROR = 2.0 ** -24
+
+
+def get_float_dtype(dtype: Any) -> np.dtype:
+    """
+    Return the float dtype of state arrays and exports
+
+    Args:
+        dtype (Any): np.float64 or np.float32, or anything np.dtype accepts for them
+
+    Returns:
+        np.dtype: one of FLOAT_DTYPES
+
+    Raises:
+        ValueError: if dtype is not one of FLOAT_DTYPES
+    """
+    try:
+        float_dtype = np.dtype(dtype)
+    except (TypeError, ValueError):
+        float_dtype = np.dtype(np.object_)
+    if float_dtype not in FLOAT_DTYPES:
+        raise ValueError("[Precision]: dtype must be one of {}, got {}".format(
+            [str(supported) for supported in FLOAT_DTYPES], dtype))
+    return float_dtype
+
+
+def get_error_bound(reference: Any, dtype: Any = np.float32) -> Any:
+    """
+    Return the largest error of storing reference values with a float dtype
+
+    Args:
+        reference (Any): float64 reference value or array
+        dtype (Any): float dtype, one of FLOAT_DTYPES
+
+    Returns:
+        Any: error bound with the reference shape, 0 for float64
+    """
+    if get_float_dtype(dtype) == np.float64:
+        return np.zeros_like(reference, dtype=np.float64)
+    return np.abs(reference) * FLOAT32_RELATIVE_ERROR
@@ -0,0 +1,302 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for state component profiler"""
+import bisect
+import functools
+import time
+
+from typing import Dict, Any, Callable, Iterable, List, Optional, Sequence, Tuple
+from deepracer_env_state import instrumentation
+from deepracer_env_state.composite_state import CompositeState
+from deepracer_env_state.agent.action import Action
+from deepracer_env_state.agent.episode_stats import EpisodeStats
+from deepracer_env_state.agent.lap_timing import LapTiming
+from deepracer_env_state.agent.pose import Pose
+from deepracer_env_state.agent.racing_line_status import RacingLineStatus
+from deepracer_env_state.agent.status import Status
+from deepracer_env_state.agent.track_features import TrackFeatures
+from deepracer_env_state.track.birds_eye_view import BirdsEyeView
+from deepracer_env_state.track.proximity import Proximity
+from deepracer_env_state.track.ray_cast import RayCast
+from deepracer_env_state.track.track import Track
+from deepracer_env_state.deepracer_env_state import DeepRacerEnvState
+
+# latency histogram bucket upper bounds in seconds
+DEFAULT_LATENCY_BUCKETS = (0.000001, 0.0000025, 0.000005, 0.00001, 0.000025,
+                           0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+                           0.005, 0.01, 0.025, 0.05, 0.1)
+
+# methods instrumented in addition to the properties of a class
+INSTRUMENTED_METHODS = ("update", "to_dict", "select", "on_step", "on_reset")
+
+# properties which are not worth instrumenting
+UNINSTRUMENTED_PROPERTIES = ("fields", "name")
+
+
+class LatencyHistogram(object):
+    """
+    LatencyHistogram class
+    """
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Initialize LatencyHistogram
+
+        Args:
+            buckets (Sequence[float]): sorted bucket upper bounds in seconds
+        """
+        self._buckets = tuple(buckets)
+        self.reset()
+
+    @property
+    def count(self) -> int:
+        """
+        Return number of observations
+
+        Returns:
+            int: number of observations
+        """
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        """
+        Return sum of observed latencies in seconds
+
+        Returns:
+            float: sum of observed latencies
+        """
+        return self._sum
+
+    def reset(self) -> None:
+        """
+        Clear all observations
+        """
+        # last count is for the +Inf bucket
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Record a latency
+
+        Args:
+            seconds (float): latency in seconds
+        """
+        self._counts[bisect.bisect_left(self._buckets, seconds)] += 1
+        self._count += 1
+        self._sum += seconds
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        """
+        Return cumulative bucket counts with Prometheus le label
+
+        Returns:
+            List[Tuple[str, int]]: (le label, cumulative count) pairs ending with +Inf
+        """
+        labels = [repr(bucket) for bucket in self._buckets] + ["+Inf"]
+        cumulative_counts = []
+        total = 0
+        for label, count in zip(labels, self._counts):
+            total += count
+            cumulative_counts.append((label, total))
+        return cumulative_counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return LatencyHistogram class instance in dict format
+
+        Returns:
+            Dict[str, Any]: LatencyHistogram class instance in dict format
+        """
+        return {"count": self._count,
+                "sum": self._sum,
+                "mean": self._sum / self._count if self._count else 0.0,
+                "buckets": dict(self.cumulative_counts())}
+
+
+class StateProfiler(object):
+    """
+    StateProfiler class
+
+    Records call counts and latency histograms of StateInterface updates and
+    derived properties. Every state class of the package is registered by
+    default, and other classes can be added with instrument. Instrumentation
+    wraps the class attributes only while the profiler is enabled and
+    removes the wrappers when it is disabled, so there is no overhead at all
+    when profiling is off. Wrappers are installed through the shared
+    instrumentation registry, so the profiler can be combined with
+    MemoryProfiler and StateTracer. Latency of a property which calls
+    other instrumented properties includes their latency.
+    """
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        """
+        Initialize StateProfiler
+
+        Args:
+            buckets (Sequence[float]): sorted latency bucket upper bounds in seconds
+        """
+        self._buckets = tuple(buckets)
+        self._histograms = dict()
+        self._targets = dict()
+        self.instrument(Action)
+        self.instrument(Pose)
+        self.instrument(Status, extra_members=["_is_wheels_on_track"])
+        self.instrument(EpisodeStats)
+        self.instrument(LapTiming)
+        self.instrument(TrackFeatures)
+        self.instrument(RacingLineStatus)
+        self.instrument(CompositeState)
+        self.instrument(Track)
+        self.instrument(Proximity)
+        self.instrument(RayCast)
+        self.instrument(BirdsEyeView)
+        self.instrument(DeepRacerEnvState)
+
+    @property
+    def is_enabled(self) -> bool:
+        """
+        Return whether the profiler is enabled
+
+        Returns:
+            bool: True if instrumentation is installed and False otherwise
+        """
+        return instrumentation.is_installed(self)
+
+    def instrument(self, cls: type,
+                   members: Optional[Iterable[str]] = None,
+                   extra_members: Optional[Iterable[str]] = None) -> None:
+        """
+        Register class members to instrument
+
+        Args:
+            cls (type): class to instrument
+            members (Optional[Iterable[str]]): member names defined in cls, update/to_dict
+                                               like methods and properties if None
+            extra_members (Optional[Iterable[str]]): member names instrumented in addition
+        """
+        if members is None:
+            members = [name for name, value in vars(cls).items()
+                       if name in INSTRUMENTED_METHODS or
+                       (isinstance(value, property) and
+                        name not in UNINSTRUMENTED_PROPERTIES)]
+        members = list(members) + list(extra_members or [])
+        self._targets.setdefault(cls, [])
+        self._targets[cls].extend(name for name in members
+                                  if name not in self._targets[cls])
+        if self.is_enabled:
+            self.disable()
+            self.enable()
+
+    def enable(self) -> None:
+        """
+        Install instrumentation on every registered class member
+        """
+        if self.is_enabled:
+            return
+        instrumentation.install(self, [
+            (cls, member, functools.partial(self._wrap,
+                                            component="{}.{}".format(cls.__name__, member)))
+            for cls, members in self._targets.items() for member in members])
+
+    def disable(self) -> None:
+        """
+        Remove instrumentation and keep the instrumentation of other tools
+        """
+        instrumentation.uninstall(self)
+
+    def reset(self) -> None:
+        """
+        Clear all recorded histograms
+        """
+        [histogram.reset() for histogram in self._histograms.values()]
+
+    def _wrap(self, original: Any, component: str) -> Any:
+        """
+        Return the timed version of a method or property
+
+        Args:
+            original (Any): original function or property
+            component (str): component name used as histogram key
+
+        Returns:
+            Any: timed function or property
+        """
+        if isinstance(original, property):
+            return property(self._wrap_function(original.fget, component),
+                            original.fset, original.fdel, original.__doc__)
+        return self._wrap_function(original, component)
+
+    def _wrap_function(self, function: Callable, component: str) -> Callable:
+        """
+        Return the timed version of a function
+
+        Args:
+            function (Callable): original function
+            component (str): component name used as histogram key
+
+        Returns:
+            Callable: timed function
+        """
+        histogram = self._histograms.get(component)
+        if histogram is None:
+            histogram = LatencyHistogram(self._buckets)
+            self._histograms[component] = histogram
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+        return timed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return recorded histograms in dict format
+
+        Returns:
+            Dict[str, Any]: histogram dict with component name as key
+        """
+        return {component: histogram.to_dict()
+                for component, histogram in sorted(self._histograms.items())
+                if histogram.count}
+
+    def to_prometheus(self, metric_name: str = "deepracer_env_state_latency_seconds") -> str:
+        """
+        Return recorded histograms in Prometheus text exposition format
+
+        Args:
+            metric_name (str): histogram metric name
+
+        Returns:
+            str: histograms in Prometheus text exposition format
+        """
+        lines = ["# HELP {} Latency of DeepRacer environment state components.".format(
+                     metric_name),
+                 "# TYPE {} histogram".format(metric_name)]
+        for component, histogram in sorted(self._histograms.items()):
+            if not histogram.count:
+                continue
+            for label, count in histogram.cumulative_counts():
+                lines.append('{}_bucket{{component="{}",le="{}"}} {}'.format(
+                    metric_name, component, label, count))
+            lines.append('{}_sum{{component="{}"}} {!r}'.format(
+                metric_name, component, histogram.sum))
+            lines.append('{}_count{{component="{}"}} {}'.format(
+                metric_name, component, histogram.count))
+        return "\n".join(lines) + "\n"
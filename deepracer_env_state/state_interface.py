@@ -15,8 +15,9 @@
 #################################################################################
 """A abstract class for state interface"""
 import abc
+import copy
 
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Tuple
 from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
 
 # Python 2 and 3 compatible Abstract class
@@ -27,6 +28,30 @@ class StateInterface(ABC):
     """
     State Interface
     """
+    # attributes holding immutable objects such as track geometry,
+    # which deepcopy shares by reference instead of copying
+    _shared_attributes = tuple()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "StateInterface":
+        """
+        Return a deep copy sharing the _shared_attributes by reference
+
+        Args:
+            memo (Dict[int, Any]): deepcopy memo
+
+        Returns:
+            StateInterface: deep copy of the state
+        """
+        for name in self._shared_attributes:
+            # read from the instance, so that lazy defaults are not built by copying
+            value = self.__dict__.get(name)
+            memo.setdefault(id(value), value)
+        state = self.__class__.__new__(self.__class__)
+        memo[id(self)] = state
+        for name, value in self.__dict__.items():
+            state.__dict__[name] = copy.deepcopy(value, memo)
+        return state
+
     @abc.abstractmethod
     def update(self, deepracer_env_data: DeepRacerEnvData) -> None:
         """
@@ -38,6 +63,15 @@ class StateInterface(ABC):
         """
         raise NotImplementedError()
 
+    def clear_cache(self) -> None:
+        """
+        Drop the values memoized since the last update
+
+        Properties are recomputed on their next evaluation, as they are on the
+        first evaluation after an update. States without memoized values have
+        nothing to drop.
+        """
+
     @abc.abstractmethod
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -47,3 +81,29 @@ class StateInterface(ABC):
             Dict[str, Any]: internal state as a dict format
         """
         raise NotImplementedError()
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Subclasses should override this to avoid evaluating every field.
+
+        Returns:
+            Tuple[str, ...]: field names in to_dict order
+        """
+        return tuple(self.to_dict().keys())
+
+    def select(self, fields: Iterable[str]) -> Dict[str, Any]:
+        """
+        Return only the given fields as a dict format
+
+        Only the properties backing the requested fields are evaluated.
+
+        Args:
+            fields (Iterable[str]): field names, each one of the fields property
+
+        Returns:
+            Dict[str, Any]: requested internal state as a dict format
+        """
+        return {field: getattr(self, field) for field in fields}
@@ -0,0 +1,222 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for state timeline tracer"""
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+from typing import Dict, Any, Callable, Iterable, List, Optional
+from deepracer_env_state import instrumentation
+from deepracer_env_state.agent.agent import Agent
+from deepracer_env_state.deepracer_env_state import DeepRacerEnvState
+from deepracer_env_state.track.track_geometry_pool import TrackGeometryPool
+
+# default maximum number of retained events
+DEFAULT_CAPACITY = 65536
+
+# category of the Chrome trace events
+TRACE_CATEGORY = "deepracer_env_state"
+
+
+class StateTracer(object):
+    """
+    StateTracer class
+
+    Records a timeline of on_step, on_reset, Agent.update, track geometry
+    construction by TrackGeometryPool and to_dict calls into a ring buffer,
+    which keeps the latest capacity events, and exports it in Chrome trace
+    event format to open in chrome://tracing or Perfetto. Like StateProfiler,
+    instrumentation wraps the class attributes through the shared
+    instrumentation registry only while the tracer is enabled, so there is
+    no overhead at all when tracing is off. Each call is recorded as a single
+    complete event with its begin time and duration, so events dropped by
+    the ring buffer never leave a begin event without its end.
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Initialize StateTracer
+
+        Args:
+            capacity (int): maximum number of retained events
+
+        Raises:
+            ValueError: if capacity is less than 1
+        """
+        if capacity < 1:
+            raise ValueError("[StateTracer]: capacity must be at least 1, got {}".format(
+                capacity))
+        self._events = collections.deque(maxlen=capacity)
+        self._targets = dict()
+        self._labels = dict()
+        self.instrument(DeepRacerEnvState, ["on_step", "on_reset", "to_dict"])
+        self.instrument(Agent, ["update"], label=lambda agent, *args, **kwargs: agent.name)
+        self.instrument(TrackGeometryPool, ["get", "build"],
+                        label=lambda pool, track_config, *args, **kwargs: track_config.name)
+
+    @property
+    def is_enabled(self) -> bool:
+        """
+        Return whether the tracer is enabled
+
+        Returns:
+            bool: True if instrumentation is installed and False otherwise
+        """
+        return instrumentation.is_installed(self)
+
+    @property
+    def capacity(self) -> int:
+        """
+        Return maximum number of retained events
+
+        Returns:
+            int: maximum number of retained events
+        """
+        return self._events.maxlen
+
+    def __len__(self) -> int:
+        """
+        Return number of retained events
+
+        Returns:
+            int: number of retained events
+        """
+        return len(self._events)
+
+    def instrument(self, cls: type, members: Iterable[str],
+                   label: Optional[Callable[..., Any]] = None) -> None:
+        """
+        Register class members to trace
+
+        Args:
+            cls (type): class to instrument
+            members (Iterable[str]): method names of cls, which may be inherited
+            label (Optional[Callable[..., Any]]): function returning the label of a call
+                                                  from the instance and the arguments
+                                                  the method is called with, recorded
+                                                  as event argument
+        """
+        self._targets.setdefault(cls, [])
+        self._targets[cls].extend(name for name in members
+                                  if name not in self._targets[cls])
+        if label is not None:
+            self._labels[cls] = label
+        if self.is_enabled:
+            self.disable()
+            self.enable()
+
+    def enable(self) -> None:
+        """
+        Install instrumentation on every registered class member
+        """
+        if self.is_enabled:
+            return
+        instrumentation.install(self, [
+            (cls, member, functools.partial(self._wrap,
+                                            name="{}.{}".format(cls.__name__, member),
+                                            label=self._labels.get(cls)))
+            for cls, members in self._targets.items() for member in members])
+
+    def disable(self) -> None:
+        """
+        Remove instrumentation and keep the instrumentation of other tools
+        """
+        instrumentation.uninstall(self)
+
+    def reset(self) -> None:
+        """
+        Clear all recorded events
+        """
+        self._events.clear()
+
+    def _wrap(self, function: Callable, name: str,
+              label: Optional[Callable[..., Any]]) -> Callable:
+        """
+        Return the traced version of a method
+
+        Args:
+            function (Callable): original method
+            name (str): event name
+            label (Optional[Callable[..., Any]]): function returning the call label
+
+        Returns:
+            Callable: traced method
+        """
+        events = self._events
+
+        def get_label(instance: Any, *args, **kwargs) -> Optional[str]:
+            if label is None:
+                return None
+            try:
+                return str(label(instance, *args, **kwargs))
+            except Exception:
+                # the label is not available, such as for an uninitialized instance
+                return None
+
+        @functools.wraps(function)
+        def traced(instance, *args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return function(instance, *args, **kwargs)
+            finally:
+                end = time.perf_counter_ns()
+                events.append((name, start, end, threading.get_ident(),
+                               get_label(instance, *args, **kwargs)))
+        return traced
+
+    def get_events(self) -> List[Dict[str, Any]]:
+        """
+        Return retained events in Chrome trace event format in recording order
+
+        Returns:
+            List[Dict[str, Any]]: complete events with time in microseconds
+        """
+        pid = os.getpid()
+        trace_events = []
+        for name, start, end, tid, label in list(self._events):
+            event = {"name": name,
+                     "cat": TRACE_CATEGORY,
+                     "ph": "X",
+                     "ts": start / 1000.0,
+                     "dur": (end - start) / 1000.0,
+                     "pid": pid,
+                     "tid": tid}
+            if label is not None:
+                event["args"] = {"label": label}
+            trace_events.append(event)
+        return trace_events
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Return retained events as a Chrome trace JSON object
+
+        Returns:
+            Dict[str, Any]: Chrome trace JSON object
+        """
+        return {"traceEvents": self.get_events(),
+                "displayTimeUnit": "ms"}
+
+    def save(self, path: str) -> None:
+        """
+        Write retained events to a Chrome trace JSON file
+
+        Args:
+            path (str): file path
+        """
+        with open(path, "w") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
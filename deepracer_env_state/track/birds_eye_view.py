@@ -0,0 +1,433 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for bird's-eye-view occupancy raster state"""
+import math
+import weakref
+import numpy as np
+
+from typing import Dict, Optional, Tuple, Any
+from deepracer_env_state.state_interface import StateInterface
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.agent.constants import (
+    DEEPRACER_LENGTH,
+    DEEPRACER_WIDTH)
+from deepracer_env_state.agent.utils import get_yaws
+from deepracer_env_state.track.polyline import get_track_polylines
+from deepracer_env_state.track.road import (
+    contains,
+    get_road_edge_index)
+from deepracer_track_geometry import TrackGeometry
+
+# channels of the occupancy image
+BEV_CHANNELS = ("track", "border", "agents")
+TRACK_CHANNEL, BORDER_CHANNEL, AGENTS_CHANNEL = range(len(BEV_CHANNELS))
+# default pixel size in meter
+BEV_RESOLUTION = 0.05
+# default egocentric crop width and height in pixels
+BEV_CROP_SIZE = 128
+# margin around the track borders of the track raster in meter
+BEV_MARGIN = 1.0
+# number of pixels rasterized at once
+CHUNK_PIXELS = 1 << 16
+
+
+class TrackRaster(object):
+    """
+    TrackRaster class
+
+    Static track and border channels of a track geometry rasterized once,
+    built and cached per track geometry and resolution by get_track_raster.
+    Row 0 is the top of the image at the largest y and column 0 is at the
+    smallest x. A pixel is track if its center is on the road area and
+    border if its center is within half a pixel diagonal of a border line.
+    """
+    def __init__(self, track_geometry: TrackGeometry, resolution: float = BEV_RESOLUTION):
+        """
+        Initialize TrackRaster
+
+        Args:
+            track_geometry (TrackGeometry): track geometry class instance
+            resolution (float): pixel size in meter
+        """
+        track_polylines = get_track_polylines(track_geometry)
+        borders = (track_polylines.inner_border_line, track_polylines.outer_border_line)
+        coords = np.concatenate([border.coords for border in borders])
+        low = coords.min(axis=0) - BEV_MARGIN
+        high = coords.max(axis=0) + BEV_MARGIN
+        self._resolution = float(resolution)
+        self._left = float(low[0])
+        self._top = float(high[1])
+        self._shape = (int(math.ceil((high[1] - low[1]) / resolution)),
+                       int(math.ceil((high[0] - low[0]) / resolution)))
+        self._image = np.zeros((2,) + self._shape, dtype=np.uint8)
+        edge_index = get_road_edge_index(track_geometry)
+        rows, columns = np.divmod(np.arange(self._shape[0] * self._shape[1]), self._shape[1])
+        for begin in range(0, len(rows), CHUNK_PIXELS):
+            chunk = slice(begin, begin + CHUNK_PIXELS)
+            points = np.c_[self._left + (columns[chunk] + 0.5) * resolution,
+                           self._top - (rows[chunk] + 0.5) * resolution]
+            self._image[TRACK_CHANNEL].flat[chunk] = contains(points, edge_index)
+            distances = np.minimum(*[border.distance(points) for border in borders])
+            self._image[BORDER_CHANNEL].flat[chunk] = distances <= resolution * 0.5 ** 0.5
+        # track bit 0 and border bit 1 of every pixel, then an empty pixel for the outside
+        self._packed = np.zeros(self._shape[0] * self._shape[1] + 1, dtype=np.uint8)
+        self._packed[:-1] = self._image[TRACK_CHANNEL].ravel() | \
+            (self._image[BORDER_CHANNEL].ravel() << 1)
+
+    @property
+    def image(self) -> np.ndarray:
+        """
+        Return the static channels
+
+        Returns:
+            np.ndarray: (2, H, W) uint8 track and border channels, read only by convention
+        """
+        return self._image
+
+    @property
+    def resolution(self) -> float:
+        """
+        Return pixel size
+
+        Returns:
+            float: pixel size in meter
+        """
+        return self._resolution
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        Return image height and width
+
+        Returns:
+            Tuple[int, int]: number of rows and columns
+        """
+        return self._shape
+
+    def get_pixels(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the row and column of the pixels containing points
+
+        Args:
+            x (np.ndarray): point x
+            y (np.ndarray): point y
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: row and column, outside the image
+                                           for points outside the raster
+        """
+        columns = np.floor((x - self._left) / self._resolution).astype(np.int64)
+        rows = np.floor((self._top - y) / self._resolution).astype(np.int64)
+        return rows, columns
+
+    def get_packed(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Return the static channels of the pixels containing points as bits
+
+        Args:
+            x (np.ndarray): point x
+            y (np.ndarray): point y
+
+        Returns:
+            np.ndarray: uint8 with the track channel in bit 0 and the border
+                        channel in bit 1, 0 for points outside the raster
+        """
+        rows, columns = self.get_pixels(x, y)
+        is_inside = (rows >= 0) & (rows < self._shape[0]) & \
+            (columns >= 0) & (columns < self._shape[1])
+        return self._packed[np.where(is_inside, rows * self._shape[1] + columns,
+                                     len(self._packed) - 1)]
+
+    def get_centers(self, rows: np.ndarray, columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the center of pixels
+
+        Args:
+            rows (np.ndarray): pixel row
+            columns (np.ndarray): pixel column
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: pixel center x and y
+        """
+        return (self._left + (columns + 0.5) * self._resolution,
+                self._top - (rows + 0.5) * self._resolution)
+
+
+# track raster per resolution with track geometry as weak key
+_TRACK_RASTERS = weakref.WeakKeyDictionary()
+
+
+def get_track_raster(track_geometry: TrackGeometry,
+                     resolution: float = BEV_RESOLUTION) -> TrackRaster:
+    """
+    Return the track raster of a track geometry, built on first use
+
+    Rasters are cached per track geometry instance and resolution for as
+    long as the instance is alive.
+
+    Args:
+        track_geometry (TrackGeometry): track geometry class instance
+        resolution (float): pixel size in meter
+
+    Returns:
+        TrackRaster: track raster of the track geometry
+    """
+    track_rasters = _TRACK_RASTERS.setdefault(track_geometry, dict())
+    track_raster = track_rasters.get(resolution)
+    if track_raster is None:
+        track_raster = TrackRaster(track_geometry, resolution)
+        track_rasters[resolution] = track_raster
+    return track_raster
+
+
+def _is_in_footprint(x: np.ndarray, y: np.ndarray, car_x: np.ndarray, car_y: np.ndarray,
+                     yaw_cos: np.ndarray, yaw_sin: np.ndarray) -> np.ndarray:
+    """
+    Return whether points are inside the footprint of cars
+
+    Args:
+        x (np.ndarray): point x, broadcast against the car arguments
+        y (np.ndarray): point y, broadcast against the car arguments
+        car_x (np.ndarray): car center x
+        car_y (np.ndarray): car center y
+        yaw_cos (np.ndarray): cosine of car yaw
+        yaw_sin (np.ndarray): sine of car yaw
+
+    Returns:
+        np.ndarray: True if the point is inside the footprint and False otherwise
+    """
+    offset_x = x - car_x
+    offset_y = y - car_y
+    return ((np.abs(offset_x * yaw_cos + offset_y * yaw_sin) <= DEEPRACER_LENGTH / 2.0) &
+            (np.abs(offset_y * yaw_cos - offset_x * yaw_sin) <= DEEPRACER_WIDTH / 2.0))
+
+
+class BirdsEyeView(StateInterface):
+    """
+    BirdsEyeView class
+
+    Top-down occupancy image of the track surface, the borders and the agent
+    footprints. The static channels come from the TrackRaster cached per
+    track geometry, so each step only stamps the footprints into a reused
+    buffer. With crop_size, every agent gets an egocentric crop centered on
+    itself, optionally rotated so that it heads up, whose agents channel
+    holds the other agents. The per-step cost is then bounded by the crop
+    size. Without crop_size, every agent shares the whole track image with
+    all agents stamped, and only the pixels of the last footprints are
+    cleared each step.
+
+    Images are written in place on every step, so copy them to keep them.
+    """
+    _shared_attributes = ("_track_geometry", "_track_raster")
+
+    def __init__(self, resolution: float = BEV_RESOLUTION,
+                 crop_size: Optional[int] = BEV_CROP_SIZE,
+                 rotate: bool = True):
+        """
+        Initialize BirdsEyeView
+
+        Args:
+            resolution (float): pixel size in meter
+            crop_size (Optional[int]): egocentric crop width and height in pixels,
+                                       whole track image if None
+            rotate (bool): rotate egocentric crops so that the agent heads up,
+                           north up if False
+
+        Raises:
+            ValueError: crop_size is less than 1
+        """
+        if crop_size is not None and crop_size < 1:
+            raise ValueError("[BirdsEyeView]: crop_size must be at least 1 "
+                             "or None, got {}".format(crop_size))
+        self._resolution = resolution
+        # half width in pixels of the square pixel window holding a footprint
+        self._footprint_radius = int(math.ceil(
+            math.hypot(DEEPRACER_LENGTH, DEEPRACER_WIDTH) / 2.0 / resolution)) + 1
+        self._crop_size = crop_size
+        self._rotate = rotate
+        self._track_geometry = None
+        self._track_raster = None
+        self._agent_names = tuple()
+        self._buffer = np.zeros((0, len(BEV_CHANNELS), 0, 0), dtype=np.uint8)
+        # agents channel pixels stamped on the last step of the whole track image
+        self._stamped = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        if crop_size is not None:
+            # pixel center offsets ahead and to the left of the crop center
+            offsets = (crop_size / 2.0 - 0.5 - np.arange(crop_size)) * resolution
+            self._forward = np.repeat(offsets, crop_size)
+            self._left = np.tile(offsets, crop_size)
+
+    @property
+    def agent_names(self) -> Tuple[str, ...]:
+        """
+        Return agent names in order of images
+
+        Returns:
+            Tuple[str, ...]: agent names
+        """
+        return self._agent_names
+
+    @property
+    def images(self) -> np.ndarray:
+        """
+        Return the occupancy images
+
+        Returns:
+            np.ndarray: (N, C, S, S) uint8 egocentric crop of each agent with
+                        crop_size, or (C, H, W) uint8 whole track image without,
+                        with channels in BEV_CHANNELS order
+        """
+        return self._buffer
+
+    @property
+    def birds_eye_view(self) -> Dict[str, np.ndarray]:
+        """
+        Return occupancy image with agent name as key
+
+        Returns:
+            Dict[str, np.ndarray]: (C, S, S) egocentric crop with crop_size, or the
+                                   shared (C, H, W) whole track image without
+        """
+        if self._crop_size is None:
+            return {name: self._buffer for name in self._agent_names}
+        return dict(zip(self._agent_names, self._buffer))
+
+    def update(self, deepracer_env_data: DeepRacerEnvData) -> None:
+        """
+        Update the internal state information
+
+        Args:
+            deepracer_env_data (DeepRacerEnvData): DeepRacerEnvData class instance
+
+        """
+        is_new_track = deepracer_env_data.track_geometry is not self._track_geometry
+        if is_new_track:
+            self._track_geometry = deepracer_env_data.track_geometry
+            self._track_raster = get_track_raster(self._track_geometry, self._resolution)
+        agent_names = deepracer_env_data.agent_names
+        positions = deepracer_env_data.get_array("position").astype(float).reshape(-1, 3)
+        quaternions = deepracer_env_data.get_array("orientation").astype(float).reshape(-1, 4)
+        yaws = get_yaws(quaternions)
+        if self._crop_size is None:
+            self._update_track_image(positions[:, 0], positions[:, 1], yaws, is_new_track)
+        else:
+            self._update_crops(positions[:, 0], positions[:, 1], yaws)
+        self._agent_names = agent_names
+
+    def _update_track_image(self, car_x: np.ndarray, car_y: np.ndarray, yaws: np.ndarray,
+                            is_new_track: bool) -> None:
+        """
+        Stamp the agent footprints into the whole track image
+
+        Args:
+            car_x (np.ndarray): (N,) car center x
+            car_y (np.ndarray): (N,) car center y
+            yaws (np.ndarray): (N,) car yaw in radian
+            is_new_track (bool): True if the track changed since the last step
+        """
+        track_raster = self._track_raster
+        if is_new_track:
+            self._buffer = np.zeros((len(BEV_CHANNELS),) + track_raster.shape, dtype=np.uint8)
+            self._buffer[:AGENTS_CHANNEL] = track_raster.image
+        else:
+            self._buffer[AGENTS_CHANNEL][self._stamped] = 0
+        # square pixel window around each car which holds its footprint
+        steps = np.arange(-self._footprint_radius, self._footprint_radius + 1)
+        rows, columns = track_raster.get_pixels(car_x, car_y)
+        rows = (rows[:, np.newaxis, np.newaxis] + steps[:, np.newaxis]).repeat(len(steps), 2)
+        columns = (columns[:, np.newaxis, np.newaxis] + steps).repeat(len(steps), 1)
+        pixel_x, pixel_y = track_raster.get_centers(rows, columns)
+        shape = (-1, 1, 1)
+        is_stamped = _is_in_footprint(pixel_x, pixel_y, car_x.reshape(shape),
+                                      car_y.reshape(shape), np.cos(yaws).reshape(shape),
+                                      np.sin(yaws).reshape(shape))
+        is_stamped &= (rows >= 0) & (rows < track_raster.shape[0]) & \
+            (columns >= 0) & (columns < track_raster.shape[1])
+        self._stamped = (rows[is_stamped], columns[is_stamped])
+        self._buffer[AGENTS_CHANNEL][self._stamped] = 1
+
+    def _update_crops(self, car_x: np.ndarray, car_y: np.ndarray, yaws: np.ndarray) -> None:
+        """
+        Sample the egocentric crop of every agent and stamp the other agents
+
+        Args:
+            car_x (np.ndarray): (N,) car center x
+            car_y (np.ndarray): (N,) car center y
+            yaws (np.ndarray): (N,) car yaw in radian
+        """
+        size = self._crop_size
+        resolution = self._resolution
+        num_agents = len(car_x)
+        if len(self._buffer) != num_agents:
+            self._buffer = np.zeros((num_agents, len(BEV_CHANNELS), size, size), dtype=np.uint8)
+        # (N, S * S) world coordinates of the crop pixel centers
+        headings = yaws if self._rotate else np.full(num_agents, math.pi / 2.0)
+        heading_cos = np.cos(headings)[:, np.newaxis]
+        heading_sin = np.sin(headings)[:, np.newaxis]
+        pixel_x = car_x[:, np.newaxis] + self._forward * heading_cos - self._left * heading_sin
+        pixel_y = car_y[:, np.newaxis] + self._forward * heading_sin + self._left * heading_cos
+        packed = self._track_raster.get_packed(pixel_x, pixel_y).reshape(num_agents, size, size)
+        np.bitwise_and(packed, 1, out=self._buffer[:, TRACK_CHANNEL])
+        np.right_shift(packed, 1, out=self._buffer[:, BORDER_CHANNEL])
+
+        # other agents in the crop frame of each agent, only pairs which can overlap
+        agents = self._buffer[:, AGENTS_CHANNEL]
+        agents[...] = 0
+        offset_x = car_x[np.newaxis, :] - car_x[:, np.newaxis]
+        offset_y = car_y[np.newaxis, :] - car_y[:, np.newaxis]
+        forward = offset_x * heading_cos + offset_y * heading_sin
+        left = offset_y * heading_cos - offset_x * heading_sin
+        reach = size * resolution / 2.0 + self._footprint_radius * resolution
+        is_near = (np.abs(forward) <= reach) & (np.abs(left) <= reach)
+        np.fill_diagonal(is_near, False)
+        crops, others = np.nonzero(is_near)
+        if not len(crops):
+            return
+        # square pixel window around each other agent which holds its footprint
+        steps = np.arange(-self._footprint_radius, self._footprint_radius + 1)
+        rows = np.floor(size / 2.0 - forward[crops, others] / resolution).astype(np.int64)
+        columns = np.floor(size / 2.0 - left[crops, others] / resolution).astype(np.int64)
+        rows = (rows[:, np.newaxis, np.newaxis] + steps[:, np.newaxis]).repeat(len(steps), 2)
+        columns = (columns[:, np.newaxis, np.newaxis] + steps).repeat(len(steps), 1)
+        relative_yaws = (yaws[others] - headings[crops]).reshape(-1, 1, 1)
+        shape = (-1, 1, 1)
+        is_stamped = _is_in_footprint((size / 2.0 - 0.5 - rows) * resolution,
+                                      (size / 2.0 - 0.5 - columns) * resolution,
+                                      forward[crops, others].reshape(shape),
+                                      left[crops, others].reshape(shape),
+                                      np.cos(relative_yaws), np.sin(relative_yaws))
+        is_stamped &= (rows >= 0) & (rows < size) & (columns >= 0) & (columns < size)
+        crops = np.broadcast_to(crops.reshape(shape), rows.shape)
+        agents[crops[is_stamped], rows[is_stamped], columns[is_stamped]] = 1
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Returns:
+            Tuple[str, ...]: field names in to_dict order
+        """
+        return ("birds_eye_view",)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return all internal state as a dict format
+
+        Returns:
+            Dict[str, Any]: internal state as a dict format
+        """
+        return {"birds_eye_view": self.birds_eye_view}
@@ -0,0 +1,768 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for vectorized polyline projection"""
+import math
+import weakref
+import numpy as np
+
+from typing import Iterator, List, Optional, Sequence, Tuple
+from deepracer_track_geometry import TrackGeometry
+
+# maximum number of point x segment pairs evaluated at once
+CHUNK_PAIRS = 1 << 16
+# grid cell size of the candidate segment index in median segment lengths
+GRID_CELL_SEGMENTS = 1.0
+# grid margin around the polyline bounds in cells
+GRID_MARGIN_CELLS = 12
+# maximum number of candidate segments of a grid cell, larger cells are searched in full
+GRID_MAX_CANDIDATES = 16
+# maximum number of grid cells, the cell size grows beyond it
+GRID_MAX_CELLS = 1 << 16
+# distance in cells within which get_nearby_segments lists the segments of a point
+GRID_NEARBY_CELLS = 1.0
+
+
+class Polyline(object):
+    """
+    Polyline class
+
+    NumPy projection engine over precomputed segment start points, direction
+    vectors and cumulative lengths of a polyline. Batches of points are
+    projected to (segment index, ndist, signed lateral offset) in one pass
+    instead of one shapely project call per point. A grid index narrows the
+    search down to the few segments which can be nearest to each cell, and
+    locate_point searches them without NumPy overhead for single points.
+    Projected lengths and distances match shapely within 1e-9 meter.
+    """
+    def __init__(self, coords: np.ndarray):
+        """
+        Initialize Polyline
+
+        Args:
+            coords (np.ndarray): (M, 2) or (M, 3) polyline vertices, z is ignored
+        """
+        self._coords = np.array(coords, dtype=float)[:, :2]
+        self._starts = self._coords[:-1]
+        self._directions = np.diff(self._coords, axis=0)
+        self._start_x, self._start_y = self._starts[:, 0].copy(), self._starts[:, 1].copy()
+        self._direction_x = self._directions[:, 0].copy()
+        self._direction_y = self._directions[:, 1].copy()
+        squared_lengths = np.einsum("ij,ij->i", self._directions, self._directions)
+        # same length arithmetic as shapely so that vertex ndists round the same way
+        self._lengths = np.sqrt(squared_lengths)
+        self._inverse_squared_lengths = 1.0 / np.maximum(squared_lengths, 1e-300)
+        self._cumulative_lengths = np.concatenate([[0.0], np.cumsum(self._lengths)])
+        self._is_ring = len(self._coords) > 2 and \
+            bool(np.allclose(self._coords[0], self._coords[-1]))
+        # tangents at the start, inside and end of each segment; at a vertex the tangent
+        # is the sum of the adjacent segment directions, so that the side of a point
+        # follows the corner bisector
+        previous = np.roll(self._directions, 1, axis=0)
+        if not self._is_ring:
+            previous[0] = 0.0
+        start_tangents = previous + self._directions
+        end_tangents = np.roll(start_tangents, -1, axis=0)
+        if not self._is_ring:
+            end_tangents[-1] = self._directions[-1]
+        self._tangents = np.concatenate([start_tangents, self._directions, end_tangents])
+        self._build_grid()
+
+    def _build_grid(self) -> None:
+        """
+        Build the grid index of candidate and nearby segments
+
+        Each segment is rasterized into the cells its bounding box grown by the
+        grid margin covers, and the candidates of a cell are chosen among the
+        segments rasterized into it, which takes time proportional to the
+        number of segments and cells instead of their product. Cells with
+        candidates farther than the margin, less one cell for rounding, are
+        searched in full. The cell size grows to keep at most GRID_MAX_CELLS cells.
+        """
+        cell_size = max(GRID_CELL_SEGMENTS * float(np.median(self._lengths)), 1e-9)
+        # smallest cell size with (width / size + margin) * (height / size + margin)
+        # cells at most GRID_MAX_CELLS, the positive root of a quadratic in 1 / size
+        width, height = (self._coords.max(axis=0) - self._coords.min(axis=0)).tolist()
+        margin = 2 * GRID_MARGIN_CELLS + 1
+        a, b, c = width * height, margin * (width + height), margin * margin - GRID_MAX_CELLS
+        cell_size = max(cell_size, (b + math.sqrt(b * b - 4.0 * a * c)) / (-2.0 * c))
+        low = self._coords.min(axis=0) - GRID_MARGIN_CELLS * cell_size
+        high = self._coords.max(axis=0) + GRID_MARGIN_CELLS * cell_size
+        shape = np.maximum(np.ceil((high - low) / cell_size).astype(np.int64), 1)
+        self._grid_origin = low
+        self._grid_inverse_cell_size = 1.0 / cell_size
+        self._grid_shape = shape
+        self._grid_origin_values = tuple(low.tolist())
+        self._grid_shape_values = tuple(shape.tolist())
+
+        # cells covered by the bounding box of each segment grown by the margin
+        ends = self._starts + self._directions
+        first = np.floor((np.minimum(self._starts, ends) - low) / cell_size).astype(np.int64)
+        last = np.floor((np.maximum(self._starts, ends) - low) / cell_size).astype(np.int64)
+        first = np.clip(first - GRID_MARGIN_CELLS, 0, shape - 1)
+        spans = np.clip(last + GRID_MARGIN_CELLS, 0, shape - 1) - first + 1
+        # same candidate rule as get_candidates restricted to the rasterized segments,
+        # with the nearest distance of each cell found in a first pass
+        cell_count = int(np.prod(shape))
+        bounds = np.full(cell_count, np.inf)
+        for cells, _, distances in self._get_grid_pairs(first, spans, cell_size):
+            np.minimum.at(bounds, cells, distances)
+        bounds += 2.0 * cell_size * 0.5 ** 0.5
+        # candidates are counted in a second pass and only kept for indexed cells in a
+        # third one, which bounds the memory to GRID_MAX_CANDIDATES per cell
+        bounds[bounds > (GRID_MARGIN_CELLS - 1) * cell_size] = -1.0
+        counts = np.zeros(cell_count, dtype=np.int64)
+        for cells, _, distances in self._get_grid_pairs(first, spans, cell_size):
+            counts += np.bincount(cells[distances <= bounds[cells]], minlength=cell_count)
+        is_indexed = (bounds >= 0.0) & (counts <= GRID_MAX_CANDIDATES)
+        bounds[~is_indexed] = -1.0
+        # the third pass also keeps the segments near each cell for get_nearby_segments
+        nearby_radius = cell_size * (0.5 ** 0.5 + GRID_NEARBY_CELLS)
+        candidate_pairs, nearby_pairs = [], []
+        for cells, segments, distances in self._get_grid_pairs(first, spans, cell_size):
+            is_candidate = distances <= bounds[cells]
+            candidate_pairs.append((cells[is_candidate], segments[is_candidate]))
+            is_nearby = distances <= nearby_radius
+            nearby_pairs.append((cells[is_nearby], segments[is_nearby]))
+        self._build_nearby_segments(*_sort_pairs(nearby_pairs, len(self._lengths)), cell_count)
+        cells, segments = _sort_pairs(candidate_pairs, len(self._lengths))
+
+        # cells which are not indexed are searched in full, None in the lists and
+        # -1 in the padded array; shorter rows are padded with their last candidate,
+        # which keeps the argmin
+        indexed_cells = np.nonzero(is_indexed)[0]
+        counts = counts[indexed_cells]
+        width = int(counts.max()) if len(counts) else 1
+        self._grid_candidates = np.full((cell_count, width), -1, dtype=np.int64)
+        self._grid_candidates[cells, np.arange(len(cells)) -
+                              np.repeat(np.cumsum(counts) - counts, counts)] = segments
+        self._grid_candidates[indexed_cells] = np.maximum.accumulate(
+            self._grid_candidates[indexed_cells], axis=1)
+        self._grid_cells = [None] * cell_count
+        segment_values = segments.tolist()
+        end = 0
+        for cell, count in zip(indexed_cells.tolist(), counts.tolist()):
+            self._grid_cells[cell] = segment_values[end:end + count]
+            end += count
+        # per segment start x, y, direction x, y and inverse squared length
+        self._segment_values = list(zip(self._start_x.tolist(),
+                                        self._start_y.tolist(),
+                                        self._direction_x.tolist(),
+                                        self._direction_y.tolist(),
+                                        self._inverse_squared_lengths.tolist()))
+        self._length_values = self._lengths.tolist()
+        self._cumulative_length_values = self._cumulative_lengths.tolist()
+        self._tangent_values = [tuple(tangent) for tangent in self._tangents.tolist()]
+
+    def _build_nearby_segments(self, cells: np.ndarray, segments: np.ndarray,
+                               cell_count: int) -> None:
+        """
+        Build the segments near each grid cell as offsets into a flat array
+
+        Args:
+            cells (np.ndarray): (P,) ascending flat cell index of each near pair
+            segments (np.ndarray): (P,) segment index of each near pair
+            cell_count (int): number of grid cells
+        """
+        self._grid_nearby_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(cells, minlength=cell_count))])
+        self._grid_nearby_segments = segments
+
+    def _get_grid_pairs(self, first: np.ndarray, spans: np.ndarray,
+                        cell_size: float) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Yield the rasterized (cell, segment) pairs of the grid index in chunks
+
+        Args:
+            first (np.ndarray): (S, 2) first grid cell x, y covered by each segment
+            spans (np.ndarray): (S, 2) number of grid cells covered by each segment along x, y
+            cell_size (float): grid cell size
+
+        Yields:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: flat cell index, segment index and
+                                                       distance from the cell center to
+                                                       the segment of each pair
+        """
+        counts = spans[:, 0] * spans[:, 1]
+        cumulative_counts = np.cumsum(counts)
+        begin = 0
+        while begin < len(counts):
+            end = max(begin + 1, int(np.searchsorted(
+                cumulative_counts, cumulative_counts[begin] - counts[begin] + CHUNK_PAIRS,
+                side="right")))
+            segments = np.repeat(np.arange(begin, end), counts[begin:end])
+            ranks = np.arange(len(segments)) - np.repeat(
+                cumulative_counts[begin:end] - counts[begin:end] -
+                (cumulative_counts[begin] - counts[begin]), counts[begin:end])
+            cell_x = first[segments, 0] + ranks // spans[segments, 1]
+            cell_y = first[segments, 1] + ranks % spans[segments, 1]
+            offset_x = self._grid_origin[0] + (cell_x + 0.5) * cell_size - \
+                self._start_x[segments]
+            offset_y = self._grid_origin[1] + (cell_y + 0.5) * cell_size - \
+                self._start_y[segments]
+            direction_x = self._direction_x[segments]
+            direction_y = self._direction_y[segments]
+            t = (offset_x * direction_x + offset_y * direction_y) * \
+                self._inverse_squared_lengths[segments]
+            np.clip(t, 0.0, 1.0, out=t)
+            offset_x -= t * direction_x
+            offset_y -= t * direction_y
+            yield (cell_x * self._grid_shape[1] + cell_y, segments,
+                   np.sqrt(offset_x * offset_x + offset_y * offset_y))
+            begin = end
+
+    def get_candidates(self, centers: np.ndarray, radii: np.ndarray) -> List[List[int]]:
+        """
+        Return the segments which can be nearest to any point within radius of centers
+
+        A point within radius r of center q is at most d_min + r away from the
+        segment nearest to q, and at least d - r away from a segment at distance
+        d of q. Segments with d > d_min + 2r can therefore never be the nearest
+        one, and searching the remaining candidates in ascending index order
+        gives the same result as the full search, ties included.
+
+        Args:
+            centers (np.ndarray): (N, 2) centers
+            radii (np.ndarray): (N,) radius around each center
+
+        Returns:
+            List[List[int]]: ascending candidate segment indices per center
+        """
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        candidates = []
+        chunk = max(1, CHUNK_PAIRS // len(self._starts))
+        for begin in range(0, len(centers), chunk):
+            distances = np.sqrt(self._get_squared_distances(centers[begin:begin + chunk]))
+            bounds = distances.min(axis=1) + 2.0 * radii[begin:begin + chunk]
+            is_candidate = distances <= bounds[:, np.newaxis]
+            segments = np.nonzero(is_candidate)[1].tolist()
+            ends = np.cumsum(np.count_nonzero(is_candidate, axis=1)).tolist()
+            candidates.extend(segments[end - count:end] for end, count in
+                              zip(ends, np.count_nonzero(is_candidate, axis=1).tolist()))
+        return candidates
+
+    def _get_squared_distances(self, points: np.ndarray) -> np.ndarray:
+        """
+        Return squared distances from points to every segment
+
+        Args:
+            points (np.ndarray): (N, 2) points
+
+        Returns:
+            np.ndarray: (N, S) squared distances
+        """
+        offset_x = points[:, 0:1] - self._start_x
+        offset_y = points[:, 1:2] - self._start_y
+        t = (offset_x * self._direction_x + offset_y * self._direction_y) * \
+            self._inverse_squared_lengths
+        np.clip(t, 0.0, 1.0, out=t)
+        offset_x -= t * self._direction_x
+        offset_y -= t * self._direction_y
+        return offset_x * offset_x + offset_y * offset_y
+
+    @property
+    def coords(self) -> np.ndarray:
+        """
+        Return polyline vertices
+
+        Returns:
+            np.ndarray: (M, 2) polyline vertices
+        """
+        return self._coords.copy()
+
+    @property
+    def length(self) -> float:
+        """
+        Return polyline length
+
+        Returns:
+            float: polyline length
+        """
+        return float(self._cumulative_lengths[-1])
+
+    @property
+    def nearby_distance(self) -> float:
+        """
+        Return the distance within which get_nearby_segments lists the segments of a point
+
+        Returns:
+            float: GRID_NEARBY_CELLS grid cells
+        """
+        return GRID_NEARBY_CELLS / self._grid_inverse_cell_size
+
+    def get_nearby_segments(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the segments which can pass within nearby_distance of points
+
+        Segments within nearby_distance of a point are within the cell half
+        diagonal plus nearby_distance of the center of its grid cell, and the
+        grid index keeps those for each cell. Points outside the grid are
+        looked up in its nearest border cell, which is too far from the
+        polyline to have any.
+
+        Args:
+            points (np.ndarray): (N, 2) points
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (P,) point index and (P,) ascending segment
+                                           index of the pairs, in point order
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        (origin_x, origin_y), (shape_x, shape_y) = (self._grid_origin_values,
+                                                    self._grid_shape_values)
+        cell_x = np.floor((points[:, 0] - origin_x) * self._grid_inverse_cell_size)
+        cell_y = np.floor((points[:, 1] - origin_y) * self._grid_inverse_cell_size)
+        cells = (np.minimum(np.maximum(cell_x, 0.0), shape_x - 1) * shape_y +
+                 np.minimum(np.maximum(cell_y, 0.0), shape_y - 1)).astype(np.int64)
+        starts = self._grid_nearby_offsets[cells]
+        counts = self._grid_nearby_offsets[cells + 1] - starts
+        # shift from the position of each pair in the result to its flat array position
+        shifts = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return (np.repeat(np.arange(len(cells)), counts),
+                self._grid_nearby_segments[np.arange(len(shifts)) + shifts])
+
+    @property
+    def is_ring(self) -> bool:
+        """
+        Return whether the polyline is closed
+
+        Returns:
+            bool: True if the first and last vertices are the same and False otherwise
+        """
+        return self._is_ring
+
+    @property
+    def cumulative_lengths(self) -> np.ndarray:
+        """
+        Return the length along the polyline at each vertex
+
+        Returns:
+            np.ndarray: (M,) length along the polyline at each vertex
+        """
+        return self._cumulative_lengths.copy()
+
+    def locate(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the nearest segment of each point and the parameter on it
+
+        Ties are resolved to the lowest segment index like shapely.
+
+        Args:
+            points (np.ndarray): (N, 2) points
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (N,) nearest segment index and
+                                           (N,) parameter in [0, 1] on the segment
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        cells = np.floor((points - self._grid_origin) *
+                         self._grid_inverse_cell_size).astype(np.int64)
+        is_inside = np.all((cells >= 0) & (cells < self._grid_shape), axis=1)
+        candidates = self._grid_candidates[
+            np.where(is_inside, cells[:, 0] * self._grid_shape[1] + cells[:, 1], 0)]
+        is_indexed = is_inside & (candidates[:, 0] >= 0)
+        if not is_indexed.all():
+            return self._locate_all(points, candidates, is_indexed)
+
+        # search the candidate segments of the grid cell of each point
+        offset_x = points[:, 0:1] - self._start_x[candidates]
+        offset_y = points[:, 1:2] - self._start_y[candidates]
+        direction_x = self._direction_x[candidates]
+        direction_y = self._direction_y[candidates]
+        t = (offset_x * direction_x + offset_y * direction_y) * \
+            self._inverse_squared_lengths[candidates]
+        np.clip(t, 0.0, 1.0, out=t)
+        offset_x -= t * direction_x
+        offset_y -= t * direction_y
+        nearest = np.argmin(offset_x * offset_x + offset_y * offset_y, axis=1)
+        rows = np.arange(len(points))
+        return candidates[rows, nearest], t[rows, nearest]
+
+    def _locate_all(self, points: np.ndarray, candidates: np.ndarray,
+                    is_indexed: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Locate points with the grid where indexed and a full search otherwise
+
+        Args:
+            points (np.ndarray): (N, 2) points
+            candidates (np.ndarray): (N, K) grid candidate segments of each point
+            is_indexed (np.ndarray): (N,) True if the grid candidates can be used
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (N,) nearest segment index and
+                                           (N,) parameter in [0, 1] on the segment
+        """
+        segments = np.empty(len(points), dtype=np.int64)
+        params = np.empty(len(points))
+        if is_indexed.any():
+            segments[is_indexed], params[is_indexed] = self.locate(points[is_indexed])
+        outside = np.nonzero(~is_indexed)[0]
+        chunk = max(1, CHUNK_PAIRS // len(self._starts))
+        for begin in range(0, len(outside), chunk):
+            indices = outside[begin:begin + chunk]
+            nearest = np.argmin(self._get_squared_distances(points[indices]), axis=1)
+            segments[indices] = nearest
+            offsets = points[indices] - self._starts[nearest]
+            params[indices] = np.clip(np.einsum("ij,ij->i", offsets, self._directions[nearest]) *
+                                      self._inverse_squared_lengths[nearest], 0.0, 1.0)
+        return segments, params
+
+    def get_points(self, segments: np.ndarray, params: np.ndarray) -> np.ndarray:
+        """
+        Return the points at the given parameters of the given segments
+
+        Args:
+            segments (np.ndarray): (N,) segment index
+            params (np.ndarray): (N,) parameter in [0, 1] on the segment
+
+        Returns:
+            np.ndarray: (N, 2) points on the polyline
+        """
+        return self._starts[segments] + params[:, np.newaxis] * self._directions[segments]
+
+    def get_ndists(self, segments: np.ndarray, params: np.ndarray) -> np.ndarray:
+        """
+        Return the normalized distance along the polyline of segment parameters
+
+        Args:
+            segments (np.ndarray): (N,) segment index
+            params (np.ndarray): (N,) parameter in [0, 1] on the segment
+
+        Returns:
+            np.ndarray: (N,) normalized distance in [0, 1]
+        """
+        return (self._cumulative_lengths[segments] + params * self._lengths[segments]) / \
+            self._cumulative_lengths[-1]
+
+    def get_offsets(self, points: np.ndarray, segments: np.ndarray,
+                    params: np.ndarray) -> np.ndarray:
+        """
+        Return the signed lateral offset of points from their nearest polyline point
+
+        The offset is positive to the left of the polyline direction. When the
+        nearest point is a vertex, the side is taken against the sum of the two
+        adjacent segment directions so that it is also right on the outside of
+        sharp corners.
+
+        Args:
+            points (np.ndarray): (N, 2) points
+            segments (np.ndarray): (N,) nearest segment index
+            params (np.ndarray): (N,) parameter in [0, 1] on the nearest segment
+
+        Returns:
+            np.ndarray: (N,) signed lateral offset
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        offsets = points - self.get_points(segments, params)
+        tangents = self._tangents[segments + len(self._lengths) *
+                                  (1 + (params >= 1.0) - (params <= 0.0))]
+        crosses = tangents[:, 0] * offsets[:, 1] - tangents[:, 1] * offsets[:, 0]
+        return np.copysign(np.hypot(offsets[:, 0], offsets[:, 1]), crosses)
+
+    def project(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Project points to the polyline
+
+        Args:
+            points (np.ndarray): (N, 2) points
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (N,) nearest segment index,
+                                                       (N,) normalized distance along
+                                                       the polyline and (N,) signed
+                                                       lateral offset, positive to the left
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        segments, params = self.locate(points)
+        return (segments,
+                self.get_ndists(segments, params),
+                self.get_offsets(points, segments, params))
+
+    def interpolate(self, ndists: np.ndarray) -> np.ndarray:
+        """
+        Return the points at normalized distances along the polyline
+
+        Args:
+            ndists (np.ndarray): (N,) normalized distance, clipped to [0, 1]
+
+        Returns:
+            np.ndarray: (N, 2) points on the polyline
+        """
+        lengths = np.clip(np.asarray(ndists, dtype=float).reshape(-1), 0.0, 1.0) * \
+            self._cumulative_lengths[-1]
+        segments = np.clip(np.searchsorted(self._cumulative_lengths, lengths, side="right") - 1,
+                           0, len(self._lengths) - 1)
+        params = np.clip((lengths - self._cumulative_lengths[segments]) /
+                         np.maximum(self._lengths[segments], 1e-300), 0.0, 1.0)
+        return self.get_points(segments, params)
+
+    def distance(self, points: np.ndarray) -> np.ndarray:
+        """
+        Return the distance from points to the polyline
+
+        Args:
+            points (np.ndarray): (N, 2) points
+
+        Returns:
+            np.ndarray: (N,) distance to the nearest polyline point
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        segments, params = self.locate(points)
+        return np.hypot(*(points - self.get_points(segments, params)).T)
+
+    def locate_point(self, x: float, y: float,
+                     candidates: Optional[Sequence[int]] = None) -> Tuple[int, float]:
+        """
+        Return the nearest segment of a single point and the parameter on it
+
+        Single point counterpart of locate without NumPy call overhead, which
+        searches the grid cell candidates, or the given candidates, in plain
+        Python with the same arithmetic as locate.
+
+        Args:
+            x (float): point x
+            y (float): point y
+            candidates (Optional[Sequence[int]]): ascending segments which include
+                                                  the nearest one, grid cell
+                                                  candidates if None
+
+        Returns:
+            Tuple[int, float]: nearest segment index and parameter in [0, 1] on the segment
+        """
+        if candidates is None:
+            origin_x, origin_y = self._grid_origin_values
+            shape_x, shape_y = self._grid_shape_values
+            cell_x = math.floor((x - origin_x) * self._grid_inverse_cell_size)
+            cell_y = math.floor((y - origin_y) * self._grid_inverse_cell_size)
+            if 0 <= cell_x < shape_x and 0 <= cell_y < shape_y:
+                candidates = self._grid_cells[cell_x * shape_y + cell_y]
+            if candidates is None:
+                segments, params = self.locate(np.array([[x, y]]))
+                return int(segments[0]), float(params[0])
+        segment_values = self._segment_values
+        nearest, nearest_param, nearest_distance = -1, 0.0, float("inf")
+        for segment in candidates:
+            start_x, start_y, direction_x, direction_y, inverse_squared_length = \
+                segment_values[segment]
+            offset_x = x - start_x
+            offset_y = y - start_y
+            param = (offset_x * direction_x + offset_y * direction_y) * inverse_squared_length
+            param = 0.0 if param < 0.0 else 1.0 if param > 1.0 else param
+            offset_x -= param * direction_x
+            offset_y -= param * direction_y
+            distance = offset_x * offset_x + offset_y * offset_y
+            if distance < nearest_distance:
+                nearest, nearest_param, nearest_distance = segment, param, distance
+        return nearest, nearest_param
+
+    def get_point(self, segment: int, param: float) -> Tuple[float, float]:
+        """
+        Return the point at the given parameter of the given segment
+
+        Args:
+            segment (int): segment index
+            param (float): parameter in [0, 1] on the segment
+
+        Returns:
+            Tuple[float, float]: point x, y on the polyline
+        """
+        start_x, start_y, direction_x, direction_y, _ = self._segment_values[segment]
+        return start_x + param * direction_x, start_y + param * direction_y
+
+    def get_ndist(self, segment: int, param: float) -> float:
+        """
+        Return the normalized distance along the polyline of a segment parameter
+
+        Args:
+            segment (int): segment index
+            param (float): parameter in [0, 1] on the segment
+
+        Returns:
+            float: normalized distance in [0, 1]
+        """
+        return (self._cumulative_length_values[segment] +
+                param * self._length_values[segment]) / self._cumulative_length_values[-1]
+
+    def get_offset(self, x: float, y: float, segment: int, param: float) -> float:
+        """
+        Return the signed lateral offset of a single point, see get_offsets
+
+        Args:
+            x (float): point x
+            y (float): point y
+            segment (int): nearest segment index
+            param (float): parameter in [0, 1] on the nearest segment
+
+        Returns:
+            float: signed lateral offset, positive to the left
+        """
+        point_x, point_y = self.get_point(segment, param)
+        offset_x = x - point_x
+        offset_y = y - point_y
+        if param <= 0.0:
+            segment -= len(self._length_values)
+        elif param >= 1.0:
+            segment += len(self._length_values)
+        tangent_x, tangent_y = self._tangent_values[segment + len(self._length_values)]
+        return math.copysign(math.hypot(offset_x, offset_y),
+                             tangent_x * offset_y - tangent_y * offset_x)
+
+
+def _sort_pairs(pairs: List[Tuple[np.ndarray, np.ndarray]],
+                num_segments: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return chunks of (cell, segment) pairs concatenated and sorted by cell and segment
+
+    Args:
+        pairs (List[Tuple[np.ndarray, np.ndarray]]): chunks of cell and segment indices
+        num_segments (int): number of segments
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (P,) cell and (P,) segment indices
+    """
+    cells = np.concatenate([pair[0] for pair in pairs])
+    segments = np.concatenate([pair[1] for pair in pairs])
+    order = np.argsort(cells * num_segments + segments)
+    return cells[order], segments[order]
+
+
+class TrackPolylines(object):
+    """
+    TrackPolylines class
+
+    Polyline projection engines of the center line and borders of a track
+    geometry, built once per geometry by get_track_polylines.
+    """
+    def __init__(self, track_geometry: TrackGeometry):
+        """
+        Initialize TrackPolylines
+
+        Args:
+            track_geometry (TrackGeometry): track geometry class instance
+        """
+        self._center_line = Polyline(track_geometry.track_center_line.coords)
+        self._inner_border_line = Polyline(track_geometry.inner_border_line.coords)
+        self._outer_border_line = Polyline(track_geometry.outer_border_line.coords)
+        # the inner border is on the side of the center line most of its vertices are on
+        inner = self._inner_border_line.coords
+        self._inner_side = 1.0 if np.sum(np.sign(self._center_line.get_offsets(
+            inner, *self._center_line.locate(inner)))) >= 0.0 else -1.0
+        # border segments which can be nearest to a point of each center line segment
+        coords = self._center_line.coords
+        midpoints = (coords[:-1] + coords[1:]) / 2.0
+        half_lengths = np.hypot(*(coords[1:] - coords[:-1]).T) / 2.0
+        self._inner_candidates = self._inner_border_line.get_candidates(midpoints, half_lengths)
+        self._outer_candidates = self._outer_border_line.get_candidates(midpoints, half_lengths)
+
+    @property
+    def center_line(self) -> Polyline:
+        """
+        Return center line polyline
+
+        Returns:
+            Polyline: center line polyline
+        """
+        return self._center_line
+
+    @property
+    def inner_border_line(self) -> Polyline:
+        """
+        Return inner border line polyline
+
+        Returns:
+            Polyline: inner border line polyline
+        """
+        return self._inner_border_line
+
+    @property
+    def outer_border_line(self) -> Polyline:
+        """
+        Return outer border line polyline
+
+        Returns:
+            Polyline: outer border line polyline
+        """
+        return self._outer_border_line
+
+    @property
+    def inner_side(self) -> float:
+        """
+        Return the sign of center line offsets on the inner border side
+
+        Returns:
+            float: 1.0 if the inner border is to the left of the center line
+                   direction and -1.0 otherwise
+        """
+        return self._inner_side
+
+    def get_track_width(self, center_points: np.ndarray) -> np.ndarray:
+        """
+        Return the track width at center line points
+
+        The width is the distance between the inner and outer border points
+        nearest to each center line point, as in Status.track_width.
+
+        Args:
+            center_points (np.ndarray): (N, 2) points on the center line
+
+        Returns:
+            np.ndarray: (N,) track width
+        """
+        inner_points = self._inner_border_line.get_points(
+            *self._inner_border_line.locate(center_points))
+        outer_points = self._outer_border_line.get_points(
+            *self._outer_border_line.locate(center_points))
+        return np.hypot(*(inner_points - outer_points).T)
+
+    def get_track_width_at(self, segment: int, param: float) -> float:
+        """
+        Return the track width at a single center line point, see get_track_width
+
+        Args:
+            segment (int): center line segment index
+            param (float): parameter in [0, 1] on the center line segment
+
+        Returns:
+            float: track width
+        """
+        x, y = self._center_line.get_point(segment, param)
+        inner_x, inner_y = self._inner_border_line.get_point(
+            *self._inner_border_line.locate_point(x, y, self._inner_candidates[segment]))
+        outer_x, outer_y = self._outer_border_line.get_point(
+            *self._outer_border_line.locate_point(x, y, self._outer_candidates[segment]))
+        return math.hypot(inner_x - outer_x, inner_y - outer_y)
+
+
+_TRACK_POLYLINES = weakref.WeakKeyDictionary()
+
+
+def get_track_polylines(track_geometry: TrackGeometry) -> TrackPolylines:
+    """
+    Return the polylines of a track geometry, built on first use
+
+    Polylines are cached per track geometry instance for as long as the
+    instance is alive.
+
+    Args:
+        track_geometry (TrackGeometry): track geometry class instance
+
+    Returns:
+        TrackPolylines: polylines of the track geometry
+    """
+    track_polylines = _TRACK_POLYLINES.get(track_geometry)
+    if track_polylines is None:
+        track_polylines = TrackPolylines(track_geometry)
+        _TRACK_POLYLINES[track_geometry] = track_polylines
+    return track_polylines
@@ -0,0 +1,170 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for precomputed heading and curvature profile of a polyline"""
+import math
+import weakref
+import numpy as np
+
+from deepracer_env_state.track.polyline import (
+    Polyline,
+    get_track_polylines)
+from deepracer_track_geometry import TrackGeometry
+
+# arc length between the samples of the curvature profile in meter
+PROFILE_STEP = 0.05
+
+
+class TrackProfile(object):
+    """
+    TrackProfile class
+
+    Heading of every segment and signed curvature along a polyline, such as
+    the track center line in race direction. Vertex curvature is the turn
+    angle between the adjacent segments over their mean length, positive for
+    left turns, and is resampled at PROFILE_STEP arc length, so that the
+    curvature at any distance along the polyline is a single array lookup.
+    """
+    def __init__(self, polyline: Polyline, step: float = PROFILE_STEP):
+        """
+        Initialize TrackProfile
+
+        Args:
+            polyline (Polyline): polyline in race direction
+            step (float): arc length between curvature samples in meter
+        """
+        coords = polyline.coords
+        directions = np.diff(coords, axis=0)
+        lengths = np.sqrt(np.einsum("ij,ij->i", directions, directions))
+        self._length = polyline.length
+        self._is_ring = polyline.is_ring
+        self._headings = np.arctan2(directions[:, 1], directions[:, 0])
+        self._heading_values = self._headings.tolist()
+
+        # turn angle at every vertex between its incoming and outgoing segments
+        previous = np.roll(self._headings, 1)
+        turns = np.angle(np.exp(1j * (self._headings - previous)))
+        mean_lengths = np.maximum((np.roll(lengths, 1) + lengths) / 2.0, 1e-12)
+        curvatures = turns / mean_lengths
+        vertex_distances = np.concatenate([[0.0], np.cumsum(lengths)])[:-1]
+        if not self._is_ring:
+            # no turn at the start vertex of an open polyline
+            curvatures[0] = 0.0
+            vertex_distances = np.append(vertex_distances, self._length)
+            curvatures = np.append(curvatures, 0.0)
+        num_samples = max(int(math.ceil(self._length / step)), 1)
+        self._step = self._length / num_samples
+        self._inverse_step = 1.0 / self._step if self._step else 0.0
+        samples = np.arange(num_samples + (0 if self._is_ring else 1)) * self._step
+        self._curvatures = np.interp(samples, vertex_distances, curvatures,
+                                     period=self._length if self._is_ring else None)
+        self._curvature_values = self._curvatures.tolist()
+
+    @property
+    def length(self) -> float:
+        """
+        Return polyline length
+
+        Returns:
+            float: polyline length in meter
+        """
+        return self._length
+
+    @property
+    def headings(self) -> np.ndarray:
+        """
+        Return heading of every segment
+
+        Returns:
+            np.ndarray: (M - 1,) heading in radian in [-pi, pi]
+        """
+        return self._headings.copy()
+
+    @property
+    def curvatures(self) -> np.ndarray:
+        """
+        Return curvature samples every step along the polyline
+
+        Returns:
+            np.ndarray: signed curvature in 1/meter, positive for left turns
+        """
+        return self._curvatures.copy()
+
+    def get_heading(self, segment: int) -> float:
+        """
+        Return heading of a segment
+
+        Args:
+            segment (int): segment index
+
+        Returns:
+            float: heading in radian in [-pi, pi]
+        """
+        return self._heading_values[segment]
+
+    def get_curvature(self, distance: float) -> float:
+        """
+        Return curvature at a distance along the polyline
+
+        Distances wrap around on a ring and are clipped to the ends otherwise.
+
+        Args:
+            distance (float): distance from the first vertex in meter
+
+        Returns:
+            float: signed curvature in 1/meter, positive for left turns
+        """
+        index = int(round(distance * self._inverse_step))
+        if self._is_ring:
+            return self._curvature_values[index % len(self._curvature_values)]
+        return self._curvature_values[min(max(index, 0), len(self._curvature_values) - 1)]
+
+    def get_curvatures(self, distances: np.ndarray) -> np.ndarray:
+        """
+        Return curvature at distances along the polyline, see get_curvature
+
+        Args:
+            distances (np.ndarray): (N,) distances from the first vertex in meter
+
+        Returns:
+            np.ndarray: (N,) signed curvature in 1/meter, positive for left turns
+        """
+        indices = np.rint(np.asarray(distances, dtype=float) * self._inverse_step).astype(np.int64)
+        if self._is_ring:
+            return self._curvatures[indices % len(self._curvatures)]
+        return self._curvatures[np.clip(indices, 0, len(self._curvatures) - 1)]
+
+
+_TRACK_PROFILES = weakref.WeakKeyDictionary()
+
+
+def get_track_profile(track_geometry: TrackGeometry) -> TrackProfile:
+    """
+    Return the center line profile of a track geometry, built on first use
+
+    Profiles are cached per track geometry instance for as long as the
+    instance is alive.
+
+    Args:
+        track_geometry (TrackGeometry): track geometry class instance
+
+    Returns:
+        TrackProfile: center line profile of the track geometry
+    """
+    track_profile = _TRACK_PROFILES.get(track_geometry)
+    if track_profile is None:
+        track_profile = TrackProfile(get_track_polylines(track_geometry).center_line)
+        _TRACK_PROFILES[track_geometry] = track_profile
+    return track_profile
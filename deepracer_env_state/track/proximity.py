@@ -0,0 +1,228 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for multi-agent proximity state"""
+import numpy as np
+
+from typing import Dict, List, Tuple, Any
+from deepracer_env_state.state_interface import StateInterface
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.agent.utils import get_yaws
+from deepracer_env_state.track.polyline import get_track_polylines
+
+
+class Proximity(StateInterface):
+    """
+    Proximity class
+
+    Pairwise proximity between all agents computed in one vectorized pass
+    per step: nearest opponent and distance, longitudinal gap to the
+    opponents ahead and behind along the track center line, lateral offset
+    of the nearest opponent in the agent frame and overtake events.
+
+    A dense N x N evaluation is used, as it is only a few microseconds for
+    dozens of agents and cheaper than building a spatial index every step.
+    """
+    def __init__(self):
+        """
+        Initialize Proximity
+        """
+        self._agent_names = tuple()
+        # pairwise euclidean distance with inf on diagonal
+        self._distances = np.zeros((0, 0))
+        # pairwise signed longitudinal gap: positive if column agent is ahead of row agent
+        self._gaps = np.zeros((0, 0))
+        # lateral offset of column agent in row agent frame: positive if to the left
+        self._lateral_offsets = np.zeros((0, 0))
+        self._done = dict()
+        self._overtakes = list()
+
+    @property
+    def agent_names(self) -> Tuple[str, ...]:
+        """
+        Return agent names in row/column order of the pairwise arrays,
+        which is the agent index order
+
+        Returns:
+            Tuple[str, ...]: agent names
+        """
+        return self._agent_names
+
+    @property
+    def distances(self) -> np.ndarray:
+        """
+        Return pairwise euclidean distance in meter with inf on the diagonal
+
+        Returns:
+            np.ndarray: (N, N) pairwise distance
+        """
+        return self._distances
+
+    @property
+    def gaps(self) -> np.ndarray:
+        """
+        Return pairwise signed longitudinal gap along the center line in meter
+
+        The gap is positive if the column agent is ahead of the row agent and
+        wraps around the track to the shortest gap.
+
+        Returns:
+            np.ndarray: (N, N) pairwise longitudinal gap
+        """
+        return self._gaps
+
+    @property
+    def lateral_offsets(self) -> np.ndarray:
+        """
+        Return pairwise lateral offset in meter of the column agent in the row agent frame
+
+        Returns:
+            np.ndarray: (N, N) pairwise lateral offset, positive to the left
+        """
+        return self._lateral_offsets
+
+    @property
+    def proximity(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return proximity status of each agent
+
+        Returns:
+            Dict[str, Dict[str, Any]]: nearest_opponent, nearest_opponent_distance,
+                                       lateral_offset, opponent_ahead, gap_ahead,
+                                       opponent_behind and gap_behind with agent name
+                                       as key. Values are None without opponents.
+        """
+        proximity = dict()
+        for index, name in enumerate(self._agent_names):
+            proximity[name] = {"nearest_opponent": None,
+                               "nearest_opponent_distance": None,
+                               "lateral_offset": None,
+                               "opponent_ahead": None,
+                               "gap_ahead": None,
+                               "opponent_behind": None,
+                               "gap_behind": None}
+            if len(self._agent_names) < 2:
+                continue
+            nearest = int(np.argmin(self._distances[index]))
+            proximity[name].update({
+                "nearest_opponent": self._agent_names[nearest],
+                "nearest_opponent_distance": float(self._distances[index, nearest]),
+                "lateral_offset": float(self._lateral_offsets[index, nearest])})
+            gaps = np.delete(self._gaps[index], index)
+            opponents = np.delete(np.arange(len(self._agent_names)), index)
+            if np.any(gaps > 0.0):
+                ahead = int(np.argmin(np.where(gaps > 0.0, gaps, np.inf)))
+                proximity[name].update({
+                    "opponent_ahead": self._agent_names[opponents[ahead]],
+                    "gap_ahead": float(gaps[ahead])})
+            if np.any(gaps <= 0.0):
+                behind = int(np.argmax(np.where(gaps <= 0.0, gaps, -np.inf)))
+                proximity[name].update({
+                    "opponent_behind": self._agent_names[opponents[behind]],
+                    "gap_behind": float(-gaps[behind])})
+        return proximity
+
+    @property
+    def overtakes(self) -> List[Tuple[str, str]]:
+        """
+        Return overtake events of the last step
+
+        Returns:
+            List[Tuple[str, str]]: (overtaking agent name, overtaken agent name) pairs
+        """
+        return self._overtakes
+
+    def update(self, deepracer_env_data: DeepRacerEnvData) -> None:
+        """
+        Update the internal state information
+
+        Args:
+            deepracer_env_data (DeepRacerEnvData): DeepRacerEnvData class instance
+
+        """
+        center_line = get_track_polylines(deepracer_env_data.track_geometry).center_line
+        agent_names = deepracer_env_data.agent_names
+        xy = deepracer_env_data.get_array("position").astype(float).reshape(
+            len(agent_names), -1)[:, :2]
+        quaternions = deepracer_env_data.get_array("orientation").astype(float).reshape(-1, 4)
+        track_length = center_line.length
+        ndists = center_line.get_ndists(*center_line.locate(xy))
+
+        # pairwise displacement from row agent to column agent
+        deltas = xy[np.newaxis, :, :] - xy[:, np.newaxis, :]
+        distances = np.hypot(deltas[..., 0], deltas[..., 1])
+        np.fill_diagonal(distances, np.inf)
+        # shortest signed gap along the center line in [-length / 2, length / 2)
+        along = (ndists[np.newaxis, :] - ndists[:, np.newaxis]) * track_length
+        gaps = np.mod(along + track_length / 2.0, track_length) - track_length / 2.0
+        yaws = get_yaws(quaternions)
+        lateral_offsets = (- np.sin(yaws)[:, np.newaxis] * deltas[..., 0] +
+                           np.cos(yaws)[:, np.newaxis] * deltas[..., 1])
+
+        self._overtakes = self._get_overtakes(agent_names, gaps, track_length)
+        self._agent_names = agent_names
+        self._distances = distances
+        self._gaps = gaps
+        self._lateral_offsets = lateral_offsets
+        self._done = dict(deepracer_env_data.done)
+
+    def _get_overtakes(self, agent_names: Tuple[str, ...], gaps: np.ndarray,
+                       track_length: float) -> List[Tuple[str, str]]:
+        """
+        Return overtake events between the last and the current step
+
+        Row agent overtakes column agent when the column agent moves from
+        ahead to behind. Pairs with a gap close to half the track length
+        are ignored, as their sign flips by wrapping around the track, and so
+        are agents which were done on the last step.
+
+        Args:
+            agent_names (Tuple[str, ...]): current agent names
+            gaps (np.ndarray): current pairwise signed longitudinal gap
+            track_length (float): track length in meter
+
+        Returns:
+            List[Tuple[str, str]]: (overtaking agent name, overtaken agent name) pairs
+        """
+        if agent_names != self._agent_names or len(agent_names) < 2:
+            return list()
+        valid = np.array([not self._done.get(name, False) for name in agent_names])
+        valid = valid[:, np.newaxis] & valid[np.newaxis, :]
+        near = (np.abs(gaps) < track_length / 4.0) & (np.abs(self._gaps) < track_length / 4.0)
+        overtaken = (self._gaps > 0.0) & (gaps <= 0.0) & valid & near
+        np.fill_diagonal(overtaken, False)
+        return [(agent_names[row], agent_names[column])
+                for row, column in zip(*np.nonzero(overtaken))]
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Returns:
+            Tuple[str, ...]: field names in to_dict order
+        """
+        return ("proximity",
+                "overtakes")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return all internal state as a dict format
+
+        Returns:
+            Dict[str, Any]: internal state as a dict format
+        """
+        return {"proximity": self.proximity,
+                "overtakes": self.overtakes}
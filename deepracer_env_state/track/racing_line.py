@@ -0,0 +1,144 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for reference racing line"""
+import numpy as np
+
+from typing import Optional, Sequence, Tuple
+from deepracer_env_state.track.polyline import Polyline
+
+
+class RacingLine(object):
+    """
+    RacingLine class
+
+    Precomputed optimal line of a track with an optional target speed at
+    every vertex. The line is kept as a Polyline, so that deviation and
+    projected ndist are grid index lookups like the center line projection,
+    for single points on every step and for whole trajectories at once.
+    The line is assumed to follow race direction.
+    """
+    def __init__(self, coords: np.ndarray, speeds: Optional[Sequence[float]] = None):
+        """
+        Initialize RacingLine
+
+        Args:
+            coords (np.ndarray): (M, 2) or (M, 3) racing line vertices, z is ignored
+            speeds (Optional[Sequence[float]]): (M,) target speed at each vertex
+                                                in meter per second, no target
+                                                speed if None
+
+        Raises:
+            ValueError: speeds and coords have different lengths
+        """
+        self._polyline = Polyline(coords)
+        self._speeds = None
+        self._speed_values = None
+        if speeds is not None:
+            self._speeds = np.array(speeds, dtype=float).reshape(-1)
+            if len(self._speeds) != len(self._polyline.coords):
+                raise ValueError("[RacingLine]: {} speeds for {} vertices".format(
+                    len(self._speeds), len(self._polyline.coords)))
+            self._speed_values = self._speeds.tolist()
+
+    @property
+    def polyline(self) -> Polyline:
+        """
+        Return racing line polyline
+
+        Returns:
+            Polyline: racing line polyline
+        """
+        return self._polyline
+
+    @property
+    def length(self) -> float:
+        """
+        Return racing line length
+
+        Returns:
+            float: racing line length
+        """
+        return self._polyline.length
+
+    @property
+    def speeds(self) -> Optional[np.ndarray]:
+        """
+        Return target speed at each vertex
+
+        Returns:
+            Optional[np.ndarray]: (M,) target speed in meter per second,
+                                  None if the line has no target speed
+        """
+        return None if self._speeds is None else self._speeds.copy()
+
+    def get_target_speeds(self, segments: np.ndarray, params: np.ndarray) -> np.ndarray:
+        """
+        Return the target speed at segment parameters, linear between vertices
+
+        Args:
+            segments (np.ndarray): (N,) segment index
+            params (np.ndarray): (N,) parameter in [0, 1] on the segment
+
+        Returns:
+            np.ndarray: (N,) target speed, NaN if the line has no target speed
+        """
+        if self._speeds is None:
+            return np.full(len(segments), np.nan)
+        starts = self._speeds[segments]
+        return starts + params * (self._speeds[segments + 1] - starts)
+
+    def project(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Project points to the racing line
+
+        Args:
+            points (np.ndarray): (N, 2) points
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (N,) normalized distance along
+                                                       the line, (N,) signed deviation,
+                                                       positive to the left, and (N,)
+                                                       target speed, NaN if the line
+                                                       has no target speed
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        segments, params = self._polyline.locate(points)
+        return (self._polyline.get_ndists(segments, params),
+                self._polyline.get_offsets(points, segments, params),
+                self.get_target_speeds(segments, params))
+
+    def project_point(self, x: float, y: float) -> Tuple[float, float, Optional[float]]:
+        """
+        Project a single point to the racing line, see project
+
+        Args:
+            x (float): point x
+            y (float): point y
+
+        Returns:
+            Tuple[float, float, Optional[float]]: normalized distance along the line,
+                                                  signed deviation, positive to the
+                                                  left, and target speed, None if
+                                                  the line has no target speed
+        """
+        segment, param = self._polyline.locate_point(x, y)
+        speed = None
+        if self._speed_values is not None:
+            start = self._speed_values[segment]
+            speed = start + param * (self._speed_values[segment + 1] - start)
+        return (self._polyline.get_ndist(segment, param),
+                self._polyline.get_offset(x, y, segment, param),
+                speed)
@@ -0,0 +1,296 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for ray-cast distance to track border state"""
+import math
+import weakref
+import numpy as np
+
+from typing import Dict, Tuple, Any
+from deepracer_env_state.state_interface import StateInterface
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.agent.constants import RELATIVE_POSITION_OF_FRONT_OF_CAR
+from deepracer_env_state.agent.utils import (
+    get_yaws,
+    rotate_array)
+from deepracer_env_state.track.polyline import get_track_polylines
+from deepracer_track_geometry import TrackGeometry
+
+# default number of rays of the fan
+RAY_COUNT = 11
+# default angle in radian between the outermost rays of the fan
+RAY_FIELD_OF_VIEW = math.pi
+# default ray length in meter, reported when a ray hits no border
+RAY_MAX_RANGE = 5.0
+
+
+class BorderSegments(object):
+    """
+    BorderSegments class
+
+    Start points and direction vectors of the inner and outer border
+    segments of a track geometry, built once per geometry by
+    get_border_segments. Rays are only intersected with the segments the
+    grid index of the border polylines lists along them.
+    """
+    def __init__(self, track_geometry: TrackGeometry):
+        """
+        Initialize BorderSegments
+
+        Args:
+            track_geometry (TrackGeometry): track geometry class instance
+        """
+        track_polylines = get_track_polylines(track_geometry)
+        self._polylines = (track_polylines.inner_border_line,
+                           track_polylines.outer_border_line)
+        coords = [polyline.coords for polyline in self._polylines]
+        self._start_x, self._start_y = np.concatenate([line[:-1] for line in coords]).T.copy()
+        self._direction_x, self._direction_y = np.concatenate(
+            [np.diff(line, axis=0) for line in coords]).T.copy()
+        # index of the first segment of each polyline
+        self._offsets = np.cumsum([0] + [len(line) - 1 for line in coords[:-1]])
+
+    def __len__(self) -> int:
+        """
+        Return number of border segments
+
+        Returns:
+            int: number of border segments
+        """
+        return len(self._start_x)
+
+    def get_candidates(self, origins: np.ndarray, rays: np.ndarray,
+                       max_range: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the segments which each ray of max_range can hit
+
+        Every point of a ray is within the nearby distance of the points
+        sampled along it at most twice that apart, so the segments near the
+        samples in the grid index of the border polylines include every
+        segment the ray crosses. A segment near several samples of a ray is
+        listed once per sample.
+
+        Args:
+            origins (np.ndarray): (M, 2) ray origins
+            rays (np.ndarray): (M, 2) unit ray directions
+            max_range (float): ray length in meter
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (P,) ascending ray index and (P,) segment index
+                                           of the candidate pairs
+        """
+        ray_indices, segments = [], []
+        for polyline, offset in zip(self._polylines, self._offsets.tolist()):
+            num_steps = max(int(math.ceil(max_range / (2.0 * polyline.nearby_distance))), 1)
+            steps = np.arange(num_steps + 1) * (max_range / num_steps)
+            points = np.empty((len(origins), len(steps), 2))
+            points[:, :, 0] = origins[:, 0:1] + steps * rays[:, 0:1]
+            points[:, :, 1] = origins[:, 1:2] + steps * rays[:, 1:2]
+            samples, polyline_segments = polyline.get_nearby_segments(points.reshape(-1, 2))
+            ray_indices.append(samples // len(steps))
+            segments.append(polyline_segments + offset)
+        # merge the pairs of both polylines, each in ray order
+        ray_indices = np.concatenate(ray_indices)
+        order = np.argsort(ray_indices, kind="mergesort")
+        return ray_indices[order], np.concatenate(segments)[order]
+
+    def cast(self, origins: np.ndarray, angles: np.ndarray, max_range: float) -> np.ndarray:
+        """
+        Return the distance along rays to the nearest border segment
+
+        All rays are intersected with their candidate segments in one pass,
+        solving origin + t * ray = start + s * direction for t >= 0 and s in
+        [0, 1].
+
+        Args:
+            origins (np.ndarray): (N, 2) ray origins
+            angles (np.ndarray): (N, K) ray angles in radian
+            max_range (float): ray length in meter
+
+        Returns:
+            np.ndarray: (N, K) distance to the nearest hit, max_range without hit
+        """
+        origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+        angles = np.asarray(angles, dtype=float).reshape(len(origins), -1)
+        ray_origins = np.repeat(origins, angles.shape[1], axis=0)
+        rays = np.empty((angles.size, 2))
+        rays[:, 0], rays[:, 1] = np.cos(angles).ravel(), np.sin(angles).ravel()
+        ray_indices, segments = self.get_candidates(ray_origins, rays, max_range)
+        # candidate segments relative to the origin of their ray
+        start_x = self._start_x[segments] - ray_origins[:, 0][ray_indices]
+        start_y = self._start_y[segments] - ray_origins[:, 1][ray_indices]
+        direction_x = self._direction_x[segments]
+        direction_y = self._direction_y[segments]
+        ray_x = rays[:, 0][ray_indices]
+        ray_y = rays[:, 1][ray_indices]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inverse_denominators = 1.0 / (ray_x * direction_y - ray_y * direction_x)
+            t = (start_x * direction_y - start_y * direction_x) * inverse_denominators
+            s = (start_x * ray_y - start_y * ray_x) * inverse_denominators
+            # parallel rays give infinite or NaN t and s
+            t[~((t >= 0.0) & (s >= 0.0) & (s <= 1.0))] = np.inf
+        # nearest hit of each ray, whose candidates are contiguous
+        firsts = np.flatnonzero(np.diff(ray_indices, prepend=-1))
+        distances = np.full(angles.size, float(max_range))
+        if len(firsts):
+            distances[ray_indices[firsts]] = np.minimum(np.minimum.reduceat(t, firsts),
+                                                        max_range)
+        return distances.reshape(angles.shape)
+
+
+_BORDER_SEGMENTS = weakref.WeakKeyDictionary()
+
+
+def get_border_segments(track_geometry: TrackGeometry) -> BorderSegments:
+    """
+    Return the border segments of a track geometry, built on first use
+
+    Border segments are cached per track geometry instance for as long as
+    the instance is alive.
+
+    Args:
+        track_geometry (TrackGeometry): track geometry class instance
+
+    Returns:
+        BorderSegments: border segments of the track geometry
+    """
+    border_segments = _BORDER_SEGMENTS.get(track_geometry)
+    if border_segments is None:
+        border_segments = BorderSegments(track_geometry)
+        _BORDER_SEGMENTS[track_geometry] = border_segments
+    return border_segments
+
+
+class RayCast(StateInterface):
+    """
+    RayCast class
+
+    LiDAR-like distance from the front of car of every agent to the track
+    borders along a fan of rays around the agent heading. Rays of all agents
+    are cast against the border segments in one vectorized pass per step.
+    """
+    def __init__(self, num_rays: int = RAY_COUNT,
+                 field_of_view: float = RAY_FIELD_OF_VIEW,
+                 max_range: float = RAY_MAX_RANGE):
+        """
+        Initialize RayCast
+
+        Args:
+            num_rays (int): number of rays of the fan
+            field_of_view (float): angle in radian between the outermost rays,
+                                   centered on the agent heading
+            max_range (float): ray length in meter
+
+        Raises:
+            ValueError: num_rays is less than 1 or max_range is not positive
+        """
+        if num_rays < 1:
+            raise ValueError("[RayCast]: num_rays must be at least 1, got {}".format(num_rays))
+        if max_range <= 0.0:
+            raise ValueError("[RayCast]: max_range must be positive, got {}".format(max_range))
+        self._ray_angles = np.linspace(-field_of_view / 2.0, field_of_view / 2.0, num_rays) \
+            if num_rays > 1 else np.zeros(1)
+        self._max_range = float(max_range)
+        self._agent_names = tuple()
+        self._distances = np.zeros((0, num_rays), dtype=np.float32)
+
+    @property
+    def ray_angles(self) -> np.ndarray:
+        """
+        Return ray angles relative to the agent heading
+
+        Returns:
+            np.ndarray: (K,) ray angle in radian, positive to the left
+        """
+        return self._ray_angles.copy()
+
+    @property
+    def max_range(self) -> float:
+        """
+        Return ray length
+
+        Returns:
+            float: ray length in meter
+        """
+        return self._max_range
+
+    @property
+    def agent_names(self) -> Tuple[str, ...]:
+        """
+        Return agent names in row order of distances
+
+        Returns:
+            Tuple[str, ...]: agent names
+        """
+        return self._agent_names
+
+    @property
+    def distances(self) -> np.ndarray:
+        """
+        Return ray distances of every agent
+
+        Returns:
+            np.ndarray: (N, K) float32 distance to the border along each ray,
+                        max_range without hit
+        """
+        return self._distances
+
+    @property
+    def ray_distances(self) -> Dict[str, np.ndarray]:
+        """
+        Return ray distances with agent name as key
+
+        Returns:
+            Dict[str, np.ndarray]: (K,) float32 distance to the border along each ray
+        """
+        return dict(zip(self._agent_names, self._distances))
+
+    def update(self, deepracer_env_data: DeepRacerEnvData) -> None:
+        """
+        Update the internal state information
+
+        Args:
+            deepracer_env_data (DeepRacerEnvData): DeepRacerEnvData class instance
+
+        """
+        agent_names = deepracer_env_data.agent_names
+        positions = deepracer_env_data.get_array("position").astype(float).reshape(-1, 3)
+        quaternions = deepracer_env_data.get_array("orientation").astype(float).reshape(-1, 4)
+        origins = (positions + rotate_array(RELATIVE_POSITION_OF_FRONT_OF_CAR, quaternions))[:, :2]
+        yaws = get_yaws(quaternions)
+        border_segments = get_border_segments(deepracer_env_data.track_geometry)
+        distances = border_segments.cast(origins, yaws[:, np.newaxis] + self._ray_angles,
+                                         self._max_range)
+        self._agent_names = agent_names
+        self._distances = distances.astype(np.float32)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Returns:
+            Tuple[str, ...]: field names in to_dict order
+        """
+        return ("ray_distances",)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return all internal state as a dict format
+
+        Returns:
+            Dict[str, Any]: internal state as a dict format
+        """
+        return {"ray_distances": self.ray_distances}
@@ -0,0 +1,123 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""Module for the road area of a track"""
+import weakref
+
+import numpy as np
+
+from typing import List, Tuple
+from deepracer_track_geometry import TrackGeometry
+
+
+def _build_edge_index(rings: List[np.ndarray]) -> Tuple[np.ndarray, ...]:
+    """
+    Return the edges of rings indexed by horizontal bands for contains
+
+    Args:
+        rings (List[np.ndarray]): closed (M, 2) rings
+
+    Returns:
+        Tuple[np.ndarray, ...]: band bottom and height, padded band edge indices,
+                                edge start x, start y, end y and inverse slopes
+    """
+    starts = np.concatenate([ring[:-1] for ring in rings])
+    ends = np.concatenate([ring[1:] for ring in rings])
+    low = np.minimum(starts[:, 1], ends[:, 1])
+    high = np.maximum(starts[:, 1], ends[:, 1])
+    num_bands = max(1, len(starts) // 4)
+    band_height = max((high.max() - low.min()) / num_bands, 1e-12)
+    first_band = np.clip(((low - low.min()) // band_height).astype(np.int64), 0, num_bands - 1)
+    last_band = np.clip(((high - low.min()) // band_height).astype(np.int64), 0, num_bands - 1)
+    band_edges = [[] for _ in range(num_bands)]
+    for edge, (first, last) in enumerate(zip(first_band, last_band)):
+        [band_edges[band].append(edge) for band in range(first, last + 1)]
+    # pad band edge lists with a horizontal edge at infinity which never straddles
+    width = max(len(edges) for edges in band_edges)
+    padded = np.full((num_bands, width), len(starts), dtype=np.int64)
+    for band, edges in enumerate(band_edges):
+        padded[band, :len(edges)] = edges
+    start_x = np.append(starts[:, 0], 0.0)
+    start_y = np.append(starts[:, 1], np.inf)
+    end_y = np.append(ends[:, 1], np.inf)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = np.append((ends[:, 0] - starts[:, 0]) / (ends[:, 1] - starts[:, 1]), 0.0)
+    return np.array([low.min(), band_height]), padded, start_x, start_y, end_y, slopes
+
+
+def contains(points: np.ndarray, edge_index: Tuple[np.ndarray, ...]) -> np.ndarray:
+    """
+    Return whether points are inside the area bounded by rings with even-odd rule
+
+    Edges are indexed by horizontal bands, so that each point is only tested
+    against the few edges overlapping its band.
+
+    Args:
+        points (np.ndarray): (N, 2) points
+        edge_index (Tuple[np.ndarray, ...]): edge index of the rings from _build_edge_index
+
+    Returns:
+        np.ndarray: (N,) True if the point is inside and False otherwise
+    """
+    (bottom, band_height), padded, start_x, start_y, end_y, slopes = edge_index
+    bands = np.clip(((points[:, 1] - bottom) // band_height).astype(np.int64),
+                    0, len(padded) - 1)
+    edges = padded[bands]
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+    straddles = (start_y[edges] > y) != (end_y[edges] > y)
+    with np.errstate(invalid="ignore"):
+        crossings = straddles & (x < start_x[edges] + (y - start_y[edges]) * slopes[edges])
+    return np.count_nonzero(crossings, axis=1) % 2 == 1
+
+
+def _get_road_rings(track_geometry: TrackGeometry) -> List[np.ndarray]:
+    """
+    Return the rings bounding the road area of a track
+
+    Args:
+        track_geometry (TrackGeometry): track geometry class instance
+
+    Returns:
+        List[np.ndarray]: closed (M, 2) rings
+    """
+    inner = np.asarray(track_geometry.inner_border_line.coords)[:, :2]
+    outer = np.asarray(track_geometry.outer_border_line.coords)[:, :2]
+    if np.allclose(inner[0], inner[-1]) and np.allclose(outer[0], outer[-1]):
+        return [outer, inner]
+    # open track: single ring along the outer border and back along the inner border
+    ring = np.concatenate([outer, inner[::-1]])
+    return [np.concatenate([ring, ring[:1]])]
+
+
+# road area edge index with track geometry as weak key
+_ROAD_EDGE_INDICES = weakref.WeakKeyDictionary()
+
+
+def get_road_edge_index(track_geometry: TrackGeometry) -> Tuple[np.ndarray, ...]:
+    """
+    Return the edge index of the road area of a track, built on first use
+
+    Args:
+        track_geometry (TrackGeometry): track geometry class instance
+
+    Returns:
+        Tuple[np.ndarray, ...]: edge index of the road rings from _build_edge_index
+    """
+    edge_index = _ROAD_EDGE_INDICES.get(track_geometry)
+    if edge_index is None:
+        edge_index = _build_edge_index(_get_road_rings(track_geometry))
+        _ROAD_EDGE_INDICES[track_geometry] = edge_index
+    return edge_index
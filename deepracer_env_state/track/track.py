@@ -14,28 +14,82 @@
 #   limitations under the License.                                              #
 #################################################################################
 """A class for track state"""
+from types import MappingProxyType
 from typing import Dict, List, Tuple, Optional, Any
 
 from deepracer_env_state.state_interface import StateInterface
 from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.track.racing_line import RacingLine
+from deepracer_env_state.track.track_geometry_pool import DefaultTrackGeometry
 from deepracer_track_geometry import (
     TrackGeometry,
     TrackDirection)
-from deepracer_env import DEFAULT_TRACK
 
 
 class Track(StateInterface):
     """
     Track class
     """
-    def __init__(self, track_geometry: Optional[TrackGeometry] = None):
+    _shared_attributes = ("_track_geometry", "_racing_lines")
+    # default track geometry, built on first use without a track geometry
+    _track_geometry = DefaultTrackGeometry()
+
+    def __init__(self, track_geometry: Optional[TrackGeometry] = None,
+                 racing_lines: Optional[Dict[Tuple[str, TrackDirection], RacingLine]] = None):
         """
         Initialize Track
 
         Args:
             track_geometry (Optional[TrackGeometry]): TrackGeometry instance
+            racing_lines (Optional[Dict[Tuple[str, TrackDirection], RacingLine]]):
+                racing line with (track name, direction) as key
+        """
+        if track_geometry is not None:
+            self._track_geometry = track_geometry
+        # immutable, so that copies share it until set_racing_line replaces it
+        self._racing_lines = MappingProxyType(dict(racing_lines or {}))
+
+    def set_racing_line(self, track_name: str, racing_line: Optional[RacingLine],
+                        direction: TrackDirection = TrackDirection.COUNTER_CLOCKWISE) -> None:
+        """
+        Set the racing line of a track direction
+
+        Args:
+            track_name (str): track name
+            racing_line (Optional[RacingLine]): racing line following the direction,
+                                                removes the line if None
+            direction (TrackDirection): track direction the line is raced in
+        """
+        racing_lines = dict(self._racing_lines)
+        if racing_line is None:
+            racing_lines.pop((track_name, direction), None)
+        else:
+            racing_lines[(track_name, direction)] = racing_line
+        self._racing_lines = MappingProxyType(racing_lines)
+
+    def get_racing_line(self,
+                        track_geometry: Optional[TrackGeometry] = None) -> Optional[RacingLine]:
+        """
+        Return the racing line of a track geometry in its direction
+
+        Args:
+            track_geometry (Optional[TrackGeometry]): track geometry, current one if None
+
+        Returns:
+            Optional[RacingLine]: racing line, None if the track direction has none
         """
-        self._track_geometry = track_geometry or TrackGeometry(DEFAULT_TRACK)
+        track_geometry = track_geometry or self._track_geometry
+        return self._racing_lines.get((track_geometry.track_name, track_geometry.direction))
+
+    @property
+    def racing_line(self) -> Optional[RacingLine]:
+        """
+        Return the racing line of the current track
+
+        Returns:
+            Optional[RacingLine]: racing line, None if the track has none
+        """
+        return self.get_racing_line(self._track_geometry)
 
     @property
     def is_clockwise(self) -> bool:
@@ -77,6 +131,18 @@ class Track(StateInterface):
         """
         self._track_geometry = deepracer_env_data.track_geometry
 
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        Return the names of the fields returned by to_dict
+
+        Returns:
+            Tuple[str, ...]: field names in to_dict order
+        """
+        return ("is_clockwise",
+                "track_length",
+                "waypoints")
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Return all internal state as a dict format
@@ -0,0 +1,282 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+"""A class for track geometry pool"""
+import threading
+import weakref
+
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from deepracer_env_state.track.polyline import get_track_polylines
+from deepracer_track_geometry import TrackGeometry
+
+_DEFAULT_TRACK_GEOMETRY = None
+_DEFAULT_TRACK_GEOMETRY_LOCK = threading.Lock()
+
+# default maximum number of retained track geometries
+DEFAULT_MAX_SIZE = 8
+
+
+def get_default_track_geometry() -> TrackGeometry:
+    """
+    Return the track geometry of the default track, built on first use
+
+    The geometry is shared by every state created without a track geometry,
+    and threads reading it concurrently on first use build it only once.
+
+    Returns:
+        TrackGeometry: track geometry class instance of DEFAULT_TRACK
+    """
+    global _DEFAULT_TRACK_GEOMETRY
+    if _DEFAULT_TRACK_GEOMETRY is None:
+        with _DEFAULT_TRACK_GEOMETRY_LOCK:
+            if _DEFAULT_TRACK_GEOMETRY is None:
+                # imported here, so that states without an env do not import deepracer_env
+                from deepracer_env import DEFAULT_TRACK
+                _DEFAULT_TRACK_GEOMETRY = TrackGeometry(DEFAULT_TRACK)
+    return _DEFAULT_TRACK_GEOMETRY
+
+
+class DefaultTrackGeometry(object):
+    """
+    DefaultTrackGeometry class
+
+    Non-data descriptor of a track geometry attribute which resolves to the
+    default track geometry on first read and stores it on the instance, so
+    that the geometry is only built when it is used and later reads are
+    plain attribute lookups. Assigning the attribute bypasses the descriptor.
+    """
+    def __set_name__(self, owner: type, name: str) -> None:
+        """
+        Remember the attribute name
+
+        Args:
+            owner (type): class owning the descriptor
+            name (str): attribute name
+        """
+        self._name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        """
+        Return the default track geometry and store it on the instance
+
+        Args:
+            instance (Any): instance the attribute is read from, None for the class
+            owner (type): class owning the descriptor
+
+        Returns:
+            Any: default track geometry, or the descriptor itself on the class
+        """
+        if instance is None:
+            return self
+        track_geometry = get_default_track_geometry()
+        instance.__dict__[self._name] = track_geometry
+        return track_geometry
+
+
+def build_track_geometry(track_config: Any) -> TrackGeometry:
+    """
+    Build the track geometry of a track config and its polylines
+
+    Args:
+        track_config (Any): track config with name, finish_line and direction
+
+    Returns:
+        TrackGeometry: track geometry class instance
+    """
+    track_geometry = TrackGeometry(
+        track_name=track_config.name,
+        finish_line=track_config.finish_line,
+        direction=track_config.direction)
+    # build the projection engine along, so that preloaded tracks are fully warm
+    get_track_polylines(track_geometry)
+    return track_geometry
+
+
+class TrackGeometryPool(object):
+    """
+    TrackGeometryPool class
+
+    Warm pool of TrackGeometry instances keyed by track config. Geometries of
+    upcoming tracks can be preloaded in the background, so that switching
+    track on reset only swaps in a ready geometry instead of building it.
+    The default executor uses a worker thread, which is shut down by close
+    or when the pool is garbage collected. A ProcessPoolExecutor can be given
+    instead, as long as the build function is picklable, and is left to its
+    owner.
+    """
+    def __init__(self,
+                 build: Callable[[Any], TrackGeometry] = build_track_geometry,
+                 executor: Optional[Executor] = None,
+                 max_size: Optional[int] = DEFAULT_MAX_SIZE):
+        """
+        Initialize TrackGeometryPool
+
+        Args:
+            build (Callable[[Any], TrackGeometry]): function building geometry from track config
+            executor (Optional[Executor]): executor running preloads,
+                                           single worker thread if None
+            max_size (Optional[int]): maximum number of retained geometries,
+                                      unbounded if None
+        """
+        self._build = build
+        self._executor = executor
+        # shuts down the executor created by the pool, None if there is none
+        self._executor_finalizer = None
+        self._max_size = max_size
+        self._geometries = OrderedDict()
+
+    @staticmethod
+    def get_key(track_config: Any) -> Hashable:
+        """
+        Return pool key of a track config
+
+        Args:
+            track_config (Any): track config with name, finish_line and direction
+
+        Returns:
+            Hashable: pool key
+        """
+        return track_config.name, track_config.finish_line, track_config.direction
+
+    def preload(self, track_configs: Iterable[Any]) -> None:
+        """
+        Start building the geometries of the given track configs in the background
+
+        Args:
+            track_configs (Iterable[Any]): upcoming track configs
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+            self._executor_finalizer = weakref.finalize(self, self._executor.shutdown,
+                                                        wait=False)
+        for track_config in track_configs:
+            key = self.get_key(track_config)
+            if key in self._geometries:
+                self._geometries.move_to_end(key)
+            else:
+                self._geometries[key] = self._executor.submit(self._build, track_config)
+        self._evict()
+
+    def is_ready(self, track_config: Any) -> bool:
+        """
+        Return whether the geometry of a track config is built
+
+        Args:
+            track_config (Any): track config with name, finish_line and direction
+
+        Returns:
+            bool: True if get returns without building or waiting and False otherwise
+        """
+        future = self._geometries.get(self.get_key(track_config))
+        return future is not None and future.done()
+
+    def get(self, track_config: Any) -> TrackGeometry:
+        """
+        Return the geometry of a track config
+
+        Waits for the geometry if it is being preloaded and builds it
+        synchronously if it was not preloaded.
+
+        Args:
+            track_config (Any): track config with name, finish_line and direction
+
+        Returns:
+            TrackGeometry: track geometry class instance
+        """
+        key = self.get_key(track_config)
+        future = self._geometries.get(key)
+        if future is None:
+            future = Future()
+            future.set_result(self.build(track_config))
+            self._geometries[key] = future
+        self._geometries.move_to_end(key)
+        try:
+            track_geometry = future.result()
+        except Exception:
+            # drop failed preload so that the next get builds again
+            del self._geometries[key]
+            raise
+        self._evict()
+        return track_geometry
+
+    def build(self, track_config: Any) -> TrackGeometry:
+        """
+        Build the geometry of a track config in the calling thread without retaining it
+
+        Preloads call the build function on the executor instead, which may
+        run in another process.
+
+        Args:
+            track_config (Any): track config with name, finish_line and direction
+
+        Returns:
+            TrackGeometry: track geometry class instance
+        """
+        return self._build(track_config)
+
+    def __bool__(self) -> bool:
+        """
+        Return True, so that an empty pool is not mistaken for no pool
+
+        Returns:
+            bool: always True
+        """
+        return True
+
+    def __len__(self) -> int:
+        """
+        Return number of retained and pending geometries
+
+        Returns:
+            int: number of retained and pending geometries
+        """
+        return len(self._geometries)
+
+    def clear(self) -> None:
+        """
+        Drop every retained geometry
+        """
+        self._geometries = OrderedDict()
+
+    def close(self) -> None:
+        """
+        Drop every retained geometry and shut down the executor created by the pool
+
+        A given executor is left to its owner. The pool can still be used
+        after close, and creates a new executor on the next preload.
+        """
+        self.clear()
+        if self._executor_finalizer is not None:
+            self._executor_finalizer()
+            self._executor_finalizer = None
+            self._executor = None
+
+    # alias of close
+    shutdown = close
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used built geometries beyond max_size
+        """
+        if self._max_size is None:
+            return
+        for key in list(self._geometries.keys()):
+            if len(self._geometries) <= self._max_size:
+                break
+            if self._geometries[key].done():
+                del self._geometries[key]
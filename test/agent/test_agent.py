@@ -13,11 +13,22 @@
 #   See the License for the specific language governing permissions and         #
 #   limitations under the License.                                              #
 #################################################################################
+import copy
+import pickle
+
 from unittest import TestCase
 from unittest.mock import patch
 
-from deepracer_env_state.agent.agent import Agent
+import numpy as np
+
+from deepracer_env_state.agent.agent import (
+    Agent,
+    AgentSnapshot)
 from deepracer_env_state.agent.constants import AgentStates
+from deepracer_env_state.agent.track_features import TrackFeatures
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.precision import get_error_bound
+from deepracer_track_geometry import TrackGeometry
 
 
 class AgentTest(TestCase):
@@ -35,6 +46,7 @@ class AgentTest(TestCase):
             {AgentStates.ACTION: action_mock(agent._name),
              AgentStates.POSE: pose_mock(agent._name),
              AgentStates.STATUS: status_mock(agent._name)})
+        status_mock.assert_any_call("agent0", None)
 
     def test_name(self) -> None:
         agent = Agent("agent0")
@@ -54,3 +66,99 @@ class AgentTest(TestCase):
     def test_status(self, status_mock) -> None:
         agent = Agent("agent0")
         self.assertEqual(agent.status, status_mock(agent._name))
+
+
+class AgentSnapshotTest(TestCase):
+    def setUp(self) -> None:
+        self.track_geometry = TrackGeometry("monaco")
+        self.agent = Agent("agent0", self.track_geometry)
+        self.agent.update(DeepRacerEnvData(
+            {"agent0": False},
+            {"agent0": (10.0, 2.0)},
+            {"agent0": {"position": (-7.25, 0.9, 0.0),
+                        "orientation": (0.0, 0.0, 0.3826834323650898, 0.9238795325112867),
+                        "is_offtrack": False,
+                        "progress": 12.5}},
+            self.track_geometry))
+
+    def test_snapshot(self) -> None:
+        snapshot = self.agent.snapshot()
+        self.assertEqual(snapshot.name, "agent0")
+        self.assertIs(snapshot.track_geometry, self.track_geometry)
+        self.assertEqual(len(snapshot.values), 30)
+        self.assertEqual(snapshot.values[:2], (10.0, 2.0))
+        self.assertEqual(snapshot.to_dict(), self.agent.to_dict())
+
+    def test_restore(self) -> None:
+        snapshot = self.agent.snapshot()
+        expected = self.agent.to_dict()
+        self.agent.update(DeepRacerEnvData(
+            {"agent0": True},
+            {"agent0": (-10.0, 1.0)},
+            {"agent0": {"position": (-6.75, 1.0, 0.0),
+                        "orientation": (0.0, 0.0, 0.0, 1.0),
+                        "is_offtrack": True,
+                        "progress": 50.0}},
+            self.track_geometry))
+        self.assertNotEqual(self.agent.to_dict(), expected)
+        self.agent.restore(snapshot)
+        self.assertEqual(self.agent.to_dict(), expected)
+        self.assertEqual(self.agent.status.steps, 1)
+        self.assertFalse(self.agent.status._done)
+
+    def test_snapshot_values(self) -> None:
+        values = self.agent.snapshot_values()
+        self.assertEqual(len(values), Agent.SNAPSHOT_SIZE)
+        agent = Agent("agent0", self.track_geometry)
+        agent.restore_values(values)
+        self.assertEqual(agent.to_dict(), self.agent.to_dict())
+
+    def test_to_agent(self) -> None:
+        agent = self.agent.snapshot().to_agent()
+        self.assertIsInstance(agent, Agent)
+        self.assertIsNot(agent, self.agent)
+        self.assertIs(agent.status.track_geometry, self.track_geometry)
+        self.assertEqual(agent.to_dict(), self.agent.to_dict())
+
+    def test_pickle(self) -> None:
+        snapshot = pickle.loads(pickle.dumps(self.agent.snapshot()))
+        self.assertIsInstance(snapshot, AgentSnapshot)
+        self.assertEqual(snapshot.values, self.agent.snapshot().values)
+
+    def test_snapshot_float32(self) -> None:
+        reference = np.array(self.agent.snapshot().values)
+        snapshot = self.agent.snapshot(np.float32)
+        self.assertEqual(snapshot.dtype, np.float32)
+        self.assertEqual(len(snapshot._values), len(reference) * 4)
+        error = np.abs(np.array(snapshot.values) - reference)
+        self.assertTrue(np.all(error <= get_error_bound(reference)))
+        snapshot = pickle.loads(pickle.dumps(snapshot))
+        self.assertEqual(snapshot.dtype, np.float32)
+        agent = snapshot.to_agent()
+        self.assertEqual(agent.status.steps, 1)
+        self.assertEqual(agent.status.closest_waypoints, self.agent.status.closest_waypoints)
+        self.assertAlmostEqual(agent.status.distance_from_center,
+                               self.agent.status.distance_from_center, places=5)
+
+    def test_deepcopy_on_demand_shares_track_geometry(self) -> None:
+        self.agent.add(AgentStates.TRACK_FEATURES, TrackFeatures("agent0"), update_every=None)
+        self.agent.update(DeepRacerEnvData(
+            {"agent0": False},
+            {"agent0": (10.0, 2.0)},
+            {"agent0": {"position": (-7.25, 0.9, 0.0),
+                        "orientation": (0.0, 0.0, 0.0, 1.0),
+                        "is_offtrack": False,
+                        "progress": 13.0}},
+            self.track_geometry))
+        agent = copy.deepcopy(self.agent)
+        deepracer_env_data = agent._pending[AgentStates.TRACK_FEATURES]
+        self.assertIsNot(deepracer_env_data, self.agent._pending[AgentStates.TRACK_FEATURES])
+        self.assertIs(deepracer_env_data.track_geometry, self.track_geometry)
+        self.assertEqual(agent.get(AgentStates.TRACK_FEATURES).to_dict(),
+                         self.agent.get(AgentStates.TRACK_FEATURES).to_dict())
+
+    def test_deepcopy_shares_track_geometry(self) -> None:
+        agent = copy.deepcopy(self.agent)
+        self.assertIsNot(agent.status, self.agent.status)
+        self.assertIs(agent.status.track_geometry, self.track_geometry)
+        self.assertEqual(agent.to_dict(), self.agent.to_dict())
@@ -0,0 +1,80 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from deepracer_env_state.agent.episode_stats import EpisodeStats
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+
+
+class EpisodeStatsTest(TestCase):
+    def setUp(self) -> None:
+        self.name = "agent0"
+        self.status = MagicMock()
+        self.episode_stats = EpisodeStats(self.name, self.status)
+
+    def step(self, distance_from_center, all_wheels_on_track, is_offtrack,
+             progress, done=False) -> None:
+        self.status.distance_from_center = distance_from_center
+        self.status.all_wheels_on_track = all_wheels_on_track
+        self.status.is_offtrack = is_offtrack
+        self.status.progress = progress
+        self.episode_stats.update(DeepRacerEnvData({self.name: done}, {}, {}, "track_geometry"))
+
+    def test_init(self) -> None:
+        self.assertEqual(self.episode_stats.episode_summary,
+                         {"steps": 0,
+                          "lap_steps": None,
+                          "mean_distance_from_center": 0.0,
+                          "max_distance_from_center": 0.0,
+                          "all_wheels_on_track_percentage": 0.0,
+                          "offtrack_count": 0,
+                          "progress_per_step": 0.0})
+
+    def test_update(self) -> None:
+        self.step(0.1, True, False, 40.0)
+        self.step(0.3, False, False, 80.0)
+        self.step(0.2, True, False, 100.0)
+        self.step(0.6, False, True, 100.0, done=True)
+        self.assertEqual(self.episode_stats.steps, 4)
+        self.assertEqual(self.episode_stats.lap_steps, 3)
+        self.assertAlmostEqual(self.episode_stats.mean_distance_from_center, 0.3)
+        self.assertAlmostEqual(self.episode_stats.max_distance_from_center, 0.6)
+        self.assertAlmostEqual(self.episode_stats.all_wheels_on_track_percentage, 50.0)
+        self.assertEqual(self.episode_stats.offtrack_count, 1)
+        self.assertAlmostEqual(self.episode_stats.progress_per_step, 25.0)
+
+    def test_offtrack_count_events(self) -> None:
+        self.step(0.1, True, False, 10.0)
+        self.step(0.6, False, True, 20.0)
+        self.step(0.7, False, True, 30.0)
+        self.step(0.2, True, False, 40.0)
+        self.step(0.6, False, True, 50.0)
+        self.assertEqual(self.episode_stats.offtrack_count, 2)
+
+    def test_update_reset_after_done(self) -> None:
+        self.step(0.5, False, True, 10.0, done=True)
+        self.step(0.1, True, False, 2.0)
+        self.assertEqual(self.episode_stats.steps, 1)
+        self.assertIsNone(self.episode_stats.lap_steps)
+        self.assertAlmostEqual(self.episode_stats.max_distance_from_center, 0.1)
+        self.assertAlmostEqual(self.episode_stats.all_wheels_on_track_percentage, 100.0)
+        self.assertEqual(self.episode_stats.offtrack_count, 0)
+
+    def test_to_dict(self) -> None:
+        self.step(0.1, True, False, 40.0)
+        self.assertEqual(self.episode_stats.to_dict(),
+                         {"episode_summary": self.episode_stats.episode_summary})
@@ -0,0 +1,144 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import copy
+
+from unittest import TestCase
+
+from deepracer_env_state.agent.constants import RELATIVE_POSITION_OF_FRONT_OF_CAR
+from deepracer_env_state.agent.lap_timing import LapTiming
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_track_geometry import TrackGeometry
+
+
+class LapTimingTest(TestCase):
+    def setUp(self) -> None:
+        self.name = "agent0"
+        self.track_geometry = TrackGeometry("monaco")
+        self.lap_timing = LapTiming(self.name, self.track_geometry)
+
+    def step(self, ndist, done=False, track_geometry=None) -> None:
+        track_geometry = track_geometry or self.track_geometry
+        point = track_geometry.get_point_from_ndist(ndist)
+        # place the front of car on the center line
+        position = (point.x - RELATIVE_POSITION_OF_FRONT_OF_CAR[0], point.y, 0.0)
+        self.lap_timing.update(DeepRacerEnvData(
+            {self.name: done}, {},
+            {self.name: {"position": position,
+                         "orientation": (0.0, 0.0, 0.0, 1.0),
+                         "is_offtrack": False,
+                         "progress": 0.0}},
+            track_geometry))
+
+    def test_init(self) -> None:
+        self.assertEqual(self.lap_timing.sector_starts, (0.0, 1 / 3, 2 / 3))
+        self.assertEqual(self.lap_timing.to_dict(),
+                         {"lap_timing": {"lap": 0,
+                                         "lap_steps": None,
+                                         "sector": None,
+                                         "sector_splits": (),
+                                         "laps_completed": 0,
+                                         "last_lap_steps": None,
+                                         "last_sector_splits": None,
+                                         "best_lap_steps": None,
+                                         "best_sector_splits": (None, None, None)}})
+        self.assertEqual(LapTiming(self.name, sectors=[0.25, 0.5]).sector_starts,
+                         (0.0, 0.25, 0.5))
+
+    def test_init_invalid_sectors(self) -> None:
+        with self.assertRaises(ValueError):
+            LapTiming(self.name, sectors=[0.5, 0.25])
+        with self.assertRaises(ValueError):
+            LapTiming(self.name, sectors=[0.0, 0.5])
+
+    def test_lap(self) -> None:
+        for ndist in (0.0, 0.2, 0.4, 0.6, 0.8, 0.95, 0.05):
+            self.step(ndist)
+        self.assertEqual(self.lap_timing.laps_completed, 1)
+        self.assertEqual(self.lap_timing.lap, 2)
+        self.assertAlmostEqual(self.lap_timing.last_lap_steps, 5.5)
+        for split, expected in zip(self.lap_timing.last_sector_splits, (5 / 3, 5 / 3, 13 / 6)):
+            self.assertAlmostEqual(split, expected)
+        self.assertAlmostEqual(self.lap_timing.best_lap_steps, 5.5)
+        self.assertEqual(self.lap_timing.sector, 0)
+        self.assertAlmostEqual(self.lap_timing.lap_steps, 0.5)
+        self.assertEqual(self.lap_timing.sector_splits, ())
+
+    def test_best_lap(self) -> None:
+        for ndist in (0.0, 0.2, 0.4, 0.6, 0.8, 0.95, 0.05, 0.4, 0.7, 0.95, 0.15):
+            self.step(ndist)
+        self.assertEqual(self.lap_timing.laps_completed, 2)
+        self.assertAlmostEqual(self.lap_timing.last_lap_steps, 3.75)
+        self.assertAlmostEqual(self.lap_timing.best_lap_steps, 3.75)
+        self.assertEqual(len(self.lap_timing.best_sector_splits), 3)
+        self.assertLess(self.lap_timing.best_sector_splits[0], 5 / 3)
+
+    def test_start_away_from_finish_line(self) -> None:
+        self.step(0.5)
+        self.assertEqual(self.lap_timing.lap, 0)
+        self.assertIsNone(self.lap_timing.lap_steps)
+        self.assertEqual(self.lap_timing.sector, 1)
+        for ndist in (0.7, 0.9, 0.1):
+            self.step(ndist)
+        # the partial lap is not timed
+        self.assertEqual(self.lap_timing.laps_completed, 0)
+        self.assertEqual(self.lap_timing.lap, 1)
+        self.assertAlmostEqual(self.lap_timing.lap_steps, 0.5)
+
+    def test_reverse(self) -> None:
+        for ndist in (0.0, 0.2, 0.4):
+            self.step(ndist)
+        self.assertEqual(len(self.lap_timing.sector_splits), 1)
+        self.step(0.3)
+        self.assertEqual(self.lap_timing.sector, 0)
+        self.assertEqual(self.lap_timing.sector_splits, ())
+        self.step(0.4)
+        self.assertEqual(self.lap_timing.sector, 1)
+        self.assertAlmostEqual(self.lap_timing.sector_splits[0], 4 + (1 / 3 - 0.3) / 0.1 - 1)
+
+    def test_reverse_finish_line(self) -> None:
+        for ndist in (0.0, 0.05, 0.95):
+            self.step(ndist)
+        self.assertIsNone(self.lap_timing.lap_steps)
+        self.assertEqual(self.lap_timing.sector, 2)
+        for ndist in (0.05, 0.4, 0.7, 0.99, 0.01):
+            self.step(ndist)
+        # timed again from the forward crossing
+        self.assertEqual(self.lap_timing.laps_completed, 1)
+        self.assertEqual(self.lap_timing.lap, 3)
+        self.assertAlmostEqual(self.lap_timing.last_lap_steps, 4.0)
+
+    def test_reset_after_done(self) -> None:
+        for ndist in (0.0, 0.2, 0.4, 0.6, 0.8, 0.95, 0.05):
+            self.step(ndist, done=ndist == 0.05)
+        self.assertEqual(self.lap_timing.laps_completed, 1)
+        self.step(0.5)
+        self.assertEqual(self.lap_timing.lap, 0)
+        self.assertIsNone(self.lap_timing.last_lap_steps)
+        # best times are kept over episodes
+        self.assertAlmostEqual(self.lap_timing.best_lap_steps, 5.5)
+
+    def test_track_change(self) -> None:
+        self.step(0.0)
+        track_geometry = TrackGeometry("reinvent_base")
+        self.step(0.5, track_geometry=track_geometry)
+        self.assertIs(self.lap_timing._track_geometry, track_geometry)
+        self.assertEqual(self.lap_timing.lap, 0)
+
+    def test_deepcopy(self) -> None:
+        self.step(0.0)
+        lap_timing = copy.deepcopy(self.lap_timing)
+        self.assertIs(lap_timing._center_line, self.lap_timing._center_line)
+        self.assertEqual(lap_timing.to_dict(), self.lap_timing.to_dict())
@@ -0,0 +1,72 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import copy
+
+from unittest import TestCase
+
+from deepracer_env_state.agent.racing_line_status import RacingLineStatus
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.track.racing_line import RacingLine
+from deepracer_env_state.track.track import Track
+from deepracer_track_geometry import TrackGeometry
+
+
+class RacingLineStatusTest(TestCase):
+    def setUp(self) -> None:
+        self.name = "agent0"
+        self.track_geometry = TrackGeometry("monaco")
+        self.track = Track(self.track_geometry)
+        self.racing_line_status = RacingLineStatus(self.name, self.track)
+
+    def step(self) -> DeepRacerEnvData:
+        deepracer_env_data = DeepRacerEnvData(
+            {self.name: False}, {},
+            {self.name: {"position": (1.0, 0.5, 0.0),
+                         "orientation": (0.0, 0.0, 0.0, 1.0),
+                         "is_offtrack": False,
+                         "progress": 0.0}},
+            self.track_geometry)
+        self.racing_line_status.update(deepracer_env_data)
+        return deepracer_env_data
+
+    def test_without_racing_line(self) -> None:
+        self.step()
+        self.assertEqual(self.racing_line_status.to_dict(),
+                         {"racing_line_deviation": None,
+                          "racing_line_speed": None,
+                          "racing_line_ndist": None})
+
+    def test_update(self) -> None:
+        racing_line = RacingLine([(-10.0, 0.0), (10.0, 0.0)], speeds=[1.0, 3.0])
+        self.track.set_racing_line("monaco", racing_line)
+        deepracer_env_data = self.step()
+        x, y, _ = deepracer_env_data.get_front_of_car_position(self.name)
+        self.assertAlmostEqual(self.racing_line_status.racing_line_deviation, y)
+        self.assertAlmostEqual(self.racing_line_status.racing_line_ndist, (x + 10.0) / 20.0)
+        self.assertAlmostEqual(self.racing_line_status.racing_line_speed,
+                               1.0 + 2.0 * (x + 10.0) / 20.0)
+        # line removed from the track
+        self.track.set_racing_line("monaco", None)
+        self.step()
+        self.assertIsNone(self.racing_line_status.racing_line_deviation)
+
+    def test_deepcopy(self) -> None:
+        racing_line_status = copy.deepcopy(self.racing_line_status)
+        self.assertIs(racing_line_status._track, self.track)
+
+    def test_fields(self) -> None:
+        self.assertEqual(tuple(self.racing_line_status.to_dict()),
+                         self.racing_line_status.fields)
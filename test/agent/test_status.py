@@ -49,15 +49,40 @@ class StatusTest(TestCase):
         is_wheels_on_track_mock.assert_called_once_with(condition=all)
 
     def test_closest_waypoints(self) -> None:
-        self.status._front_of_car_point = \
-            self.status._track_geometry.get_point_from_ndist(0.9)
+        self._update_front_of_car(self.status._track_geometry.get_point_from_ndist(0.9))
         self.assertEqual(self.status.closest_waypoints, (211, 212))
 
     def test_distance_from_center(self) -> None:
-        self.status._front_of_car_point = \
-            Point(self.status._track_geometry.get_point_from_ndist(0.9))
+        self._update_front_of_car(self.status._track_geometry.get_point_from_ndist(0.9))
         self.assertAlmostEqual(self.status.distance_from_center, 0)
 
+    def test_project_front_of_car(self) -> None:
+        self._update_front_of_car(self.status._track_geometry.get_point_from_ndist(0.9))
+        projection = self.status._project_front_of_car()
+        self.assertIs(self.status._project_front_of_car(), projection)
+        self.assertAlmostEqual(projection[2], 0)
+        self._update_front_of_car(self.status._track_geometry.get_point_from_ndist(0.3))
+        self.assertIsNot(self.status._project_front_of_car(), projection)
+
+    def test_clear_cache(self) -> None:
+        self._update_front_of_car(self.status._track_geometry.get_point_from_ndist(0.9))
+        projection = self.status._project_front_of_car()
+        point = self.status._front_of_car_point
+        self.status.clear_cache()
+        self.assertIsNot(self.status._project_front_of_car(), projection)
+        self.assertEqual(self.status._project_front_of_car(), projection)
+        self.assertIsNot(self.status._front_of_car_point, point)
+
+    def test_front_of_car_point(self) -> None:
+        self.status._front_of_car_position = (1.0, 2.0, 3.0)
+        self.status._front_of_car_shape = None
+        point = self.status._front_of_car_point
+        self.assertEqual(point.coords[:][0], (1.0, 2.0, 3.0))
+        self.assertIs(self.status._front_of_car_point, point)
+        self._update_front_of_car(Point(-6.75, 1))
+        self.assertIsNot(self.status._front_of_car_point, point)
+        self.assertAlmostEqual(self.status._front_of_car_point.x, -6.75)
+
     def test_is_offtrack(self) -> None:
         self.status._is_offtrack = True
         self.assertTrue(self.status.is_offtrack)
@@ -71,49 +96,44 @@ class StatusTest(TestCase):
         self.assertEqual(self.status.steps, 100)
 
     def test_track_width(self) -> None:
-        self.status._front_of_car_point = \
-            Point(self.status._track_geometry.get_point_from_ndist(0.1))
+        self._update_front_of_car(self.status._track_geometry.get_point_from_ndist(0.1))
         self.assertAlmostEqual(self.status.track_width, 1.4225172646452378)
 
-        self.status._front_of_car_point = \
-            Point(self.status._track_geometry.get_point_from_ndist(0.3))
+        self._update_front_of_car(self.status._track_geometry.get_point_from_ndist(0.3))
         self.assertAlmostEqual(self.status.track_width, 1.4422976314751388)
 
-        self.status._front_of_car_point = \
-            Point(self.status._track_geometry.get_point_from_ndist(0.5))
+        self._update_front_of_car(self.status._track_geometry.get_point_from_ndist(0.5))
         self.assertAlmostEqual(self.status.track_width, 1.437603192260296)
 
-        self.status._front_of_car_point = \
-            Point(self.status._track_geometry.get_point_from_ndist(0.7))
+        self._update_front_of_car(self.status._track_geometry.get_point_from_ndist(0.7))
         self.assertAlmostEqual(self.status.track_width, 1.4514809963425641)
 
-        self.status._front_of_car_point = \
-            Point(self.status._track_geometry.get_point_from_ndist(0.9))
+        self._update_front_of_car(self.status._track_geometry.get_point_from_ndist(0.9))
         self.assertAlmostEqual(self.status.track_width, 1.447689103441436)
 
     def test_is_left_of_center(self) -> None:
         # inner lane and cw
-        self.status._front_of_car_point = Point(-6.75, 1)
         self.status._track_geometry = TrackGeometry(
             "monaco", 0.0, TrackDirection.CLOCKWISE)
+        self._update_front_of_car(Point(-6.75, 1))
         self.assertFalse(self.status.is_left_of_center)
 
         # inner lane and ccw
-        self.status._front_of_car_point = Point(-6.75, 1)
         self.status._track_geometry = TrackGeometry(
             "monaco", 0.0, TrackDirection.COUNTER_CLOCKWISE)
+        self._update_front_of_car(Point(-6.75, 1))
         self.assertTrue(self.status.is_left_of_center)
 
         # outer lane and cw
         self.status._track_geometry = TrackGeometry(
             "monaco", 0.0, TrackDirection.CLOCKWISE)
-        self.status._front_of_car_point = Point(-7.5, 1)
+        self._update_front_of_car(Point(-7.5, 1))
         self.assertTrue(self.status.is_left_of_center)
 
         # outer lane and ccw
         self.status._track_geometry = TrackGeometry(
             "monaco", 0.0, TrackDirection.COUNTER_CLOCKWISE)
-        self.status._front_of_car_point = Point(-7.5, 1)
+        self._update_front_of_car(Point(-7.5, 1))
         self.assertFalse(self.status.is_left_of_center)
 
     def test_is_wheels_on_track_all(self) -> None:
@@ -184,18 +204,117 @@ class StatusTest(TestCase):
         self.assertEqual(self.status._is_offtrack, True)
         self.assertEqual(self.status._progress, 10)
 
-    def test_to_dict(self) -> None:
+    def _update(self, x, done=False, progress=10) -> None:
+        self.status.update(DeepRacerEnvData(
+            {self.name: done},
+            "test",
+            {self.name: {"position": (x, 0.9, 0.0),
+                         "orientation": (0.0, 0.0, 0.0, 1.0),
+                         "is_offtrack": False,
+                         "progress": progress}},
+            self.status._track_geometry))
+
+    def _update_front_of_car(self, point) -> None:
+        # the car heads along the x axis, so the front of car is offset in x only
+        self.status.update(DeepRacerEnvData(
+            {self.name: False},
+            "test",
+            {self.name: {"position": (point.x - RELATIVE_POSITION_OF_FRONT_OF_CAR[0],
+                                      point.y, 0.0),
+                         "orientation": (0.0, 0.0, 0.0, 1.0),
+                         "is_offtrack": False,
+                         "progress": 10}},
+            self.status._track_geometry))
+
+    def test_geometry_update_every(self) -> None:
+        self.status.set_geometry_update_rate(update_every=3)
+        self._update(-7.25)
+        distance_from_center = self.status.distance_from_center
+        self._update(-7.2, progress=11)
+        self._update(-7.15, progress=12)
+        # cheap fields stay per step while the geometric fields are stale
+        self.assertEqual(self.status.steps, 3)
+        self.assertEqual(self.status.progress, 12)
+        self.assertEqual(self.status._position, (-7.25, 0.9, 0.0))
+        self.assertEqual(self.status.distance_from_center, distance_from_center)
+        self.assertEqual(self.status.geometry_age, 2)
+        self.assertAlmostEqual(self.status.geometry_distance, 0.1)
+        self._update(-7.1)
+        self.assertEqual(self.status._position, (-7.1, 0.9, 0.0))
+        self.assertEqual(self.status.geometry_age, 0)
+        self.assertEqual(self.status.geometry_distance, 0.0)
+
+    def test_geometry_update_distance(self) -> None:
+        self.status.set_geometry_update_rate(update_every=None, update_distance=0.2)
+        self._update(-7.25)
+        self._update(-7.1)
+        self.assertEqual(self.status._position, (-7.25, 0.9, 0.0))
+        self.assertEqual(self.status.geometry_age, 1)
+        self._update(-7.0)
+        self.assertEqual(self.status._position, (-7.0, 0.9, 0.0))
+        self.assertEqual(self.status.geometry_age, 0)
+
+    def test_geometry_update_new_episode(self) -> None:
+        self.status.set_geometry_update_rate(update_every=10)
+        self._update(-7.25, done=True)
+        self._update(-7.0)
+        self.assertEqual(self.status._position, (-7.0, 0.9, 0.0))
+        self.assertEqual(self.status.steps, 1)
+
+    def test_geometry_update_snapshot_restore(self) -> None:
+        self.status.set_geometry_update_rate(update_every=5)
+        for x in (-7.25, -7.2, -7.15, -7.1):
+            self._update(x, progress=x + 8.0)
+        distance_from_center = self.status.distance_from_center
+        values = self.status.snapshot()
+        self.assertEqual(len(values), Status.SNAPSHOT_SIZE)
+        # the latest pose is kept next to the pose of the last geometry update
+        self.assertEqual(values[2:5], (-7.1, 0.9, 0.0))
+        self.assertAlmostEqual(values[10], 0.9)
+        self.assertEqual(values[11:14], (-7.25, 0.9, 0.0))
+        self._update(-6.9, done=True)
+        status = Status(self.name, self.status._track_geometry)
+        status.set_geometry_update_rate(update_every=5)
+        status.restore(values)
+        self.assertEqual(status.steps, 4)
+        self.assertEqual(status.geometry_age, 3)
+        self.assertAlmostEqual(status.geometry_distance, 0.15)
+        self.assertEqual(status._position, (-7.25, 0.9, 0.0))
+        self.assertEqual(status.distance_from_center, distance_from_center)
+        self.assertEqual(status.snapshot(), values)
+        # the next update continues from the latest pose and its staleness
+        self.status = status
+        self._update(-7.05)
+        self.assertEqual(status.geometry_age, 4)
+        self.assertAlmostEqual(status.geometry_distance, 0.2)
+        self._update(-7.0)
+        self.assertEqual(status.geometry_age, 0)
+        self.assertEqual(status._position, (-7.0, 0.9, 0.0))
+
+    def test_set_geometry_update_rate_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            self.status.set_geometry_update_rate(update_every=0)
+        with self.assertRaises(ValueError):
+            self.status.set_geometry_update_rate(update_every=None)
+
+    def test_is_wheels_on_track_cached(self) -> None:
         self.status._position = (-7.25, 0.9, 0)
-        self.status._orientation = (0.0, 0.0, 0.0, 1.0)
-        self.status._front_of_car_point = Point(-7.08824, 0.9, 0)
-        self.status._progress = 99.5298442510512
+        with patch.object(self.status._track_geometry, "is_on_track",
+                          return_value=True) as is_on_track_mock:
+            self.assertTrue(self.status.all_wheels_on_track)
+            self.assertTrue(self.status._is_wheels_on_track(any))
+        self.assertEqual(is_on_track_mock.call_count, 4)
+
+    def test_to_dict(self) -> None:
+        self._update(-7.25, progress=99.5298442510512)
+        self.assertEqual(self.status._front_of_car_point.coords[:][0], (-7.08824, 0.9, 0.0))
         status_dict = {
             "all_wheels_on_track": True,
             "closest_waypoints": (233, 234),
             "distance_from_center": 0.12220389538742775,
             "is_offtrack": False,
             "progress": 99.5298442510512,
-            "steps": 0,
+            "steps": 1,
             "track_width": 1.4475344276809832,
             "is_left_of_center": True}
         self.assertEqual(status_dict, self.status.to_dict())
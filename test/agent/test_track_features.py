@@ -0,0 +1,85 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import copy
+import math
+
+from unittest import TestCase
+
+from deepracer_env_state.agent.constants import RELATIVE_POSITION_OF_FRONT_OF_CAR
+from deepracer_env_state.agent.track_features import TrackFeatures
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.track.profile import get_track_profile
+from deepracer_track_geometry import TrackGeometry
+
+
+class TrackFeaturesTest(TestCase):
+    def setUp(self) -> None:
+        self.name = "agent0"
+        self.track_geometry = TrackGeometry("monaco")
+        self.track_features = TrackFeatures(self.name, look_ahead_distances=(0.0, 5.0))
+
+    def step(self, ndist, yaw) -> None:
+        point = self.track_geometry.get_point_from_ndist(ndist)
+        orientation = (0.0, 0.0, math.sin(yaw / 2.0), math.cos(yaw / 2.0))
+        front_x = RELATIVE_POSITION_OF_FRONT_OF_CAR[0]
+        # place the front of car on the center line
+        position = (point.x - front_x * math.cos(yaw), point.y - front_x * math.sin(yaw), 0.0)
+        self.track_features.update(DeepRacerEnvData(
+            {self.name: False}, {},
+            {self.name: {"position": position,
+                         "orientation": orientation,
+                         "is_offtrack": False,
+                         "progress": 0.0}},
+            self.track_geometry))
+
+    def test_init(self) -> None:
+        self.assertEqual(self.track_features.to_dict(),
+                         {"heading_error": 0.0,
+                          "look_ahead_curvatures": (0.0, 0.0),
+                          "look_ahead_turns": (0, 0)})
+
+    def test_heading_error(self) -> None:
+        self.step(0.1, 0.0)
+        profile = get_track_profile(self.track_geometry)
+        heading = profile.get_heading(self.track_features._segment)
+        self.step(0.1, heading + 0.2)
+        self.assertAlmostEqual(self.track_features.heading_error, 0.2)
+        # wrapped into [-pi, pi)
+        self.step(0.1, heading - 0.2 + 2.0 * math.pi)
+        self.assertAlmostEqual(self.track_features.heading_error, -0.2)
+
+    def test_look_ahead(self) -> None:
+        self.step(0.1, 0.0)
+        profile = get_track_profile(self.track_geometry)
+        distance = 0.1 * profile.length
+        self.assertAlmostEqual(self.track_features._distance, distance)
+        curvatures = self.track_features.look_ahead_curvatures
+        self.assertEqual(curvatures, (profile.get_curvature(distance),
+                                      profile.get_curvature(distance + 5.0)))
+        # the counter clockwise track only turns left
+        self.assertGreater(min(curvatures), 0.0)
+        self.assertEqual(self.track_features.look_ahead_turns,
+                         tuple(1 if curvature >= 0.1 else 0 for curvature in curvatures))
+
+    def test_fields(self) -> None:
+        self.step(0.5, 0.0)
+        self.assertEqual(tuple(self.track_features.to_dict()), self.track_features.fields)
+
+    def test_deepcopy(self) -> None:
+        self.step(0.5, 0.0)
+        track_features = copy.deepcopy(self.track_features)
+        self.assertIs(track_features._profile, self.track_features._profile)
+        self.assertEqual(track_features.to_dict(), self.track_features.to_dict())
@@ -0,0 +1,161 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import numpy as np
+
+from unittest import TestCase
+
+from deepracer_env_state.agent.constants import RELATIVE_POSITION_OF_FRONT_OF_CAR
+from deepracer_env_state.agent.racing_line_status import RacingLineStatus
+from deepracer_env_state.agent.status import Status
+from deepracer_env_state.agent.trajectory import (
+    evaluate_racing_line,
+    evaluate_trajectory,
+    get_racing_line_dtype,
+    get_trajectory_dtype,
+    RACING_LINE_DTYPE,
+    TRAJECTORY_DTYPE)
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.precision import get_error_bound
+from deepracer_env_state.track.racing_line import RacingLine
+from deepracer_env_state.track.track import Track
+from deepracer_track_geometry import (
+    TrackGeometry,
+    TrackDirection)
+
+
+class TrajectoryTest(TestCase):
+    def setUp(self) -> None:
+        self.name = "agent0"
+        random_state = np.random.RandomState(0)
+        self.steps = 50
+        self.positions = np.c_[random_state.uniform(-8.0, 8.0, self.steps),
+                               random_state.uniform(-6.0, 6.0, self.steps),
+                               np.zeros(self.steps)]
+        yaws = random_state.uniform(-np.pi, np.pi, self.steps)
+        self.orientations = np.c_[np.zeros(self.steps), np.zeros(self.steps),
+                                  np.sin(yaws / 2), np.cos(yaws / 2)]
+
+    def _get_expected(self, track_geometry):
+        status = Status(self.name, track_geometry)
+        expected = []
+        for position, orientation in zip(self.positions, self.orientations):
+            status.update(DeepRacerEnvData(
+                {self.name: False},
+                {},
+                {self.name: {"position": tuple(position),
+                             "orientation": tuple(orientation),
+                             "is_offtrack": False,
+                             "progress": 0.0}},
+                track_geometry))
+            expected.append(status.to_dict())
+        return expected
+
+    def test_evaluate_trajectory(self) -> None:
+        for direction in TrackDirection:
+            track_geometry = TrackGeometry("monaco", 0.0, direction)
+            result = evaluate_trajectory(self.positions, self.orientations, track_geometry)
+            self.assertEqual(result.dtype, TRAJECTORY_DTYPE)
+            self.assertEqual(len(result), self.steps)
+            for row, expected in zip(result, self._get_expected(track_geometry)):
+                self.assertEqual(bool(row["all_wheels_on_track"]),
+                                 expected["all_wheels_on_track"])
+                self.assertEqual(tuple(row["closest_waypoints"]),
+                                 expected["closest_waypoints"])
+                self.assertAlmostEqual(row["distance_from_center"],
+                                       expected["distance_from_center"])
+                self.assertAlmostEqual(row["track_width"], expected["track_width"])
+                self.assertEqual(bool(row["is_left_of_center"]),
+                                 expected["is_left_of_center"])
+
+    def test_evaluate_trajectory_on_center_line(self) -> None:
+        track_geometry = TrackGeometry("monaco")
+        point = track_geometry.get_point_from_ndist(0.3)
+        # agent facing +x with its front of car on the center line
+        position = (point.x - RELATIVE_POSITION_OF_FRONT_OF_CAR[0], point.y, 0.0)
+        result = evaluate_trajectory([position], [(0.0, 0.0, 0.0, 1.0)], track_geometry)
+        self.assertAlmostEqual(result["distance_from_center"][0], 0.0)
+        self.assertTrue(result["all_wheels_on_track"][0])
+
+    def test_evaluate_trajectory_empty(self) -> None:
+        result = evaluate_trajectory(np.zeros((0, 3)), np.zeros((0, 4)), TrackGeometry("monaco"))
+        self.assertEqual(len(result), 0)
+        self.assertEqual(result.dtype, TRAJECTORY_DTYPE)
+
+    def test_get_dtype(self) -> None:
+        self.assertEqual(get_trajectory_dtype(), TRAJECTORY_DTYPE)
+        self.assertEqual(get_racing_line_dtype(), RACING_LINE_DTYPE)
+        self.assertEqual(get_trajectory_dtype(np.float32)["x"], np.float32)
+        self.assertEqual(get_trajectory_dtype(np.float32).itemsize,
+                         TRAJECTORY_DTYPE.itemsize - 5 * 4)
+        self.assertEqual(get_racing_line_dtype(np.float32).itemsize,
+                         RACING_LINE_DTYPE.itemsize // 2)
+        with self.assertRaises(ValueError):
+            get_trajectory_dtype(np.int32)
+
+    def test_evaluate_trajectory_float32(self) -> None:
+        for track_name in ("monaco", "reinvent_base", "austin"):
+            track_geometry = TrackGeometry(track_name)
+            reference = evaluate_trajectory(self.positions, self.orientations, track_geometry)
+            result = evaluate_trajectory(self.positions, self.orientations, track_geometry,
+                                         np.float32)
+            self.assertEqual(result.dtype, get_trajectory_dtype(np.float32))
+            for field in ("x", "y", "z", "distance_from_center", "track_width"):
+                error = np.abs(result[field].astype(np.float64) - reference[field])
+                self.assertTrue(np.all(error <= get_error_bound(reference[field])),
+                                msg=(track_name, field))
+            # bundled tracks are within 100 meters, so positions are within 6e-6 meter
+            self.assertLess(np.abs(np.asarray(track_geometry.outer_border_line.coords)).max(),
+                            100.0)
+            for field in ("all_wheels_on_track", "closest_waypoints", "is_left_of_center"):
+                np.testing.assert_array_equal(result[field], reference[field],
+                                              err_msg=track_name)
+
+    def test_evaluate_racing_line(self) -> None:
+        track_geometry = TrackGeometry("monaco")
+        coords = np.asarray(track_geometry.track_center_line.coords) * 0.95
+        racing_line = RacingLine(coords, speeds=np.linspace(1.0, 4.0, len(coords)))
+        track = Track(track_geometry, {("monaco", track_geometry.direction): racing_line})
+        racing_line_status = RacingLineStatus(self.name, track)
+        result = evaluate_racing_line(self.positions, self.orientations, racing_line)
+        self.assertEqual(result.dtype, RACING_LINE_DTYPE)
+        for index, (position, orientation) in enumerate(zip(self.positions, self.orientations)):
+            racing_line_status.update(DeepRacerEnvData(
+                {self.name: False},
+                {},
+                {self.name: {"position": tuple(position),
+                             "orientation": tuple(orientation),
+                             "is_offtrack": False,
+                             "progress": 0.0}},
+                track_geometry))
+            for field, value in racing_line_status.to_dict().items():
+                self.assertAlmostEqual(result[field][index], value, places=9)
+
+    def test_evaluate_racing_line_float32(self) -> None:
+        track_geometry = TrackGeometry("monaco")
+        coords = np.asarray(track_geometry.track_center_line.coords) * 0.95
+        racing_line = RacingLine(coords, speeds=np.linspace(1.0, 4.0, len(coords)))
+        reference = evaluate_racing_line(self.positions, self.orientations, racing_line)
+        result = evaluate_racing_line(self.positions, self.orientations, racing_line,
+                                      np.float32)
+        self.assertEqual(result.dtype, get_racing_line_dtype(np.float32))
+        for field in RACING_LINE_DTYPE.names:
+            error = np.abs(result[field].astype(np.float64) - reference[field])
+            self.assertTrue(np.all(error <= get_error_bound(reference[field])), msg=field)
+
+    def test_evaluate_racing_line_empty(self) -> None:
+        racing_line = RacingLine([(0.0, 0.0), (1.0, 0.0)])
+        self.assertEqual(len(evaluate_racing_line(np.zeros((0, 3)), np.zeros((0, 4)),
+                                                  racing_line)), 0)
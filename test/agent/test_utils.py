@@ -14,8 +14,17 @@
 #   limitations under the License.                                              #
 #################################################################################
 from unittest import TestCase
+from deepracer_env_state.agent.constants import (
+    RELATIVE_POSITION_OF_FOUR_WHEELS,
+    RELATIVE_POSITION_OF_FRONT_OF_CAR)
 from deepracer_env_state.agent.utils import (
+    apply_rotation,
+    get_front_of_car_position,
+    get_rotation_coefficients,
+    get_wheel_positions,
+    get_yaws,
     rotate,
+    rotate_array,
     quaternion_to_euler)
 
 
@@ -29,6 +38,49 @@ class UtilsTest(TestCase):
         expected_vector = (-1.0, 0.0, 0.0)
         self.assertEqual(rotate(vector, quaternion), expected_vector)
 
+    def test_rotate_array(self) -> None:
+        vector = [1.0, 2.0, 0.5]
+        quaternions = [[0.0, 0.0, 1.0, 0.0],
+                       [0.1, -0.2, 0.3, 0.9273618495495703]]
+        rotated = rotate_array(vector, quaternions)
+        self.assertEqual(rotated.shape, (2, 3))
+        for quaternion, row in zip(quaternions, rotated):
+            self.assertEqual(tuple(row), rotate(vector, quaternion))
+
+    def test_apply_rotation(self) -> None:
+        vector = [1.0, 2.0, 0.5]
+        quaternion = [0.1, -0.2, 0.3, 0.9273618495495703]
+        coefficients = get_rotation_coefficients(quaternion)
+        self.assertEqual(len(coefficients), 9)
+        for rotated, expected in zip(apply_rotation(vector, coefficients),
+                                     rotate(vector, quaternion)):
+            self.assertAlmostEqual(rotated, expected)
+        for rotated, expected, translation in zip(
+                apply_rotation(vector, coefficients, (1.0, 2.0, 3.0)),
+                rotate(vector, quaternion),
+                (1.0, 2.0, 3.0)):
+            self.assertAlmostEqual(rotated, expected + translation)
+
+    def test_get_front_of_car_position(self) -> None:
+        orientation = (0.0, 0.0, 0.3826834323650898, 0.9238795325112867)
+        self.assertEqual(get_front_of_car_position((1.0, 2.0, 3.0), orientation),
+                         (1.1143815929247358, 2.114381592924736, 3.0))
+        expected = rotate(RELATIVE_POSITION_OF_FRONT_OF_CAR, orientation)
+        for position, relative_position in zip(
+                get_front_of_car_position((0.0, 0.0, 0.0), orientation), expected):
+            self.assertAlmostEqual(position, relative_position)
+
+    def test_get_wheel_positions(self) -> None:
+        orientation = (0.0, 0.0, 0.3826834323650898, 0.9238795325112867)
+        wheel_positions = get_wheel_positions((1.0, 2.0, 0.0), orientation)
+        self.assertEqual(len(wheel_positions), 4)
+        for wheel_position, wheel_relative_position in zip(wheel_positions,
+                                                           RELATIVE_POSITION_OF_FOUR_WHEELS):
+            expected = rotate(wheel_relative_position, orientation)
+            self.assertAlmostEqual(wheel_position[0], 1.0 + expected[0])
+            self.assertAlmostEqual(wheel_position[1], 2.0 + expected[1])
+            self.assertAlmostEqual(wheel_position[2], expected[2])
+
     def test_quaternion_to_euler(self) -> None:
         quaternion = (
             -0.7182870182434113,
@@ -45,3 +97,12 @@ class UtilsTest(TestCase):
             1.1415926535897936,
             -0.14159265358979317)
         self.assertEqual(euler, expected_euler)
+
+    def test_get_yaws(self) -> None:
+        quaternions = [(-0.7182870182434113, 0.31062245106570396,
+                        0.44443511344300074, 0.4359528440735657),
+                       (0.0, 0.0, 0.0, 1.0)]
+        yaws = get_yaws(quaternions)
+        self.assertEqual(yaws.shape, (2,))
+        for quaternion, yaw in zip(quaternions, yaws):
+            self.assertAlmostEqual(yaw, quaternion_to_euler(*quaternion)[2], places=12)
@@ -0,0 +1,172 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from deepracer_env_state.batch_env_state import BatchDeepRacerEnvState
+from deepracer_env_state.deepracer_env_state import DeepRacerEnvState
+from deepracer_env_state.precision import (
+    FLOAT32_RELATIVE_ERROR,
+    get_error_bound)
+from deepracer_env_state.track.track_geometry_pool import TrackGeometryPool
+from deepracer_env_config import Track as TrackConfig
+from deepracer_env_config import Agent as AgentConfig
+
+
+class BatchDeepRacerEnvStateTest(TestCase):
+    def setUp(self) -> None:
+        self.deepracer_envs = []
+        for _ in range(3):
+            env = MagicMock()
+            env.get_track.return_value = TrackConfig()
+            env.get_agent.return_value = [AgentConfig(name="agent0"),
+                                          AgentConfig(name="agent1")]
+            self.deepracer_envs.append(env)
+
+    def _step_result(self, offset, done=False):
+        info = {"agent0": {"position": (-7.25 + offset, 0.9, 0.0),
+                           "orientation": (0.0, 0.0, 0.3826834323650898, 0.9238795325112867),
+                           "is_offtrack": False,
+                           "progress": 12.5 + offset},
+                "agent1": {"position": (-6.75, 1.0 + offset, 0.0),
+                           "orientation": (0.0, 0.0, 0.0, 1.0),
+                           "is_offtrack": True,
+                           "progress": 50.0}}
+        return (None, None, {"agent0": done, "agent1": False},
+                {"agent0": (10.0, 2.0 + offset), "agent1": (-5.0, 1.0)}, info)
+
+    def test_init(self) -> None:
+        batch = BatchDeepRacerEnvState(self.deepracer_envs)
+        self.assertEqual(batch.num_envs, 3)
+        self.assertEqual(batch.agent_names, [("agent0", "agent1")] * 3)
+        # environments on the same track share the geometry
+        self.assertEqual(len(set(map(id, batch.track_geometries))), 1)
+        for index, env in enumerate(self.deepracer_envs):
+            env.register.assert_called_once_with(batch)
+            self.assertEqual(batch.get_env_index(env), index)
+        arrays = batch.to_arrays(["position", "orientation", "steps"])
+        self.assertEqual(arrays["position"].shape, (3, 2, 3))
+        np.testing.assert_array_equal(arrays["orientation"][..., 3], np.ones((3, 2)))
+        np.testing.assert_array_equal(arrays["steps"], np.zeros((3, 2)))
+
+    def test_init_empty_track_geometry_pool(self) -> None:
+        # an empty pool given is shared
+        track_geometry_pool = TrackGeometryPool()
+        batch = BatchDeepRacerEnvState(self.deepracer_envs, track_geometry_pool)
+        self.assertIs(batch._track_geometry_pool, track_geometry_pool)
+        self.assertEqual(len(track_geometry_pool), 1)
+
+    def test_init_agent_count_mismatch(self) -> None:
+        self.deepracer_envs[1].get_agent.return_value = AgentConfig(name="agent0")
+        with self.assertRaises(ValueError):
+            BatchDeepRacerEnvState(self.deepracer_envs)
+
+    def test_to_arrays_matches_env_state(self) -> None:
+        batch = BatchDeepRacerEnvState(self.deepracer_envs)
+        env_state = DeepRacerEnvState(self.deepracer_envs[1])
+        for step in range(3):
+            step_result = self._step_result(0.1 * step, done=step == 1)
+            batch.on_step(self.deepracer_envs[1], step_result)
+            env_state.on_step(self.deepracer_envs[1], step_result)
+        arrays = batch.to_arrays()
+        for agent_index, (name, agent) in enumerate(env_state.agents.items()):
+            expected = agent.to_dict()
+            for field in ("steps", "is_offtrack", "progress", "speed", "steering_angle",
+                          "all_wheels_on_track", "distance_from_center", "track_width",
+                          "is_left_of_center"):
+                self.assertAlmostEqual(arrays[field][1, agent_index], expected[field],
+                                       msg=field)
+            self.assertEqual(tuple(arrays["closest_waypoints"][1, agent_index]),
+                             tuple(expected["closest_waypoints"]))
+            np.testing.assert_allclose(arrays["position"][1, agent_index],
+                                       agent.status._position)
+            np.testing.assert_allclose(arrays["front_of_car_position"][1, agent_index],
+                                       agent.status._front_of_car_position)
+        # other environments are not stepped
+        np.testing.assert_array_equal(arrays["steps"][[0, 2]], np.zeros((2, 2)))
+
+    def test_to_arrays_float32(self) -> None:
+        reference_batch = BatchDeepRacerEnvState(self.deepracer_envs)
+        batch = BatchDeepRacerEnvState(self.deepracer_envs, dtype=np.float32)
+        self.assertEqual(batch.dtype, np.float32)
+        for step in range(3):
+            for env in self.deepracer_envs:
+                step_result = self._step_result(0.1 * step + 0.01 * batch.get_env_index(env))
+                reference_batch.on_step(env, step_result)
+                batch.on_step(env, step_result)
+        reference = reference_batch.to_arrays()
+        arrays = batch.to_arrays()
+        for field in ("steering_angle", "speed", "position", "orientation", "progress",
+                      "front_of_car_position", "distance_from_center", "track_width"):
+            self.assertEqual(arrays[field].dtype, np.float32, msg=field)
+        for field in ("steering_angle", "speed", "position", "orientation", "progress"):
+            error = np.abs(arrays[field] - reference[field])
+            self.assertTrue(np.all(error <= get_error_bound(reference[field])), msg=field)
+        # distances evaluated from float32 positions
+        position_norm = np.linalg.norm(reference["position"], axis=-1)
+        for field in ("front_of_car_position", "distance_from_center"):
+            error = np.abs(arrays[field] - reference[field])
+            bound = FLOAT32_RELATIVE_ERROR * (np.abs(reference[field]) + 1.0 +
+                                              (position_norm[..., None] if error.ndim == 3
+                                               else position_norm))
+            self.assertTrue(np.all(error <= bound), msg=field)
+        for field in ("steps", "done", "is_offtrack", "all_wheels_on_track",
+                      "closest_waypoints", "is_left_of_center"):
+            np.testing.assert_array_equal(arrays[field], reference[field], err_msg=field)
+
+    def test_init_dtype_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            BatchDeepRacerEnvState(self.deepracer_envs, dtype=np.float16)
+
+    def test_to_arrays_copy(self) -> None:
+        batch = BatchDeepRacerEnvState(self.deepracer_envs)
+        batch.on_step(self.deepracer_envs[0], self._step_result(0.0))
+        arrays = batch.to_arrays(["progress", "distance_from_center"])
+        self.assertEqual(set(arrays), {"progress", "distance_from_center"})
+        arrays["progress"][:] = -1.0
+        arrays["distance_from_center"][:] = -1.0
+        self.assertEqual(batch.to_arrays(["progress"])["progress"][0, 0], 12.5)
+        self.assertGreaterEqual(
+            batch.to_arrays(["distance_from_center"])["distance_from_center"].min(), 0.0)
+
+    def test_to_arrays_unknown(self) -> None:
+        batch = BatchDeepRacerEnvState(self.deepracer_envs)
+        with self.assertRaises(ValueError):
+            batch.to_arrays(["progress", "unknown"])
+
+    def test_on_reset_diff_track(self) -> None:
+        track_geometry_pool = MagicMock()
+        batch = BatchDeepRacerEnvState(self.deepracer_envs, track_geometry_pool)
+        track_config = TrackConfig(name="austin")
+        self.deepracer_envs[2].get_track.return_value = track_config
+        batch.on_reset(self.deepracer_envs[0], MagicMock())
+        self.assertEqual(track_geometry_pool.get.call_count, 3)
+        batch.on_reset(self.deepracer_envs[2], MagicMock())
+        track_geometry_pool.get.assert_called_with(track_config)
+        self.assertEqual(track_geometry_pool.get.call_count, 4)
+
+    def test_track_groups(self) -> None:
+        track_geometry_pool = TrackGeometryPool()
+        batch = BatchDeepRacerEnvState(self.deepracer_envs, track_geometry_pool)
+        for env in self.deepracer_envs:
+            batch.on_step(env, self._step_result(0.0))
+        self.deepracer_envs[2].get_track.return_value = TrackConfig(name="austin")
+        batch.on_reset(self.deepracer_envs[2], MagicMock())
+        self.assertIsNot(batch.track_geometries[2], batch.track_geometries[0])
+        arrays = batch.to_arrays(["track_width"])
+        np.testing.assert_array_equal(arrays["track_width"][0], arrays["track_width"][1])
@@ -14,7 +14,7 @@
 #   limitations under the License.                                              #
 #################################################################################
 from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, call
 
 from deepracer_env_state.composite_state import CompositeState
 from deepracer_env_state.agent.constants import AgentStates
@@ -70,3 +70,122 @@ class CompositeStateTest(TestCase):
         composite_state._states = {AgentStates.ACTION: state1,
                                    AgentStates.POSE: state2}
         self.assertEqual(composite_state.to_dict(), {"action": 1.0, "pose": 2.0})
+
+    def test_fields(self) -> None:
+        state1 = MagicMock()
+        state2 = MagicMock()
+        state1.fields = ("speed",)
+        state2.fields = ("x", "y")
+        composite_state = CompositeState()
+        composite_state._states = {AgentStates.ACTION: state1,
+                                   AgentStates.POSE: state2}
+        self.assertEqual(composite_state.fields, ("speed", "x", "y"))
+
+    def test_compile_fields(self) -> None:
+        state1 = MagicMock()
+        state2 = MagicMock()
+        state1.fields = ("speed", "steering_angle")
+        state2.fields = ("x", "y")
+        composite_state = CompositeState()
+        composite_state._states = {AgentStates.ACTION: state1,
+                                   AgentStates.POSE: state2}
+        self.assertEqual(composite_state.compile_fields(["y", "speed"]),
+                         {AgentStates.ACTION: ("speed",),
+                          AgentStates.POSE: ("y",)})
+        self.assertEqual(composite_state.compile_fields(["x"]),
+                         {AgentStates.POSE: ("x",)})
+
+    def test_compile_fields_unknown(self) -> None:
+        composite_state = CompositeState()
+        composite_state.add(AgentStates.ACTION, Action("agent0"))
+        with self.assertRaises(ValueError):
+            composite_state.compile_fields(["speed", "unknown"])
+
+    def test_evaluate(self) -> None:
+        state1 = MagicMock()
+        state2 = MagicMock()
+        state1.select.return_value = {"speed": 1.0}
+        composite_state = CompositeState()
+        composite_state._states = {AgentStates.ACTION: state1,
+                                   AgentStates.POSE: state2}
+        self.assertEqual(composite_state.evaluate({AgentStates.ACTION: ("speed",)}),
+                         {"speed": 1.0})
+        state1.select.assert_called_once_with(("speed",))
+        state2.select.assert_not_called()
+
+    def test_to_dict_fields(self) -> None:
+        composite_state = CompositeState()
+        action = Action("agent0")
+        action._speed = 2.0
+        composite_state.add(AgentStates.ACTION, action)
+        self.assertEqual(composite_state.to_dict(["speed"]), {"speed": 2.0})
+
+    def test_update_plan_dependency_order(self) -> None:
+        composite_state = CompositeState()
+        calls = []
+        stats = MagicMock()
+        stats.update.side_effect = lambda env_data: calls.append("stats")
+        status = MagicMock()
+        status.update.side_effect = lambda env_data: calls.append("status")
+        composite_state.add(AgentStates.EPISODE_STATS, stats, depends_on=(AgentStates.STATUS,))
+        composite_state.add(AgentStates.STATUS, status)
+        self.assertEqual(composite_state.update_plan,
+                         (AgentStates.STATUS, AgentStates.EPISODE_STATS))
+        composite_state.update("env_data")
+        self.assertEqual(calls, ["status", "stats"])
+
+    def test_update_plan_deduplicated(self) -> None:
+        composite_state = CompositeState()
+        state = MagicMock()
+        composite_state.add(AgentStates.ACTION, state)
+        composite_state.add("action_alias", state)
+        composite_state.update("env_data")
+        state.update.assert_called_once_with("env_data")
+
+    def test_update_plan_unknown_dependency(self) -> None:
+        composite_state = CompositeState()
+        composite_state.add(AgentStates.EPISODE_STATS, MagicMock(),
+                            depends_on=(AgentStates.STATUS,))
+        with self.assertRaises(ValueError):
+            composite_state.update("env_data")
+
+    def test_update_plan_cycle(self) -> None:
+        composite_state = CompositeState()
+        composite_state.add(AgentStates.POSE, MagicMock(), depends_on=(AgentStates.STATUS,))
+        composite_state.add(AgentStates.STATUS, MagicMock(), depends_on=(AgentStates.POSE,))
+        with self.assertRaises(ValueError):
+            composite_state.update_plan
+
+    def test_add_invalid_update_every(self) -> None:
+        composite_state = CompositeState()
+        with self.assertRaises(ValueError):
+            composite_state.add(AgentStates.ACTION, MagicMock(), update_every=0)
+
+    def test_update_every(self) -> None:
+        composite_state = CompositeState()
+        state = MagicMock()
+        composite_state.add(AgentStates.STATUS, state, update_every=3)
+        [composite_state.update(step) for step in range(7)]
+        self.assertEqual(state.update.call_args_list, [call(0), call(3), call(6)])
+
+    def test_update_on_demand(self) -> None:
+        composite_state = CompositeState()
+        status = MagicMock()
+        stats = MagicMock()
+        composite_state.add(AgentStates.STATUS, status, update_every=None)
+        composite_state.add(AgentStates.EPISODE_STATS, stats,
+                            depends_on=(AgentStates.STATUS,), update_every=2)
+        composite_state.update(0)
+        # the dependent state brings the on demand state up to date first
+        status.update.assert_called_once_with(0)
+        composite_state.update(1)
+        composite_state.update(2)
+        status.update.assert_called_with(2)
+        self.assertEqual(status.update.call_count, 2)
+        composite_state.update(3)
+        self.assertEqual(status.update.call_count, 2)
+        # reading the on demand state applies only the latest data
+        self.assertIs(composite_state.get(AgentStates.STATUS), status)
+        status.update.assert_called_with(3)
+        composite_state.get(AgentStates.STATUS)
+        self.assertEqual(status.update.call_count, 3)
@@ -49,3 +49,34 @@ class DeepracerEnvDataTest(TestCase):
 
     def test_is_offtrack(self) -> None:
         self.assertEqual(self.deepracer_env_data.is_offtrack, {"agent0": True})
+
+    def test_get_front_of_car_position(self) -> None:
+        deepracer_env_data = DeepRacerEnvData(
+            self.done,
+            self.action,
+            {"agent0": {"position": (1.0, 2.0, 3.0), "orientation": (0.0, 0.0, 0.0, 1.0)}},
+            self.track_geometry)
+        front_of_car_position = deepracer_env_data.get_front_of_car_position("agent0")
+        self.assertEqual(front_of_car_position, (1.16176, 2.0, 3.0))
+        self.assertIs(deepracer_env_data.get_front_of_car_position("agent0"),
+                      front_of_car_position)
+
+    def test_agent_names(self) -> None:
+        self.assertEqual(self.deepracer_env_data.agent_names, ("agent0",))
+        deepracer_env_data = DeepRacerEnvData(
+            self.done,
+            self.action,
+            {"agent0": {"progress": 10}, "agent1": {"progress": 20}},
+            self.track_geometry,
+            agent_names=["agent1", "agent2", "agent0"])
+        self.assertEqual(deepracer_env_data.agent_names, ("agent1", "agent0"))
+
+    def test_get_array(self) -> None:
+        deepracer_env_data = DeepRacerEnvData(
+            self.done,
+            self.action,
+            {"agent0": {"position": (1.0, 2.0, 0.0)}, "agent1": {"position": (3.0, 4.0, 0.0)}},
+            self.track_geometry,
+            agent_names=["agent1", "agent0"])
+        self.assertEqual(deepracer_env_data.get_array("position").tolist(),
+                         [[3.0, 4.0, 0.0], [1.0, 2.0, 0.0]])
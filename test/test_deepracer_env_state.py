@@ -13,10 +13,25 @@
 #   See the License for the specific language governing permissions and         #
 #   limitations under the License.                                              #
 #################################################################################
+import pickle
+
+import numpy as np
+
 from unittest import TestCase
 from unittest.mock import patch, MagicMock, call
 from deepracer_track_geometry import TrackDirection
-from deepracer_env_state.deepracer_env_state import DeepRacerEnvState
+from deepracer_env_state.deepracer_env_state import (
+    DeepRacerEnvState,
+    DeepRacerEnvStateSnapshot)
+from deepracer_env_state.agent.agent import Agent
+from deepracer_env_state.field_plan import FieldPlan
+from deepracer_env_state.agent.constants import AgentStates
+from deepracer_env_state.agent.episode_stats import EpisodeStats
+from deepracer_env_state.agent.racing_line_status import RacingLineStatus
+from deepracer_env_state.precision import get_error_bound
+from deepracer_env_state.track.racing_line import RacingLine
+from deepracer_env_state.track.constants import TrackStates
+from deepracer_env_state.track.track_geometry_pool import TrackGeometryPool
 from deepracer_env_config import Track as TrackConfig
 from deepracer_env_config import Agent as AgentConfig
 from deepracer_env import DEFAULT_TRACK
@@ -41,6 +56,33 @@ class DeepracerEnvStateTest(TestCase):
         deepracer_env_state._deepracer_env.register.assert_called_once_with(
             deepracer_env_state)
 
+    def test_init_empty_track_geometry_pool(self) -> None:
+        # an empty pool given is shared
+        track_geometry_pool = TrackGeometryPool()
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env, track_geometry_pool)
+        self.assertIs(deepracer_env_state._track_geometry_pool, track_geometry_pool)
+
+    def test_agent_order(self) -> None:
+        self.deepracer_env.get_agent.return_value = [
+            AgentConfig(name="racer_b"), AgentConfig(name="racer_a"), AgentConfig(name="racer_c")]
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        self.assertEqual(deepracer_env_state.agent_names, ("racer_b", "racer_a", "racer_c"))
+        self.assertEqual(deepracer_env_state.get_agent_index("racer_b"), 0)
+        self.assertEqual(deepracer_env_state.get_agent_index("racer_c"), 2)
+        self.assertEqual(list(deepracer_env_state.agents), ["racer_b", "racer_a", "racer_c"])
+        self.assertEqual(list(deepracer_env_state.to_dict(["progress"])),
+                         ["racer_b", "racer_a", "racer_c"])
+
+    @patch("deepracer_env_state.deepracer_env_state.copy")
+    def test_get_agent(self, copy_mock) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        agent = MagicMock()
+        other_agent = MagicMock()
+        copy_mock.deepcopy.return_value = "agent_return"
+        deepracer_env_state._agents = {"agent0": agent, "agent1": other_agent}
+        self.assertEqual(deepracer_env_state.get_agent("agent0"), "agent_return")
+        copy_mock.deepcopy.assert_called_once_with(agent)
+
     @patch("deepracer_env_state.deepracer_env_state.DeepRacerEnvData")
     def test_on_step(self, env_data_mock) -> None:
         env = MagicMock()
@@ -50,39 +92,126 @@ class DeepracerEnvStateTest(TestCase):
         step_result = ("test", "test", done, action, info)
         deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
         env_data_mock.return_value = "env_data"
-        deepracer_env_state._agents = {MagicMock()}
+        deepracer_env_state._agents = {"agent0": MagicMock()}
         deepracer_env_state._track = MagicMock()
         deepracer_env_state.on_step(env, step_result)
 
         env_data_mock.assert_called_once_with(
-            done, action, info, deepracer_env_state._track_geometry)
+            done, action, info, deepracer_env_state._track_geometry,
+            agent_names=("agent0",))
         [agent.update.assert_has_calls(
-            [call("env_data")]) for agent in deepracer_env_state._agents]
+            [call("env_data")]) for agent in deepracer_env_state._agents.values()]
         deepracer_env_state._track.update.assert_called_once_with("env_data")
 
-    @patch("deepracer_env_state.deepracer_env_state.TrackGeometry")
+    @patch("deepracer_env_state.track.track_geometry_pool.TrackGeometry")
     def test_on_reset_same_track(self, track_geometry_mock) -> None:
         env = MagicMock()
         reset_result = MagicMock()
         deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
         deepracer_env_state.on_reset(env, reset_result)
-        # called only once from constructor
-        track_geometry_mock.assert_called_once()
+        # default track geometry is only built on first use
+        track_geometry_mock.assert_not_called()
 
-    @patch("deepracer_env_state.deepracer_env_state.TrackGeometry")
-    def test_on_reset_diff_track(self, track_geometry_mock) -> None:
+    @patch("deepracer_env_state.track.track_geometry_pool.get_track_polylines")
+    @patch("deepracer_env_state.track.track_geometry_pool.TrackGeometry")
+    def test_on_reset_diff_track(self, pool_track_geometry_mock,
+                                 get_track_polylines_mock) -> None:
         env = MagicMock()
         reset_result = MagicMock()
         deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
         self.deepracer_env.get_track.return_value = TrackConfig(
             name="austin")
         deepracer_env_state.on_reset(env, reset_result)
-        # call twice from constroctor and on_reset
-        track_geometry_mock.assert_has_calls(
-            [call(DEFAULT_TRACK),
-             call(direction=TrackDirection.COUNTER_CLOCKWISE,
-                  finish_line=0.0,
-                  track_name='austin')])
+        # called once from on_reset through track geometry pool
+        pool_track_geometry_mock.assert_called_once_with(
+            direction=TrackDirection.COUNTER_CLOCKWISE,
+            finish_line=0.0,
+            track_name='austin')
+        self.assertEqual(deepracer_env_state._track_geometry,
+                         pool_track_geometry_mock.return_value)
+
+    @patch("deepracer_env_state.track.track_geometry_pool._DEFAULT_TRACK_GEOMETRY", None)
+    def test_default_track_geometry_deferred(self) -> None:
+        with patch("deepracer_env_state.track.track_geometry_pool.TrackGeometry") as \
+                track_geometry_mock:
+            deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+            track_geometry_mock.assert_not_called()
+            # agents, track and env state share the default track geometry
+            track_geometry = deepracer_env_state._track_geometry
+            track_geometry_mock.assert_called_once_with(DEFAULT_TRACK)
+            self.assertIs(deepracer_env_state._agents["agent0"].status.track_geometry,
+                          track_geometry)
+            self.assertIs(deepracer_env_state._track._track_geometry, track_geometry)
+
+    def test_on_reset_preloaded_track(self) -> None:
+        env = MagicMock()
+        reset_result = MagicMock()
+        track_geometry_pool = MagicMock()
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env, track_geometry_pool)
+        track_config = TrackConfig(name="austin")
+        deepracer_env_state.preload_tracks([track_config])
+        track_geometry_pool.preload.assert_called_once_with([track_config])
+        self.deepracer_env.get_track.return_value = track_config
+        deepracer_env_state.on_reset(env, reset_result)
+        track_geometry_pool.get.assert_called_once_with(track_config)
+        self.assertEqual(deepracer_env_state._track_geometry,
+                         track_geometry_pool.get.return_value)
+
+    def test_on_reset_same_agents(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        agent = deepracer_env_state._agents["agent0"]
+        deepracer_env_state.on_reset(MagicMock(), MagicMock())
+        self.assertIs(deepracer_env_state._agents["agent0"], agent)
+        self.assertEqual(deepracer_env_state.pooled_agent_names, ())
+
+    def test_on_reset_diff_agents(self) -> None:
+        self.deepracer_env.get_agent.return_value = [AgentConfig(name="agent0"),
+                                                     AgentConfig(name="agent1")]
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        deepracer_env_state.add_agent_state(
+            AgentStates.EPISODE_STATS, lambda agent: EpisodeStats(agent.name, agent.status))
+        agent0 = deepracer_env_state._agents["agent0"]
+        agent1 = deepracer_env_state._agents["agent1"]
+        # agent1 leaves and agent2 joins in front of agent0
+        self.deepracer_env.get_agent.return_value = [AgentConfig(name="agent2"),
+                                                     AgentConfig(name="agent0")]
+        deepracer_env_state.on_reset(MagicMock(), MagicMock())
+        self.assertEqual(deepracer_env_state.agent_names, ("agent2", "agent0"))
+        self.assertEqual(deepracer_env_state.get_agent_index("agent0"), 1)
+        self.assertIs(deepracer_env_state._agents["agent0"], agent0)
+        self.assertEqual(deepracer_env_state.pooled_agent_names, ("agent1",))
+        agent2 = deepracer_env_state._agents["agent2"]
+        self.assertEqual(agent2.name, "agent2")
+        self.assertIsInstance(agent2.get(AgentStates.EPISODE_STATS), EpisodeStats)
+        self._step(deepracer_env_state, (-7.25, 0.9, 0.0), 12.5, ("agent2", "agent0"))
+        env_dict = deepracer_env_state.to_dict()
+        self.assertEqual(env_dict["agent2"]["progress"], 12.5)
+        self.assertEqual(env_dict["agent0"]["progress"], 12.5)
+        self.assertNotIn("agent1", env_dict)
+        # agent1 comes back and is reused with the states added meanwhile
+        deepracer_env_state.set_geometry_update_rate(5, 0.5)
+        deepracer_env_state.set_racing_line(DEFAULT_TRACK, RacingLine([(0.0, 0.0), (1.0, 0.0)]))
+        self.deepracer_env.get_agent.return_value = [AgentConfig(name="agent0"),
+                                                     AgentConfig(name="agent1")]
+        deepracer_env_state.on_reset(MagicMock(), MagicMock())
+        self.assertIs(deepracer_env_state._agents["agent1"], agent1)
+        self.assertEqual(deepracer_env_state.pooled_agent_names, ("agent2",))
+        self.assertIsInstance(agent1.get(AgentStates.RACING_LINE), RacingLineStatus)
+        self.assertEqual(agent1.status._geometry_update_every, 5)
+
+    def test_on_reset_agent_pool_size(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env, max_pooled_agents=1)
+        for name in ("agent1", "agent2", "agent3"):
+            self.deepracer_env.get_agent.return_value = [AgentConfig(name=name)]
+            deepracer_env_state.on_reset(MagicMock(), MagicMock())
+        self.assertEqual(deepracer_env_state.agent_names, ("agent3",))
+        self.assertEqual(deepracer_env_state.pooled_agent_names, ("agent2",))
+        # swapping with the pooled agent reuses it even with a full pool
+        agent2 = deepracer_env_state._agent_pool["agent2"][0]
+        self.deepracer_env.get_agent.return_value = [AgentConfig(name="agent2")]
+        deepracer_env_state.on_reset(MagicMock(), MagicMock())
+        self.assertIs(deepracer_env_state._agents["agent2"], agent2)
+        self.assertEqual(deepracer_env_state.pooled_agent_names, ("agent3",))
 
     @patch("deepracer_env_state.deepracer_env_state.copy")
     def test_track(self, copy_mock) -> None:
@@ -99,18 +228,220 @@ class DeepracerEnvStateTest(TestCase):
         agent = MagicMock()
         agent.name = "agent_name"
         copy_mock.deepcopy.return_value = "agent_return"
-        deepracer_env_state._agents = {agent}
+        deepracer_env_state._agents = {"agent_name": agent}
         deepracer_env_state.agents
         copy_mock.deepcopy.assert_called_once()
         self.assertEqual(deepracer_env_state.agents, {"agent_name": "agent_return"})
 
+    def test_snapshot_agents(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        agent = MagicMock()
+        agent.snapshot.return_value = "snapshot"
+        deepracer_env_state._agents = {"agent0": agent}
+        self.assertEqual(deepracer_env_state.snapshot_agents(), {"agent0": "snapshot"})
+        agent.snapshot.assert_called_once_with(deepracer_env_state.dtype)
+
+    def _step(self, deepracer_env_state, position, progress, names=("agent0",)) -> None:
+        deepracer_env_state.on_step(MagicMock(), (
+            None, None, {name: False for name in names}, {name: (10.0, 2.0) for name in names},
+            {name: {"position": position,
+                    "orientation": (0.0, 0.0, 0.0, 1.0),
+                    "is_offtrack": False,
+                    "progress": progress} for name in names}))
+
+    def test_snapshot_restore(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        self._step(deepracer_env_state, (-7.25, 0.9, 0.0), 12.5)
+        snapshot = deepracer_env_state.snapshot()
+        expected = deepracer_env_state.to_dict()
+        self.assertEqual(snapshot.agent_names, ("agent0",))
+        self.assertEqual(snapshot.track_config, TrackConfig())
+        self.assertEqual(len(snapshot.values), Agent.SNAPSHOT_SIZE)
+        self.assertEqual(snapshot.get_agent_values("agent0"), snapshot.values)
+        self._step(deepracer_env_state, (-6.75, 1.0, 0.0), 50.0)
+        self.assertNotEqual(deepracer_env_state.to_dict(), expected)
+        deepracer_env_state.restore(snapshot)
+        self.assertEqual(deepracer_env_state.to_dict(), expected)
+        # the snapshot can be restored more than once
+        self._step(deepracer_env_state, (-6.75, 1.0, 0.0), 50.0)
+        deepracer_env_state.restore(pickle.loads(pickle.dumps(snapshot)))
+        self.assertEqual(deepracer_env_state.to_dict(), expected)
+
+    def test_snapshot_restore_decimated(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        deepracer_env_state.set_geometry_update_rate(5, None)
+        for x in (0.0, 0.3, 0.6, 0.9):
+            self._step(deepracer_env_state, (x, 0.0, 0.0), x)
+        snapshot = deepracer_env_state.snapshot()
+        expected = deepracer_env_state.to_dict()
+        status = deepracer_env_state._agents["agent0"].status
+        geometry_distance = status.geometry_distance
+        self._step(deepracer_env_state, (-6.75, 1.0, 0.0), 50.0)
+        deepracer_env_state.restore(snapshot)
+        self.assertEqual(deepracer_env_state.to_dict(), expected)
+        self.assertEqual(status.geometry_age, 3)
+        self.assertAlmostEqual(status.geometry_distance, geometry_distance)
+        self.assertEqual(status._latest_position, (0.9, 0.0, 0.0))
+
+    def test_snapshot_restore_float32(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env, dtype=np.float32)
+        self.assertEqual(deepracer_env_state.dtype, np.float32)
+        self._step(deepracer_env_state, (-7.25, 0.9, 0.0), 12.5)
+        reference = deepracer_env_state.to_dict()["agent0"]
+        snapshot = deepracer_env_state.snapshot()
+        self.assertEqual(snapshot.dtype, np.float32)
+        self.assertEqual(len(snapshot._values), Agent.SNAPSHOT_SIZE * 4)
+        self.assertEqual(deepracer_env_state.snapshot_agents()["agent0"].dtype, np.float32)
+        self._step(deepracer_env_state, (-6.75, 1.0, 0.0), 50.0)
+        deepracer_env_state.restore(pickle.loads(pickle.dumps(snapshot)))
+        restored = deepracer_env_state.to_dict()["agent0"]
+        for field in ("steps", "speed", "progress", "closest_waypoints", "is_offtrack"):
+            self.assertEqual(restored[field], reference[field], msg=field)
+        for field in ("x", "y", "yaw"):
+            self.assertLessEqual(abs(restored[field] - reference[field]),
+                                 get_error_bound(reference[field]), msg=field)
+
+    def test_init_dtype_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            DeepRacerEnvState(self.deepracer_env, dtype=np.int32)
+
+    def test_restore_diff_track(self) -> None:
+        track_geometry_pool = MagicMock()
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env, track_geometry_pool)
+        track_config = TrackConfig(name="austin")
+        snapshot = DeepRacerEnvStateSnapshot(track_config, ("agent0",),
+                                             deepracer_env_state.snapshot().values)
+        deepracer_env_state._agents = {"agent0": MagicMock()}
+        deepracer_env_state.restore(snapshot)
+        track_geometry_pool.get.assert_called_once_with(track_config)
+        self.assertEqual(deepracer_env_state._track_geometry,
+                         track_geometry_pool.get.return_value)
+        self.assertEqual(deepracer_env_state._track_config, track_config)
+        deepracer_env_state._agents["agent0"].restore_values.assert_called_once_with(
+            snapshot.values, track_geometry_pool.get.return_value)
+
+    def test_restore_same_track(self) -> None:
+        track_geometry_pool = MagicMock()
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env, track_geometry_pool)
+        deepracer_env_state.restore(deepracer_env_state.snapshot())
+        track_geometry_pool.get.assert_not_called()
+
+    def test_restore_agent_mismatch(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        snapshot = DeepRacerEnvStateSnapshot(TrackConfig(), ("agent1",),
+                                             deepracer_env_state.snapshot().values)
+        with self.assertRaises(ValueError):
+            deepracer_env_state.restore(snapshot)
+
     def test_to_dict(self) -> None:
         deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
         agent_mock = MagicMock()
         agent_mock.name = "agent0"
         agent_mock.to_dict.return_value = {"x": 0, "y": 0}
-        deepracer_env_state._agents = {agent_mock}
+        deepracer_env_state._agents = {"agent0": agent_mock}
         deepracer_env_state._track = MagicMock()
         deepracer_env_state._track.to_dict.return_value = {"name": "spain"}
         self.assertEqual(deepracer_env_state.to_dict(),
                          {"agent0": {"x": 0, "y": 0}, "name": "spain"})
+
+    def test_compile_fields(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        field_plan = deepracer_env_state.compile_fields(["speed", "progress", "track_length"])
+        self.assertEqual(field_plan.agent_plan,
+                         {AgentStates.ACTION: ("speed",),
+                          AgentStates.STATUS: ("progress",)})
+        self.assertEqual(field_plan.track_fields, ("track_length",))
+
+    def test_compile_fields_unknown(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        with self.assertRaises(ValueError):
+            deepracer_env_state.compile_fields(["speed", "unknown"])
+
+    def test_to_dict_fields(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        deepracer_env_state._track = MagicMock()
+        deepracer_env_state._track.select.return_value = {"track_length": 10.0}
+        agent_mock = MagicMock()
+        agent_mock.name = "agent0"
+        agent_mock.evaluate.return_value = {"speed": 1.0}
+        deepracer_env_state._agents = {"agent0": agent_mock}
+        field_plan = FieldPlan({AgentStates.ACTION: ("speed",)}, ("track_length",))
+        self.assertEqual(deepracer_env_state.to_dict(field_plan),
+                         {"agent0": {"speed": 1.0}, "track_length": 10.0})
+        agent_mock.evaluate.assert_called_once_with({AgentStates.ACTION: ("speed",)})
+        agent_mock.to_dict.assert_not_called()
+        deepracer_env_state._track.to_dict.assert_not_called()
+
+    def test_to_dict_track_fields_only(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        self.assertEqual(set(deepracer_env_state.to_dict(["is_clockwise"]).keys()),
+                         {"is_clockwise"})
+
+    def test_profile_fields(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        costs = deepracer_env_state.profile_fields(repeat=1)
+        self.assertEqual(set(costs.keys()),
+                         set(deepracer_env_state.compile_fields(costs.keys()).fields))
+        self.assertIn("track_width", costs)
+        self.assertIn("waypoints", costs)
+
+    def test_set_geometry_update_rate(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        agent = MagicMock()
+        deepracer_env_state._agents = {"agent0": agent}
+        deepracer_env_state.set_geometry_update_rate(5, 0.5)
+        agent.status.set_geometry_update_rate.assert_called_once_with(5, 0.5)
+
+    @patch("deepracer_env_state.composite_state.logging")
+    def test_set_racing_line(self, logging_mock) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        racing_line = RacingLine([(0.0, 0.0), (1.0, 0.0)])
+        deepracer_env_state.set_racing_line(DEFAULT_TRACK, None)
+        self.assertNotIn(AgentStates.RACING_LINE, deepracer_env_state._agents["agent0"]._states)
+        deepracer_env_state.set_racing_line(DEFAULT_TRACK, racing_line)
+        deepracer_env_state.set_racing_line("other_track", racing_line)
+        logging_mock.info.assert_not_called()
+        self.assertIs(deepracer_env_state.track.racing_line, racing_line)
+        self.assertEqual(len(deepracer_env_state._agent_states), 1)
+        agent = deepracer_env_state._agents["agent0"]
+        self.assertIsInstance(agent.get(AgentStates.RACING_LINE), RacingLineStatus)
+        self.assertIs(agent.get(AgentStates.RACING_LINE)._track, deepracer_env_state._track)
+        self.assertIn("racing_line_deviation", deepracer_env_state.to_dict()["agent0"])
+
+    def test_add_track_state(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        track_state = MagicMock()
+        track_state.fields = ("proximity",)
+        track_state.to_dict.return_value = {"proximity": {}}
+        track_state.select.return_value = {"proximity": {}}
+        deepracer_env_state.add_track_state(TrackStates.PROXIMITY, track_state)
+        self.assertEqual(deepracer_env_state.get_track_state(TrackStates.PROXIMITY),
+                         track_state)
+        deepracer_env_state._track = MagicMock()
+        deepracer_env_state._agents = dict()
+        deepracer_env_state.on_step(MagicMock(), ("test", "test", {}, {}, {}))
+        track_state.update.assert_called_once()
+        self.assertIn("proximity", deepracer_env_state.to_dict())
+        field_plan = deepracer_env_state.compile_fields(["proximity"])
+        self.assertEqual(field_plan.track_state_plan,
+                         {TrackStates.PROXIMITY: ("proximity",)})
+        self.assertEqual(deepracer_env_state.to_dict(field_plan), {"proximity": {}})
+
+    def test_add_agent_state(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        deepracer_env_state.add_agent_state(
+            AgentStates.EPISODE_STATS,
+            lambda agent: EpisodeStats(agent.name, agent.status))
+        agent = deepracer_env_state._agents["agent0"]
+        self.assertIsInstance(agent.get(AgentStates.EPISODE_STATS), EpisodeStats)
+        self.assertIn("episode_summary", deepracer_env_state.to_dict(["episode_summary"])["agent0"])
+
+    def test_add_agent_state_depends_on(self) -> None:
+        deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        stats = MagicMock()
+        deepracer_env_state.add_agent_state(AgentStates.EPISODE_STATS, lambda agent: stats,
+                                            depends_on=(AgentStates.STATUS,),
+                                            update_every=None)
+        agent = deepracer_env_state._agents["agent0"]
+        self.assertEqual(agent._dependencies[AgentStates.EPISODE_STATS], (AgentStates.STATUS,))
+        self.assertIsNone(agent._update_intervals[AgentStates.EPISODE_STATS])
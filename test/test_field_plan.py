@@ -0,0 +1,54 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from deepracer_env_state.field_plan import (
+    FieldPlan,
+    profile_field_costs)
+from deepracer_env_state.agent.constants import AgentStates
+
+
+class FieldPlanTest(TestCase):
+    def setUp(self) -> None:
+        self.agent_plan = {AgentStates.ACTION: ("speed",),
+                           AgentStates.STATUS: ("progress", "steps")}
+        self.track_fields = ("track_length",)
+
+    def test_init(self) -> None:
+        field_plan = FieldPlan(self.agent_plan, self.track_fields)
+        self.assertEqual(field_plan.agent_plan, self.agent_plan)
+        self.assertEqual(field_plan.track_fields, self.track_fields)
+
+    def test_fields(self) -> None:
+        field_plan = FieldPlan(self.agent_plan, self.track_fields)
+        self.assertEqual(field_plan.fields,
+                         ("speed", "progress", "steps", "track_length"))
+
+    def test_profile_field_costs(self) -> None:
+        state = MagicMock()
+        costs = profile_field_costs(state, ("speed", "progress"), repeat=2)
+        self.assertEqual(set(costs.keys()), {"speed", "progress"})
+        self.assertTrue(all(cost >= 0.0 for cost in costs.values()))
+        # every evaluation follows a cleared cache
+        self.assertEqual(state.clear_cache.call_count, 5)
+
+    def test_track_state_plan(self) -> None:
+        field_plan = FieldPlan(self.agent_plan, self.track_fields,
+                               {"proximity": ("overtakes",)})
+        self.assertEqual(field_plan.track_state_plan, {"proximity": ("overtakes",)})
+        self.assertEqual(field_plan.fields,
+                         ("speed", "progress", "steps", "track_length", "overtakes"))
@@ -0,0 +1,44 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import os
+import subprocess
+import sys
+
+from unittest import TestCase
+
+import deepracer_env_state
+
+
+class InitTest(TestCase):
+    def test_all(self) -> None:
+        for name in deepracer_env_state.__all__:
+            self.assertIsNotNone(getattr(deepracer_env_state, name))
+        self.assertIn("DeepRacerEnvState", dir(deepracer_env_state))
+
+    def test_unknown_attribute(self) -> None:
+        with self.assertRaises(AttributeError):
+            deepracer_env_state.unknown_attribute
+
+    def test_lazy_import(self) -> None:
+        code = ("import sys\n"
+                "from deepracer_env_state import Action, DEEPRACER_LENGTH\n"
+                "print(sorted(name for name in ('shapely', 'deepracer_env', 'ude', "
+                "'deepracer_track_geometry') if name in sys.modules))")
+        repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [repository, env.get("PYTHONPATH")]))
+        output = subprocess.check_output([sys.executable, "-c", code], env=env, cwd=repository)
+        self.assertEqual(output.decode().strip(), "[]")
@@ -0,0 +1,83 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+from unittest import TestCase
+
+from deepracer_env_state import instrumentation
+
+
+class Base(object):
+    def update(self, calls):
+        calls.append("Base.update")
+
+
+class Derived(Base):
+    pass
+
+
+def get_wrap(name):
+    def wrap(function):
+        def wrapped(instance, calls):
+            calls.append(name)
+            return function(instance, calls)
+        return wrapped
+    return wrap
+
+
+class InstrumentationTest(TestCase):
+    def setUp(self) -> None:
+        self.update = vars(Base)["update"]
+        self.first = object()
+        self.second = object()
+
+    def tearDown(self) -> None:
+        instrumentation.uninstall(self.first)
+        instrumentation.uninstall(self.second)
+
+    def get_calls(self, instance):
+        calls = []
+        instance.update(calls)
+        return calls
+
+    def test_install_uninstall(self) -> None:
+        self.assertFalse(instrumentation.is_installed(self.first))
+        instrumentation.install(self.first, [(Base, "update", get_wrap("first"))])
+        self.assertTrue(instrumentation.is_installed(self.first))
+        self.assertEqual(self.get_calls(Base()), ["first", "Base.update"])
+        instrumentation.uninstall(self.first)
+        self.assertFalse(instrumentation.is_installed(self.first))
+        self.assertIs(vars(Base)["update"], self.update)
+
+    def test_chain(self) -> None:
+        instrumentation.install(self.first, [(Base, "update", get_wrap("first"))])
+        instrumentation.install(self.second, [(Base, "update", get_wrap("second"))])
+        self.assertEqual(self.get_calls(Base()), ["second", "first", "Base.update"])
+        # removing the first wrapper keeps the second one
+        instrumentation.uninstall(self.first)
+        self.assertTrue(instrumentation.is_installed(self.second))
+        self.assertEqual(self.get_calls(Base()), ["second", "Base.update"])
+        instrumentation.uninstall(self.second)
+        self.assertIs(vars(Base)["update"], self.update)
+
+    def test_inherited(self) -> None:
+        instrumentation.install(self.first, [(Derived, "update", get_wrap("first"))])
+        instrumentation.install(self.second, [(Base, "update", get_wrap("second"))])
+        self.assertEqual(self.get_calls(Derived()), ["first", "second", "Base.update"])
+        # the inherited member is rebuilt on the restored base class member
+        instrumentation.uninstall(self.second)
+        self.assertEqual(self.get_calls(Derived()), ["first", "Base.update"])
+        instrumentation.uninstall(self.first)
+        self.assertNotIn("update", vars(Derived))
+        self.assertEqual(self.get_calls(Derived()), ["Base.update"])
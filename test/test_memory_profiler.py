@@ -0,0 +1,200 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import sys
+import tracemalloc
+
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+import numpy as np
+
+from deepracer_env_state.memory_profiler import (
+    MemoryProfiler,
+    get_cache_sizes,
+    get_component_sizes,
+    get_components,
+    get_live_track_geometries,
+    get_size)
+from deepracer_env_state.deepracer_env_state import DeepRacerEnvState
+from deepracer_env_state.agent.episode_stats import EpisodeStats
+from deepracer_env_state.agent.constants import AgentStates
+from deepracer_env_config import Track as TrackConfig
+from deepracer_env_config import Agent as AgentConfig
+
+
+class GetSizeTest(TestCase):
+    def test_get_size(self) -> None:
+        value = [1.0, "a"]
+        self.assertGreater(get_size({"key": value}), get_size(value))
+
+    def test_get_size_seen(self) -> None:
+        array = np.zeros(1000)
+        seen = set()
+        self.assertGreaterEqual(get_size(array, seen), array.nbytes)
+        # already counted objects are not counted again
+        container = [array]
+        self.assertEqual(get_size(container, seen), sys.getsizeof(container))
+
+    def test_get_size_view(self) -> None:
+        array = np.zeros(1000)
+        self.assertGreaterEqual(get_size(array[::2]), array.nbytes)
+
+    def test_get_size_unsized(self) -> None:
+        container = [AgentStates.POSE, np.zeros]
+        self.assertEqual(get_size(container), sys.getsizeof(container))
+
+
+class MemoryProfilerTest(TestCase):
+    def setUp(self) -> None:
+        self.deepracer_env = MagicMock()
+        self.deepracer_env.get_track.return_value = TrackConfig()
+        self.deepracer_env.get_agent.return_value = [AgentConfig(name="agent0")]
+        self.deepracer_env_state = DeepRacerEnvState(self.deepracer_env)
+        self.step_result = (None, None,
+                            {"agent0": False},
+                            {"agent0": (0.0, 1.0)},
+                            {"agent0": {"position": [0.5, 0.5, 0.0],
+                                        "orientation": [0.0, 0.0, 0.0, 1.0],
+                                        "is_offtrack": False,
+                                        "progress": 1.0}})
+        self.dump = MagicMock()
+        self.profiler = MemoryProfiler(dump_every=2, dump=self.dump, top_allocations=3)
+
+    def tearDown(self) -> None:
+        self.profiler.disable()
+
+    def test_get_components(self) -> None:
+        self.deepracer_env_state.add_agent_state(
+            AgentStates.EPISODE_STATS, lambda agent: EpisodeStats(agent.name, agent.status))
+        names = [name for name, _ in get_components(self.deepracer_env_state)]
+        self.assertEqual(names, ["agents.agent0.action",
+                                 "agents.agent0.pose",
+                                 "agents.agent0.status",
+                                 "agents.agent0.episode_stats",
+                                 "agents.agent0",
+                                 "track",
+                                 "track_states"])
+
+    def test_get_components_agent_pool(self) -> None:
+        self.deepracer_env.get_agent.return_value = [AgentConfig(name="agent1")]
+        self.deepracer_env_state.on_reset(self.deepracer_env, MagicMock())
+        names = [name for name, _ in get_components(self.deepracer_env_state)]
+        self.assertIn("agents.agent1", names)
+        self.assertIn("agent_pool.agent0.status", names)
+        self.assertIn("agent_pool.agent0", names)
+
+    def test_get_component_sizes(self) -> None:
+        sizes = get_component_sizes(self.deepracer_env_state)
+        self.assertEqual(set(sizes), {"shared",
+                                      "agents.agent0.action",
+                                      "agents.agent0.pose",
+                                      "agents.agent0.status",
+                                      "agents.agent0",
+                                      "track",
+                                      "track_states"})
+        self.assertTrue(all(size > 0 for size in sizes.values()))
+
+    def test_get_component_sizes_shared(self) -> None:
+        status = self.deepracer_env_state._agents["agent0"].status
+        shared = np.zeros(10000)
+        status._front_of_car_shape = shared
+        sizes = get_component_sizes(self.deepracer_env_state)
+        self.assertGreaterEqual(sizes["shared"], shared.nbytes)
+        self.assertLess(sizes["agents.agent0.status"], shared.nbytes)
+
+    @patch("deepracer_env_state.memory_profiler.polyline")
+    def test_get_cache_sizes(self, polyline_mock) -> None:
+        polyline_mock._TRACK_POLYLINES = {"track_geometry": np.zeros(1000)}
+        cache_sizes = get_cache_sizes()
+        self.assertEqual(cache_sizes["track_polylines"]["entries"], 1)
+        self.assertGreaterEqual(cache_sizes["track_polylines"]["bytes"], 8000)
+        self.assertEqual(set(cache_sizes), {"track_polylines",
+                                            "road_edge_indices",
+                                            "track_profiles",
+                                            "border_segments",
+                                            "track_rasters"})
+
+    def test_get_live_track_geometries(self) -> None:
+        class TrackGeometryStub(object):
+            def __init__(self, track_name):
+                self.track_name = track_name
+
+        track_geometries = [TrackGeometryStub("monaco"), TrackGeometryStub("monaco"),
+                            TrackGeometryStub("reinvent_base")]
+        with patch("deepracer_env_state.memory_profiler.TrackGeometry", TrackGeometryStub):
+            self.assertEqual(get_live_track_geometries(), {"monaco": 2, "reinvent_base": 1})
+        del track_geometries
+
+    def test_dump_every_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            MemoryProfiler(dump_every=0)
+
+    def test_enable_disable(self) -> None:
+        on_step = vars(DeepRacerEnvState)["on_step"]
+        is_tracing = tracemalloc.is_tracing()
+        self.profiler.enable()
+        self.assertTrue(self.profiler.is_enabled)
+        self.assertTrue(tracemalloc.is_tracing())
+        self.assertIsNot(vars(DeepRacerEnvState)["on_step"], on_step)
+        self.profiler.disable()
+        self.assertFalse(self.profiler.is_enabled)
+        self.assertEqual(tracemalloc.is_tracing(), is_tracing)
+        self.assertIs(vars(DeepRacerEnvState)["on_step"], on_step)
+
+    def test_disabled(self) -> None:
+        self.deepracer_env_state.on_step(self.deepracer_env, self.step_result)
+        self.assertEqual(self.profiler.step_count, 0)
+        self.dump.assert_not_called()
+
+    def test_on_step(self) -> None:
+        self.profiler.enable()
+        for _ in range(5):
+            self.deepracer_env_state.on_step(self.deepracer_env, self.step_result)
+        self.assertEqual(self.profiler.step_count, 5)
+        self.assertEqual(self.dump.call_count, 2)
+        report = self.dump.call_args[0][0]
+        self.assertEqual(report["step_count"], 4)
+        self.assertEqual(set(report["step_allocations"]), {"last", "total", "max", "mean"})
+        self.assertIn("agents.agent0.status", report["components"])
+        self.assertIn("track_polylines", report["caches"])
+        self.assertIn("track_geometries", report)
+        self.assertLessEqual(report["traced_memory"]["current"], report["traced_memory"]["peak"])
+        self.assertLessEqual(len(report["top_allocations"]), 3)
+
+    def test_reset(self) -> None:
+        self.profiler.enable()
+        self.deepracer_env_state.on_step(self.deepracer_env, self.step_result)
+        self.profiler.reset()
+        report = self.profiler.report()
+        self.assertEqual(report["step_count"], 0)
+        self.assertEqual(report["step_allocations"]["mean"], 0.0)
+        self.assertEqual(report["components"], {})
+
+    def test_report_not_tracing(self) -> None:
+        report = self.profiler.report(self.deepracer_env_state)
+        if not tracemalloc.is_tracing():
+            self.assertNotIn("traced_memory", report)
+            self.assertNotIn("top_allocations", report)
+        self.assertIn("agents.agent0", report["components"])
+
+    @patch("deepracer_env_state.memory_profiler.logging")
+    def test_default_dump(self, logging_mock) -> None:
+        profiler = MemoryProfiler(dump_every=1)
+        profiler.enable()
+        try:
+            self.deepracer_env_state.on_step(self.deepracer_env, self.step_result)
+        finally:
+            profiler.disable()
+        logging_mock.info.assert_called_once()
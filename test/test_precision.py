@@ -0,0 +1,44 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+from unittest import TestCase
+
+import numpy as np
+
+from deepracer_env_state.precision import (
+    FLOAT32_RELATIVE_ERROR,
+    get_error_bound,
+    get_float_dtype)
+
+
+class PrecisionTest(TestCase):
+    def test_get_float_dtype(self) -> None:
+        self.assertEqual(get_float_dtype(np.float64), np.dtype(np.float64))
+        self.assertEqual(get_float_dtype(np.float32), np.dtype(np.float32))
+        self.assertEqual(get_float_dtype("float32"), np.dtype(np.float32))
+        self.assertEqual(get_float_dtype(float), np.dtype(np.float64))
+
+    def test_get_float_dtype_invalid(self) -> None:
+        for dtype in (np.float16, np.int64, "unknown"):
+            with self.assertRaises(ValueError):
+                get_float_dtype(dtype)
+
+    def test_get_error_bound(self) -> None:
+        reference = np.array([-100.0, 0.1, 0.0, 12.5])
+        np.testing.assert_array_equal(get_error_bound(reference, np.float64), np.zeros(4))
+        bound = get_error_bound(reference)
+        np.testing.assert_array_equal(bound, np.abs(reference) * FLOAT32_RELATIVE_ERROR)
+        rounded = reference.astype(np.float32).astype(np.float64)
+        self.assertTrue(np.all(np.abs(rounded - reference) <= bound))
@@ -0,0 +1,124 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+from unittest import TestCase
+
+from deepracer_env_state.profiler import (
+    LatencyHistogram,
+    StateProfiler)
+from deepracer_env_state.agent.action import Action
+from deepracer_env_state.agent.status import Status
+from deepracer_env_state.state_interface import StateInterface
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+
+
+class LatencyHistogramTest(TestCase):
+    def setUp(self) -> None:
+        self.histogram = LatencyHistogram(buckets=(0.001, 0.01))
+
+    def test_observe(self) -> None:
+        self.histogram.observe(0.0005)
+        self.histogram.observe(0.005)
+        self.histogram.observe(0.5)
+        self.assertEqual(self.histogram.count, 3)
+        self.assertAlmostEqual(self.histogram.sum, 0.5055)
+        self.assertEqual(self.histogram.cumulative_counts(),
+                         [("0.001", 1), ("0.01", 2), ("+Inf", 3)])
+
+    def test_reset(self) -> None:
+        self.histogram.observe(0.5)
+        self.histogram.reset()
+        self.assertEqual(self.histogram.count, 0)
+        self.assertEqual(self.histogram.cumulative_counts(),
+                         [("0.001", 0), ("0.01", 0), ("+Inf", 0)])
+
+    def test_to_dict(self) -> None:
+        self.histogram.observe(0.002)
+        self.histogram.observe(0.004)
+        self.assertEqual(self.histogram.to_dict(),
+                         {"count": 2,
+                          "sum": 0.006,
+                          "mean": 0.003,
+                          "buckets": {"0.001": 0, "0.01": 2, "+Inf": 2}})
+
+
+class StateProfilerTest(TestCase):
+    def setUp(self) -> None:
+        self.profiler = StateProfiler()
+        self.deepracer_env_data = DeepRacerEnvData(
+            {"agent0": False},
+            {"agent0": (10.0, 1.0)},
+            {},
+            "track_geometry")
+
+    def tearDown(self) -> None:
+        self.profiler.disable()
+
+    def test_enable_disable(self) -> None:
+        update = vars(Action)["update"]
+        speed = vars(Action)["speed"]
+        self.profiler.enable()
+        self.assertTrue(self.profiler.is_enabled)
+        self.assertIsNot(vars(Action)["update"], update)
+        self.assertIsInstance(vars(Action)["speed"], property)
+        self.profiler.disable()
+        self.assertFalse(self.profiler.is_enabled)
+        self.assertIs(vars(Action)["update"], update)
+        self.assertIs(vars(Action)["speed"], speed)
+
+    def test_instrument_default_members(self) -> None:
+        self.assertIn("_is_wheels_on_track", self.profiler._targets[Status])
+        self.assertIn("track_width", self.profiler._targets[Status])
+        self.assertIn("update", self.profiler._targets[Status])
+        self.assertNotIn("fields", self.profiler._targets[Status])
+
+    def test_instrument_state_classes(self) -> None:
+        classes = StateInterface.__subclasses__()
+        for cls in classes:
+            classes.extend(cls.__subclasses__())
+        for cls in classes:
+            if cls.__module__.startswith("deepracer_env_state.") and "update" in vars(cls):
+                self.assertIn("update", self.profiler._targets.get(cls, []), msg=cls.__name__)
+
+    def test_record(self) -> None:
+        self.profiler.enable()
+        action = Action("agent0")
+        action.update(self.deepracer_env_data)
+        action.update(self.deepracer_env_data)
+        self.assertEqual(action.speed, 1.0)
+        profile = self.profiler.to_dict()
+        self.assertEqual(profile["Action.update"]["count"], 2)
+        self.assertEqual(profile["Action.speed"]["count"], 1)
+        self.assertNotIn("Pose.update", profile)
+
+    def test_no_record_when_disabled(self) -> None:
+        self.profiler.enable()
+        self.profiler.disable()
+        Action("agent0").update(self.deepracer_env_data)
+        self.assertEqual(self.profiler.to_dict(), {})
+
+    def test_reset(self) -> None:
+        self.profiler.enable()
+        Action("agent0").update(self.deepracer_env_data)
+        self.profiler.reset()
+        self.assertEqual(self.profiler.to_dict(), {})
+
+    def test_to_prometheus(self) -> None:
+        self.profiler.enable()
+        Action("agent0").update(self.deepracer_env_data)
+        text = self.profiler.to_prometheus(metric_name="latency")
+        self.assertIn("# TYPE latency histogram", text)
+        self.assertIn('latency_bucket{component="Action.update",le="+Inf"} 1', text)
+        self.assertIn('latency_count{component="Action.update"} 1', text)
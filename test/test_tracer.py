@@ -0,0 +1,175 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import json
+import os
+import tempfile
+
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from deepracer_env_state.tracer import StateTracer
+from deepracer_env_state.memory_profiler import MemoryProfiler
+from deepracer_env_state.profiler import StateProfiler
+from deepracer_env_state.agent.agent import Agent
+from deepracer_env_state.composite_state import CompositeState
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.deepracer_env_state import DeepRacerEnvState
+from deepracer_env_state.track.track_geometry_pool import TrackGeometryPool
+from deepracer_env_config import Track as TrackConfig
+from deepracer_env_config import Agent as AgentConfig
+from deepracer_track_geometry import TrackGeometry
+
+
+class StateTracerTest(TestCase):
+    def setUp(self) -> None:
+        self.tracer = StateTracer(capacity=4)
+        self.track_geometry = TrackGeometry("monaco")
+        self.step_result = (None, None,
+                            {"agent0": False},
+                            {"agent0": (10.0, 1.0)},
+                            {"agent0": {"position": (-7.25, 0.9, 0.0),
+                                        "orientation": (0.0, 0.0, 0.0, 1.0),
+                                        "is_offtrack": False,
+                                        "progress": 12.5}})
+        self.deepracer_env_data = DeepRacerEnvData(*self.step_result[2:], self.track_geometry)
+
+    def tearDown(self) -> None:
+        self.tracer.disable()
+
+    def test_capacity_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            StateTracer(capacity=0)
+
+    def test_enable_disable(self) -> None:
+        on_step = vars(DeepRacerEnvState)["on_step"]
+        build = vars(TrackGeometryPool)["build"]
+        init = vars(TrackGeometry)["__init__"]
+        self.assertNotIn("update", vars(Agent))
+        self.tracer.enable()
+        self.assertTrue(self.tracer.is_enabled)
+        self.assertIsNot(vars(DeepRacerEnvState)["on_step"], on_step)
+        self.assertIsNot(vars(TrackGeometryPool)["build"], build)
+        self.assertIn("update", vars(Agent))
+        # the track geometry class is not instrumented
+        self.assertIs(vars(TrackGeometry)["__init__"], init)
+        self.tracer.disable()
+        self.assertFalse(self.tracer.is_enabled)
+        self.assertIs(vars(DeepRacerEnvState)["on_step"], on_step)
+        self.assertIs(vars(TrackGeometryPool)["build"], build)
+        # inherited member is removed again
+        self.assertNotIn("update", vars(Agent))
+        self.assertIs(Agent.update, CompositeState.update)
+
+    def test_record(self) -> None:
+        self.tracer.enable()
+        agent = Agent("agent0", self.track_geometry)
+        agent.update(self.deepracer_env_data)
+        TrackGeometryPool(build=MagicMock()).build(TrackConfig(name="reinvent_base"))
+        events = self.tracer.get_events()
+        self.assertEqual([event["name"] for event in events],
+                         ["Agent.update", "TrackGeometryPool.build"])
+        self.assertEqual(events[0]["args"], {"label": "agent0"})
+        self.assertEqual(events[1]["args"], {"label": "reinvent_base"})
+        for event in events:
+            self.assertEqual(event["ph"], "X")
+            self.assertGreaterEqual(event["dur"], 0.0)
+            self.assertEqual(event["pid"], os.getpid())
+        self.assertLessEqual(events[0]["ts"] + events[0]["dur"], events[1]["ts"])
+
+    def test_env_state_events(self) -> None:
+        deepracer_env = MagicMock()
+        deepracer_env.get_track.return_value = TrackConfig()
+        deepracer_env.get_agent.return_value = [AgentConfig(name="agent0")]
+        track_geometry_pool = TrackGeometryPool(build=lambda track_config: self.track_geometry)
+        deepracer_env_state = DeepRacerEnvState(deepracer_env, track_geometry_pool)
+        deepracer_env_state._track_geometry = self.track_geometry
+        self.tracer = StateTracer()
+        self.tracer.enable()
+        deepracer_env_state.on_step(deepracer_env, self.step_result)
+        deepracer_env_state.to_dict()
+        deepracer_env.get_track.return_value = TrackConfig(name="reinvent_base")
+        deepracer_env_state.on_reset(deepracer_env, MagicMock())
+        self.assertEqual([event["name"] for event in self.tracer.get_events()],
+                         ["Agent.update",
+                          "DeepRacerEnvState.on_step",
+                          "DeepRacerEnvState.to_dict",
+                          "TrackGeometryPool.build",
+                          "TrackGeometryPool.get",
+                          "DeepRacerEnvState.on_reset"])
+
+    def test_ring_buffer(self) -> None:
+        self.tracer.enable()
+        agent = Agent("agent0", self.track_geometry)
+        for _ in range(6):
+            agent.update(self.deepracer_env_data)
+        self.assertEqual(self.tracer.capacity, 4)
+        self.assertEqual(len(self.tracer), 4)
+        self.tracer.reset()
+        self.assertEqual(len(self.tracer), 0)
+
+    def test_no_record_when_disabled(self) -> None:
+        self.tracer.enable()
+        self.tracer.disable()
+        Agent("agent0", self.track_geometry).update(self.deepracer_env_data)
+        self.assertEqual(self.tracer.get_events(), [])
+
+    def test_record_exception(self) -> None:
+        self.tracer.instrument(TrackGeometryPool, ["get"])
+        self.tracer.enable()
+        track_geometry_pool = TrackGeometryPool(build=MagicMock(side_effect=RuntimeError))
+        with self.assertRaises(RuntimeError):
+            track_geometry_pool.get(TrackConfig())
+        self.assertEqual([event["name"] for event in self.tracer.get_events()],
+                         ["TrackGeometryPool.build", "TrackGeometryPool.get"])
+
+    def test_interleaved_enable_disable(self) -> None:
+        on_step = vars(DeepRacerEnvState)["on_step"]
+        update = vars(CompositeState)["update"]
+        profiler = StateProfiler()
+        memory_profiler = MemoryProfiler()
+        try:
+            profiler.enable()
+            self.tracer.enable()
+            memory_profiler.enable()
+            profiler.disable()
+            # the tracer still records on_step after the profiler is disabled
+            self.assertTrue(self.tracer.is_enabled)
+            Agent("agent0", self.track_geometry).update(self.deepracer_env_data)
+            self.assertEqual([event["name"] for event in self.tracer.get_events()],
+                             ["Agent.update"])
+            self.assertEqual(profiler.to_dict(), {})
+            self.tracer.disable()
+            self.assertTrue(memory_profiler.is_enabled)
+            self.assertIsNot(vars(DeepRacerEnvState)["on_step"], on_step)
+            memory_profiler.disable()
+        finally:
+            profiler.disable()
+            memory_profiler.disable()
+        self.assertIs(vars(DeepRacerEnvState)["on_step"], on_step)
+        self.assertIs(vars(CompositeState)["update"], update)
+        self.assertNotIn("update", vars(Agent))
+
+    def test_save(self) -> None:
+        self.tracer.enable()
+        Agent("agent0", self.track_geometry).update(self.deepracer_env_data)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            self.tracer.save(path)
+            with open(path) as trace_file:
+                trace = json.load(trace_file)
+        self.assertEqual(trace, self.tracer.to_chrome_trace())
+        self.assertEqual(trace["displayTimeUnit"], "ms")
+        self.assertEqual(len(trace["traceEvents"]), 1)
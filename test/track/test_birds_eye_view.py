@@ -0,0 +1,150 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import math
+import numpy as np
+
+from unittest import TestCase
+from shapely.geometry import Point
+
+from deepracer_env_state.agent.constants import (
+    DEEPRACER_LENGTH,
+    DEEPRACER_WIDTH)
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.track.birds_eye_view import (
+    AGENTS_CHANNEL,
+    BORDER_CHANNEL,
+    TRACK_CHANNEL,
+    BirdsEyeView,
+    get_track_raster)
+from deepracer_track_geometry import TrackGeometry
+
+
+class BirdsEyeViewTest(TestCase):
+    def setUp(self) -> None:
+        self.track_geometry = TrackGeometry("monaco")
+        self.resolution = 0.05
+
+    def get_env_data(self, poses) -> DeepRacerEnvData:
+        return DeepRacerEnvData(
+            {name: False for name in poses},
+            {},
+            {name: {"position": position,
+                    "orientation": (0.0, 0.0, math.sin(yaw / 2.0), math.cos(yaw / 2.0)),
+                    "is_offtrack": False,
+                    "progress": 0.0}
+             for name, (position, yaw) in poses.items()},
+            self.track_geometry)
+
+    def test_track_raster(self) -> None:
+        track_raster = get_track_raster(self.track_geometry, self.resolution)
+        self.assertIs(get_track_raster(self.track_geometry, self.resolution), track_raster)
+        self.assertIsNot(get_track_raster(self.track_geometry, 0.1), track_raster)
+        self.assertEqual(track_raster.image.shape, (2,) + track_raster.shape)
+        rows, columns = track_raster.get_pixels(np.array([8.0, 0.0]), np.array([0.0, 0.0]))
+        self.assertEqual(track_raster.image[TRACK_CHANNEL, rows[0], columns[0]], 1)
+        self.assertEqual(track_raster.image[TRACK_CHANNEL, rows[1], columns[1]], 0)
+        # pixel centers agree with the track geometry
+        random_state = np.random.RandomState(0)
+        rows = random_state.randint(0, track_raster.shape[0], 200)
+        columns = random_state.randint(0, track_raster.shape[1], 200)
+        for x, y, value in zip(*track_raster.get_centers(rows, columns),
+                               track_raster.image[TRACK_CHANNEL, rows, columns]):
+            self.assertEqual(bool(value), self.track_geometry.is_on_track(Point(x, y)))
+        # border pixels lie on the track edge
+        self.assertGreater(track_raster.image[BORDER_CHANNEL].sum(), 0)
+
+    def test_init_crop_size(self) -> None:
+        with self.assertRaises(ValueError):
+            BirdsEyeView(crop_size=0)
+
+    def test_crop(self) -> None:
+        birds_eye_view = BirdsEyeView(self.resolution, crop_size=32)
+        # agent1 is 0.6 meter ahead of agent0 on the right side of the track
+        birds_eye_view.update(self.get_env_data({"agent0": ((8.0, 0.0, 0.0), math.pi / 2.0),
+                                                 "agent1": ((8.0, 0.6, 0.0), math.pi / 2.0)}))
+        self.assertEqual(birds_eye_view.images.shape, (2, 3, 32, 32))
+        self.assertEqual(birds_eye_view.agent_names, ("agent0", "agent1"))
+        crop = birds_eye_view.birds_eye_view["agent0"]
+        self.assertEqual(crop.dtype, np.uint8)
+        rows, columns = np.nonzero(crop[AGENTS_CHANNEL])
+        # other agent only, in the upper center of the crop
+        self.assertTrue(np.all(rows < 16))
+        self.assertAlmostEqual(columns.mean(), 15.5)
+        self.assertAlmostEqual(len(rows) * self.resolution ** 2,
+                               DEEPRACER_LENGTH * DEEPRACER_WIDTH, delta=0.02)
+        # agent0 appears behind agent1
+        self.assertTrue(np.all(np.nonzero(
+            birds_eye_view.birds_eye_view["agent1"][AGENTS_CHANNEL])[0] >= 16))
+        # inner border to the left and outer border to the right of the agent
+        self.assertEqual(crop[TRACK_CHANNEL, 16, 16], 1)
+        self.assertEqual(crop[TRACK_CHANNEL, 16, 0], 0)
+        self.assertEqual(crop[TRACK_CHANNEL, 16, 31], 0)
+
+    def test_crop_rotate(self) -> None:
+        poses = {"agent0": ((8.0, 0.0, 0.0), 0.0),
+                 "agent1": ((8.0, 0.6, 0.0), 0.0)}
+        birds_eye_view = BirdsEyeView(self.resolution, crop_size=32)
+        birds_eye_view.update(self.get_env_data(poses))
+        # heading along x, so agent1 is to the left
+        rows, columns = np.nonzero(birds_eye_view.images[0, AGENTS_CHANNEL])
+        self.assertTrue(np.all(columns < 16))
+        north_up = BirdsEyeView(self.resolution, crop_size=32, rotate=False)
+        north_up.update(self.get_env_data(poses))
+        rows, columns = np.nonzero(north_up.images[0, AGENTS_CHANNEL])
+        self.assertTrue(np.all(rows < 16))
+
+    def test_crop_footprint(self) -> None:
+        size = 24
+        birds_eye_view = BirdsEyeView(self.resolution, crop_size=size)
+        birds_eye_view.update(self.get_env_data({"agent0": ((8.0, 0.0, 0.0), 1.2),
+                                                 "agent1": ((7.85, 0.4, 0.0), 2.1)}))
+        # pixel centers of the agent0 crop inside the rotated agent1 rectangle
+        offsets = (size / 2.0 - 0.5 - np.arange(size)) * self.resolution
+        forward, left = np.meshgrid(offsets, offsets, indexing="ij")
+        x = 8.0 + forward * math.cos(1.2) - left * math.sin(1.2) - 7.85
+        y = forward * math.sin(1.2) + left * math.cos(1.2) - 0.4
+        expected = (np.abs(x * math.cos(2.1) + y * math.sin(2.1)) <= DEEPRACER_LENGTH / 2.0) & \
+            (np.abs(y * math.cos(2.1) - x * math.sin(2.1)) <= DEEPRACER_WIDTH / 2.0)
+        self.assertGreater(expected.sum(), 0)
+        np.testing.assert_array_equal(birds_eye_view.images[0, AGENTS_CHANNEL], expected)
+
+    def test_crop_outside_raster(self) -> None:
+        birds_eye_view = BirdsEyeView(self.resolution, crop_size=16)
+        birds_eye_view.update(self.get_env_data({"agent0": ((100.0, 100.0, 0.0), 0.0)}))
+        self.assertEqual(birds_eye_view.images.sum(), 0)
+
+    def test_track_image(self) -> None:
+        birds_eye_view = BirdsEyeView(self.resolution, crop_size=None)
+        birds_eye_view.update(self.get_env_data({"agent0": ((8.0, 0.0, 0.0), 0.3),
+                                                 "agent1": ((-8.0, 0.0, 0.0), 0.0)}))
+        track_raster = get_track_raster(self.track_geometry, self.resolution)
+        image = birds_eye_view.birds_eye_view["agent0"]
+        self.assertIs(birds_eye_view.birds_eye_view["agent1"], image)
+        self.assertEqual(image.shape, (3,) + track_raster.shape)
+        np.testing.assert_array_equal(image[:AGENTS_CHANNEL], track_raster.image)
+        stamped = image[AGENTS_CHANNEL].sum()
+        self.assertAlmostEqual(stamped * self.resolution ** 2,
+                               2.0 * DEEPRACER_LENGTH * DEEPRACER_WIDTH, delta=0.04)
+        # footprints of the last step are cleared
+        birds_eye_view.update(self.get_env_data({"agent0": ((0.0, 5.0, 0.0), 0.0),
+                                                 "agent1": ((0.0, -5.0, 0.0), 0.0)}))
+        rows, _ = np.nonzero(image[AGENTS_CHANNEL])
+        self.assertTrue(np.all(np.abs(track_raster.get_centers(rows, rows)[1]) > 4.0))
+
+    def test_fields(self) -> None:
+        birds_eye_view = BirdsEyeView(self.resolution, crop_size=8)
+        birds_eye_view.update(self.get_env_data({"agent0": ((8.0, 0.0, 0.0), 0.0)}))
+        self.assertEqual(tuple(birds_eye_view.to_dict()), birds_eye_view.fields)
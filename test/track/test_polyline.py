@@ -0,0 +1,147 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import numpy as np
+
+from unittest import TestCase
+
+from shapely.geometry import Point
+from deepracer_env_state.track.polyline import (
+    GRID_MAX_CELLS,
+    Polyline,
+    TrackPolylines,
+    get_track_polylines)
+from deepracer_track_geometry import TrackGeometry
+
+
+class PolylineTest(TestCase):
+    def setUp(self) -> None:
+        self.track_geometry = TrackGeometry("monaco")
+        self.center_line = Polyline(self.track_geometry.track_center_line.coords)
+        random_state = np.random.RandomState(0)
+        self.points = np.c_[random_state.uniform(-12.0, 12.0, 200),
+                            random_state.uniform(-9.0, 9.0, 200)]
+
+    def test_square(self) -> None:
+        polyline = Polyline([(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0), (0.0, 0.0)])
+        self.assertTrue(polyline.is_ring)
+        self.assertEqual(polyline.length, 8.0)
+        segments, ndists, offsets = polyline.project([(1.0, 0.5), (3.0, 1.0), (3.0, -1.0)])
+        self.assertEqual(segments.tolist(), [0, 1, 0])
+        self.assertEqual(ndists.tolist(), [0.125, 0.375, 0.25])
+        # inside of the counter clockwise square is to the left
+        self.assertAlmostEqual(offsets[0], 0.5)
+        self.assertAlmostEqual(offsets[1], -1.0)
+        # outside of the corner
+        self.assertAlmostEqual(offsets[2], -2.0 ** 0.5)
+        self.assertEqual(polyline.interpolate([0.375]).tolist(), [[2.0, 1.0]])
+
+    def test_open_polyline(self) -> None:
+        polyline = Polyline([(0.0, 0.0, 0.0), (1.0, 0.0, 0.0)])
+        self.assertFalse(polyline.is_ring)
+        self.assertEqual(polyline.coords.shape, (2, 2))
+        self.assertEqual(polyline.distance([(-1.0, 0.0), (0.5, -2.0)]).tolist(), [1.0, 2.0])
+
+    def test_locate_matches_shapely(self) -> None:
+        center_line = self.track_geometry.track_center_line
+        segments, ndists, offsets = self.center_line.project(self.points)
+        for point, ndist, offset in zip(self.points, ndists, offsets):
+            self.assertAlmostEqual(ndist, center_line.project(Point(point), normalized=True),
+                                   places=9)
+            self.assertAlmostEqual(abs(offset), center_line.distance(Point(point)), places=9)
+
+    def test_locate_matches_full_search(self) -> None:
+        segments, params = self.center_line.locate(self.points)
+        self.assertEqual(segments.tolist(),
+                         np.argmin(self.center_line._get_squared_distances(self.points),
+                                   axis=1).tolist())
+        for point, segment, param in zip(self.points, segments, params):
+            self.assertEqual(self.center_line.locate_point(*point), (segment, param))
+
+    def test_dense_polyline_grid(self) -> None:
+        angles = np.linspace(0.0, 2.0 * np.pi, 5001)
+        polyline = Polyline(np.c_[10.0 * np.cos(angles), 10.0 * np.sin(angles)])
+        self.assertLessEqual(int(np.prod(polyline._grid_shape)), GRID_MAX_CELLS)
+        points = np.c_[np.cos(angles[:200] * 7.0), np.sin(angles[:200] * 7.0)] * \
+            np.linspace(8.0, 12.0, 200)[:, np.newaxis]
+        segments, params = polyline.locate(points)
+        self.assertEqual(segments.tolist(),
+                         np.argmin(polyline._get_squared_distances(points), axis=1).tolist())
+        for point, segment, param in zip(points, segments, params):
+            self.assertEqual(polyline.locate_point(*point), (segment, param))
+
+    def test_get_nearby_segments(self) -> None:
+        points = np.concatenate([self.points, [[100.0, 100.0]]])
+        point_indices, segments = self.center_line.get_nearby_segments(points)
+        self.assertTrue(np.all(np.diff(point_indices) >= 0))
+        distances = np.sqrt(self.center_line._get_squared_distances(points))
+        for index, point_distances in enumerate(distances):
+            nearby = set(segments[point_indices == index].tolist())
+            self.assertTrue(set(np.nonzero(
+                point_distances <= self.center_line.nearby_distance)[0].tolist()) <= nearby)
+        self.assertNotIn(len(points) - 1, point_indices)
+
+    def test_interpolate_matches_shapely(self) -> None:
+        center_line = self.track_geometry.track_center_line
+        ndists = np.linspace(0.0, 1.0, 37)
+        points = self.center_line.interpolate(ndists)
+        for ndist, point in zip(ndists, points):
+            expected = center_line.interpolate(ndist, normalized=True)
+            self.assertAlmostEqual(point[0], expected.x, places=9)
+            self.assertAlmostEqual(point[1], expected.y, places=9)
+
+    def test_scalar_matches_batch(self) -> None:
+        segments, params = self.center_line.locate(self.points)
+        ndists = self.center_line.get_ndists(segments, params)
+        offsets = self.center_line.get_offsets(self.points, segments, params)
+        for point, segment, param, ndist, offset in zip(self.points, segments, params,
+                                                        ndists, offsets):
+            self.assertAlmostEqual(self.center_line.get_ndist(segment, param), ndist, places=12)
+            self.assertAlmostEqual(self.center_line.get_offset(*point, segment, param), offset,
+                                   places=12)
+
+
+class TrackPolylinesTest(TestCase):
+    def setUp(self) -> None:
+        self.track_geometry = TrackGeometry("monaco")
+
+    def test_get_track_polylines(self) -> None:
+        track_polylines = get_track_polylines(self.track_geometry)
+        self.assertIsInstance(track_polylines, TrackPolylines)
+        self.assertIs(get_track_polylines(self.track_geometry), track_polylines)
+        self.assertIsNot(get_track_polylines(TrackGeometry("monaco")), track_polylines)
+
+    def test_inner_side(self) -> None:
+        track_polylines = get_track_polylines(self.track_geometry)
+        inner_point = self.track_geometry.inner_border_line.interpolate(0.3, normalized=True)
+        _, _, offsets = track_polylines.center_line.project([(inner_point.x, inner_point.y)])
+        self.assertEqual(np.sign(offsets[0]), track_polylines.inner_side)
+
+    def test_get_track_width(self) -> None:
+        track_geometry = self.track_geometry
+        track_polylines = get_track_polylines(track_geometry)
+        center_line = track_polylines.center_line
+        for ndist in (0.1, 0.3, 0.55, 0.9):
+            center_point = track_geometry.track_center_line.interpolate(ndist, normalized=True)
+            inner_point = track_geometry.inner_border_line.interpolate(
+                track_geometry.inner_border_line.project(center_point))
+            outer_point = track_geometry.outer_border_line.interpolate(
+                track_geometry.outer_border_line.project(center_point))
+            expected = inner_point.distance(outer_point)
+            segments, params = center_line.locate([(center_point.x, center_point.y)])
+            self.assertAlmostEqual(track_polylines.get_track_width(
+                center_line.get_points(segments, params))[0], expected, places=9)
+            self.assertAlmostEqual(track_polylines.get_track_width_at(segments[0], params[0]),
+                                   expected, places=9)
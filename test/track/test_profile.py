@@ -0,0 +1,72 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import math
+import numpy as np
+
+from unittest import TestCase
+
+from deepracer_env_state.track.polyline import Polyline
+from deepracer_env_state.track.profile import (
+    TrackProfile,
+    get_track_profile)
+from deepracer_track_geometry import TrackGeometry
+
+
+class TrackProfileTest(TestCase):
+    def setUp(self) -> None:
+        # counter clockwise circle of radius 2
+        angles = np.linspace(0.0, 2.0 * math.pi, 361)
+        self.circle = TrackProfile(Polyline(np.c_[2.0 * np.cos(angles), 2.0 * np.sin(angles)]))
+
+    def test_circle(self) -> None:
+        self.assertAlmostEqual(self.circle.length, 4.0 * math.pi, places=3)
+        np.testing.assert_allclose(self.circle.curvatures, 0.5, rtol=1e-4)
+        # first segment heads up from (2, 0)
+        self.assertAlmostEqual(self.circle.get_heading(0), math.pi / 2.0 + math.pi / 360.0)
+        self.assertEqual(len(self.circle.headings), 360)
+
+    def test_clockwise_circle(self) -> None:
+        angles = np.linspace(0.0, -2.0 * math.pi, 361)
+        profile = TrackProfile(Polyline(np.c_[2.0 * np.cos(angles), 2.0 * np.sin(angles)]))
+        self.assertAlmostEqual(profile.get_curvature(1.0), -0.5, places=3)
+
+    def test_get_curvature(self) -> None:
+        # rectangle ring turns left by pi / 2 at every corner over the mean side length
+        rectangle = TrackProfile(Polyline([(0.0, 0.0), (2.0, 0.0), (2.0, 1.0),
+                                           (0.0, 1.0), (0.0, 0.0)]), step=0.5)
+        self.assertAlmostEqual(rectangle.get_curvature(2.0), math.pi / 3.0)
+        self.assertAlmostEqual(rectangle.get_curvature(0.0), math.pi / 3.0)
+        # distances wrap around the ring
+        self.assertAlmostEqual(rectangle.get_curvature(10.0), rectangle.get_curvature(2.0))
+        np.testing.assert_allclose(rectangle.get_curvatures([2.0, 1.0, 10.0, -6.0]),
+                                   [rectangle.get_curvature(distance)
+                                    for distance in (2.0, 1.0, 10.0, -6.0)])
+
+    def test_open_polyline(self) -> None:
+        profile = TrackProfile(Polyline([(0.0, 0.0), (1.0, 0.0), (1.0, 1.0)]), step=0.5)
+        self.assertEqual(profile.get_curvature(0.0), 0.0)
+        self.assertAlmostEqual(profile.get_curvature(1.0), math.pi / 2.0)
+        # linearly interpolated between the vertices
+        self.assertAlmostEqual(profile.get_curvature(0.5), math.pi / 4.0)
+        # clipped to the ends
+        self.assertEqual(profile.get_curvature(5.0), 0.0)
+        self.assertEqual(profile.get_curvature(-5.0), 0.0)
+
+    def test_get_track_profile(self) -> None:
+        track_geometry = TrackGeometry("monaco")
+        track_profile = get_track_profile(track_geometry)
+        self.assertIs(get_track_profile(track_geometry), track_profile)
+        self.assertAlmostEqual(track_profile.length, track_geometry.length)
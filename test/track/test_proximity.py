@@ -0,0 +1,112 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import math
+import numpy as np
+
+from deepracer_env_state.track.proximity import Proximity
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+
+
+class ProximityTest(TestCase):
+    def setUp(self) -> None:
+        self.proximity = Proximity()
+        # straight 100 meter track along x axis
+        self.track_geometry = MagicMock()
+        self.track_geometry.track_center_line.coords = [(0.0, 0.0), (50.0, 0.0), (100.0, 0.0)]
+        self.track_geometry.inner_border_line.coords = [(0.0, 5.0), (100.0, 5.0)]
+        self.track_geometry.outer_border_line.coords = [(0.0, -5.0), (100.0, -5.0)]
+
+    def get_env_data(self, positions, done=None) -> DeepRacerEnvData:
+        done = done or {}
+        return DeepRacerEnvData(
+            {name: done.get(name, False) for name in positions},
+            {},
+            {name: {"position": position,
+                    "orientation": (0.0, 0.0, 0.0, 1.0),
+                    "is_offtrack": False,
+                    "progress": 0.0}
+             for name, position in positions.items()},
+            self.track_geometry)
+
+    def test_init(self) -> None:
+        self.assertEqual(self.proximity.agent_names, tuple())
+        self.assertEqual(self.proximity.proximity, {})
+        self.assertEqual(self.proximity.overtakes, [])
+
+    def test_single_agent(self) -> None:
+        self.proximity.update(self.get_env_data({"agent0": (1.0, 0.0, 0.0)}))
+        self.assertEqual(self.proximity.proximity,
+                         {"agent0": {"nearest_opponent": None,
+                                     "nearest_opponent_distance": None,
+                                     "lateral_offset": None,
+                                     "opponent_ahead": None,
+                                     "gap_ahead": None,
+                                     "opponent_behind": None,
+                                     "gap_behind": None}})
+
+    def test_update(self) -> None:
+        self.proximity.update(self.get_env_data({"agent0": (10.0, 0.0, 0.0),
+                                                 "agent1": (13.0, 4.0, 0.0),
+                                                 "agent2": (80.0, 0.0, 0.0)}))
+        self.assertEqual(self.proximity.agent_names, ("agent0", "agent1", "agent2"))
+        self.assertEqual(self.proximity.distances[0, 1], 5.0)
+        self.assertTrue(math.isinf(self.proximity.distances[0, 0]))
+        np.testing.assert_allclose(self.proximity.gaps[0], [0.0, 3.0, -30.0], atol=1e-9)
+        proximity = self.proximity.proximity
+        self.assertEqual(proximity["agent0"]["nearest_opponent"], "agent1")
+        self.assertAlmostEqual(proximity["agent0"]["nearest_opponent_distance"], 5.0)
+        self.assertAlmostEqual(proximity["agent0"]["lateral_offset"], 4.0)
+        self.assertEqual(proximity["agent0"]["opponent_ahead"], "agent1")
+        self.assertAlmostEqual(proximity["agent0"]["gap_ahead"], 3.0)
+        self.assertEqual(proximity["agent0"]["opponent_behind"], "agent2")
+        self.assertAlmostEqual(proximity["agent0"]["gap_behind"], 30.0)
+        self.assertEqual(proximity["agent1"]["opponent_behind"], "agent0")
+        self.assertAlmostEqual(proximity["agent1"]["lateral_offset"], -4.0)
+
+    def test_gap_wrap_around(self) -> None:
+        self.proximity.update(self.get_env_data({"agent0": (95.0, 0.0, 0.0),
+                                                 "agent1": (5.0, 0.0, 0.0)}))
+        self.assertAlmostEqual(self.proximity.gaps[0, 1], 10.0)
+        self.assertAlmostEqual(self.proximity.gaps[1, 0], -10.0)
+
+    def test_overtakes(self) -> None:
+        self.proximity.update(self.get_env_data({"agent0": (10.0, 0.0, 0.0),
+                                                 "agent1": (11.0, 0.5, 0.0)}))
+        self.assertEqual(self.proximity.overtakes, [])
+        self.proximity.update(self.get_env_data({"agent0": (12.0, 0.0, 0.0),
+                                                 "agent1": (11.5, 0.5, 0.0)}))
+        self.assertEqual(self.proximity.overtakes, [("agent0", "agent1")])
+        self.proximity.update(self.get_env_data({"agent0": (13.0, 0.0, 0.0),
+                                                 "agent1": (12.0, 0.5, 0.0)}))
+        self.assertEqual(self.proximity.overtakes, [])
+
+    def test_overtakes_ignore_done(self) -> None:
+        self.proximity.update(self.get_env_data({"agent0": (10.0, 0.0, 0.0),
+                                                 "agent1": (11.0, 0.5, 0.0)},
+                                                done={"agent1": True}))
+        self.proximity.update(self.get_env_data({"agent0": (12.0, 0.0, 0.0),
+                                                 "agent1": (1.0, 0.5, 0.0)}))
+        self.assertEqual(self.proximity.overtakes, [])
+
+    def test_to_dict(self) -> None:
+        self.proximity.update(self.get_env_data({"agent0": (10.0, 0.0, 0.0),
+                                                 "agent1": (13.0, 4.0, 0.0)}))
+        self.assertEqual(self.proximity.to_dict(),
+                         {"proximity": self.proximity.proximity,
+                          "overtakes": []})
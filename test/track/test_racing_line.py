@@ -0,0 +1,64 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import math
+import numpy as np
+
+from unittest import TestCase
+
+from deepracer_env_state.track.racing_line import RacingLine
+
+
+class RacingLineTest(TestCase):
+    def setUp(self) -> None:
+        # straight line along x with speeds rising from 1 to 3
+        self.racing_line = RacingLine([(0.0, 0.0, 0.0), (2.0, 0.0, 0.0), (4.0, 0.0, 0.0)],
+                                      speeds=[1.0, 2.0, 3.0])
+
+    def test_init_speeds_mismatch(self) -> None:
+        with self.assertRaises(ValueError):
+            RacingLine([(0.0, 0.0), (1.0, 0.0)], speeds=[1.0])
+
+    def test_properties(self) -> None:
+        self.assertEqual(self.racing_line.length, 4.0)
+        np.testing.assert_array_equal(self.racing_line.speeds, [1.0, 2.0, 3.0])
+        np.testing.assert_array_equal(self.racing_line.polyline.coords[:, 1], 0.0)
+
+    def test_project(self) -> None:
+        ndists, deviations, speeds = self.racing_line.project([(1.0, 0.5), (3.0, -0.25)])
+        np.testing.assert_allclose(ndists, [0.25, 0.75])
+        # positive to the left of the line direction
+        np.testing.assert_allclose(deviations, [0.5, -0.25])
+        np.testing.assert_allclose(speeds, [1.5, 2.5])
+
+    def test_project_point(self) -> None:
+        points = np.random.RandomState(0).uniform(-1.0, 5.0, (20, 2))
+        ndists, deviations, speeds = self.racing_line.project(points)
+        for index, (x, y) in enumerate(points):
+            ndist, deviation, speed = self.racing_line.project_point(x, y)
+            self.assertAlmostEqual(ndist, ndists[index])
+            self.assertAlmostEqual(deviation, deviations[index])
+            self.assertAlmostEqual(speed, speeds[index])
+
+    def test_without_speeds(self) -> None:
+        angles = np.linspace(0.0, 2.0 * math.pi, 91)
+        racing_line = RacingLine(np.c_[np.cos(angles), np.sin(angles)])
+        self.assertIsNone(racing_line.speeds)
+        ndist, deviation, speed = racing_line.project_point(0.0, 0.5)
+        self.assertAlmostEqual(ndist, 0.25)
+        # inside of the counter clockwise circle is to the left
+        self.assertAlmostEqual(deviation, 0.5, places=2)
+        self.assertIsNone(speed)
+        self.assertTrue(np.isnan(racing_line.project([(0.0, 0.5)])[2][0]))
@@ -0,0 +1,104 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import math
+import numpy as np
+
+from unittest import TestCase
+from shapely.geometry import LineString, MultiLineString, Point
+
+from deepracer_env_state.agent.constants import RELATIVE_POSITION_OF_FRONT_OF_CAR
+from deepracer_env_state.deepracer_env_data import DeepRacerEnvData
+from deepracer_env_state.track.ray_cast import (
+    RayCast,
+    get_border_segments)
+from deepracer_track_geometry import TrackGeometry
+
+
+class RayCastTest(TestCase):
+    def setUp(self) -> None:
+        self.track_geometry = TrackGeometry("monaco")
+        self.ray_cast = RayCast(num_rays=5, field_of_view=math.pi / 2.0, max_range=3.0)
+
+    def get_env_data(self, poses) -> DeepRacerEnvData:
+        return DeepRacerEnvData(
+            {name: False for name in poses},
+            {},
+            {name: {"position": position,
+                    "orientation": (0.0, 0.0, math.sin(yaw / 2.0), math.cos(yaw / 2.0)),
+                    "is_offtrack": False,
+                    "progress": 0.0}
+             for name, (position, yaw) in poses.items()},
+            self.track_geometry)
+
+    def get_expected(self, position, yaw) -> np.ndarray:
+        borders = MultiLineString([self.track_geometry.inner_border_line.coords,
+                                   self.track_geometry.outer_border_line.coords])
+        front_x = RELATIVE_POSITION_OF_FRONT_OF_CAR[0]
+        origin = Point(position[0] + front_x * math.cos(yaw),
+                       position[1] + front_x * math.sin(yaw))
+        expected = []
+        for angle in yaw + self.ray_cast.ray_angles:
+            ray = LineString([origin, (origin.x + 3.0 * math.cos(angle),
+                                       origin.y + 3.0 * math.sin(angle))])
+            hit = ray.intersection(borders)
+            expected.append(origin.distance(hit) if not hit.is_empty else 3.0)
+        return np.array(expected)
+
+    def test_init(self) -> None:
+        np.testing.assert_allclose(self.ray_cast.ray_angles,
+                                   np.linspace(-math.pi / 4.0, math.pi / 4.0, 5))
+        self.assertEqual(self.ray_cast.max_range, 3.0)
+        self.assertEqual(self.ray_cast.ray_distances, {})
+        np.testing.assert_array_equal(RayCast(num_rays=1).ray_angles, [0.0])
+        with self.assertRaises(ValueError):
+            RayCast(num_rays=0)
+        with self.assertRaises(ValueError):
+            RayCast(max_range=0.0)
+
+    def test_update(self) -> None:
+        poses = {"agent0": ((8.0, 0.0, 0.0), math.pi / 2.0),
+                 "agent1": ((0.0, 5.0, 0.0), math.pi),
+                 "agent2": ((-7.6, 0.5, 0.0), 0.3)}
+        self.ray_cast.update(self.get_env_data(poses))
+        self.assertEqual(self.ray_cast.agent_names, ("agent0", "agent1", "agent2"))
+        self.assertEqual(self.ray_cast.distances.shape, (3, 5))
+        ray_distances = self.ray_cast.ray_distances
+        for name, (position, yaw) in poses.items():
+            self.assertEqual(ray_distances[name].dtype, np.float32)
+            np.testing.assert_allclose(ray_distances[name], self.get_expected(position, yaw),
+                                       rtol=1e-6, atol=1e-6)
+
+    def test_no_hit(self) -> None:
+        # far outside the track every ray misses
+        self.ray_cast.update(self.get_env_data({"agent0": ((50.0, 50.0, 0.0), 0.0)}))
+        np.testing.assert_array_equal(self.ray_cast.distances, 3.0)
+
+    def test_border_segments(self) -> None:
+        border_segments = get_border_segments(self.track_geometry)
+        self.assertIs(get_border_segments(self.track_geometry), border_segments)
+        self.assertEqual(len(border_segments),
+                         len(self.track_geometry.inner_border_line.coords) +
+                         len(self.track_geometry.outer_border_line.coords) - 2)
+        ray_indices, segments = border_segments.get_candidates(
+            np.array([[8.0, 0.0], [50.0, 50.0]]), np.array([[1.0, 0.0], [1.0, 0.0]]), 1.0)
+        self.assertGreater(len(segments), 0)
+        self.assertLess(len(np.unique(segments)), len(border_segments))
+        # rays far outside the track have no candidates
+        np.testing.assert_array_equal(ray_indices, 0)
+
+    def test_fields(self) -> None:
+        self.ray_cast.update(self.get_env_data({"agent0": ((8.0, 0.0, 0.0), 0.0)}))
+        self.assertEqual(tuple(self.ray_cast.to_dict()), self.ray_cast.fields)
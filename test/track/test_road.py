@@ -0,0 +1,44 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import numpy as np
+
+from unittest import TestCase
+
+from shapely.geometry import Point
+from deepracer_env_state.track.road import (
+    contains,
+    get_road_edge_index)
+from deepracer_track_geometry import TrackGeometry
+
+
+class RoadTest(TestCase):
+    def setUp(self) -> None:
+        self.track_geometry = TrackGeometry("monaco")
+
+    def test_get_road_edge_index(self) -> None:
+        edge_index = get_road_edge_index(self.track_geometry)
+        self.assertIs(get_road_edge_index(self.track_geometry), edge_index)
+        self.assertIsNot(get_road_edge_index(TrackGeometry("monaco")), edge_index)
+
+    def test_contains_matches_is_on_track(self) -> None:
+        random_state = np.random.RandomState(0)
+        points = np.c_[random_state.uniform(-10.0, 10.0, 500),
+                       random_state.uniform(-7.0, 7.0, 500)]
+        is_inside = contains(points, get_road_edge_index(self.track_geometry))
+        self.assertEqual(is_inside.tolist(),
+                         [self.track_geometry.is_on_track(Point(point)) for point in points])
+        self.assertTrue(is_inside.any())
+        self.assertFalse(is_inside.all())
@@ -13,9 +13,12 @@
 #   See the License for the specific language governing permissions and         #
 #   limitations under the License.                                              #
 #################################################################################
+import copy
+
 from unittest import TestCase
 from unittest.mock import MagicMock
 
+from deepracer_env_state.track.racing_line import RacingLine
 from deepracer_env_state.track.track import Track
 from deepracer_track_geometry import (
     TrackGeometry,
@@ -52,6 +55,33 @@ class TrackTest(TestCase):
         self.track.update(env_data_mock)
         self.assertEqual(self.track._track_geometry, "track_geometry")
 
+    def test_deepcopy(self) -> None:
+        track = copy.deepcopy(self.track)
+        self.assertIsNot(track, self.track)
+        self.assertIs(track._track_geometry, self.track._track_geometry)
+
+    def test_racing_line(self) -> None:
+        self.assertIsNone(self.track.racing_line)
+        racing_line = RacingLine([(0.0, 0.0), (1.0, 0.0)])
+        self.track.set_racing_line(self.track._track_geometry.track_name, racing_line)
+        self.assertIs(self.track.racing_line, racing_line)
+        self.assertIsNone(self.track.get_racing_line(TrackGeometry("other_track")))
+        # lines are set per direction
+        self.assertIsNone(self.track.get_racing_line(TrackGeometry(
+            self.track._track_geometry.track_name, direction=TrackDirection.CLOCKWISE)))
+        # copies share the racing lines until either sets a line
+        track = copy.deepcopy(self.track)
+        self.assertIs(track._racing_lines, self.track._racing_lines)
+        track.set_racing_line(self.track._track_geometry.track_name, None)
+        self.assertIsNone(track.racing_line)
+        self.assertIs(self.track.racing_line, racing_line)
+
+    def test_racing_lines_init(self) -> None:
+        racing_line = RacingLine([(0.0, 0.0), (1.0, 0.0)])
+        track = Track(racing_lines={(DEFAULT_TRACK, TrackDirection.COUNTER_CLOCKWISE):
+                                    racing_line})
+        self.assertIs(track.racing_line, racing_line)
+
     def test_to_dict(self) -> None:
         self.assertEqual(
             self.track.to_dict(),
@@ -0,0 +1,150 @@
+#################################################################################
+#   Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.          #
+#                                                                               #
+#   Licensed under the Apache License, Version 2.0 (the "License").             #
+#   You may not use this file except in compliance with the License.            #
+#   You may obtain a copy of the License at                                     #
+#                                                                               #
+#       http://www.apache.org/licenses/LICENSE-2.0                              #
+#                                                                               #
+#   Unless required by applicable law or agreed to in writing, software         #
+#   distributed under the License is distributed on an "AS IS" BASIS,           #
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.    #
+#   See the License for the specific language governing permissions and         #
+#   limitations under the License.                                              #
+#################################################################################
+import gc
+import threading
+import time
+
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+
+from deepracer_env_state.track.track_geometry_pool import (
+    DEFAULT_MAX_SIZE,
+    TrackGeometryPool,
+    build_track_geometry,
+    get_default_track_geometry)
+from deepracer_env_config import Track as TrackConfig
+from deepracer_track_geometry import TrackDirection
+
+
+class TrackGeometryPoolTest(TestCase):
+    def setUp(self) -> None:
+        self.build_mock = MagicMock(side_effect=lambda track_config: track_config.name)
+        self.track_geometry_pool = TrackGeometryPool(build=self.build_mock)
+
+    def tearDown(self) -> None:
+        self.track_geometry_pool.close()
+
+    @patch("deepracer_env_state.track.track_geometry_pool.get_track_polylines")
+    @patch("deepracer_env_state.track.track_geometry_pool.TrackGeometry")
+    def test_build_track_geometry(self, track_geometry_mock, get_track_polylines_mock) -> None:
+        track_geometry = build_track_geometry(TrackConfig(name="austin"))
+        track_geometry_mock.assert_called_once_with(
+            track_name="austin",
+            finish_line=0.0,
+            direction=TrackDirection.COUNTER_CLOCKWISE)
+        get_track_polylines_mock.assert_called_once_with(track_geometry_mock.return_value)
+        self.assertEqual(track_geometry, track_geometry_mock.return_value)
+
+    def test_get_key(self) -> None:
+        self.assertEqual(TrackGeometryPool.get_key(TrackConfig(name="austin")),
+                         ("austin", 0.0, TrackDirection.COUNTER_CLOCKWISE))
+
+    def test_get_not_preloaded(self) -> None:
+        track_config = TrackConfig(name="austin")
+        self.assertFalse(self.track_geometry_pool.is_ready(track_config))
+        self.assertEqual(self.track_geometry_pool.get(track_config), "austin")
+        self.assertEqual(self.track_geometry_pool.get(track_config), "austin")
+        self.build_mock.assert_called_once_with(track_config)
+        self.assertTrue(self.track_geometry_pool.is_ready(track_config))
+
+    def test_preload(self) -> None:
+        track_configs = [TrackConfig(name="austin"), TrackConfig(name="monaco")]
+        self.track_geometry_pool.preload(track_configs)
+        self.track_geometry_pool.preload(track_configs)
+        self.assertEqual(len(self.track_geometry_pool), 2)
+        self.assertEqual(self.track_geometry_pool.get(track_configs[1]), "monaco")
+        self.assertEqual(self.track_geometry_pool.get(track_configs[0]), "austin")
+        self.assertEqual(self.build_mock.call_count, 2)
+
+    def test_get_preload_failed(self) -> None:
+        self.build_mock.side_effect = RuntimeError()
+        track_config = TrackConfig(name="austin")
+        self.track_geometry_pool.preload([track_config])
+        with self.assertRaises(RuntimeError):
+            self.track_geometry_pool.get(track_config)
+        self.assertEqual(len(self.track_geometry_pool), 0)
+
+    def test_max_size(self) -> None:
+        track_geometry_pool = TrackGeometryPool(build=self.build_mock, max_size=1)
+        track_geometry_pool.get(TrackConfig(name="austin"))
+        track_geometry_pool.get(TrackConfig(name="monaco"))
+        self.assertEqual(len(track_geometry_pool), 1)
+        self.assertFalse(track_geometry_pool.is_ready(TrackConfig(name="austin")))
+        self.assertTrue(track_geometry_pool.is_ready(TrackConfig(name="monaco")))
+
+    def test_max_size_default(self) -> None:
+        for index in range(DEFAULT_MAX_SIZE + 2):
+            self.track_geometry_pool.get(TrackConfig(name="track{}".format(index)))
+        self.assertEqual(len(self.track_geometry_pool), DEFAULT_MAX_SIZE)
+        self.assertFalse(self.track_geometry_pool.is_ready(TrackConfig(name="track0")))
+
+    def test_close(self) -> None:
+        self.track_geometry_pool.preload([TrackConfig(name="austin")])
+        executor = self.track_geometry_pool._executor
+        self.track_geometry_pool.close()
+        self.assertEqual(len(self.track_geometry_pool), 0)
+        self.assertIsNone(self.track_geometry_pool._executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(self.build_mock, TrackConfig(name="monaco"))
+        # the pool creates a new executor on the next preload
+        self.track_geometry_pool.preload([TrackConfig(name="monaco")])
+        self.assertEqual(self.track_geometry_pool.get(TrackConfig(name="monaco")), "monaco")
+
+    def test_shutdown_alias(self) -> None:
+        self.assertIs(TrackGeometryPool.shutdown, TrackGeometryPool.close)
+
+    def test_empty_pool_is_true(self) -> None:
+        self.assertEqual(len(self.track_geometry_pool), 0)
+        self.assertTrue(self.track_geometry_pool)
+
+    def test_close_given_executor(self) -> None:
+        executor = MagicMock()
+        track_geometry_pool = TrackGeometryPool(build=self.build_mock, executor=executor)
+        track_geometry_pool.close()
+        executor.shutdown.assert_not_called()
+
+    def test_garbage_collected_shuts_down_executor(self) -> None:
+        track_geometry_pool = TrackGeometryPool(build=self.build_mock)
+        track_geometry_pool.preload([TrackConfig(name="austin")])
+        track_geometry_pool.get(TrackConfig(name="austin"))
+        executor = track_geometry_pool._executor
+        del track_geometry_pool
+        gc.collect()
+        with self.assertRaises(RuntimeError):
+            executor.submit(self.build_mock, TrackConfig(name="monaco"))
+
+    def test_clear(self) -> None:
+        self.track_geometry_pool.get(TrackConfig(name="austin"))
+        self.track_geometry_pool.clear()
+        self.assertEqual(len(self.track_geometry_pool), 0)
+
+
+class DefaultTrackGeometryTest(TestCase):
+    @patch("deepracer_env_state.track.track_geometry_pool._DEFAULT_TRACK_GEOMETRY", None)
+    @patch("deepracer_env_state.track.track_geometry_pool.TrackGeometry")
+    def test_get_default_track_geometry_concurrent(self, track_geometry_mock) -> None:
+        # a slow build lets every thread pass the unlocked check first
+        track_geometry_mock.side_effect = lambda track_name: time.sleep(0.05) or object()
+        track_geometries = []
+        threads = [threading.Thread(
+            target=lambda: track_geometries.append(get_default_track_geometry()))
+            for _ in range(8)]
+        [thread.start() for thread in threads]
+        [thread.join() for thread in threads]
+        track_geometry_mock.assert_called_once()
+        self.assertEqual(len(track_geometries), 8)
+        self.assertTrue(all(track_geometry is track_geometries[0]
+                            for track_geometry in track_geometries))